@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the closed trades and the performance statistics of strategies
+
+It runs a strategy, which closes a trade on almost every bar and calculates the average winning trade
+on every bar. It prints the per-bar time of reading every closed trade by index from the previous
+deque and from the `BoundedList` of the trades, and of reading the incrementally updated
+`strategy.avg_winning_trade`.
+"""
+from argparse import ArgumentParser
+from collections import deque
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import random
+
+from pynecore.core.script_runner import ScriptRunner
+from pynecore.core.syminfo import SymInfo
+from pynecore.types.ohlcv import OHLCV
+
+SCRIPT = '''"""
+@pyne
+"""
+from pynecore.lib import script, strategy, bar_index
+from pynecore.lib.strategy import closedtrades
+
+
+@script.strategy("Closed Trades Benchmark")
+def main():
+    if bar_index % 2:
+        strategy.entry("Long", strategy.long)
+    else:
+        strategy.entry("Short", strategy.short)
+{body}
+'''
+
+# Every closed trade is read
+LOOP = '''
+    count = min(strategy.wintrades + strategy.losstrades + strategy.eventrades, 9000)
+    wins = 0
+    profit = 0.0
+    for i in range(count):
+        trade_profit = closedtrades.profit(i)
+        if trade_profit > 0.0:
+            wins += 1
+            profit += trade_profit
+    return {"avg_win": profit / wins if wins else 0.0}
+'''
+
+# The statistics are updated with the trades
+STATS = '''
+    return {"avg_win": strategy.avg_winning_trade}
+'''
+
+
+def _ohlcv(bars: int) -> list[OHLCV]:
+    rnd = random.Random(42)
+    price = 1000.0
+    candles = []
+    for i in range(bars):
+        open_ = price
+        price += rnd.gauss(0.0, 0.5)
+        candles.append(OHLCV(timestamp=1672531200 + i * 60, open=open_, high=max(open_, price) + 0.2,
+                             low=min(open_, price) - 0.2, close=price, volume=10.0))
+    return candles
+
+
+def _syminfo() -> SymInfo:
+    return SymInfo(prefix="BENCH", description="Benchmark", ticker="BENCH", currency="USD", period="1",
+                   type="crypto", mintick=0.01, pricescale=100, minmove=1, pointvalue=1, timezone="UTC",
+                   volumetype="base", opening_hours=[], session_starts=[], session_ends=[])
+
+
+def _run(script_path: Path, candles: list[OHLCV], use_deque: bool) -> tuple[float, int]:
+    runner = ScriptRunner(script_path, candles, _syminfo())
+    position = runner.script.position
+    assert position is not None
+    if use_deque:
+        position.closed_trades = deque(maxlen=9000)  # type: ignore
+    t0 = perf_counter()
+    runner.run()
+    return perf_counter() - t0, position.closed_trades_count
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, nargs="+", default=[1000, 4000],
+                        help="Number of bars (about the same number of trades)")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        for bars in args.bars:
+            candles = _ohlcv(bars)
+            # Separate modules, so the runs don't share the state of the script
+            results = []
+            for name, body in (("deque", LOOP), ("list", LOOP), ("stats", STATS)):
+                script_path = Path(tmp_dir) / f"closed_trades_bench_{name}_{bars}.py"
+                script_path.write_text(SCRIPT.format(body=body))
+                results.append(_run(script_path, candles, name == "deque"))
+            (deque_time, deque_trades), (list_time, list_trades), (stats_time, stats_trades) = results
+            assert deque_trades == list_trades == stats_trades
+            print(f"{bars:>6} bars: deque {deque_time / bars * 1e6:9.2f} us/bar, "
+                  f"bounded list {list_time / bars * 1e6:9.2f} us/bar ({deque_time / list_time:.1f}x), "
+                  f"statistics {stats_time / bars * 1e6:7.2f} us/bar ({deque_time / stats_time:.0f}x), "
+                  f"{stats_trades} trades")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the fast backtest mode of strategies
+
+It runs an SMA cross strategy (market entries on the signals, the position is reversed on every cross)
+bar by bar and in fast mode, where the bars without pending orders are processed later in a vectorized
+way, and with precomputed ta calls too. It prints the per-bar time of the runs and checks that the
+results are the same.
+"""
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import random
+
+from pynecore.core.ohlcv_columns import OHLCVColumns, _import_numpy
+from pynecore.core.optimizer import collect_stats
+from pynecore.core.script_runner import ScriptRunner
+from pynecore.core.syminfo import SymInfo
+
+SCRIPT = '''"""
+@pyne
+"""
+from pynecore.lib import script, strategy, close, ta
+
+
+@script.strategy("Fast Backtest Benchmark", commission_type=strategy.commission.percent, commission_value=0.05)
+def main():
+    fast = ta.sma(close, {fast})
+    slow = ta.sma(close, {slow})
+    if ta.crossover(fast, slow):
+        strategy.entry("Long", strategy.long)
+    if ta.crossunder(fast, slow):
+        strategy.entry("Short", strategy.short)
+'''
+
+
+def _ohlcv(bars: int) -> OHLCVColumns:
+    np = _import_numpy()
+    rnd = random.Random(42)
+    price = 1000.0
+    rows = []
+    for i in range(bars):
+        open_ = price
+        price += rnd.gauss(0.0, 0.5)
+        rows.append((1672531200 + i * 60, open_, max(open_, price) + 0.2, min(open_, price) - 0.2, price, 10.0))
+    return OHLCVColumns(*(np.array(column, dtype=np.int64 if i == 0 else np.float64)
+                          for i, column in enumerate(zip(*rows))))
+
+
+def _syminfo() -> SymInfo:
+    return SymInfo(prefix="BENCH", description="Benchmark", ticker="BENCH", currency="USD", period="1",
+                   type="crypto", mintick=0.01, pricescale=100, minmove=1, pointvalue=1, timezone="UTC",
+                   volumetype="base", opening_hours=[], session_starts=[], session_ends=[])
+
+
+def _run(script_path: Path, columns: OHLCVColumns, fast: bool, precompute: bool) -> tuple[float, dict]:
+    runner = ScriptRunner(script_path, columns, _syminfo(), last_bar_index=len(columns) - 1,
+                          fast=fast, precompute=precompute)
+    # The best of more runs, the first one has import costs
+    best = float('inf')
+    for _ in range(3):
+        runner.reset()
+        t0 = perf_counter()
+        runner.run()
+        best = min(best, perf_counter() - t0)
+    return best, collect_stats(runner)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, nargs="+", default=[20000, 100000], help="Number of bars")
+    parser.add_argument("--lengths", type=int, nargs=2, default=[20, 50],
+                        help="Lengths of the fast and slow moving averages (longer means fewer trades)")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        for bars in args.bars:
+            columns = _ohlcv(bars)
+            # Separate modules, so the runs don't share the state of the script
+            results = []
+            for name, fast, precompute in (("normal", False, False), ("fast", True, False),
+                                           ("precompute", False, True), ("fast_precompute", True, True)):
+                script_path = Path(tmp_dir) / f"fast_backtest_bench_{name}_{bars}.py"
+                script_path.write_text(SCRIPT.format(fast=args.lengths[0], slow=args.lengths[1]))
+                results.append(_run(script_path, columns, fast, precompute))
+            (normal, stats), (fast, fast_stats), (pre, pre_stats), (both, both_stats) = results
+            assert stats == fast_stats and pre_stats == both_stats
+            print(f"{bars:>7} bars: normal {normal / bars * 1e6:6.2f} us/bar, "
+                  f"fast {fast / bars * 1e6:6.2f} us/bar ({normal / fast:.1f}x), "
+                  f"precompute {pre / bars * 1e6:6.2f} us/bar, "
+                  f"fast + precompute {both / bars * 1e6:6.2f} us/bar ({pre / both:.1f}x), "
+                  f"{stats['total_trades']} trades")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of `isolate_function`
+
+It simulates a script with many isolated calls per bar: every bar calls a number of call sites in the
+same parent scope, then the step is reset, like the script runner does. Inner functions (defined in
+`main`) are measured separately, because they are recreated on every bar.
+"""
+from typing import Callable
+from argparse import ArgumentParser
+from time import perf_counter
+
+from pynecore.core import function_isolation
+from pynecore.core.function_isolation import isolate_function
+
+__persistent_f·s__ = 0.0
+__persistent_outer·inner·s__ = 0.0
+__persistent_function_vars__ = {'f': ['__persistent_f·s__'], 'outer.inner': ['__persistent_outer·inner·s__']}
+__scope_id__ = 'benchmark'
+
+
+def f(x: float) -> float:
+    """ A function with persistent state, like most ta functions """
+    global __persistent_f·s__
+    __persistent_f·s__ += x
+    return __persistent_f·s__
+
+
+def outer(call_ids: list[str]):
+    """ A function with an inner function, like `main` with helper functions """
+    global __scope_id__
+    offset = 1.0
+
+    def inner(x: float) -> float:
+        global __persistent_outer·inner·s__
+        __persistent_outer·inner·s__ += x + offset
+        return __persistent_outer·inner·s__
+
+    for slot, call_id in enumerate(call_ids):
+        isolate_function(inner, call_id, __scope_id__, slot)(1.0)
+
+
+def _run_nested(call_ids: list[str], bars: int) -> float:
+    """ Call sites of inner functions """
+    function_isolation.reset()
+    start = perf_counter()
+    for _ in range(bars):
+        outer(call_ids)
+        function_isolation.reset_step()
+    return perf_counter() - start
+
+
+def _run_slots(call_ids: list[str], bars: int) -> float:
+    """ Call sites with slots, like the transformer generates """
+    sites = list(enumerate(call_ids))
+    function_isolation.reset()
+    start = perf_counter()
+    for _ in range(bars):
+        for slot, call_id in sites:
+            isolate_function(f, call_id, __scope_id__, slot)(1.0)
+        function_isolation.reset_step()
+    return perf_counter() - start
+
+
+def _run_strings(call_ids: list[str], bars: int) -> float:
+    """ Call sites without slots, the full call ID is formatted in every call """
+    function_isolation.reset()
+    start = perf_counter()
+    for _ in range(bars):
+        for call_id in call_ids:
+            isolate_function(f, call_id, __scope_id__)(1.0)
+        function_isolation.reset_step()
+    return perf_counter() - start
+
+
+def _best(func: Callable[[list[str], int], float], call_ids: list[str], bars: int, repeat: int) -> float:
+    return min(func(call_ids, bars) for _ in range(repeat))
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark function isolation")
+    parser.add_argument('--sites', type=int, default=50, help="Number of call sites per bar")
+    parser.add_argument('--bars', type=int, default=20000, help="Number of bars")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of repeats, the best is used")
+    parser.add_argument('--globals', type=int, default=300,
+                        help="Number of module globals, a real script has a lot of them (imports, series, etc.)")
+    args = parser.parse_args()
+
+    # Simulate the globals of a real script
+    for i in range(args.globals):
+        globals()[f'__series_padding_{i}__'] = None
+
+    call_ids = [f"main|f|{i}" for i in range(args.sites)]
+    calls = args.sites * args.bars
+
+    strings = _best(_run_strings, call_ids, args.bars, args.repeat)
+    slots = _best(_run_slots, call_ids, args.bars, args.repeat)
+    nested = _best(_run_nested, call_ids, args.bars, args.repeat)
+
+    print(f"{calls} isolated calls ({args.sites} call sites x {args.bars} bars)")
+    print(f"  string call IDs: {strings * 1e9 / calls:8.1f} ns/call")
+    print(f"  call site slots: {slots * 1e9 / calls:8.1f} ns/call")
+    print(f"  speedup:         {strings / slots:8.2f}x")
+    print(f"  inner functions: {nested * 1e9 / calls:8.1f} ns/call")
+
+
+if __name__ == '__main__':
+    main()
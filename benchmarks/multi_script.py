@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark of running many scripts on the same bars
+
+It runs N generated indicators on the same data as separate `ScriptRunner` runs, in one pass with
+`MultiScriptRunner` and in separate processes (one `ScriptRunner` per process, like N `pyne run`
+commands), and prints the time of each.
+"""
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import random
+import sys
+
+from pynecore.core.script_runner import ScriptRunner
+from pynecore.core.multi_script_runner import MultiScriptRunner
+from pynecore.core.syminfo import SymInfo
+from pynecore.types.ohlcv import OHLCV
+
+SCRIPT = '''"""
+@pyne
+"""
+from pynecore.lib import script, close, high, low, ta
+
+
+@script.indicator("Multi Script Benchmark {index}")
+def main():
+    return {{
+        "sma": ta.sma(close, {length}),
+        "ema": ta.ema(close, {length}),
+        "highest": ta.highest(high, {length}),
+        "lowest": ta.lowest(low, {length}),
+    }}
+'''
+
+
+def _ohlcv(bars: int) -> list[OHLCV]:
+    rnd = random.Random(42)
+    price = 100.0
+    candles = []
+    for i in range(bars):
+        open_ = price
+        price += rnd.gauss(0.0, 1.0)
+        candles.append(OHLCV(timestamp=1672531200 + i * 60, open=open_, high=max(open_, price) + 0.5,
+                             low=min(open_, price) - 0.5, close=price, volume=10.0))
+    return candles
+
+
+def _syminfo() -> SymInfo:
+    return SymInfo(prefix="BENCH", description="Benchmark", ticker="BENCH", currency="USD", period="1",
+                   type="crypto", mintick=0.01, pricescale=100, minmove=1, pointvalue=1, timezone="UTC",
+                   volumetype="base", opening_hours=[], session_starts=[], session_ends=[])
+
+
+def _run_process(script_path: Path, bars: int):
+    """ Import and run one script in a new process """
+    ScriptRunner(script_path, _ohlcv(bars), _syminfo()).run()
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark running many scripts on the same bars")
+    parser.add_argument('--scripts', type=int, default=20, help="Number of scripts")
+    parser.add_argument('--bars', type=int, default=5000, help="Number of bars")
+    parser.add_argument('--processes', type=int, default=None,
+                        help="Number of worker processes (default: number of CPUs)")
+    args = parser.parse_args()
+
+    candles = _ohlcv(args.bars)
+    syminfo = _syminfo()
+
+    with TemporaryDirectory() as tmp:
+        sys.path.insert(0, tmp)
+        paths = []
+        for i in range(args.scripts):
+            path = Path(tmp, f'multi_bench_{i}.py')
+            path.write_text(SCRIPT.format(index=i, length=10 + i))
+            paths.append(path)
+
+        multi = MultiScriptRunner(candles, syminfo)
+        runners = [multi.add_script(path) for path in paths]
+
+        start = perf_counter()
+        for runner in runners:
+            runner.reset()
+            runner.ohlcv_iter = candles
+            runner.run()
+        separate = perf_counter() - start
+
+        multi.reset()
+        start = perf_counter()
+        multi.run()
+        one_pass = perf_counter() - start
+
+        start = perf_counter()
+        with ProcessPoolExecutor(max_workers=args.processes) as executor:
+            list(executor.map(_run_process, paths, [args.bars] * len(paths)))
+        processes = perf_counter() - start
+
+    print(f"{args.scripts} scripts, {args.bars} bars:")
+    print(f"  separate runs        {separate:8.3f} s")
+    print(f"  one pass             {one_pass:8.3f} s  ({separate / one_pass:.2f}x)")
+    print(f"  processes            {processes:8.3f} s  (with import)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the open trade statistics of strategies
+
+It runs a pyramiding strategy, which keeps N lots open, and prints the per-bar time with the
+incremental drawdown/runup sums (the per-trade values are updated lazily) and with the previous
+processing, which updated every open trade on every bar.
+"""
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import random
+
+from pynecore.core.script_runner import ScriptRunner
+from pynecore.core.syminfo import SymInfo
+from pynecore.lib.strategy import Position
+from pynecore.types.ohlcv import OHLCV
+
+SCRIPT = '''"""
+@pyne
+"""
+from pynecore.lib import script, strategy, bar_index
+
+
+@script.strategy("Open Trades Benchmark", pyramiding={lots}, commission_type=strategy.commission.percent,
+                 commission_value=0.05)
+def main():
+    if bar_index < {lots}:
+        strategy.entry(f"L{{bar_index}}", strategy.long, qty=1 + bar_index % 3)
+'''
+
+
+class _EagerPosition(Position):
+    """ Every open trade is updated on every bar, like before the incremental sums """
+
+    def _open_drawdown_runup(self) -> tuple[float, float]:
+        self.update_open_trades()
+        drawdown_summ = runup_summ = 0.0
+        for trade in self.open_trades:
+            hprofit = trade.size * (self.h - self.avg_price) - trade.commission
+            lprofit = trade.size * (self.l - self.avg_price) - trade.commission
+            drawdown_summ += -min(hprofit, lprofit, 0.0)
+            runup_summ += max(hprofit, lprofit, 0.0)
+        return drawdown_summ, runup_summ
+
+
+def _ohlcv(bars: int) -> list[OHLCV]:
+    rnd = random.Random(42)
+    price = 1000.0
+    candles = []
+    for i in range(bars):
+        open_ = price
+        price += rnd.gauss(0.0, 0.5)
+        candles.append(OHLCV(timestamp=1672531200 + i * 60, open=open_, high=max(open_, price) + 0.2,
+                             low=min(open_, price) - 0.2, close=price, volume=10.0))
+    return candles
+
+
+def _syminfo() -> SymInfo:
+    return SymInfo(prefix="BENCH", description="Benchmark", ticker="BENCH", currency="USD", period="1",
+                   type="crypto", mintick=0.01, pricescale=100, minmove=1, pointvalue=1, timezone="UTC",
+                   volumetype="base", opening_hours=[], session_starts=[], session_ends=[])
+
+
+def _run(script_path: Path, candles: list[OHLCV], eager: bool) -> tuple[float, float]:
+    runner = ScriptRunner(script_path, candles, _syminfo())
+    if eager:
+        runner.script.position = _EagerPosition()
+    position = runner.script.position
+    assert position is not None
+    t0 = perf_counter()
+    runner.run()
+    return perf_counter() - t0, position.max_drawdown
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, default=20000, help="Number of bars")
+    parser.add_argument("--lots", type=int, nargs="+", default=[1, 100, 1000], help="Number of open lots")
+    args = parser.parse_args()
+
+    candles = _ohlcv(args.bars)
+    with TemporaryDirectory() as tmp_dir:
+        for lots in args.lots:
+            # Separate modules, so the runs don't share the state of the script
+            results = []
+            for name in ("eager", "lazy"):
+                script_path = Path(tmp_dir) / f"open_trades_bench_{name}_{lots}.py"
+                script_path.write_text(SCRIPT.format(lots=lots))
+                results.append(_run(script_path, candles, name == "eager"))
+            (eager, eager_dd), (lazy, lazy_dd) = results
+            print(f"{lots:>5} lots: every trade {eager / args.bars * 1e6:8.2f} us/bar, "
+                  f"incremental {lazy / args.bars * 1e6:8.2f} us/bar ({eager / lazy:.1f}x), "
+                  f"max drawdown {lazy_dd:.2f} ({eager_dd:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the pending order book of strategies
+
+It runs a strategy with a grid of resting limit and stop orders (N on both sides of the price, replaced
+periodically) and a moving average cross, and prints the per-bar time with the price indexed
+`OrderBook` and with the previous processing, which checked every pending order on every bar.
+"""
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import random
+
+from pynecore.core.order_book import OrderBook
+from pynecore.core.script_runner import ScriptRunner
+from pynecore.core.syminfo import SymInfo
+from pynecore.types.ohlcv import OHLCV
+
+SCRIPT = '''"""
+@pyne
+"""
+from pynecore.lib import script, close, strategy, ta, bar_index
+
+
+@script.strategy("Order Book Benchmark")
+def main():
+    if bar_index % 500 == 0:
+        for i in range({orders}):
+            strategy.entry(f"L{{i}}", strategy.long, limit=close - 20 - i * 0.5)
+            strategy.entry(f"S{{i}}", strategy.short, limit=close + 20 + i * 0.5)
+            strategy.entry(f"BL{{i}}", strategy.long, stop=close + 25 + i * 0.5)
+            strategy.entry(f"BS{{i}}", strategy.short, stop=close - 25 - i * 0.5)
+    fast = ta.sma(close, 10)
+    slow = ta.sma(close, 30)
+    if ta.crossover(fast, slow):
+        strategy.entry("Long", strategy.long)
+    if ta.crossunder(fast, slow):
+        strategy.entry("Short", strategy.short)
+'''
+
+
+class _ScanOrderBook(OrderBook):
+    """ Every pending order is a candidate on every bar, like before the price index """
+
+    __slots__ = ()
+
+    def candidates(self, *, high: float | None = None, low: float | None = None,
+                   market: bool = False) -> list:
+        return list(self.values())
+
+
+def _ohlcv(bars: int) -> list[OHLCV]:
+    rnd = random.Random(42)
+    price = 1000.0
+    candles = []
+    for i in range(bars):
+        open_ = price
+        price += rnd.gauss(0.0, 0.5)
+        candles.append(OHLCV(timestamp=1672531200 + i * 60, open=open_, high=max(open_, price) + 0.2,
+                             low=min(open_, price) - 0.2, close=price, volume=10.0))
+    return candles
+
+
+def _syminfo() -> SymInfo:
+    return SymInfo(prefix="BENCH", description="Benchmark", ticker="BENCH", currency="USD", period="1",
+                   type="crypto", mintick=0.01, pricescale=100, minmove=1, pointvalue=1, timezone="UTC",
+                   volumetype="base", opening_hours=[], session_starts=[], session_ends=[])
+
+
+def _run(script_path: Path, candles: list[OHLCV], scan: bool) -> tuple[float, int]:
+    runner = ScriptRunner(script_path, candles, _syminfo())
+    position = runner.script.position
+    assert position is not None
+    if scan:
+        position.orders = _ScanOrderBook()
+    t0 = perf_counter()
+    runner.run()
+    return perf_counter() - t0, position.closed_trades_count
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, default=20000, help="Number of bars")
+    parser.add_argument("--orders", type=int, nargs="+", default=[10, 100, 250],
+                        help="Number of resting orders per grid line (4 lines)")
+    args = parser.parse_args()
+
+    candles = _ohlcv(args.bars)
+    with TemporaryDirectory() as tmp_dir:
+        for orders in args.orders:
+            # Separate modules, so the runs don't share the state of the script
+            results = []
+            for name in ("scan", "book"):
+                script_path = Path(tmp_dir) / f"order_book_bench_{name}_{orders}.py"
+                script_path.write_text(SCRIPT.format(orders=orders))
+                results.append(_run(script_path, candles, name == "scan"))
+            (scan, scan_trades), (book, book_trades) = results
+            assert scan_trades == book_trades
+            print(f"{orders * 4:>5} orders: scan {scan / args.bars * 1e6:8.2f} us/bar, "
+                  f"order book {book / args.bars * 1e6:8.2f} us/bar ({scan / book:.1f}x), "
+                  f"{book_trades} trades")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the rank based functions of the `ta` library
+
+It compares the library implementation of `median`, `mode`, `percentile_linear_interpolation`,
+`percentile_nearest_rank`, `percentrank` and `rci` (rolling windows in a sorted block list, O(log n)
+per bar, O(n) for RCI) with their previous implementation (sorting or scanning the whole window on
+every bar, O(n^2) for RCI). Every function is called once per bar through `isolate_function`, like in
+a script, on a random walk.
+"""
+from typing import Callable
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import importlib
+import math
+import random
+import sys
+
+from pynecore.core import import_hook  # noqa: F401  # Needed to import the Pyne module
+from pynecore.core import function_isolation
+from pynecore.core.function_isolation import isolate_function
+from pynecore.core.series import SeriesImpl
+from pynecore import lib
+
+# The previous implementation and the library calls in a Pyne module, so they are transformed the same way
+MODULE = '''"""
+@pyne
+"""
+import builtins
+import heapq
+import math
+
+from pynecore import Series, Persistent
+from pynecore.types.na import NA
+from pynecore.lib import bar_index, ta, array
+
+EPSILON = 1e-14
+
+
+def rescan_median(source: Series[float], length: int):
+    heap_low: Persistent[list[float]] = []
+    heap_high: Persistent[list[float]] = []
+    window: Persistent[list[float]] = []
+
+    window.append(source)
+    heapq.heappush(heap_low, -source)
+    heapq.heappush(heap_high, -heapq.heappop(heap_low))
+    if len(heap_low) < len(heap_high):
+        heapq.heappush(heap_low, -heapq.heappop(heap_high))
+
+    if len(window) > length:
+        old = window.pop(0)
+        if old <= -heap_low[0]:
+            heap_low.remove(-old)
+            heapq.heapify(heap_low)
+        else:
+            heap_high.remove(old)
+            heapq.heapify(heap_high)
+        if len(heap_low) < len(heap_high):
+            heapq.heappush(heap_low, -heapq.heappop(heap_high))
+        elif len(heap_low) > len(heap_high) + 1:
+            heapq.heappush(heap_high, -heapq.heappop(heap_low))
+
+    if len(window) < length:
+        return NA(float)
+    if len(heap_low) > len(heap_high):
+        return -heap_low[0]
+    return (-heap_low[0] + heap_high[0]) / 2
+
+
+def rescan_mode(source: Series[float], length: int):
+    if bar_index < length - 1:
+        return NA(float)
+    values = [source[i] for i in builtins.range(length)]
+    values.sort()
+    mode_val = current_val = values[0]
+    max_freq = curr_freq = 1
+    for i in builtins.range(1, len(values)):
+        if values[i] == current_val:
+            curr_freq += 1
+            if curr_freq > max_freq:
+                max_freq = curr_freq
+                mode_val = current_val
+        else:
+            current_val = values[i]
+            curr_freq = 1
+    return mode_val
+
+
+def rescan_percentile_linear_interpolation(source: Series[float], length: int):
+    if bar_index < length - 1:
+        return NA(float)
+    return array.percentile_linear_interpolation(source[:length], 33)
+
+
+def rescan_percentile_nearest_rank(source: Series[float], length: int):
+    if bar_index < length - 1:
+        return NA(float)
+    return array.percentile_nearest_rank(source[:length], 67)
+
+
+def rescan_percentrank(source: Series[float], length: int):
+    if bar_index < length:
+        return NA(float)
+    return array.percentrank(source[:length + 1], 0)
+
+
+def rescan_rci(source: Series[float], length: int):
+    if bar_index < length:
+        return NA(float)
+    values = source[:length]
+    sum_x = sum_y = sum_xy = sum_x2 = sum_y2 = 0.0
+    for i in builtins.range(length):
+        x = i + 1
+        rank_sum = 0.0
+        tie_count = 0
+        for vi in values:
+            diff = vi - values[i]
+            if diff > EPSILON:
+                rank_sum += 1
+            elif abs(diff) < EPSILON:
+                tie_count += 1
+        y = rank_sum + (tie_count - 1) / 2.0 + 1
+        sum_x += x
+        sum_y += y
+        sum_xy += x * y
+        sum_x2 += x * x
+        sum_y2 += y * y
+    n = length
+    numerator = n * sum_xy - sum_x * sum_y
+    denominator = math.sqrt((n * sum_x2 - sum_x * sum_x) * (n * sum_y2 - sum_y * sum_y))
+    return (numerator / denominator) * 100
+
+
+def lib_median(source: float, length: int):
+    return ta.median(source, length)
+
+
+def lib_mode(source: float, length: int):
+    return ta.mode(source, length)
+
+
+def lib_percentile_linear_interpolation(source: float, length: int):
+    return ta.percentile_linear_interpolation(source, length, 33)
+
+
+def lib_percentile_nearest_rank(source: float, length: int):
+    return ta.percentile_nearest_rank(source, length, 67)
+
+
+def lib_percentrank(source: float, length: int):
+    return ta.percentrank(source, length)
+
+
+def lib_rci(source: float, length: int):
+    return ta.rci(source, length)
+'''
+
+FUNCTIONS = ('median', 'mode', 'percentile_linear_interpolation', 'percentile_nearest_rank', 'percentrank', 'rci')
+
+
+def _run(func: Callable, values: list[float], length: int) -> tuple[float, list]:
+    """ Call the function on every bar, return the time and the results """
+    function_isolation.reset()
+    results = []
+    start = perf_counter()
+    for i, value in enumerate(values):
+        lib.bar_index = i
+        results.append(isolate_function(func, 'main|bench|0', '', 0)(value, length))
+        function_isolation.reset_step()
+    return perf_counter() - start, results
+
+
+def _best(func: Callable, values: list[float], length: int, repeat: int) -> tuple[float, list]:
+    runs = [_run(func, values, length) for _ in range(repeat)]
+    return min(t for t, _ in runs), runs[0][1]
+
+
+def _same(old_results: list, new_results: list) -> bool:
+    """ The results are the same, apart from rounding errors of the different summation order """
+    for old, new in zip(old_results, new_results):
+        if isinstance(old, float) and isinstance(new, float):
+            if not math.isclose(old, new, rel_tol=1e-9, abs_tol=1e-9):
+                return False
+        elif str(old) != str(new):
+            return False
+    return len(old_results) == len(new_results)
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark the rank based functions of the ta library")
+    parser.add_argument('--bars', type=int, default=2000, help="Number of bars")
+    parser.add_argument('--lengths', type=int, nargs='+', default=[50, 200], help="Window lengths")
+    parser.add_argument('--repeat', type=int, default=1, help="Number of repeats, the best is used")
+    args = parser.parse_args()
+
+    # The previous implementation needs the whole window in the history of the source
+    SeriesImpl.DEFAULT_MAX_BARS_BACK = max(max(args.lengths) + 1, SeriesImpl.DEFAULT_MAX_BARS_BACK)
+
+    rnd = random.Random(42)
+    # Rounded random walk, so there are repeated values for mode
+    walk = [100.0]
+    for _ in range(args.bars - 1):
+        walk.append(round(walk[-1] + rnd.gauss(0.0, 1.0), 1))
+
+    with TemporaryDirectory() as tmp:
+        Path(tmp, 'order_statistics_bench.py').write_text(MODULE)
+        sys.path.insert(0, tmp)
+        module = importlib.import_module('order_statistics_bench')
+
+    for length in args.lengths:
+        print(f"random walk, length {length} ({args.bars} bars), us/bar:")
+        print(f"  {'function':<32} {'rescan':>10} {'window':>8} {'speedup':>8}")
+        for func in FUNCTIONS:
+            old, old_results = _best(getattr(module, f'rescan_{func}'), walk, length, args.repeat)
+            new, new_results = _best(getattr(module, f'lib_{func}'), walk, length, args.repeat)
+            same = '' if _same(old_results, new_results) else '  (results differ!)'
+            print(f"  {func:<32} {old * 1e6 / args.bars:10.2f} {new * 1e6 / args.bars:8.2f}"
+                  f" {old / new:7.2f}x{same}")
+
+
+if __name__ == '__main__':
+    main()
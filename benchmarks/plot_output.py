@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the plot output of the runner
+
+It runs an indicator with many plots and measures the per-bar time without output, with CSV plot output
+and with binary plot file output (`.plot`), and the size of the files. It checks that the converted plot
+file is the same as the CSV output.
+"""
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import random
+
+from pynecore.core.plot_file import PlotReader
+from pynecore.core.script_runner import ScriptRunner
+from pynecore.core.syminfo import SymInfo
+from pynecore.types.ohlcv import OHLCV
+
+SCRIPT = '''"""
+@pyne
+"""
+from pynecore.lib import script, close, high, low
+
+
+@script.indicator("Plot Output Benchmark")
+def main():
+    return {{{plots}}}
+'''
+
+
+def _ohlcv(bars: int) -> list[OHLCV]:
+    rnd = random.Random(42)
+    price = 1000.0
+    candles = []
+    for i in range(bars):
+        open_ = price
+        price += rnd.gauss(0.0, 0.5)
+        candles.append(OHLCV(1672531200 + i * 60, open_, max(open_, price) + 0.2, min(open_, price) - 0.2,
+                             price, 10.0))
+    return candles
+
+
+def _syminfo() -> SymInfo:
+    return SymInfo(prefix="BENCH", description="Benchmark", ticker="BENCH", currency="USD", period="1",
+                   type="crypto", mintick=0.01, pricescale=100, minmove=1, pointvalue=1, timezone="UTC",
+                   volumetype="base", opening_hours=[], session_starts=[], session_ends=[])
+
+
+def _run(script_path: Path, candles: list[OHLCV], plot_path: Path | None) -> float:
+    # The best of more runs, the first one has import costs
+    best = float('inf')
+    for _ in range(3):
+        runner = ScriptRunner(script_path, candles, _syminfo(), plot_path=plot_path)
+        t0 = perf_counter()
+        runner.run()
+        best = min(best, perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, nargs="+", default=[20000, 100000], help="Number of bars")
+    parser.add_argument("--plots", type=int, default=50, help="Number of plotted values")
+    args = parser.parse_args()
+
+    # The plotted values are simple expressions, so the output is a big part of the time
+    sources = ("close", "high", "low")
+    plots = ", ".join(f"'p{i}': {sources[i % 3]} + {i}" for i in range(args.plots))
+
+    with TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        script_path = tmp / "plot_output_bench.py"
+        script_path.write_text(SCRIPT.format(plots=plots))
+        for bars in args.bars:
+            candles = _ohlcv(bars)
+            csv_path = tmp / f"plot_{bars}.csv"
+            plot_path = tmp / f"plot_{bars}.plot"
+            none = _run(script_path, candles, None)
+            csv = _run(script_path, candles, csv_path)
+            binary = _run(script_path, candles, plot_path)
+
+            converted_path = tmp / f"converted_{bars}.csv"
+            with PlotReader(plot_path) as reader:
+                reader.to_csv(converted_path)
+            assert converted_path.read_bytes() == csv_path.read_bytes()
+
+            print(f"{bars:>7} bars, {args.plots} plots: no output {none / bars * 1e6:7.2f} us/bar, "
+                  f"csv {csv / bars * 1e6:7.2f} us/bar ({csv_path.stat().st_size / 2 ** 20:.1f} MiB), "
+                  f"plot file {binary / bars * 1e6:7.2f} us/bar ({plot_path.stat().st_size / 2 ** 20:.1f} MiB), "
+                  f"output {(csv - none) / max(binary - none, 1e-9):.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
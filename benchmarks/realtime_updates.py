@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark of realtime bar updates
+
+It runs an indicator on historical bars, then on realtime updates (`ScriptRunner.run_realtime`), where
+every update is calculated from the state of the last confirmed bar. It prints the time of a
+historical bar and of a realtime update, and the time of restoring the state of the last confirmed
+bar by the commit/rollback journal and by deep copying the same state.
+"""
+from argparse import ArgumentParser
+from copy import deepcopy
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import asyncio
+import random
+
+from pynecore.core.script_runner import ScriptRunner
+from pynecore.core.state_journal import StateJournal
+from pynecore.core.syminfo import SymInfo
+from pynecore.core import function_isolation
+from pynecore.types.ohlcv import OHLCV
+
+SCRIPT = '''"""
+@pyne
+"""
+from pynecore import Persistent
+from pynecore.lib import script, close, high, low, ta
+
+
+@script.indicator("Realtime Benchmark")
+def main():
+    bars: Persistent[int] = 0
+    bars += 1
+    return {
+        "sma": ta.sma(close, 50),
+        "ema": ta.ema(close, 20),
+        "rsi": ta.rsi(close, 14),
+        "stdev": ta.stdev(close, 100),
+        "highest": ta.highest(high, HIGHEST_LENGTH),
+        "lowest": ta.lowest(low, HIGHEST_LENGTH),
+        "median": ta.median(close, MEDIAN_LENGTH),
+        "alma": ta.alma(close, 50, 0.85, 6),
+        "change": close - close[10],
+    }
+'''
+
+
+def _ohlcv(bars: int) -> list[OHLCV]:
+    rnd = random.Random(42)
+    price = 100.0
+    candles = []
+    for i in range(bars):
+        open_ = price
+        price += rnd.gauss(0.0, 1.0)
+        candles.append(OHLCV(timestamp=1672531200 + i * 60, open=open_, high=max(open_, price) + 0.5,
+                             low=min(open_, price) - 0.5, close=price, volume=10.0))
+    return candles
+
+
+async def _updates(candles: list[OHLCV], updates: int):
+    """ Every bar is updated `updates` times """
+    for candle in candles:
+        for i in range(1, updates + 1):
+            close = candle.open + (candle.close - candle.open) * i / updates
+            yield candle._replace(high=max(candle.high, close), low=min(candle.low, close), close=close)
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark realtime bar updates")
+    parser.add_argument('--bars', type=int, default=5000, help="Number of historical bars")
+    parser.add_argument('--realtime', type=int, default=200, help="Number of realtime bars")
+    parser.add_argument('--updates', type=int, default=20, help="Number of updates per realtime bar")
+    parser.add_argument('--median-length', type=int, default=100,
+                        help="Length of the median, its sorted window is rolled back on every update")
+    parser.add_argument('--highest-length', type=int, default=100,
+                        help="Length of highest and lowest, their deques are rolled back on every update")
+    args = parser.parse_args()
+
+    candles = _ohlcv(args.bars + args.realtime)
+    syminfo = SymInfo(prefix="BENCH", description="Benchmark", ticker="BENCH", currency="USD", period="1",
+                      type="crypto", mintick=0.01, pricescale=100, minmove=1, pointvalue=1, timezone="UTC",
+                      volumetype="base", opening_hours=[], session_starts=[], session_ends=[])
+
+    with TemporaryDirectory() as tmp:
+        script_path = Path(tmp, 'realtime_bench.py')
+        script_path.write_text(SCRIPT.replace('MEDIAN_LENGTH', str(args.median_length))
+                               .replace('HIGHEST_LENGTH', str(args.highest_length)))
+        runner = ScriptRunner(script_path, candles[:args.bars], syminfo)
+
+        history = realtime = 0.0
+        updates = 0
+
+        async def run():
+            nonlocal history, realtime, updates
+            start = perf_counter()
+            async for _, _, confirmed in runner.run_realtime(_updates(candles[args.bars:], args.updates)):
+                if runner.bar_index == args.bars and not updates:
+                    history = perf_counter() - start
+                    start = perf_counter()
+                updates += not confirmed
+            realtime = perf_counter() - start
+
+        asyncio.run(run())
+
+        # Restoring the state of the instances, the journal and deep copies
+        journal = StateJournal()
+        state = function_isolation.get_instance_globals()
+        for instance_globals, names in state:
+            journal.track(instance_globals, names)
+        repeat = 1000
+        start = perf_counter()
+        for _ in range(repeat):
+            journal.rollback()
+        rollback = (perf_counter() - start) / repeat
+        start = perf_counter()
+        for _ in range(repeat):
+            deepcopy([{name: g[name] for name in names if name in g} for g, names in state])
+        copying = (perf_counter() - start) / repeat
+
+    print(f"{args.bars} historical bars, {args.realtime} realtime bars with {args.updates} updates:")
+    print(f"  historical bar       {history * 1e6 / args.bars:10.2f} us")
+    print(f"  realtime update      {realtime * 1e6 / max(updates, 1):10.2f} us")
+    print(f"  journal rollback     {rollback * 1e6:10.2f} us")
+    print(f"  deep copy of state   {copying * 1e6:10.2f} us")
+
+
+if __name__ == '__main__':
+    main()
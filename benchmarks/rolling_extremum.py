@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the rolling extremum functions of the `ta` library
+
+It compares the library implementation of `highest`, `lowest`, `highestbars`, `lowestbars`, `range`,
+`pivothigh` and `pivotlow` (monotonic deques, amortized O(1) per bar) with the previous implementation
+(rescanning the whole window when the extremum leaves it). Every function is called once per bar
+through `isolate_function`, like in a script. A random walk and a falling trend (the maximum leaves
+the window on every bar, the worst case of rescanning) are measured.
+"""
+from typing import Callable
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import importlib
+import random
+import sys
+
+from pynecore.core import import_hook  # noqa: F401  # Needed to import the Pyne module
+from pynecore.core import function_isolation
+from pynecore.core.function_isolation import isolate_function
+from pynecore import lib
+
+# The previous implementation and the library calls in a Pyne module, so they are transformed the same way
+MODULE = '''"""
+@pyne
+"""
+import builtins
+from typing import cast
+
+from pynecore import Series, Persistent
+from pynecore.types.na import NA
+from pynecore.lib import bar_index, ta
+
+
+def rescan_highest(source: Series[float], length: int, _bars: bool = False, _tuple: bool = False,
+                   _check_eq: bool = False):
+    last_max: Persistent[float | NA] = NA(float)
+    last_max_index: Persistent[int] = 0
+
+    if last_max < source or isinstance(last_max, NA) or (_check_eq and last_max == source):
+        last_max = source
+        last_max_index = 0
+
+    if last_max_index >= length:
+        last_max = source
+        last_max_index = 0
+        for i in builtins.range(length - 1, 0, -1):
+            if source[i] > last_max:
+                last_max = source[i]
+                last_max_index = i
+
+    max_index = last_max_index
+    last_max_index += 1
+
+    if bar_index < length - 1:
+        return NA(float) if not _tuple else (NA(float), NA(float))
+
+    if _bars:
+        return -max_index
+    if _tuple:
+        return last_max, -max_index
+    return last_max
+
+
+def rescan_lowest(source: Series[float], length: int, _bars: bool = False, _tuple: bool = False,
+                  _check_eq: bool = False):
+    last_min: Persistent[float | NA[float]] = NA(float)
+    last_min_index: Persistent[int] = 0
+
+    if last_min > source or isinstance(last_min, NA) or (_check_eq and last_min == source):
+        last_min = source
+        last_min_index = 0
+
+    if last_min_index >= length:
+        last_min = source
+        last_min_index = 0
+        for i in builtins.range(length - 1, 0, -1):
+            s = source[i]
+            if s < last_min:
+                last_min = s
+                last_min_index = i
+
+    min_index = last_min_index
+    last_min_index += 1
+
+    if bar_index < length - 1:
+        return NA(float) if not _tuple else (NA(float), NA(int))
+
+    if _bars:
+        return -min_index
+    if _tuple:
+        return last_min, -min_index
+    return last_min
+
+
+def rescan_highestbars(source: float, length: int):
+    return rescan_highest(source, length, _bars=True)
+
+
+def rescan_lowestbars(source: float, length: int):
+    return rescan_lowest(source, length, _bars=True)
+
+
+def rescan_range(source: float, length: int):
+    return rescan_highest(source, length) - rescan_lowest(source, length)
+
+
+def rescan_pivothigh(source: float, length: int):
+    ph, pi = rescan_highest(source, length + length + 1, _tuple=True, _check_eq=True)
+    return ph if pi == -length else NA(float)
+
+
+def rescan_pivotlow(source: float, length: int):
+    pl, pi = rescan_lowest(source, length + length + 1, _tuple=True, _check_eq=True)
+    return pl if pi == -length else NA(float)
+
+
+def lib_highest(source: float, length: int):
+    return ta.highest(source, length)
+
+
+def lib_lowest(source: float, length: int):
+    return ta.lowest(source, length)
+
+
+def lib_highestbars(source: float, length: int):
+    return ta.highestbars(source, length)
+
+
+def lib_lowestbars(source: float, length: int):
+    return ta.lowestbars(source, length)
+
+
+def lib_range(source: float, length: int):
+    return ta.range(source, length)
+
+
+def lib_pivothigh(source: float, length: int):
+    return ta.pivothigh(source, length, length)
+
+
+def lib_pivotlow(source: float, length: int):
+    return ta.pivotlow(source, length, length)
+'''
+
+FUNCTIONS = ('highest', 'lowest', 'highestbars', 'lowestbars', 'range', 'pivothigh', 'pivotlow')
+
+
+def _run(func: Callable, values: list[float], length: int) -> tuple[float, list]:
+    """ Call the function on every bar, return the time and the results """
+    function_isolation.reset()
+    results = []
+    start = perf_counter()
+    for i, value in enumerate(values):
+        lib.bar_index = i
+        results.append(isolate_function(func, 'main|bench|0', '', 0)(value, length))
+        function_isolation.reset_step()
+    return perf_counter() - start, results
+
+
+def _best(func: Callable, values: list[float], length: int, repeat: int) -> tuple[float, list]:
+    runs = [_run(func, values, length) for _ in range(repeat)]
+    return min(t for t, _ in runs), runs[0][1]
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark the rolling extremum functions of the ta library")
+    parser.add_argument('--bars', type=int, default=20000, help="Number of bars")
+    parser.add_argument('--lengths', type=int, nargs='+', default=[20, 200], help="Window lengths")
+    parser.add_argument('--repeat', type=int, default=3, help="Number of repeats, the best is used")
+    args = parser.parse_args()
+
+    rnd = random.Random(42)
+    walk = [100.0]
+    for _ in range(args.bars - 1):
+        walk.append(walk[-1] + rnd.gauss(0.0, 1.0))
+    series = {
+        'random walk': walk,
+        'falling trend': [1000.0 - i * 0.01 for i in range(args.bars)],
+    }
+
+    with TemporaryDirectory() as tmp:
+        Path(tmp, 'rolling_extremum_bench.py').write_text(MODULE)
+        sys.path.insert(0, tmp)
+        module = importlib.import_module('rolling_extremum_bench')
+
+    for name, values in series.items():
+        for length in args.lengths:
+            print(f"{name}, length {length} ({args.bars} bars), us/bar:")
+            print(f"  {'function':<12} {'rescan':>8} {'deque':>8} {'speedup':>8}")
+            for func in FUNCTIONS:
+                old, old_results = _best(getattr(module, f'rescan_{func}'), values, length, args.repeat)
+                new, new_results = _best(getattr(module, f'lib_{func}'), values, length, args.repeat)
+                same = '' if str(old_results) == str(new_results) else '  (results differ!)'
+                print(f"  {func:<12} {old * 1e6 / args.bars:8.2f} {new * 1e6 / args.bars:8.2f}"
+                      f" {old / new:7.2f}x{same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the session calendar
+
+It measures the per-bar time of the session lookups of `timeframe.change` and `session.ismarket` with
+the `SessionCalendar` and with their previous implementation (building the session datetimes of the day
+for every bar), the time of the replay from the first session of the year (the anchor of daily
+timeframes) and the per-bar time of a script using `timeframe.change` and `session.*`.
+"""
+from argparse import ArgumentParser
+from datetime import datetime, time, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import random
+
+from pynecore.core.script_runner import ScriptRunner
+from pynecore.core.session_calendar import SessionCalendar
+from pynecore.core.syminfo import SymInfo, SymInfoInterval, SymInfoSession
+from pynecore.types.ohlcv import OHLCV
+
+SCRIPT = '''"""
+@pyne
+"""
+from pynecore.lib import script, timeframe, session
+
+
+@script.indicator("Session Calendar Benchmark")
+def main():
+    return {
+        "daily": timeframe.change("D"),
+        "4h": timeframe.change("240"),
+        "market": session.ismarket,
+        "first": session.isfirstbar,
+    }
+'''
+
+
+def _syminfo() -> SymInfo:
+    """ Forex like sessions: Sunday 17:00 - Friday 17:00 with a daily break """
+    opening_hours = [SymInfoInterval(day, time(0, 0), time(16, 59, 50)) for day in range(5)]
+    opening_hours += [SymInfoInterval(day, time(17, 5), time(0, 0)) for day in range(4)]
+    opening_hours.append(SymInfoInterval(6, time(17, 0), time(0, 0)))
+    session_starts = [SymInfoSession(day, time(17, 5)) for day in range(4)] + [SymInfoSession(6, time(17, 0))]
+    session_ends = [SymInfoSession(day, time(16, 59, 50)) for day in range(5)]
+    return SymInfo(prefix="BENCH", description="Benchmark", ticker="EURUSD", currency="USD", period="1",
+                   type="forex", mintick=0.00001, pricescale=100000, minmove=1, pointvalue=1,
+                   timezone="US/Eastern", volumetype="base", opening_hours=opening_hours,
+                   session_starts=session_starts, session_ends=session_ends)
+
+
+def _previous_is_new_session(syminfo: SymInfo, current_dt: datetime, tf_sec: int) -> bool:
+    """ The previous implementation of `timeframe._is_new_session` """
+    prev_dt = current_dt - timedelta(seconds=tf_sec)
+    current_weekday = current_dt.weekday()
+    prev_weekday = prev_dt.weekday()
+    session_starts = [ss for day, ss in syminfo.session_starts if day == current_weekday]
+    if prev_weekday != current_weekday:
+        for day, ss, se in syminfo.opening_hours:
+            if day == prev_weekday and se < ss:
+                session_starts.append(ss)
+    for start_time in session_starts:
+        session_start = current_dt.replace(hour=start_time.hour, minute=start_time.minute,
+                                           second=start_time.second, microsecond=0)
+        if prev_weekday != current_weekday and start_time > current_dt.time():
+            session_start = session_start - timedelta(days=1)
+        if current_dt <= session_start < current_dt + timedelta(seconds=tf_sec) and session_start > prev_dt:
+            return True
+    return False
+
+
+def _previous_check_session(syminfo: SymInfo, dt: datetime, tf_sec: int) -> bool:
+    """ The previous implementation of `session._check_session` """
+    candle_end = dt + timedelta(seconds=tf_sec)
+    for day, ss, se in syminfo.opening_hours:
+        if day != dt.weekday():
+            continue
+        ssdt = dt.replace(hour=ss.hour, minute=ss.minute, second=ss.second, microsecond=0)
+        sedt = dt.replace(hour=se.hour, minute=se.minute, second=se.second, microsecond=0)
+        if sedt < ssdt:
+            sedt += timedelta(days=1)
+        if candle_end >= ssdt and dt < sedt:
+            return True
+    return False
+
+
+# noinspection PyProtectedMember
+def _bench_lookups(syminfo: SymInfo, bars: int):
+    from pynecore import lib
+    tz = lib._parse_timezone(syminfo.timezone)
+    start = datetime(2024, 12, 2, tzinfo=tz)
+    dts = [start + timedelta(minutes=i) for i in range(bars)]
+    calendar = SessionCalendar(syminfo.opening_hours, syminfo.session_starts, syminfo.session_ends)
+
+    for name, func in (
+            ("new session (previous)", lambda dt: _previous_is_new_session(syminfo, dt, 60)),
+            ("new session (calendar)", lambda dt: calendar.is_new_session(dt, 60)),
+            ("ismarket (previous)", lambda dt: _previous_check_session(syminfo, dt, 60)),
+            ("ismarket (calendar)", lambda dt: calendar.in_session(dt, 60)),
+    ):
+        t0 = perf_counter()
+        for dt in dts:
+            func(dt)
+        elapsed = perf_counter() - t0
+        print(f"{name:<28} {elapsed / bars * 1e6:8.3f} us/bar")
+
+    # Replay from the first session of the year to the first bar (1 minute chart, first bar in December)
+    year_start = datetime(2024, 1, 1, 17, 0, tzinfo=tz)
+    t0 = perf_counter()
+    count = 0
+    dt = year_start
+    while dt < start:
+        if _previous_is_new_session(syminfo, dt, 60):
+            count += 1
+        dt += timedelta(seconds=60)
+    previous = perf_counter() - t0
+    t0 = perf_counter()
+    assert count == sum(1 for _ in calendar.new_session_bars(year_start, start, 60))
+    print(f"{'year replay (previous)':<28} {previous * 1e3:8.1f} ms")
+    print(f"{'year replay (calendar)':<28} {(perf_counter() - t0) * 1e3:8.1f} ms")
+
+
+def _bench_script(syminfo: SymInfo, bars: int):
+    rnd = random.Random(42)
+    price = 1.1
+    candles = []
+    ts = int(datetime(2024, 12, 2).timestamp())
+    for i in range(bars):
+        open_ = price
+        price += rnd.gauss(0.0, 0.0001)
+        candles.append(OHLCV(timestamp=ts + i * 60, open=open_, high=max(open_, price), low=min(open_, price),
+                             close=price, volume=10.0))
+    with TemporaryDirectory() as tmp_dir:
+        script_path = Path(tmp_dir) / "session_calendar_bench.py"
+        script_path.write_text(SCRIPT)
+        runner = ScriptRunner(script_path, candles, syminfo)
+        t0 = perf_counter()
+        runner.run()
+        elapsed = perf_counter() - t0
+    print(f"{'script':<28} {elapsed / bars * 1e6:8.3f} us/bar ({elapsed:.2f} s)")
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, default=50000, help="Number of 1 minute bars")
+    args = parser.parse_args()
+
+    syminfo = _syminfo()
+    _bench_lookups(syminfo, args.bars)
+    _bench_script(syminfo, args.bars)
+
+
+if __name__ == "__main__":
+    main()
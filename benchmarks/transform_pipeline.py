@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the AST transformer pipeline
+
+It transforms Pyne modules (the @pyne modules of the library by default) with every transformer in a
+separate pass, and with the pipeline, where compatible transformers share one traversal. The time is
+reported in milliseconds per 1000 source lines, parsing and compiling are not included.
+"""
+from typing import Callable
+from argparse import ArgumentParser
+from pathlib import Path
+from time import perf_counter
+import ast
+
+import pynecore
+from pynecore.transformers.import_lifter import ImportLifterTransformer
+from pynecore.transformers.import_normalizer import ImportNormalizerTransformer
+from pynecore.transformers.persistent_series import PersistentSeriesTransformer
+from pynecore.transformers.lib_series import LibrarySeriesTransformer
+from pynecore.transformers.function_isolation import FunctionIsolationTransformer
+from pynecore.transformers.precompute import PrecomputeTransformer
+from pynecore.transformers.overload import OverloadTransformer
+from pynecore.transformers.module_property import ModulePropertyTransformer
+from pynecore.transformers.series import SeriesTransformer
+from pynecore.transformers.persistent import PersistentTransformer
+from pynecore.transformers.input_transformer import InputTransformer
+from pynecore.transformers.safe_convert_transformer import SafeConvertTransformer
+from pynecore.transformers.pipeline import transform
+
+TRANSFORMERS = (
+    ImportLifterTransformer,
+    ImportNormalizerTransformer,
+    PersistentSeriesTransformer,
+    LibrarySeriesTransformer,
+    FunctionIsolationTransformer,
+    PrecomputeTransformer,
+    OverloadTransformer,
+    ModulePropertyTransformer,
+    SeriesTransformer,
+    PersistentTransformer,
+    InputTransformer,
+    SafeConvertTransformer,
+)
+
+
+def _separate(tree: ast.Module) -> ast.Module:
+    """ Every transformer in its own pass """
+    for transformer in TRANSFORMERS:
+        tree = transformer().visit(tree)
+    return tree
+
+
+def _parse(path: Path, source: str) -> ast.Module:
+    """ Parse the module like the import hook does """
+    tree = ast.parse(source)
+    tree._module_file_path = str(path.resolve())  # type: ignore
+    tree.body = [node for node in tree.body
+                 if not (isinstance(node, ast.FunctionDef)
+                         and node.name.startswith('__test_') and node.name.endswith('__'))]
+    return tree
+
+
+def _best(func: Callable[[ast.Module], ast.Module], modules: list[tuple[Path, str]], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        elapsed = 0.0
+        for path, source in modules:
+            tree = _parse(path, source)
+            start = perf_counter()
+            func(tree)
+            elapsed += perf_counter() - start
+        best = min(best, elapsed)
+    return best
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark the AST transformer pipeline")
+    parser.add_argument('files', nargs='*', type=Path,
+                        help="Pyne modules to transform, default is the @pyne modules of the library")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of repeats, the best is used")
+    args = parser.parse_args()
+
+    files = args.files or sorted(Path(pynecore.__file__).parent.joinpath('lib').rglob('*.py'))
+    modules = [(path, source) for path in files
+               for source in (path.read_text(encoding='utf-8'),) if '@pyne' in source]
+    if not modules:
+        parser.error("No Pyne modules found")
+    kloc = sum(source.count('\n') + 1 for _, source in modules) / 1000
+
+    separate = _best(_separate, modules, args.repeat)
+    fused = _best(transform, modules, args.repeat)
+
+    print(f"{len(modules)} modules, {kloc * 1000:.0f} lines")
+    print(f"  separate passes: {separate * 1000 / kloc:8.1f} ms/KLOC")
+    print(f"  fused pipeline:  {fused * 1000 / kloc:8.1f} ms/KLOC")
+    print(f"  speedup:         {separate / fused:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the window kernels of the `ta` library
+
+It compares the library implementation of `dev` (sorted window with block sums) and `alma` (ring buffer
+and a dot product in C) with their previous implementation, which looped over the window in Python on
+every bar. The running sum kernels (`wma`, `hma`, `linreg`, `correlation` and `cog`) are measured too,
+their time per bar doesn't depend on the length. Every function is called once per bar through
+`isolate_function`, like in a script, on a random walk.
+"""
+from typing import Callable
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import importlib
+import math
+import random
+import sys
+
+from pynecore.core import import_hook  # noqa: F401  # Needed to import the Pyne module
+from pynecore.core import function_isolation
+from pynecore.core.function_isolation import isolate_function
+from pynecore.core.series import SeriesImpl
+from pynecore import lib
+
+# The previous implementation and the library calls in a Pyne module, so they are transformed the same way
+MODULE = '''"""
+@pyne
+"""
+import builtins
+import math
+
+from pynecore import Series, Persistent
+from pynecore.types.na import NA
+from pynecore.lib import ta
+
+
+def loop_dev(source: Series[float], length: int):
+    mean = ta.sma(source, length)
+    if isinstance(mean, NA):
+        return NA(float)
+    summ = 0.0
+    for i in builtins.range(length):
+        summ += abs(source[i] - mean)
+    return summ / length
+
+
+def loop_alma(source: Series[float], length: int):
+    weights: Persistent[list[float]] = []
+    norm: Persistent[float] = 0.0
+    if not weights:
+        m = 0.85 * (length - 1)
+        s = length / 6.0
+        weights = [math.exp(-1 * ((i - m) ** 2) / (2 * s ** 2)) for i in builtins.range(length)]
+        weights.reverse()
+        norm = sum(weights)
+    summ = 0.0
+    for i, w in enumerate(weights):
+        summ += w * source[i]
+    return summ / norm
+
+
+def lib_dev(source: float, length: int):
+    return ta.dev(source, length)
+
+
+def lib_alma(source: float, length: int):
+    return ta.alma(source, length, 0.85, 6.0)
+
+
+def lib_wma(source: float, length: int):
+    return ta.wma(source, length)
+
+
+def lib_hma(source: float, length: int):
+    return ta.hma(source, length)
+
+
+def lib_linreg(source: float, length: int):
+    return ta.linreg(source, length, 0)
+
+
+def lib_correlation(source: float, length: int):
+    return ta.correlation(source, source * source, length)
+
+
+def lib_cog(source: float, length: int):
+    return ta.cog(source, length)
+'''
+
+COMPARED = ('dev', 'alma')
+RUNNING_SUMS = ('wma', 'hma', 'linreg', 'correlation', 'cog')
+
+
+def _run(func: Callable, values: list[float], length: int) -> tuple[float, list]:
+    """ Call the function on every bar, return the time and the results """
+    function_isolation.reset()
+    results = []
+    start = perf_counter()
+    for i, value in enumerate(values):
+        lib.bar_index = i
+        results.append(isolate_function(func, 'main|bench|0', '', 0)(value, length))
+        function_isolation.reset_step()
+    return perf_counter() - start, results
+
+
+def _best(func: Callable, values: list[float], length: int, repeat: int) -> tuple[float, list]:
+    runs = [_run(func, values, length) for _ in range(repeat)]
+    return min(t for t, _ in runs), runs[0][1]
+
+
+def _same(old_results: list, new_results: list) -> bool:
+    """ The results are the same, apart from rounding errors of the different summation order """
+    for old, new in zip(old_results, new_results):
+        if isinstance(old, float) and isinstance(new, float):
+            if not math.isclose(old, new, rel_tol=1e-9, abs_tol=1e-9):
+                return False
+        elif str(old) != str(new):
+            return False
+    return len(old_results) == len(new_results)
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark the window kernels of the ta library")
+    parser.add_argument('--bars', type=int, default=10000, help="Number of bars")
+    parser.add_argument('--lengths', type=int, nargs='+', default=[20, 200, 1000], help="Window lengths")
+    parser.add_argument('--repeat', type=int, default=3, help="Number of repeats, the best is used")
+    args = parser.parse_args()
+
+    # The previous implementation and the running sums need the whole window in the history of the source
+    SeriesImpl.DEFAULT_MAX_BARS_BACK = max(max(args.lengths) + 1, SeriesImpl.DEFAULT_MAX_BARS_BACK)
+
+    rnd = random.Random(42)
+    walk = [100.0]
+    for _ in range(args.bars - 1):
+        walk.append(walk[-1] + rnd.gauss(0.0, 1.0))
+
+    with TemporaryDirectory() as tmp:
+        Path(tmp, 'window_kernels_bench.py').write_text(MODULE)
+        sys.path.insert(0, tmp)
+        module = importlib.import_module('window_kernels_bench')
+
+    for length in args.lengths:
+        print(f"random walk, length {length} ({args.bars} bars), us/bar:")
+        print(f"  {'function':<12} {'loop':>8} {'library':>8} {'speedup':>8}")
+        for func in COMPARED:
+            old, old_results = _best(getattr(module, f'loop_{func}'), walk, length, args.repeat)
+            new, new_results = _best(getattr(module, f'lib_{func}'), walk, length, args.repeat)
+            same = '' if _same(old_results, new_results) else '  (results differ!)'
+            print(f"  {func:<12} {old * 1e6 / args.bars:8.2f} {new * 1e6 / args.bars:8.2f}"
+                  f" {old / new:7.2f}x{same}")
+        for func in RUNNING_SUMS:
+            new, _ = _best(getattr(module, f'lib_{func}'), walk, length, args.repeat)
+            print(f"  {func:<12} {'':>8} {new * 1e6 / args.bars:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,7 @@
 import time
 import gc
+import sys
+import subprocess
 from pathlib import Path
 from typing import Optional
 import statistics
@@ -16,6 +18,17 @@ from ...core.script_runner import ScriptRunner
 
 __all__ = []
 
+# Code of the startup benchmark, it is run in a new interpreter: it imports the runner and the script,
+# then runs it without data. Arguments: script path, data path
+_STARTUP_CODE = """
+import sys
+from pathlib import Path
+from pynecore.core.syminfo import SymInfo
+from pynecore.core.script_runner import ScriptRunner
+script, data = map(Path, sys.argv[1:3])
+ScriptRunner(script, iter(()), SymInfo.load_toml(data.with_suffix('.toml'))).run()
+"""
+
 
 @app.command(name="benchmark")
 def benchmark(
@@ -25,12 +38,17 @@ def benchmark(
         candles: int = Option(365, "--candles", "-c", help="Number of candles to process"),
         warmup: int = Option(2, "--warmup", "-w", help="Number of warmup iterations"),
         no_output: bool = Option(False, "--no-output", help="Don't write CSV output"),
+        startup: bool = Option(False, "--startup",
+                               help="Measure the startup time of a run in a new process instead of the execution"),
 ):
     """
     Benchmark script execution performance
 
     This command runs a script multiple times to measure performance.
     By default, it uses demo.py and demo.ohlcv files from the workdir.
+
+    With --startup it measures how long it takes for a new process to be ready to run the script
+    (importing PyneCore, the script and the libraries it uses), which matters for short runs.
     """
     console = Console()
 
@@ -77,6 +95,10 @@ def benchmark(
         secho(f"Symbol info file '{data.with_suffix('.toml')}' not found!", fg="red", err=True)
         raise Exit(1)
 
+    if startup:
+        _benchmark_startup(script, data, iterations, warmup, console)
+        return
+
     secho(f"\nBenchmarking: {script.name}", fg="cyan")
     secho(f"Data: {data.name} ({candles} candles)", fg="cyan")
     secho(f"Iterations: {iterations} (warmup: {warmup})", fg="cyan")
@@ -182,3 +204,52 @@ def benchmark(
 
     console.print("")
     console.print(table)
+
+
+def _benchmark_startup(script: Path, data: Path, iterations: int, warmup: int, console: Console):
+    """
+    Measure the startup time of running a script in a new process
+
+    The time of starting an empty Python interpreter is measured too, the difference is the startup
+    overhead of PyneCore and the script.
+    """
+    secho(f"\nBenchmarking startup: {script.name}", fg="cyan")
+    secho(f"Iterations: {iterations} (warmup: {warmup})", fg="cyan")
+    secho("")
+
+    def measure(args: list[str]) -> list[float]:
+        times = []
+        for i in range(warmup + iterations):
+            start = time.perf_counter()
+            # The first run compiles the script, it is the part of the warmup
+            subprocess.run([sys.executable, *args], check=True)
+            if i >= warmup:
+                times.append(time.perf_counter() - start)
+        return times
+
+    try:
+        python_times = measure(['-c', 'pass'])
+        pyne_times = measure(['-c', _STARTUP_CODE, str(script), str(data)])
+    except subprocess.CalledProcessError as e:
+        secho(f"Failed to run the script: {e}", fg="red", err=True)
+        raise Exit(1)
+
+    avg_python = statistics.mean(python_times)
+    avg_pyne = statistics.mean(pyne_times)
+
+    table = Table(title="Startup Benchmark Results", show_header=True, header_style="bold magenta")
+    table.add_column("Metric", style="cyan", no_wrap=True)
+    table.add_column("Value", justify="right", style="green")
+
+    table.add_row("Script", script.name)
+    table.add_row("Iterations", str(iterations))
+    table.add_row("", "")
+    table.add_row("Python Startup", f"{avg_python * 1000:.2f} ms")
+    table.add_row("Avg Startup Time", f"{avg_pyne * 1000:.2f} ms")
+    table.add_row("Min Startup Time", f"{min(pyne_times) * 1000:.2f} ms")
+    table.add_row("Max Startup Time", f"{max(pyne_times) * 1000:.2f} ms")
+    table.add_row("", "")
+    table.add_row("PyneCore Overhead", f"{(avg_pyne - avg_python) * 1000:.2f} ms")
+
+    console.print("")
+    console.print(table)
@@ -1,3 +1,8 @@
+from pathlib import Path
+
+from typer import Option, secho, Exit
+from rich.console import Console
+
 from ..app import app, app_state
 
 __all__ = []
@@ -6,9 +11,47 @@ __all__ = []
 # noinspection PyShadowingBuiltins
 @app.command()
 def compile(
-
+        precompile_all: bool = Option(False, "--precompile-all",
+                                      help="Transform and cache all Pyne scripts of the scripts directory, "
+                                           "so the first run does not need to transform them"),
+        scripts_dir: Path | None = Option(None, "--scripts-dir", "-d", file_okay=False, dir_okay=True,
+                                          help="The directory of the scripts to precompile, default is "
+                                               "the scripts directory of the workdir"),
 ):
     """
     Compile Pine Script to Python through pynesys.com
     """
+    if precompile_all:
+        _precompile_all(scripts_dir or app_state.scripts_dir)
+        return
+
     # TODO: Implement the compile command when API is ready
+
+
+def _precompile_all(scripts_dir: Path):
+    """
+    Precompile all Pyne scripts of a directory recursively
+    """
+    from ...core.import_hook import precompile
+
+    if not scripts_dir.is_dir():
+        secho(f"Scripts directory '{scripts_dir}' not found!", err=True, fg="red")
+        raise Exit(1)
+
+    console = Console()
+    count = 0
+    errors = 0
+    for path in sorted(scripts_dir.rglob('*.py')):
+        if '__pycache__' in path.parts:
+            continue
+        try:
+            if precompile(path):
+                count += 1
+                console.print(f"[green]Compiled[/] {path.relative_to(scripts_dir)}")
+        except (SyntaxError, ValueError) as e:
+            errors += 1
+            console.print(f"[red]Failed[/] {path.relative_to(scripts_dir)}: {e}")
+
+    console.print(f"{count} script(s) compiled" + (f", {errors} failed" if errors else ""))
+    if errors:
+        raise Exit(1)
@@ -16,6 +16,7 @@ from ...providers.provider import Provider
 
 from ...utils.rich.date_column import DateColumn
 from pynecore.core.ohlcv_file import OHLCVReader, OHLCVWriter
+from pynecore.core.plot_file import PlotReader, PLOT_SUFFIX
 
 __all__ = []
 
@@ -274,3 +275,36 @@ def convert_from(
 
             # Complete task
             progress.update(task, completed=1)
+
+
+@app_data.command()
+def convert_plot(
+        file_path: Path = Argument(..., help="Binary plot file (*.plot) to convert"),
+        output_path: Path | None = Option(None, '--output', '-o',
+                                          help="Path of the CSV file, if not specified, it is the same as the "
+                                               "plot file with '.csv' extension"),
+        float_fmt: str = Option('.8g', '--float-format', help="Format of the float values"),
+):
+    """
+    Convert a binary plot file (saved by [italic]pyne run --plot <name>.plot[/]) to CSV
+    """
+    # Expand file path
+    if file_path.suffix == "":
+        file_path = file_path.with_suffix(PLOT_SUFFIX)
+    if len(file_path.parts) == 1:
+        file_path = app_state.output_dir / file_path
+    if not file_path.exists():
+        secho(f"Plot file '{file_path}' not found!", err=True, fg=colors.RED)
+        raise Exit(1)
+    if output_path is None:
+        output_path = file_path.with_suffix('.csv')
+
+    with Progress(SpinnerColumn(finished_text="[green]✓"), TextColumn("{task.description}")) as progress:
+        task = progress.add_task(description="Converting to CSV...", total=1)
+        try:
+            with PlotReader(file_path) as reader:
+                reader.to_csv(output_path, float_fmt=float_fmt)
+        except ValueError as e:
+            secho(str(e), err=True, fg=colors.RED)
+            raise Exit(1)
+        progress.update(task, completed=1)
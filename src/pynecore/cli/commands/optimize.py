@@ -0,0 +1,214 @@
+from pathlib import Path
+from datetime import datetime
+from typing import Any
+import sys
+
+from typer import Option, Argument, secho, Exit
+from rich.table import Table
+from rich.console import Console
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn, TimeElapsedColumn
+
+from ..app import app, app_state
+
+from ...core.syminfo import SymInfo
+from ...core.csv_file import CSVWriter
+from ...core.optimizer import optimize as run_optimize, grid_space, random_space, frange, OptimizationResult
+
+__all__ = []
+
+
+def _parse_value(value: str) -> int | float | str:
+    """
+    Parse a parameter value from the command line
+    """
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _parse_param(param: str) -> tuple[str, list[Any]]:
+    """
+    Parse a parameter definition, it can be a list (`name=1,2,3`) or a range (`name=start:stop:step`)
+    """
+    try:
+        name, values = param.split('=', 1)
+    except ValueError:
+        raise ValueError(f"Invalid parameter '{param}', the format is 'name=v1,v2,...' or 'name=start:stop:step'!")
+    name = name.strip()
+
+    if ':' in values:
+        parts = [_parse_value(p.strip()) for p in values.split(':')]
+        if len(parts) not in (2, 3) or not all(isinstance(p, (int, float)) for p in parts):
+            raise ValueError(f"Invalid range for parameter '{name}'!")
+        start, stop = parts[0], parts[1]
+        step = parts[2] if len(parts) == 3 else 1
+        if all(isinstance(p, int) for p in (start, stop, step)):
+            return name, list(range(start, stop + 1, step))  # type: ignore
+        return name, frange(start, stop, step)  # type: ignore
+
+    return name, [_parse_value(v.strip()) for v in values.split(',')]
+
+
+@app.command()
+def optimize(
+        script: Path = Argument(..., dir_okay=False, file_okay=True, help="Strategy script to optimize"),
+        data: Path = Argument(..., dir_okay=False, file_okay=True,
+                              help="Data file to use (*.ohlcv)"),
+        params: list[str] = Option(..., "--param", "-p",
+                                   help="Input to sweep: 'name=v1,v2,...' or 'name=start:stop:step'"),
+        samples: int | None = Option(None, "--random", "-r",
+                                     help="Run only this many random combinations instead of the full grid"),
+        seed: int | None = Option(None, "--seed", help="Random seed for random search"),
+        workers: int | None = Option(None, "--workers", "-j",
+                                     help="Number of worker processes, default is the number of CPUs"),
+        sort_by: str = Option("net_profit", "--sort", "-s", help="Statistic to sort the results by"),
+        top: int = Option(20, "--top", "-n", help="Number of best results to show"),
+        time_from: datetime | None = Option(None, '--from', '-f',
+                                            formats=["%Y-%m-%d", "%Y-%m-%d %H:%M:%S"],
+                                            help="Start date (UTC), if not specified, will use the "
+                                                 "first date in the data"),
+        time_to: datetime | None = Option(None, '--to', '-t',
+                                          formats=["%Y-%m-%d", "%Y-%m-%d %H:%M:%S"],
+                                          help="End date (UTC), if not specified, will use the last "
+                                               "date in the data"),
+        precompute: bool = Option(False, "--precompute",
+                                  help="Precompute bar-invariant ta calls in a vectorized way (needs NumPy)"),
+        fast: bool = Option(False, "--fast",
+                            help="Process the bars without pending orders in a vectorized way (needs NumPy)"),
+        output_path: Path | None = Option(None, "--output", "-o",
+                                          help="Path to save all results as CSV",
+                                          rich_help_panel="Out Path Options"),
+):
+    """
+    Optimize strategy inputs by running the strategy with many input combinations
+
+    Every worker process imports the script only once, then re-runs it with different input values.
+    By default all combinations of the [bold]--param[/] values are run (grid search), with [bold]--random[/]
+    only the given number of randomly selected combinations are run.
+
+    Example: [italic]pyne optimize my_strategy data --param length=10:50:5 --param src=close,hl2[/]
+    """  # noqa
+    # Ensure .py extension
+    if script.suffix != ".py":
+        script = script.with_suffix(".py")
+    # Expand script path
+    if len(script.parts) == 1:
+        script = app_state.scripts_dir / script
+    # Check if script exists
+    if not script.exists():
+        secho(f"Script file '{script}' not found!", fg="red", err=True)
+        raise Exit(1)
+
+    # Check file format and extension
+    if data.suffix == "":
+        data = data.with_suffix(".ohlcv")
+    elif data.suffix != ".ohlcv":
+        secho(f"Cannot run with '{data.suffix}' files. The PyneCore runtime requires .ohlcv format.",
+              fg="red", err=True)
+        raise Exit(1)
+    # Expand data path
+    if len(data.parts) == 1:
+        data = app_state.data_dir / data
+    # Check if data exists
+    if not data.exists():
+        secho(f"Data file '{data}' not found!", fg="red", err=True)
+        raise Exit(1)
+
+    # Ensure .csv extension for output path
+    if output_path and output_path.suffix != ".csv":
+        output_path = output_path.with_suffix(".csv")
+    if output_path and len(output_path.parts) == 1:
+        output_path = app_state.output_dir / output_path
+
+    # Get symbol info for the data
+    try:
+        syminfo = SymInfo.load_toml(data.with_suffix(".toml"))
+    except FileNotFoundError:
+        secho(f"Symbol info file '{data.with_suffix('.toml')}' not found!", fg="red", err=True)
+        raise Exit(1)
+
+    # Parse parameter space
+    try:
+        space_params = dict(_parse_param(p) for p in params)
+    except ValueError as e:
+        secho(str(e), fg="red", err=True)
+        raise Exit(1)
+
+    total = 1
+    for values in space_params.values():
+        total *= len(values)
+    if samples is not None:
+        total = min(total, samples)
+        space = random_space(space_params, samples, seed)
+    else:
+        space = grid_space(space_params)
+
+    # Add lib directory to Python path for library imports
+    lib_dir = app_state.scripts_dir / "lib"
+    lib_path_added = False
+    if lib_dir.exists() and lib_dir.is_dir():
+        sys.path.insert(0, str(lib_dir))
+        lib_path_added = True
+
+    results: list[OptimizationResult] = []
+    try:
+        with Progress(
+                SpinnerColumn(finished_text="[green]✓"),
+                TextColumn("{task.description}"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                TimeElapsedColumn(),
+        ) as progress:
+            task = progress.add_task(description="Optimizing...", total=total)
+            results = run_optimize(
+                script, data, syminfo, space,
+                time_from=int(time_from.replace(tzinfo=None).timestamp()) if time_from else None,
+                time_to=int(time_to.replace(tzinfo=None).timestamp()) if time_to else None,
+                workers=workers,
+                precompute=precompute,
+                fast=fast,
+                on_result=lambda _: progress.advance(task),
+            )
+    except (ValueError, KeyError, ImportError) as e:
+        secho(str(e), fg="red", err=True)
+        raise Exit(1)
+    finally:
+        if lib_path_added:
+            sys.path.remove(str(lib_dir))
+
+    if not results:
+        secho("No results!", fg="yellow")
+        return
+    if sort_by not in results[0].stats:
+        secho(f"Unknown statistic '{sort_by}', available: {', '.join(results[0].stats)}", fg="red", err=True)
+        raise Exit(1)
+
+    results.sort(key=lambda res: res.stats[sort_by], reverse=True)
+
+    # Save all results
+    if output_path:
+        with CSVWriter(output_path) as writer:
+            for res in results:
+                writer.write_dict({**res.inputs, **res.stats})
+
+    # Show the best results
+    table = Table(title="Optimization Results", show_header=True, header_style="bold magenta")
+    for name in space_params:
+        table.add_column(name, style="cyan")
+    for name in ('net_profit', 'profit_factor', 'total_trades', 'percent_profitable', 'max_drawdown'):
+        table.add_column(name, justify="right", style="green" if name == sort_by else None)
+    for res in results[:top]:
+        table.add_row(
+            *(str(res.inputs[name]) for name in space_params),
+            *(f"{res.stats[name]:.4g}" for name in ('net_profit', 'profit_factor', 'total_trades',
+                                                     'percent_profitable', 'max_drawdown')),
+        )
+
+    console = Console()
+    console.print("")
+    console.print(table)
@@ -7,16 +7,18 @@ import sys
 
 from typer import Option, Argument, secho, Exit
 from rich.progress import (Progress, SpinnerColumn, TextColumn, BarColumn,
-                           ProgressColumn, Task)
+                           ProgressColumn, Task, MofNCompleteColumn, TimeElapsedColumn)
 from rich.text import Text
 
 from ..app import app, app_state
 
 from ...utils.rich.date_column import DateColumn
 from pynecore.core.ohlcv_file import OHLCVReader
+from pynecore.core.plot_file import PLOT_SUFFIX
 
 from pynecore.core.syminfo import SymInfo
 from pynecore.core.script_runner import ScriptRunner
+from pynecore.core.batch_runner import run_batch, write_summary
 
 __all__ = []
 
@@ -51,11 +53,100 @@ class CustomTimeRemainingColumn(ProgressColumn):
         return Text(f"{minutes:02d}:{seconds:06.3f}", style="cyan")
 
 
+def _resolve_symbols(symbols: list[str]) -> list[Path]:
+    """
+    Resolve the data files of the symbols, entries can be comma separated names or glob patterns
+    """
+    paths: dict[Path, None] = {}
+    for entry in symbols:
+        for name in entry.split(','):
+            name = name.strip()
+            if not name:
+                continue
+            path = Path(name)
+            if path.suffix != ".ohlcv":
+                path = path.with_name(path.name + ".ohlcv")
+            # Expand data path
+            if len(path.parts) == 1:
+                path = app_state.data_dir / path
+            if any(c in name for c in '*?['):
+                paths.update(dict.fromkeys(sorted(path.parent.glob(path.name))))
+            else:
+                paths[path] = None
+    return list(paths)
+
+
+def _run_symbols(script: Path, symbols: list[str], time_from: datetime | None, time_to: datetime | None,
+                 summary_path: Path | None, workers: int | None, precompute: bool):
+    """
+    Run the script on many symbols
+    """
+    data_paths = _resolve_symbols(symbols)
+    if not data_paths:
+        secho("No data files found for the symbols!", fg="red", err=True)
+        raise Exit(1)
+    for data_path in data_paths:
+        if not data_path.exists():
+            secho(f"Data file '{data_path}' not found!", fg="red", err=True)
+            raise Exit(1)
+        if not data_path.with_suffix(".toml").exists():
+            secho(f"Symbol info file '{data_path.with_suffix('.toml')}' not found!", fg="red", err=True)
+            raise Exit(1)
+
+    # Ensure .csv extension for summary path
+    if summary_path and summary_path.suffix != ".csv":
+        summary_path = summary_path.with_suffix(".csv")
+    if summary_path and len(summary_path.parts) == 1:
+        summary_path = app_state.output_dir / summary_path
+    if not summary_path:
+        summary_path = app_state.output_dir / f"{script.stem}_summary.csv"
+
+    # Add lib directory to Python path for library imports
+    lib_dir = app_state.scripts_dir / "lib"
+    lib_path_added = False
+    if lib_dir.exists() and lib_dir.is_dir():
+        sys.path.insert(0, str(lib_dir))
+        lib_path_added = True
+
+    try:
+        with Progress(
+                SpinnerColumn(finished_text="[green]✓"),
+                TextColumn("{task.description}"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                TimeElapsedColumn(),
+        ) as progress:
+            task = progress.add_task(description="Running script on symbols...", total=len(data_paths))
+            results = run_batch(
+                script, data_paths,
+                output_dir=app_state.output_dir / script.stem,
+                time_from=int(time_from.replace(tzinfo=None).timestamp()) if time_from else None,
+                time_to=int(time_to.replace(tzinfo=None).timestamp()) if time_to else None,
+                workers=workers,
+                precompute=precompute,
+                on_result=lambda _: progress.advance(task),
+            )
+    except (ValueError, ImportError) as e:
+        secho(str(e), fg="red", err=True)
+        raise Exit(1)
+    finally:
+        if lib_path_added:
+            sys.path.remove(str(lib_dir))
+
+    write_summary(results, summary_path)
+
+    for result in results:
+        if result.error:
+            secho(f"{result.symbol}: {result.error}", fg="yellow", err=True)
+    secho(f"Outputs of the symbols: {app_state.output_dir / script.stem}")
+    secho(f"Summary: {summary_path}")
+
+
 @app.command()
 def run(
         script: Path = Argument(..., dir_okay=False, file_okay=True, help="Script to run"),
-        data: Path = Argument(..., dir_okay=False, file_okay=True,
-                              help="Data file to use (*.ohlcv)"),
+        data: Path | None = Argument(None, dir_okay=False, file_okay=True,
+                                     help="Data file to use (*.ohlcv), not needed with --symbols"),
         time_from: datetime | None = Option(None, '--from', '-f',
                                             formats=["%Y-%m-%d", "%Y-%m-%d %H:%M:%S"],
                                             help="Start date (UTC), if not specified, will use the "
@@ -65,7 +156,8 @@ def run(
                                           help="End date (UTC), if not specified, will use the last "
                                                "date in the data"),
         plot_path: Path | None = Option(None, "--plot", "-pp",
-                                        help="Path to save the plot data",
+                                        help="Path to save the plot data, with '.plot' extension it is "
+                                             "saved in binary format",
                                         rich_help_panel="Out Path Options"),
         strat_path: Path | None = Option(None, "--strat", "-sp",
                                          help="Path to save the strategy statistics",
@@ -74,6 +166,29 @@ def run(
         equity_path: Path | None = Option(None, "--equity", "-ep",
                                           help="Path to save the equity curve",
                                           rich_help_panel="Out Path Options"),
+        checkpoint_path: Path | None = Option(None, "--checkpoint", "-cp",
+                                              help="Path to save the state of the script after the last bar",
+                                              rich_help_panel="Out Path Options"),
+        resume: bool = Option(False, "--resume",
+                              help="Continue from the checkpoint of the previous run, only the new bars are "
+                                   "processed. If the script, its inputs or PyneCore changed, it runs from "
+                                   "the first bar."),
+        precompute: bool = Option(False, "--precompute",
+                                  help="Precompute bar-invariant ta calls in a vectorized way (needs NumPy)"),
+        fast: bool = Option(False, "--fast",
+                            help="Process the bars of strategies without pending orders in a vectorized way "
+                                 "(needs NumPy)"),
+        symbols: list[str] | None = Option(None, "--symbols",
+                                           help="Run on many symbols instead of DATA: data file names "
+                                                "(comma separated) or glob patterns, e.g. 'BINANCE_*'",
+                                           rich_help_panel="Multi-Symbol Options"),
+        summary_path: Path | None = Option(None, "--summary",
+                                           help="Path to save the summary table of the symbols",
+                                           rich_help_panel="Multi-Symbol Options"),
+        workers: int | None = Option(None, "--workers", "-j",
+                                     help="Number of worker processes for --symbols, default is the number "
+                                          "of CPUs",
+                                     rich_help_panel="Multi-Symbol Options"),
 ):
     """
     Run a script
@@ -85,6 +200,16 @@ def run(
     Similarly, if [bold]data[/] path is a name without full path, it will be searched in the [italic]"workdir/data"[/] directory.
     The [bold]plot_path[/], [bold]strat_path[/], and [bold]equity_path[/] work the same way - if they are names without full paths,
     they will be saved in the [italic]"workdir/output"[/] directory.
+
+    With [bold]--resume[/] the state of the script is saved to a checkpoint file after the last bar
+    ([italic]"workdir/output/<script>.checkpoint"[/] by default), and the next run with [bold]--resume[/]
+    processes only the new bars and appends them to the output files.
+
+    With [bold]--symbols[/] the script runs on many data files, every worker process imports the script only
+    once. The outputs of the symbols are saved in the [italic]"workdir/output/<script>"[/] directory, and a
+    summary table of all symbols is saved as [italic]"workdir/output/<script>_summary.csv"[/].
+
+    Example: [italic]pyne run my_strategy --symbols 'ccxt_BINANCE_*_1D' --symbols EURUSD,GBPUSD[/]
     """  # noqa
     # Ensure .py extension
     if script.suffix != ".py":
@@ -97,6 +222,23 @@ def run(
         secho(f"Script file '{script}' not found!", fg="red", err=True)
         raise Exit(1)
 
+    # Run on many symbols
+    if symbols:
+        if data is not None:
+            secho("DATA can't be used with --symbols!", fg="red", err=True)
+            raise Exit(1)
+        if plot_path or strat_path or equity_path or checkpoint_path or resume:
+            secho("Output paths and checkpoints can't be used with --symbols!", fg="red", err=True)
+            raise Exit(1)
+        if fast:
+            secho("Fast mode can't be used with --symbols!", fg="red", err=True)
+            raise Exit(1)
+        _run_symbols(script, symbols, time_from, time_to, summary_path, workers, precompute)
+        return
+    if data is None:
+        secho("Missing DATA argument (or --symbols)!", fg="red", err=True)
+        raise Exit(1)
+
     # Check file format and extension
     if data.suffix == "":
         # No extension, add .ohlcv
@@ -120,8 +262,8 @@ def run(
         secho(f"Data file '{data}' not found!", fg="red", err=True)
         raise Exit(1)
 
-    # Ensure .csv extension for plot path
-    if plot_path and plot_path.suffix != ".csv":
+    # Ensure .csv extension for plot path, if it is not a binary plot file
+    if plot_path and plot_path.suffix not in (".csv", PLOT_SUFFIX):
         plot_path = plot_path.with_suffix(".csv")
     if not plot_path:
         plot_path = app_state.output_dir / f"{script.stem}.csv"
@@ -138,6 +280,18 @@ def run(
     if not equity_path:
         equity_path = app_state.output_dir / f"{script.stem}_equity.csv"
 
+    # Checkpoints are saved if requested or needed by resume
+    if checkpoint_path and len(checkpoint_path.parts) == 1:
+        checkpoint_path = app_state.output_dir / checkpoint_path
+    if resume and not checkpoint_path:
+        checkpoint_path = app_state.output_dir / f"{script.stem}.checkpoint"
+    if checkpoint_path and precompute:
+        secho("Checkpoints can't be used in precompute mode!", fg="red", err=True)
+        raise Exit(1)
+    if checkpoint_path and fast:
+        secho("Checkpoints can't be used in fast mode!", fg="red", err=True)
+        raise Exit(1)
+
     # Get symbol info for the data
     try:
         syminfo = SymInfo.load_toml(data.with_suffix(".toml"))
@@ -159,6 +313,14 @@ def run(
         # Get the iterator
         size = reader.get_size(int(time_from.timestamp()), int(time_to.timestamp()))
         ohlcv_iter = reader.read_from(int(time_from.timestamp()), int(time_to.timestamp()))
+        # Precompute and fast modes need the whole data in columns
+        if precompute or fast:
+            try:
+                from pynecore.core.ohlcv_columns import OHLCVColumns
+                ohlcv_iter = OHLCVColumns.from_reader(reader, int(time_from.timestamp()), int(time_to.timestamp()))
+            except ImportError as e:
+                secho(str(e), fg="red", err=True)
+                raise Exit(1)
 
         # Add lib directory to Python path for library imports
         lib_dir = app_state.scripts_dir / "lib"
@@ -177,7 +339,9 @@ def run(
             try:
                 # Create script runner (this is where the import happens)
                 runner = ScriptRunner(script, ohlcv_iter, syminfo, last_bar_index=size - 1,
-                                      plot_path=plot_path, strat_path=strat_path, equity_path=equity_path)
+                                      plot_path=plot_path, strat_path=strat_path, equity_path=equity_path,
+                                      precompute=precompute, fast=fast, checkpoint_path=checkpoint_path,
+                                      resume=resume)
             finally:
                 # Remove lib directory from Python path
                 if lib_path_added:
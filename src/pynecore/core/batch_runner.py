@@ -0,0 +1,190 @@
+"""
+Run one script on many symbols
+
+The script is imported only once per worker process, then it is reset and re-run with the data and
+the symbol information of every symbol. Symbols are distributed between worker processes.
+"""
+from typing import Iterable, Callable, Any
+from dataclasses import dataclass, field
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from .syminfo import SymInfo
+from .script_runner import ScriptRunner
+from .ohlcv_file import OHLCVReader
+from .csv_file import CSVWriter
+from .optimizer import collect_stats, _run_chunks
+
+__all__ = ['SymbolResult', 'run_batch', 'write_summary']
+
+
+@dataclass(kw_only=True)
+class SymbolResult:
+    """
+    Result of the run on one symbol
+    """
+    symbol: str
+    bars: int = 0
+    stats: dict[str, float | int] = field(default_factory=dict)
+    error: str | None = None
+
+
+class _BatchWorker:
+    """
+    The state of a worker: the imported script and the options of the batch
+    """
+
+    __slots__ = ('runner', 'output_dir', 'time_from', 'time_to', 'precompute')
+
+    def __init__(self, script_path: Path, syminfo: SymInfo, output_dir: Path | None,
+                 time_from: int | None, time_to: int | None, precompute: bool = False):
+        # The symbol information is replaced before every run, the first one is needed for the import
+        self.runner = ScriptRunner(script_path, iter(()), syminfo, precompute=precompute)
+        self.output_dir = output_dir
+        self.time_from = time_from
+        self.time_to = time_to
+        self.precompute = precompute
+
+    def run(self, data_path: Path) -> SymbolResult:
+        """
+        Run the script on the data of a symbol, errors are returned in the result
+
+        :param data_path: The path of the OHLCV data file, its symbol information is the toml file
+                          with the same name
+        :return: The result of the run
+        """
+        symbol = data_path.stem
+        try:
+            return self._run(data_path, symbol)
+        except Exception as e:  # One bad symbol should not stop the whole batch
+            return SymbolResult(symbol=symbol, error=f"{type(e).__name__}: {e}")
+
+    def _run(self, data_path: Path, symbol: str) -> SymbolResult:
+        runner = self.runner
+        runner.reset()
+        runner.syminfo = SymInfo.load_toml(data_path.with_suffix(".toml"))
+
+        is_strat = runner.script.position is not None
+        output_dir = self.output_dir
+        if output_dir is not None:
+            runner.set_output_paths(plot_path=output_dir / f"{symbol}.csv",
+                                    equity_path=output_dir / f"{symbol}_equity.csv" if is_strat else None)
+
+        reader = OHLCVReader(str(data_path))
+        try:
+            reader.open()
+            time_from = self.time_from if self.time_from is not None else reader.start_timestamp
+            time_to = self.time_to if self.time_to is not None else reader.end_timestamp
+            runner.last_bar_index = reader.get_size(time_from, time_to) - 1
+            if self.precompute:
+                from .ohlcv_columns import OHLCVColumns
+                runner.ohlcv_iter = OHLCVColumns.from_reader(reader, time_from, time_to)
+            else:
+                runner.ohlcv_iter = reader.read_from(time_from, time_to)
+            bars = sum(1 for _ in runner.run_iter())
+        finally:
+            # Workers live for the whole batch, the memory mapping and the data of the symbol must not be
+            # kept until the next one
+            runner.ohlcv_iter = iter(())
+            reader.close()
+
+        return SymbolResult(symbol=symbol, bars=bars, stats=collect_stats(runner) if is_strat else {})
+
+
+# The worker of the current process
+_worker: _BatchWorker | None = None
+
+
+def _init_worker(script_path: Path, syminfo: SymInfo, output_dir: Path | None,
+                 time_from: int | None, time_to: int | None, precompute: bool):
+    """
+    Process pool initializer, it imports the script once per process
+    """
+    global _worker
+    # Workers must not write the toml file of the script concurrently
+    os.environ['PYNE_SAVE_SCRIPT_TOML'] = '0'
+    _worker = _BatchWorker(script_path, syminfo, output_dir, time_from, time_to, precompute)
+
+
+def _run_in_worker(data_path: Path) -> SymbolResult:
+    """
+    Run one symbol in the worker of the current process
+    """
+    assert _worker is not None
+    return _worker.run(data_path)
+
+
+def run_batch(script_path: Path, data_paths: Iterable[Path], *, output_dir: Path | None = None,
+              time_from: int | None = None, time_to: int | None = None,
+              workers: int | None = None, chunksize: int = 1, precompute: bool = False,
+              on_result: Callable[[SymbolResult], None] | None = None) -> list[SymbolResult]:
+    """
+    Run a script on the data of many symbols
+
+    :param script_path: The path of the script
+    :param data_paths: The paths of the OHLCV data files, the symbol information of every data file is the
+                       toml file with the same name
+    :param output_dir: Directory to save the outputs of every symbol (`<symbol>.csv` and
+                       `<symbol>_equity.csv`), if None, the outputs are not saved
+    :param time_from: Start timestamp (UTC seconds), if None, the first bar of the data is used
+    :param time_to: End timestamp (UTC seconds), if None, the last bar of the data is used
+    :param workers: Number of worker processes, if None, the number of CPUs is used,
+                    if 1, the symbols are run in the current process
+    :param chunksize: Number of symbols sent to a worker at once
+    :param precompute: Precompute bar-invariant ta calls in a vectorized way, needs NumPy
+    :param on_result: Callback called with every result as soon as it is ready, with more workers
+                      the results may come in a different order than the data paths
+    :return: List of results in the order of the data paths
+    :raises ValueError: If there are no data paths
+    :raises FileNotFoundError: If the symbol information of the first data file is not found
+    """
+    data_paths = list(data_paths)
+    if not data_paths:
+        raise ValueError("No symbols to run!")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(data_paths))
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    # The script is imported with the symbol information of the first symbol
+    syminfo = SymInfo.load_toml(data_paths[0].with_suffix(".toml"))
+
+    results: list[SymbolResult] = []
+
+    if workers <= 1:
+        worker = _BatchWorker(script_path, syminfo, output_dir, time_from, time_to, precompute)
+        for data_path in data_paths:
+            result = worker.run(data_path)
+            results.append(result)
+            if on_result:
+                on_result(result)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(script_path, syminfo, output_dir, time_from, time_to, precompute)) as executor:
+        results = _run_chunks(executor, _run_in_worker, data_paths, chunksize, on_result)
+
+    return results
+
+
+def write_summary(results: Iterable[SymbolResult], path: Path):
+    """
+    Write the results of all symbols into one CSV table, one row per symbol
+
+    :param results: The results of the batch
+    :param path: The path of the CSV file
+    """
+    results = list(results)
+    # Failed symbols have no statistics, the columns are collected from all results
+    columns: dict[str, None] = {}
+    for result in results:
+        columns.update(dict.fromkeys(result.stats))
+
+    with CSVWriter(path) as writer:
+        for result in results:
+            row: dict[str, Any] = dict(symbol=result.symbol, bars=result.bars)
+            row.update((name, result.stats.get(name, '')) for name in columns)
+            row['error'] = result.error or ''
+            writer.write_dict(row)
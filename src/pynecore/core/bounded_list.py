@@ -0,0 +1,65 @@
+"""
+List of the last N items
+
+`BoundedList` works like a `deque` with `maxlen` (appending to a full list drops the oldest item), but it
+is a `list`, so reading any item by index is O(1) and it is done by the C implementation of the list. A
+`deque` is a linked list of blocks, reading its middle items is O(n).
+
+A ring buffer is O(1) too, but its index calculation is Python code, which costs more than walking the
+blocks of a `deque` for the sizes used here (e.g. the 9000 closed trades of a strategy). Dropping the
+oldest item of a full `BoundedList` moves the references of the other items, which is a fast memory
+move, and it is needed only on appends.
+"""
+from __future__ import annotations
+from typing import Iterable, TypeVar
+
+__all__ = ['BoundedList']
+
+T = TypeVar('T')
+
+
+class BoundedList(list[T]):
+    """
+    List of the last `maxlen` appended items, the oldest item has index 0 (like in a `deque`).
+
+    Only `append` and `extend` keep the size limit, the list should not be modified in other ways.
+    """
+
+    __slots__ = ('maxlen',)
+
+    def __init__(self, maxlen: int, items: Iterable[T] = ()):
+        """
+        :param maxlen: The maximum number of items, appending more drops the oldest ones
+        :param items: Initial items
+        """
+        if maxlen <= 0:
+            raise ValueError("The size of the list must be positive!")
+        super().__init__()
+        self.maxlen = maxlen
+        self.extend(items)
+
+    def __repr__(self) -> str:
+        return f"BoundedList({super().__repr__()}, maxlen={self.maxlen})"
+
+    def __reduce__(self):
+        return self.__class__, (self.maxlen, list(self))
+
+    def append(self, item: T):
+        """
+        Append an item, if the list is full the oldest item is dropped
+
+        :param item: The item to append
+        """
+        super().append(item)
+        if len(self) > self.maxlen:
+            del self[0]
+
+    def extend(self, items: Iterable[T]):
+        """
+        Append items, if the list is full the oldest items are dropped
+
+        :param items: The items to append
+        """
+        super().extend(items)
+        if len(self) > self.maxlen:
+            del self[:len(self) - self.maxlen]
@@ -0,0 +1,136 @@
+"""
+Checkpoints of script runs
+
+A checkpoint is the whole state of a script after the last bar of a run: the persistent and series
+globals of the script and of the registered libraries, the isolated globals of all function
+instances, the strategy position and the sizes of the output files. A later run can restore it and
+process only the new bars (e.g. daily runs on a growing data file), instead of running the script
+on the whole history again.
+
+Checkpoints are pickled. A checkpoint is valid only for the same script source, inputs, symbol,
+timeframe and PyneCore version (including the sources of the library and the transformers),
+otherwise the script must be run from the first bar.
+"""
+from __future__ import annotations
+from typing import Any, TYPE_CHECKING
+from pathlib import Path
+import hashlib
+import os
+import pickle
+
+if TYPE_CHECKING:
+    from .syminfo import SymInfo
+    from ..lib.strategy import Position
+
+__all__ = ['Checkpoint', 'fingerprint']
+
+# Version of the checkpoint format, checkpoints with other versions are ignored
+FORMAT_VERSION = 2
+
+
+def _package_version() -> str:
+    """
+    Get the version of the installed PyneCore package
+    """
+    from importlib.metadata import version, PackageNotFoundError
+    try:
+        return version('pynesys-pynecore')
+    except PackageNotFoundError:
+        return ''
+
+
+def fingerprint(script_source: bytes, inputs: Any, syminfo: SymInfo) -> str:
+    """
+    Calculate the fingerprint of a run, checkpoints are valid only for the same fingerprint
+
+    :param script_source: The source of the script
+    :param inputs: The effective input values of the script (the defaults of the `main` function)
+    :param syminfo: Symbol information
+    :return: The hex digest of the fingerprint
+    """
+    from .import_hook import _get_pipeline_hash
+
+    h = hashlib.sha256(script_source)
+    h.update(repr(inputs).encode())
+    h.update(f"{syminfo.prefix}:{syminfo.ticker}|{syminfo.period}".encode())
+    h.update(_package_version().encode())
+    h.update(_get_pipeline_hash())
+    return h.hexdigest()
+
+
+class Checkpoint:
+    """
+    The state of a script after the last bar of a run
+    """
+
+    __slots__ = ('fingerprint', 'bar_index', 'timestamp', 'trade_num', 'module_state', 'library_state',
+                 'function_state', 'position', 'writers')
+
+    # noinspection PyShadowingNames
+    def __init__(self, fingerprint: str, bar_index: int, timestamp: int, *,
+                 trade_num: int = 0,
+                 module_state: dict[str, Any] | None = None,
+                 library_state: dict[str, dict[str, Any]] | None = None,
+                 function_state: dict[str, dict[str, Any]] | None = None,
+                 position: Position | None = None,
+                 writers: dict[str, tuple[int, list | tuple | None]] | None = None):
+        """
+        :param fingerprint: The fingerprint of the run
+        :param bar_index: The index of the last bar
+        :param timestamp: The timestamp of the last bar
+        :param trade_num: The number of trades written to the equity file
+        :param module_state: The persistent and series globals of the script module
+        :param library_state: The persistent and series globals of the registered libraries by title
+        :param function_state: The isolated globals of the function instances by full call ID
+        :param position: The strategy position
+        :param writers: The size (in bytes) and the headers of the output files by name
+        """
+        self.fingerprint = fingerprint
+        self.bar_index = bar_index
+        self.timestamp = timestamp
+        self.trade_num = trade_num
+        self.module_state = module_state or {}
+        self.library_state = library_state or {}
+        self.function_state = function_state or {}
+        self.position = position
+        self.writers = writers or {}
+
+    def save(self, path: Path) -> None:
+        """
+        Save the checkpoint atomically
+
+        The fingerprint is pickled separately before the state, so it can be checked without
+        unpickling the state.
+
+        :param path: The path of the checkpoint file
+        :raises ValueError: If the state of the script can't be pickled
+        """
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((FORMAT_VERSION, self.fingerprint), f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            raise ValueError(f"The state of the script can't be saved: {e}") from e
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    # noinspection PyShadowingNames
+    @classmethod
+    def load(cls, path: Path, fingerprint: str) -> Checkpoint | None:
+        """
+        Load the checkpoint if it is valid for the fingerprint
+
+        :param path: The path of the checkpoint file
+        :param fingerprint: The fingerprint of the current run
+        :return: The checkpoint or None if there is no valid checkpoint
+        """
+        try:
+            with open(path, 'rb') as f:
+                if pickle.load(f) != (FORMAT_VERSION, fingerprint):
+                    return None
+                checkpoint = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, ValueError):
+            return None
+        return checkpoint if isinstance(checkpoint, cls) else None
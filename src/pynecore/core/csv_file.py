@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import Iterator, Optional, Literal, Any
 import io
 import mmap
+import os
 import csv
 import queue
 import threading
@@ -182,18 +183,36 @@ class CSVWriter:
                 except:  # noqa
                     pass
 
-    def open(self) -> CSVWriter:
-        """Open the CSV file and start the worker thread"""
+    @property
+    def headers(self) -> tuple | list | None:
+        """The headers of the file, if they are known already"""
+        return self._headers
+
+    def open(self, append_at: int | None = None, headers: tuple | list | None = None) -> CSVWriter:
+        """
+        Open the CSV file and start the worker thread
+
+        :param append_at: Continue an existing file from this position (in bytes), everything after
+                          it is truncated and the headers are not written again
+        :param headers: The headers of the existing file, if they were not provided in the constructor
+        """
         with self._lock:
             if self._is_open:
                 return self
 
+            if headers is not None:
+                self._headers = headers
+
             # Open file for writing
-            self._file = open(self.path, 'w', buffering=self._buffer_size)
+            if append_at is None:
+                self._file = open(self.path, 'w', buffering=self._buffer_size)
+            else:
+                os.truncate(self.path, append_at)
+                self._file = open(self.path, 'a', buffering=self._buffer_size)
             self._is_open = True
 
             # Write headers if provided
-            if self._headers:
+            if self._headers and append_at is None:
                 writer = csv.writer(self._file, dialect=self._dialect)
                 writer.writerow(self._headers)
 
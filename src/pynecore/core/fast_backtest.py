@@ -0,0 +1,222 @@
+"""
+Fast backtest mode for strategies
+
+Most bars of a simple strategy (market entries and exits on signals) have no pending orders. On these
+bars nothing is filled, the position and its open trades don't change, only the per-bar values are
+updated: the open profit, the drawdown and runup of the open trades, the maximum drawdown and runup and
+the equity series of the statistics. `FastPosition` skips these bars while the script runs, and it
+calculates their values later in a vectorized way with NumPy, from the OHLC columns of the data. The
+bars with pending orders are processed normally, one by one (first the skipped bars are calculated),
+so the fills, the trades and the statistics are the same as in normal mode. Limit, stop and OCA orders
+are supported too, but while they are pending every bar is processed normally.
+
+The skipped bars are calculated when the script reads a per-bar value (`strategy.openprofit`,
+`strategy.equity`, `strategy.max_drawdown`, `strategy.opentrades.profit`, ...), so these are always
+up to date, but if a script reads them on every bar, fast mode is slower than the normal one.
+
+Fast mode is opt-in and needs NumPy and columnar data (`OHLCVColumns`).
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from datetime import datetime, UTC
+
+from .. import lib
+from ..lib.strategy import Position
+from .ohlcv_columns import _import_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+    from .ohlcv_columns import OHLCVColumns
+
+__all__ = ['FastPosition']
+
+
+def _month_periods(np, timestamps: np.ndarray, timezone: str) -> np.ndarray:
+    """
+    The month (`year * 12 + month`) of every bar in the timezone of the symbol
+
+    :param timestamps: Timestamps of the bars in seconds
+    :param timezone: The timezone of the symbol
+    :return: The months of the bars
+    """
+    # noinspection PyProtectedMember
+    tz = lib._parse_timezone(timezone)
+    first = datetime.fromtimestamp(int(timestamps[0]), UTC).astimezone(tz)
+    last = datetime.fromtimestamp(int(timestamps[-1]), UTC).astimezone(tz)
+    first_period = first.year * 12 + first.month - 1
+    # The start timestamps of the months after the first one
+    starts = []
+    for period in range(first_period + 1, last.year * 12 + last.month):
+        year, month = divmod(period, 12)
+        starts.append(datetime(year, month + 1, 1, tzinfo=tz).timestamp())
+    return np.searchsorted(np.array(starts, dtype=np.float64), timestamps, side='right') + first_period + 1
+
+
+class FastPosition(Position):
+    """
+    Position which processes the bars without pending orders later, in a vectorized way.
+
+    Without columns (see `set_columns`) it works like a normal `Position`.
+    """
+
+    def __init__(self, risk_free_rate: float = 2.0):
+        """
+        :param risk_free_rate: The annual risk-free rate of return in percent, for the Sharpe and Sortino ratios
+        """
+        super().__init__(risk_free_rate)
+        self._columns: OHLCVColumns | None = None
+        self._size = 0
+        # The index of the first bar, which is not processed yet
+        self._done = 0
+        # The rounded open, high, low and close prices and the months of the bars
+        self._arrays: tuple[np.ndarray, ...] | None = None
+        self._arrays_key: tuple[float, str] | None = None
+
+    def set_columns(self, columns: OHLCVColumns | None):
+        """
+        Set the data of the next run
+
+        :param columns: The OHLCV data the script runs on, if None, every bar is processed normally
+        """
+        if columns is not self._columns:
+            self._arrays = self._arrays_key = None
+        self._columns = columns
+        self._size = len(columns) if columns is not None else 0
+
+    def reset(self):
+        super().reset()
+        self._done = 0
+
+    def _get_arrays(self) -> tuple[np.ndarray, ...]:
+        """
+        The prices rounded to mintick (like in `process_orders`) and the months of the bars
+        """
+        key = (lib.syminfo.mintick, lib.syminfo.timezone)
+        if self._arrays is None or self._arrays_key != key:
+            np = _import_numpy()
+            columns = self._columns
+            assert columns is not None
+            mintick = key[0]
+            # The same as `lib.math.round_to_mintick`
+            self._arrays = tuple(np.trunc(np.asarray(prices, dtype=np.float64) / mintick + 0.5) * mintick
+                                 for prices in (columns.open, columns.high, columns.low, columns.close)) \
+                + (_month_periods(np, columns.timestamp, key[1]),)
+            self._arrays_key = key
+        return self._arrays
+
+    #
+    # Position interface
+    #
+
+    @property
+    def equity(self) -> float:
+        """ The current equity """
+        self.sync()
+        return super().equity
+
+    def sync(self):
+        """
+        Calculate the skipped bars up to the current one
+        """
+        self._catch_up(min(int(lib.bar_index) + 1, self._size))
+
+    def update_open_trades(self):
+        self.sync()
+        super().update_open_trades()
+
+    def process_orders(self):
+        """ Process orders, the bars without pending orders are skipped """
+        bar_index = int(lib.bar_index)
+        if not self.orders and bar_index < self._size:
+            if self.new_closed_trades:
+                self.new_closed_trades.clear()
+            # The results must be complete after the last bar
+            if bar_index == self._size - 1:
+                self._catch_up(bar_index + 1)
+            return
+
+        self._catch_up(min(bar_index, self._size))
+        self._done = bar_index + 1
+        super().process_orders()
+
+    #
+    # Vectorized processing
+    #
+
+    def _catch_up(self, end: int):
+        """
+        Process the skipped bars before `end`. They have no pending orders, so the open trades, the
+        size and the average price are the same on all of them. The calculations are the same as in
+        `Position.process_orders`, with the same operations in the same order, so the results are the
+        same too.
+
+        :param end: The index of the first bar, which should not be processed
+        """
+        start = self._done
+        if start >= end:
+            return
+        self._done = end
+
+        assert lib._script is not None
+        np = _import_numpy()
+        opens, highs, lows, closes, periods = (array[start:end] for array in self._get_arrays())
+        self.o, self.h, self.l, self.c = float(opens[-1]), float(highs[-1]), float(lows[-1]), float(closes[-1])
+        self.drawdown_summ = self.runup_summ = 0.0
+        self.new_closed_trades.clear()
+
+        equity_base = lib._script.initial_capital + self.netprofit
+        if self.open_trades:
+            openprofits = self.size * (closes - self.avg_price)
+            self.openprofit = float(openprofits[-1])
+            equities = equity_base + openprofits
+
+            # The per-trade values are updated lazily, from the extremes of the bars
+            high = float(highs.max())
+            low = float(lows.min())
+            if self._pending:
+                self._pending_high = max(self._pending_high, high)
+                self._pending_low = min(self._pending_low, low)
+            else:
+                self._pending = True
+                self._pending_high = high
+                self._pending_low = low
+            self._pending_close = self.c
+
+            drawdowns, runups = self._open_drawdowns_runups(np, highs, lows)
+            self.drawdown_summ = float(drawdowns[-1])
+            self.runup_summ = float(runups[-1])
+            changed = (drawdowns != 0.0) | (runups != 0.0)
+            if changed.any():
+                self.max_drawdown = max(self.max_drawdown, float(
+                    ((self.max_equity - self.entry_equity) + drawdowns[changed]).max()))
+                self.max_runup = max(self.max_runup, float(
+                    ((self.entry_equity - self.min_equity) + runups[changed]).max()))
+        else:
+            equities = np.full(end - start, equity_base + self.openprofit)
+
+        # Only the first and the last bars of the months change the statistics
+        changes = np.flatnonzero(periods[1:] != periods[:-1])
+        indices = np.unique(np.concatenate(((0, len(periods) - 1), changes, changes + 1)))
+        add_equity = self.stats.add_equity
+        for period, equity in zip(periods[indices].tolist(), equities[indices].tolist()):
+            add_equity(period, equity)
+
+    def _open_drawdowns_runups(self, np, highs: np.ndarray, lows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        The sums of the drawdowns and runups of the open trades on the bars, see `_open_drawdown_runup`
+        """
+        ratios, size_sums, commission_sums = (np.array(values, dtype=np.float64)
+                                              for values in self._open_trade_index())
+        if self.sign > 0.0:
+            worst = lows - self.avg_price
+            best = highs - self.avg_price
+        else:
+            worst = self.avg_price - highs
+            best = self.avg_price - lows
+
+        i = np.searchsorted(ratios, worst, side='right')
+        drawdowns = commission_sums[i] - size_sums[i] * worst
+        i = np.searchsorted(ratios, best, side='left')
+        runups = (size_sums[0] - size_sums[i]) * best - (commission_sums[0] - commission_sums[i])
+        # The sums start from zero, it makes negative zeros positive
+        return 0.0 + np.maximum(drawdowns, 0.0), 0.0 + np.maximum(runups, 0.0)
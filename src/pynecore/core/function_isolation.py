@@ -1,53 +1,221 @@
 from typing import Callable, cast, Any
-from types import FunctionType
+from types import FunctionType, CodeType, MethodType
 from collections import defaultdict
 from dataclasses import is_dataclass, replace as dataclass_replace
 from copy import copy
 from .pine_export import Exported
 
-__all__ = ['isolate_function', 'reset', 'reset_step']
+__all__ = ['isolate_function', 'reset', 'reset_step', 'register_precomputed', 'get_state', 'restore_state',
+           'get_instance_globals', 'set_instance_hook', 'get_shared']
 
 # Store all function instances
 _function_cache: dict[str, FunctionType] = {}
 _call_counters = defaultdict(int)
+# Precomputed functions by full call ID, used in precompute mode
+_precomputed: dict[str, Callable] = {}
+# Names of inner functions, which are read from the globals of the outer function
+_outer_names: dict[CodeType, tuple[str, ...]] = {}
+# Saved isolated globals by full call ID, they are applied when the instance is created (resume from checkpoint)
+_restored: dict[str, dict[str, Any]] = {}
+# Called with the globals and the isolated names of every new instance (realtime state journal)
+_instance_hook: Callable[[dict[str, Any], set[str]], None] | None = None
+# Objects shared by the function instances of a run by key (e.g. higher timeframe bars of `request.security`)
+_shared: dict[str, Any] = {}
+# The key of shared objects in the saved state, it can't be a scope ID
+_SHARED_STATE_KEY = '__shared__'
+
+
+class _CallSite:
+    """
+    Function instances of a call site (slot) in a parent scope
+    """
+
+    __slots__ = ('call_id', 'step', 'count', 'first', 'instances')
+
+    def __init__(self, call_id: str):
+        self.call_id = call_id
+        # The step of the last call and the number of calls in that step
+        self.step = -1
+        self.count = 0
+        # The instance of the first call of a step, if it can be returned as is
+        self.first: Callable | None = None
+        # All instances by call number (minus one)
+        self.instances: list[Callable | None] = []
+
+
+# Call sites by parent scope and slot, slots are assigned by FunctionIsolationTransformer
+_call_sites: dict[str, list[_CallSite | None]] = {}
+# Step (bar) counter, it replaces clearing of call counters of call sites
+_step = 0
 
 
 def reset():
     """
     Reset all function instances and call counters
     """
+    global _step, _instance_hook
     _function_cache.clear()
     _call_counters.clear()
+    _call_sites.clear()
+    _precomputed.clear()
+    _outer_names.clear()
+    _restored.clear()
+    _shared.clear()
+    _instance_hook = None
+    _step = 0
+
+
+def register_precomputed(call_id: str, func: Callable):
+    """
+    Register a function, which is returned instead of the isolated function for the given call
+
+    :param call_id: The full call ID (with parent scope and call counter)
+    :param func: The function which returns the precomputed value
+    """
+    _precomputed[call_id] = func
+
+
+def get_shared(key: str, factory: Callable[[], Any]) -> Any:
+    """
+    Get an object, which is shared by the function instances of a run. It is created at first use
+    and dropped by `reset`.
+
+    :param key: The key of the object
+    :param factory: Function to create the object if it does not exist yet
+    :return: The shared object
+    """
+    try:
+        return _shared[key]
+    except KeyError:
+        obj = _shared[key] = factory()
+        return obj
+
+
+def get_instance_globals() -> list[tuple[dict[str, Any], set[str]]]:
+    """
+    Get the globals of all function instances with their isolated (persistent and series) names
+
+    :return: List of the globals and the isolated names of the instances
+    """
+    instances = list(_function_cache.values())
+    for sites in _call_sites.values():
+        for site in sites:
+            if site is not None:
+                instances.extend(site.instances)
+
+    result = []
+    seen = set()
+    for instance in instances:
+        try:
+            instance_globals = instance.__globals__  # type: ignore
+        except AttributeError:  # Not isolated (e.g. precomputed)
+            continue
+        if '__scope_id__' not in instance_globals or id(instance_globals) in seen:
+            continue
+        seen.add(id(instance_globals))
+        qualname = instance.__qualname__.replace('<locals>.', '')
+        result.append((instance_globals, _isolated_names(instance_globals, qualname)))
+    return result
+
+
+def set_instance_hook(hook: Callable[[dict[str, Any], set[str]], None] | None):
+    """
+    Set a function, which is called with the globals and the isolated names of every new function
+    instance, before the instance is called first
+
+    :param hook: The function or None to remove the hook
+    """
+    global _instance_hook
+    _instance_hook = hook
+
+
+def get_state() -> dict[str, dict[str, Any]]:
+    """
+    Get the isolated persistent and series globals of all function instances and the shared objects
+
+    :return: The isolated globals by the full call ID (scope) of the instances
+    """
+    state = {}
+    for instance_globals, names in get_instance_globals():
+        state[instance_globals['__scope_id__']] = {key: instance_globals[key] for key in names
+                                                   if key in instance_globals}
+    # Instances which are not created since the state was restored
+    for scope, values in _restored.items():
+        state.setdefault(scope, values)
+    if _shared:
+        state[_SHARED_STATE_KEY] = dict(_shared)
+    return state
+
+
+def restore_state(state: dict[str, dict[str, Any]]):
+    """
+    Restore the isolated globals of function instances and the shared objects, saved by `get_state`.
+    The globals are applied when the instances are created, because the full call IDs are the same in
+    every run of the same script. It should be called after `reset`.
+
+    :param state: The isolated globals by the full call ID (scope) of the instances
+    """
+    _restored.clear()
+    _restored.update(state)
+    _shared.clear()
+    _shared.update(_restored.pop(_SHARED_STATE_KEY, {}))
 
 
 def reset_step():
     """
     Reset the call counters for the last bar index
     """
+    global _step
+    _step += 1
     _call_counters.clear()
 
 
-def isolate_function(func: FunctionType | Callable, call_id: str | None = None, parent_scope: str = "") -> Callable:
+def isolate_function(func: FunctionType | Callable, call_id: str | None = None, parent_scope: str = "",
+                     slot: int = -1) -> Callable:
     """
     Create a new function instance with isolated globals if the function has persistent or series globals.
 
     :param func: The function to create an instance of
     :param call_id: The unique call ID
     :param parent_scope: The parent scope ID
+    :param slot: The call site slot, it is unique in the module, assigned at compile time.
+                 If it is given, the full call ID is created only when the instance is created.
     :return: The new function instance if there are any persistent or series globals otherwise the original function
     """
     # If there is no call ID, return the function as is
     if call_id is None:
         return func
 
+    # Fast path: call sites with slots, the first call of a site in a step is just a few lookups
+    if slot >= 0:
+        try:
+            site = _call_sites[parent_scope][slot]
+            if site.call_id is call_id:
+                if site.step != _step:
+                    site.step = _step
+                    site.count = 1
+                    if site.first is not None:
+                        return site.first
+                else:
+                    site.count += 1
+                return _isolate_call_site(site, func, parent_scope)
+        except (KeyError, IndexError, AttributeError):
+            pass
+        site = _new_call_site(parent_scope, slot, call_id)
+        if site is not None:
+            site.step = _step
+            site.count = 1
+            return _isolate_call_site(site, func, parent_scope)
+
     # Check if this is an Exported proxy and unwrap it
     if isinstance(func, Exported):
         func = func.__fn__
         if func is None:
-            raise ValueError("Exported proxy has not been initialized with a function yet")        
+            raise ValueError("Exported proxy has not been initialized with a function yet")
 
-    # If it is a type object, return it as is
-    if isinstance(func, type):
+    # If it is a type object or a bound method, return it as is, methods can't be isolated without
+    # their instance
+    if isinstance(func, (type, MethodType)):
         return func  # type: ignore
 
     # If it is an overloaded function, returned by the dispatcher
@@ -63,6 +231,13 @@ def isolate_function(func: FunctionType | Callable, call_id: str | None = None,
         # Append the call counter to the call ID
         call_id = f"{call_id}#{_call_counters[call_id]}"
 
+        # In precompute mode the result is already calculated
+        if _precomputed:
+            try:
+                return _precomputed[call_id]
+            except KeyError:
+                pass
+
     else:
         call_id = parent_scope
 
@@ -79,42 +254,167 @@ def isolate_function(func: FunctionType | Callable, call_id: str | None = None,
 
         # We need to create new instance in every run only if the function is inside the main function
         if '.' in qualname:
-            # The values may have changed in the original globals
-            new_globals = dict(func.__globals__)
-
-            # We need to copy the persistent and series variables from the isolated globals
-            old_globals = isolated_function.__globals__
-            try:
-                for key in new_globals['__persistent_function_vars__'][qualname]:
-                    new_globals[key] = old_globals[key]
-            except KeyError:
-                pass
-            try:
-                for key in new_globals['__series_function_vars__'][qualname]:
-                    new_globals[key] = old_globals[key]
-            except KeyError:
-                pass
-            # Copy the __scope_id__ from the old globals to the new globals to keep scope chain
-            new_globals['__scope_id__'] = old_globals['__scope_id__']
-
-            # Create a new function with original closure and isolated globals
-            isolated_function = FunctionType(
-                func.__code__,
-                new_globals,
-                func.__name__,
-                func.__defaults__,
-                func.__closure__
-            )
+            isolated_function = _renew_inner_function(func, qualname, isolated_function)
             _function_cache[call_id] = isolated_function
 
         return isolated_function
     except KeyError:
         pass
 
+    isolated_function = _create_instance(func, qualname, call_id)
+    if isolated_function is not func:
+        _function_cache[call_id] = isolated_function
+    return isolated_function
+
+
+def _new_call_site(parent_scope: str, slot: int, call_id: str) -> _CallSite | None:
+    """
+    Create and register a call site
+
+    :return: The new call site or None if the slot is used by another call ID (it should not happen)
+    """
+    try:
+        sites = _call_sites[parent_scope]
+    except KeyError:
+        sites = _call_sites[parent_scope] = []
+    if slot >= len(sites):
+        sites.extend([None] * (slot + 1 - len(sites)))
+    elif sites[slot] is not None:
+        return None
+    site = sites[slot] = _CallSite(call_id)
+    return site
+
+
+def _isolate_call_site(site: _CallSite, func: FunctionType | Callable, parent_scope: str) -> Callable:
+    """
+    Get or create the function instance for the current call of a call site
+    """
+    # Check if this is an Exported proxy and unwrap it
+    if isinstance(func, Exported):
+        func = func.__fn__
+        if func is None:
+            raise ValueError("Exported proxy has not been initialized with a function yet")
+
+    # If it is a type object or a bound method, return it as is, methods can't be isolated without
+    # their instance
+    if isinstance(func, (type, MethodType)):
+        return func  # type: ignore
+
+    index = site.count - 1
+    instances = site.instances
+
+    # The qualified name of the function, this name is used in the globals registry by transformer
+    qualname = func.__qualname__.replace('<locals>.', '')
+
+    if index < len(instances) and instances[index] is not None:
+        isolated_function = instances[index]
+        # We need to create new instance in every run only if the function is inside the main function
+        if '.' in qualname:
+            isolated_function = instances[index] = _renew_inner_function(func, qualname, isolated_function)
+        return isolated_function
+
+    # The full call ID is needed only for new instances, it is the scope of the instance
+    call_id = f"{parent_scope}->{site.call_id}#{site.count}"
+
+    # In precompute mode the result is already calculated
+    try:
+        isolated_function = _precomputed[call_id]
+    except KeyError:
+        isolated_function = _create_instance(func, qualname, call_id)
+        # Builtins are not isolated, the function may be different in every call
+        if isolated_function is func:
+            return func
+
+    if index < len(instances):
+        instances[index] = isolated_function
+    else:
+        instances.extend([None] * (index - len(instances)))
+        instances.append(isolated_function)
+    if index == 0 and '.' not in qualname:
+        site.first = isolated_function
+    return isolated_function
+
+
+def _renew_inner_function(func: FunctionType, qualname: str, isolated_function: FunctionType) -> FunctionType:
+    """
+    Create a new instance of an inner function (it is recreated on every run of the outer function)
+
+    The isolated globals of the old instance are reused, so the persistent and series variables are kept
+    without copying. Only the names which the function reads from the outer globals (e.g. persistent
+    variables of the outer function) are updated.
+    """
+    isolated_globals = isolated_function.__globals__
+    outer_globals = func.__globals__
+
+    try:
+        names = _outer_names[func.__code__]
+    except KeyError:
+        names = _outer_names[func.__code__] = _collect_outer_names(func, qualname)
+
+    # The values may have changed in the outer globals, and globals may be created after the first call
+    for key in names:
+        if key in outer_globals:
+            isolated_globals[key] = outer_globals[key]
+
+    # Create a new function with the new closure and the isolated globals
+    return FunctionType(
+        func.__code__,
+        isolated_globals,
+        func.__name__,
+        func.__defaults__,
+        func.__closure__
+    )
+
+
+def _collect_outer_names(func: FunctionType, qualname: str) -> tuple[str, ...]:
+    """
+    Collect the global names used by the function (and its inner functions), except the isolated ones.
+    The names are not filtered by the current outer globals, because they may be created later.
+    """
+    outer_globals = func.__globals__
+
+    # Isolated names, the same way as `_create_instance` isolates them
+    isolated = _isolated_names(outer_globals, qualname)
+    isolated.add('__scope_id__')
+
+    names = set()
+    codes = [func.__code__]
+    while codes:
+        code = codes.pop()
+        names.update(code.co_names)
+        codes.extend(const for const in code.co_consts if isinstance(const, CodeType))
+
+    return tuple(name for name in names if name not in isolated)
+
+
+def _isolated_names(func_globals: dict[str, Any], qualname: str) -> set[str]:
+    """
+    Names of the persistent and series globals, which are isolated in the instances of the function
+    """
+    isolated = set()
+    registry_found = False
+    for registry_name in ('__persistent_function_vars__', '__series_function_vars__'):
+        try:
+            isolated.update(func_globals[registry_name].get(qualname, ()))
+            registry_found = True
+        except KeyError:
+            pass
+    if not registry_found:
+        isolated.update(key for key in func_globals
+                        if key.startswith(('__persistent_', '__series_')) and not key.endswith('_vars__'))
+    return isolated
+
+
+def _create_instance(func: FunctionType | Callable, qualname: str, call_id: str) -> Callable:
+    """
+    Create a new function instance with isolated persistent and series globals
+
+    :return: The new function instance or the original function if it is a builtin
+    """
     # Builtin objects have no __globals__ attribute
     try:
         new_globals = dict(func.__globals__)
-    except AttributeError as e:  # This is a builtin function (it should be filtered in the transformer)
+    except AttributeError:  # This is a builtin function (it should be filtered in the transformer)
         return func
 
     # If globals are registered, we can use them
@@ -166,14 +466,21 @@ def isolate_function(func: FunctionType | Callable, call_id: str | None = None,
 
     new_globals['__scope_id__'] = call_id
 
+    # Continue from the saved state
+    if _restored:
+        try:
+            new_globals.update(_restored.pop(call_id))
+        except KeyError:
+            pass
+
+    if _instance_hook is not None:
+        _instance_hook(new_globals, _isolated_names(new_globals, qualname))
+
     # Create a new function with new closure and globals
-    isolated_function = FunctionType(
+    return FunctionType(
         func.__code__,
         new_globals,
         func.__name__,
         func.__defaults__,
         func.__closure__
     )
-
-    _function_cache[call_id] = isolated_function
-    return isolated_function
@@ -1,34 +1,137 @@
 from typing import cast
+from types import CodeType
 import os
 import sys
 import ast
+import hashlib
+import marshal
 import importlib.util
 import importlib.machinery
 import re
 from pathlib import Path
 
+__all__ = ['PyneLoader', 'PyneImportHook', 'precompile']
+
+# Format version of the compiled script cache files
+CACHE_MAGIC = b'PYNE\x01'
+
+# Files of pynecore the transformed code depends on (relative to the package directory, with subpackages)
+PIPELINE_FILES = ('core/import_hook.py', 'core/precompute.py', 'core/series.py', 'core/overload.py',
+                  'lib/**/*.py', 'transformers/**/*.py', 'transformers/**/*.json')
+
+_PYNE_PATTERN = re.compile(rb'@pyne\b')
+
+# Hash of the transformer pipeline, it is calculated only once
+_pipeline_hash: bytes | None = None
+
+
+def _get_pipeline_hash() -> bytes:
+    """
+    Get the hash of everything the transformed code depends on besides the script source:
+    the Python bytecode version and the sources of the transformer pipeline and of the library (with
+    its subpackages, e.g. `lib/strategy`). The package version is not used, because `importlib.metadata`
+    is slow to import, and the sources change with the version.
+    """
+    global _pipeline_hash
+    if _pipeline_hash is None:
+        h = hashlib.sha256(importlib.util.MAGIC_NUMBER)
+        for file_path in _get_pipeline_files():
+            h.update(file_path.read_bytes())
+        _pipeline_hash = h.digest()
+    return _pipeline_hash
+
+
+def _get_pipeline_files() -> list[Path]:
+    """
+    Get the paths of the files in `PIPELINE_FILES`, in a stable order
+    """
+    package_dir = Path(__file__).parent.parent
+    return [file_path for pattern in PIPELINE_FILES for file_path in sorted(package_dir.glob(pattern))]
+
+
+def _get_cache_path(path: str) -> Path:
+    """
+    Get the path of the compiled script cache file, it is next to the normal bytecode cache file
+    """
+    pyc_path = Path(importlib.util.cache_from_source(path))
+    return pyc_path.with_name(f'{pyc_path.stem}.pyne.pyc')
+
+
+def _write_cache(cache_path: Path, data: bytes) -> None:
+    """
+    Write the cache file atomically, errors are ignored (e.g. read-only site-packages)
+    """
+    tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
 
 class PyneLoader(importlib.machinery.SourceFileLoader):
     """Loader that handles AST transformation"""
 
+    def get_code(self, fullname: str) -> CodeType | None:
+        """
+        Get the code object of the module.
+
+        The normal bytecode cache is only valid until the source changes, it does not know about
+        the transformers. So Pyne modules use their own cache, which is keyed by the hash of the
+        source, the module path and the transformer pipeline (see `_get_pipeline_hash`).
+        """
+        source_path = self.get_filename(fullname)
+        try:
+            data = self.get_data(source_path)
+        except OSError:
+            return super().get_code(fullname)
+
+        if not _PYNE_PATTERN.search(data):
+            return super().get_code(fullname)
+
+        # Debug outputs need the transformation to run
+        if os.environ.get('PYNE_AST_DEBUG') or os.environ.get('PYNE_AST_DEBUG_RAW') or os.environ.get('PYNE_AST_SAVE'):
+            return self.source_to_code(data, source_path)
+
+        return self._get_cached_code(source_path, data, write=not sys.dont_write_bytecode)
+
+    def _get_cached_code(self, source_path: str, data: bytes, write: bool) -> CodeType:
+        """
+        Get the code object from the compiled script cache, or transform and compile the source
+
+        :param source_path: The path of the source file
+        :param data: The source
+        :param write: Write the cache file if it is missing or outdated
+        :return: The code object
+        """
+        h = hashlib.sha256(_get_pipeline_hash())
+        h.update(str(Path(source_path).resolve()).encode())
+        h.update(b'\0')
+        h.update(data)
+        header = CACHE_MAGIC + h.digest()
+
+        cache_path = _get_cache_path(source_path)
+        try:
+            cached = cache_path.read_bytes()
+            if cached.startswith(header):
+                return marshal.loads(memoryview(cached)[len(header):])
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        code = self.source_to_code(data, source_path)
+        if write:
+            _write_cache(cache_path, header + marshal.dumps(code))
+        return code
+
     # noinspection PyMethodOverriding
     def source_to_code(self, data: bytes | str, path: str, *, _optimize: int = -1):
         """Transform source to code if needed"""
         path = Path(path)
 
-        # Create marker file for pynecore site-packages to indicate we processed this file
-        if '/site-packages/' in str(path) and '/pynecore/' in str(path):
-            cache_dir = path.parent / '__pycache__'
-            pyc_name = f'{path.stem}.cpython-{sys.version_info.major}{sys.version_info.minor}'
-            marker_path = cache_dir / f'{pyc_name}.pyne'
-            try:
-                cache_dir.mkdir(exist_ok=True)
-                # Write the .py file's mtime to the marker
-                py_mtime = str(path.stat().st_mtime)
-                marker_path.write_text(py_mtime)
-            except (OSError, PermissionError):
-                pass  # Ignore if we can't create marker
-
         # Fast check for @pyne decorator before parsing AST
         # data is bytes, need to convert to string for regex
         data_str = data.decode('utf-8') if isinstance(data, bytes) else data
@@ -55,27 +158,8 @@ class PyneLoader(importlib.machinery.SourceFileLoader):
                                         and node.name.startswith('__test_') and node.name.endswith('__'))]
 
             # Transform AST - lazy import transformers only when needed
-            from pynecore.transformers.import_lifter import ImportLifterTransformer
-            from pynecore.transformers.import_normalizer import ImportNormalizerTransformer
-            from pynecore.transformers.persistent_series import PersistentSeriesTransformer
-            from pynecore.transformers.lib_series import LibrarySeriesTransformer
-            from pynecore.transformers.function_isolation import FunctionIsolationTransformer
-            from pynecore.transformers.module_property import ModulePropertyTransformer
-            from pynecore.transformers.series import SeriesTransformer
-            from pynecore.transformers.persistent import PersistentTransformer
-            from pynecore.transformers.input_transformer import InputTransformer
-            from pynecore.transformers.safe_convert_transformer import SafeConvertTransformer
-
-            transformed = ImportLifterTransformer().visit(transformed)
-            transformed = ImportNormalizerTransformer().visit(transformed)
-            transformed = PersistentSeriesTransformer().visit(transformed)
-            transformed = LibrarySeriesTransformer().visit(transformed)
-            transformed = FunctionIsolationTransformer().visit(transformed)
-            transformed = ModulePropertyTransformer().visit(transformed)
-            transformed = SeriesTransformer().visit(transformed)
-            transformed = PersistentTransformer().visit(transformed)
-            transformed = InputTransformer().visit(transformed)
-            transformed = SafeConvertTransformer().visit(transformed)
+            from pynecore.transformers.pipeline import transform
+            transformed = transform(transformed)
 
             ast.fix_missing_locations(transformed)
 
@@ -131,40 +215,6 @@ class PyneImportHook:
 
             for py_path in candidates:
                 if py_path.exists():
-                    # Check if pynecore site-packages bytecode needs recompilation
-                    if '/site-packages/' in str(py_path) and '/pynecore/' in str(py_path):
-                        cache_dir = py_path.parent / '__pycache__'
-                        pyc_name = f'{py_path.stem}.cpython-{sys.version_info.major}{sys.version_info.minor}'
-                        pyc_path = cache_dir / f'{pyc_name}.pyc'
-                        marker_path = cache_dir / f'{pyc_name}.pyne'
-
-                        need_recompile = False
-                        
-                        if pyc_path.exists():
-                            if not marker_path.exists():
-                                # No marker - definitely need recompile
-                                need_recompile = True
-                            else:
-                                # Check if marker has the correct py mtime
-                                try:
-                                    stored_mtime = marker_path.read_text().strip()
-                                    current_mtime = str(py_path.stat().st_mtime)
-                                    if stored_mtime != current_mtime:
-                                        # .py file changed - need recompile
-                                        need_recompile = True
-                                except (OSError, ValueError):
-                                    # Can't read marker or invalid content - need recompile
-                                    need_recompile = True
-                        
-                        if need_recompile:
-                            # Force recompile by removing the old bytecode
-                            try:
-                                pyc_path.unlink()
-                                if marker_path.exists():
-                                    marker_path.unlink()  # Also remove old marker
-                            except (OSError, PermissionError):
-                                pass  # Ignore if we can't delete
-
                     return importlib.util.spec_from_file_location(
                         fullname,
                         py_path,
@@ -173,5 +223,22 @@ class PyneImportHook:
         return None
 
 
+def precompile(path: Path) -> bool:
+    """
+    Transform and compile a Pyne script into the compiled script cache without running it
+
+    :param path: The path of the script
+    :return: True if the file is a Pyne script, False otherwise
+    """
+    loader = PyneLoader(path.stem, str(path))
+    data = loader.get_data(str(path))
+    if not _PYNE_PATTERN.search(data):
+        return False
+    # It is an explicit request, so it is written even if writing bytecode is disabled
+    # noinspection PyProtectedMember
+    loader._get_cached_code(str(path), data, write=True)
+    return True
+
+
 # Install the import hook
 sys.meta_path.insert(0, PyneImportHook())
@@ -0,0 +1,205 @@
+"""
+Run many scripts in one pass over the same bars
+
+Scripts on the same symbol and timeframe share everything which depends only on the bar: the data is
+read once and the lib properties (prices, time) are set once per bar, then the `main` of every script
+runs with its own script object and plot data. Function instances don't need to be swapped, because
+their scopes start with the scope ID of the script module, which is unique per script file.
+"""
+from typing import Iterable, Iterator, Callable, Any
+from pathlib import Path
+from datetime import datetime
+
+from pynecore.types.ohlcv import OHLCV
+from pynecore.core.syminfo import SymInfo
+from pynecore.core.script_runner import ScriptRunner, _set_lib_properties, _set_lib_syminfo_properties
+
+from pynecore.types import script_type
+
+__all__ = ['MultiScriptRunner']
+
+
+class MultiScriptRunner:
+    """
+    Run many scripts on the same data in one pass over the bars
+    """
+
+    __slots__ = ('runners', 'ohlcv_iter', 'syminfo', 'tz', 'bar_index', 'last_bar_index', 'precompute')
+
+    def __init__(self, ohlcv_iter: Iterable[OHLCV], syminfo: SymInfo, *,
+                 last_bar_index=0, precompute: bool = False):
+        """
+        Initialize the runner, scripts are added by `add_script`
+
+        :param ohlcv_iter: Iterator of OHLCV data
+        :param syminfo: Symbol information
+        :param last_bar_index: Last bar index, the index of the last bar of the historical data
+        :param precompute: Precompute bar-invariant ta calls of all scripts in a vectorized way before running,
+                           `ohlcv_iter` must be an `OHLCVColumns` object (needs NumPy)
+        """
+        # noinspection PyProtectedMember
+        from ..lib import _parse_timezone
+
+        self.runners: list[ScriptRunner] = []
+        self.ohlcv_iter = ohlcv_iter
+        self.syminfo = syminfo
+        self.last_bar_index = last_bar_index
+        self.precompute = precompute
+        self.bar_index = 0
+        self.tz = _parse_timezone(syminfo.timezone)
+
+    def add_script(self, script_path: Path, *, plot_path: Path | None = None, strat_path: Path | None = None,
+                   equity_path: Path | None = None) -> ScriptRunner:
+        """
+        Import a script and add it to the runner, scripts run in the order they are added
+
+        :param script_path: The path to the script to run
+        :param plot_path: Path to save the plot data of the script
+        :param strat_path: Path to save the strategy results of the script
+        :param equity_path: Path to save the equity data of the script
+        :return: The runner of the script, it can be used to set inputs and to get the results
+        :raises ValueError: If the script is already added (a module can be imported only once)
+        :raises ImportError: If the script does not have a 'main' function
+        :raises ImportError: If the 'main' function is not decorated with @script.[indicator|strategy|library]
+        :raises OSError: If the plot file could not be opened
+        """
+        runner = ScriptRunner(script_path, (), self.syminfo, plot_path=plot_path, strat_path=strat_path,
+                              equity_path=equity_path, last_bar_index=self.last_bar_index)
+        if any(r.script_module is runner.script_module for r in self.runners):
+            raise ValueError(f"Script '{script_path}' is already added!")
+        self.runners.append(runner)
+        return runner
+
+    # noinspection PyProtectedMember
+    def run_iter(self, on_progress: Callable[[datetime], None] | None = None) \
+            -> Iterator[tuple[OHLCV, list[dict[str, Any]]]]:
+        """
+        Run all scripts on the data
+
+        :param on_progress: Callback to call on every iteration
+        :return: The bar and the plot data of every script (in the order of `runners`), the dictionaries
+                 are reused, they are cleared after the next bar is started
+        :raises AssertionError: If a 'main' function does not return a dictionary
+        :raises ValueError: If precompute mode is enabled, but the data is not columnar
+        """
+        from .. import lib
+        from ..lib import _parse_timezone, barstate
+        from pynecore.core import function_isolation
+        from . import script
+
+        runners = self.runners
+        # Script module, script, plot data, position (strategies only) and equity writer of every script
+        scripts = []
+        for runner in runners:
+            position = runner.script.position if runner.script.script_type == script_type.strategy else None
+            scripts.append((runner.script_module.main, runner.script, {}, position,
+                            runner.equity_writer if position is not None else None))
+        plot_data = [plot for _, _, plot, _, _ in scripts]
+        trade_nums = [0] * len(runners)
+
+        self.bar_index = 0
+        function_isolation.reset()
+
+        # Precompute bar-invariant ta calls on the whole data, call IDs are unique per script
+        if self.precompute:
+            from .ohlcv_columns import OHLCVColumns
+            from .precompute import precompute_calls
+            if not isinstance(self.ohlcv_iter, OHLCVColumns):
+                raise ValueError("Precompute mode needs columnar data (OHLCVColumns)!")
+            for runner in runners:
+                precompute_calls(runner.script_module, self.ohlcv_iter)
+
+        _set_lib_syminfo_properties(self.syminfo, lib)
+        self.tz = tz = _parse_timezone(lib.syminfo.timezone)
+
+        for runner in runners:
+            runner.bar_index = 0
+            if runner.plot_writer:
+                runner.plot_writer.open()
+            if runner.equity_writer and runner.script.script_type == script_type.strategy:
+                runner.equity_writer.open()
+
+        # Every script has its own script object and plot data, the originals are restored after the run
+        original_script, original_plot_data = lib._script, lib._plot_data
+
+        try:
+            for candle in self.ohlcv_iter:
+                if self.bar_index == self.last_bar_index:
+                    barstate.islast = True
+
+                # Lib properties are the same for all scripts
+                _set_lib_properties(candle, self.bar_index, tz, lib)
+                function_isolation.reset_step()
+
+                # Library main functions run once per bar, libraries are shared by the scripts
+                lib._lib_semaphore = True
+                for library_title, main_func in script._registered_libraries:
+                    main_func()
+                lib._lib_semaphore = False
+
+                for i, (main, script_obj, plot, position, equity_writer) in enumerate(scripts):
+                    lib._script = script_obj
+                    lib._plot_data = plot
+                    plot.clear()
+
+                    if position:
+                        position.process_orders()
+
+                    res = main()
+                    if res is not None:
+                        assert isinstance(res, dict), "The 'main' function must return a dictionary!"
+                        plot.update(res)
+
+                    runner = runners[i]
+                    if runner.plot_writer and plot:
+                        runner._write_plot(candle, plot)
+                    if equity_writer and position.new_closed_trades:
+                        trade_nums[i] = runner._write_trades(position.new_closed_trades, trade_nums[i])
+
+                yield candle, plot_data
+
+                if on_progress:
+                    assert lib._datetime is not None
+                    on_progress(lib._datetime.replace(tzinfo=None))
+
+                self.bar_index += 1
+                barstate.isfirst = False
+
+            for runner in runners:
+                if runner.strat_writer and runner.script.position:
+                    runner._write_report()
+
+            if on_progress:
+                on_progress(datetime.max)
+
+        except GeneratorExit:
+            pass
+        finally:
+            lib._script = original_script
+            lib._plot_data = original_plot_data
+            lib._plot_data.clear()
+            for i, runner in enumerate(runners):
+                runner.bar_index = self.bar_index
+                runner._trade_num = trade_nums[i]
+                if runner.plot_writer:
+                    runner.plot_writer.close()
+                if runner.equity_writer:
+                    runner.equity_writer.close()
+
+    def reset(self):
+        """
+        Reset the state of all scripts, so they can be run again without re-importing them
+        """
+        for runner in self.runners:
+            runner.reset()
+        self.bar_index = 0
+
+    def run(self, on_progress: Callable[[datetime], None] | None = None):
+        """
+        Run all scripts on the data
+
+        :param on_progress: Callback to call on every iteration
+        :raises AssertionError: If a 'main' function does not return a dictionary
+        """
+        for _ in self.run_iter(on_progress=on_progress):
+            pass
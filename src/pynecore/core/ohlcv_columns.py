@@ -0,0 +1,227 @@
+"""
+Columnar in-memory OHLCV data
+
+The whole (or a part of an) .ohlcv file is decoded at once into NumPy arrays, one array per field.
+It is much faster than decoding every record one by one, and it can be used many times, e.g. when
+the same data is used for a lot of backtests. The columns can be put into shared memory, so worker
+processes can use them without copying.
+
+NumPy is an optional dependency, it is needed only if you use this module.
+"""
+from __future__ import annotations
+from typing import Iterator, TYPE_CHECKING
+from pathlib import Path
+
+from pynecore.types.ohlcv import OHLCV
+from .ohlcv_file import OHLCVReader, RECORD_SIZE
+
+if TYPE_CHECKING:
+    import numpy as np
+    from multiprocessing.shared_memory import SharedMemory
+
+__all__ = ['OHLCVColumns']
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+
+def _import_numpy():
+    """
+    Import NumPy with a meaningful error message
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("NumPy is needed for columnar OHLCV data. Please install it using `pip install numpy`.")
+    return numpy
+
+
+class OHLCVColumns:
+    """
+    OHLCV data as NumPy arrays. Timestamps are int64 arrays, prices and volume are float64 arrays.
+
+    It can be used as `ohlcv_iter` of `ScriptRunner`, it can be iterated many times.
+    """
+
+    __slots__ = ('timestamp', 'open', 'high', 'low', 'close', 'volume', '_shm', '_shm_owner')
+
+    def __init__(self, timestamp: np.ndarray, open: np.ndarray, high: np.ndarray,  # noqa
+                 low: np.ndarray, close: np.ndarray, volume: np.ndarray):
+        """
+        :param timestamp: Timestamps in seconds
+        :param open: Open prices
+        :param high: High prices
+        :param low: Low prices
+        :param close: Close prices
+        :param volume: Volumes
+        :raises ValueError: If the columns have different lengths
+        """
+        size = len(timestamp)
+        if any(len(col) != size for col in (open, high, low, close, volume)):
+            raise ValueError("All columns must have the same length!")
+
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+        self._shm: SharedMemory | None = None
+        self._shm_owner = False
+
+    @classmethod
+    def from_reader(cls, reader: OHLCVReader, start_timestamp: int | None = None,
+                    end_timestamp: int | None = None, skip_gaps: bool = True) -> OHLCVColumns:
+        """
+        Decode records of an opened reader with a single `np.frombuffer` call
+
+        :param reader: An opened OHLCV reader
+        :param start_timestamp: Start timestamp, if None, read from the first record
+        :param end_timestamp: End timestamp, if None, read until the end
+        :param skip_gaps: Skip gaps (bars with -1 volume) like `OHLCVReader.read_from` does
+        :return: The columns
+        """
+        np = _import_numpy()
+        dtype = np.dtype([(name, '<u4' if name == 'timestamp' else '<f4') for name in COLUMNS])
+        assert dtype.itemsize == RECORD_SIZE
+
+        start_pos, end_pos = reader.get_positions(start_timestamp, end_timestamp)
+        # Only one record, there is no interval to calculate positions, its timestamp is checked instead
+        single = reader.size and not reader.interval
+        if single:
+            start_pos, end_pos = 0, reader.size
+        count = max(end_pos - start_pos, 0)
+
+        # noinspection PyProtectedMember
+        buffer = reader._mmap
+        if buffer is None or not count:
+            records = np.empty(0, dtype=dtype)
+        else:
+            records = np.frombuffer(buffer, dtype=dtype, count=count, offset=start_pos * RECORD_SIZE)
+        if single:
+            if start_timestamp is not None:
+                records = records[records['timestamp'] >= start_timestamp]
+            if end_timestamp is not None:
+                records = records[records['timestamp'] <= end_timestamp]
+        if skip_gaps:
+            records = records[records['volume'] >= 0.0]
+
+        # Copy into contiguous native arrays, so the mmap can be closed after this
+        return cls(*(records[name].astype(np.int64 if name == 'timestamp' else np.float64)
+                     for name in COLUMNS))
+
+    @classmethod
+    def from_file(cls, path: Path | str, start_timestamp: int | None = None,
+                  end_timestamp: int | None = None, skip_gaps: bool = True) -> OHLCVColumns:
+        """
+        Load an .ohlcv file into columns
+
+        :param path: The path of the .ohlcv file
+        :param start_timestamp: Start timestamp, if None, read from the first record
+        :param end_timestamp: End timestamp, if None, read until the end
+        :param skip_gaps: Skip gaps (bars with -1 volume) like `OHLCVReader.read_from` does
+        :return: The columns
+        """
+        with OHLCVReader(str(path)) as reader:
+            return cls.from_reader(reader, start_timestamp, end_timestamp, skip_gaps)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __iter__(self) -> Iterator[OHLCV]:
+        """
+        Iterate over the bars as OHLCV objects
+        """
+        # `tolist()` converts the whole column to Python objects at once, which is much faster than
+        # converting the items one by one
+        for ts, o, h, l, c, v in zip(self.timestamp.tolist(), self.open.tolist(), self.high.tolist(),
+                                     self.low.tolist(), self.close.tolist(), self.volume.tolist()):
+            yield OHLCV(ts, o, h, l, c, v, {})
+
+    def __getitem__(self, index: slice) -> OHLCVColumns:
+        """
+        Get a part of the data, it is a view, so there is no copying
+
+        :param index: The slice of bars
+        :return: The columns of the part
+        """
+        if not isinstance(index, slice):
+            raise TypeError("Only slices are supported, iterate to get OHLCV objects!")
+        return OHLCVColumns(*(getattr(self, name)[index] for name in COLUMNS))
+
+    @property
+    def is_shared(self) -> bool:
+        """
+        True if the columns are in shared memory
+        """
+        return self._shm is not None
+
+    def share(self) -> OHLCVColumns:
+        """
+        Copy the columns into a shared memory block. The returned object can be passed to other
+        processes (e.g. as process pool initializer argument), they will attach to the same memory
+        without copying. The creator process must call `unlink()` when the data is not needed anymore.
+
+        :return: The columns in shared memory
+        """
+        np = _import_numpy()
+        from multiprocessing.shared_memory import SharedMemory
+
+        size = len(self)
+        shm = SharedMemory(create=True, size=max(size * 8 * len(COLUMNS), 1))
+        shared = self._from_buffer(np, shm, size)
+        for name in COLUMNS:
+            getattr(shared, name)[:] = getattr(self, name)
+        shared._shm_owner = True
+        return shared
+
+    @classmethod
+    def attach(cls, name: str, size: int) -> OHLCVColumns:
+        """
+        Attach to columns in an existing shared memory block
+
+        :param name: The name of the shared memory block
+        :param size: The number of bars
+        :return: The columns
+        """
+        np = _import_numpy()
+        from multiprocessing.shared_memory import SharedMemory
+        return cls._from_buffer(np, SharedMemory(name=name), size)
+
+    @classmethod
+    def _from_buffer(cls, np, shm: SharedMemory, size: int) -> OHLCVColumns:
+        """
+        Create column views over a shared memory block
+        """
+        columns = cls(*(np.ndarray((size,), dtype=np.int64 if name == 'timestamp' else np.float64,
+                                   buffer=shm.buf, offset=i * size * 8)
+                        for i, name in enumerate(COLUMNS)))
+        columns._shm = shm
+        return columns
+
+    def __reduce__(self):
+        # Shared columns are pickled by reference, so they are not copied to the other process
+        if self._shm is not None:
+            return OHLCVColumns.attach, (self._shm.name, len(self))
+        return OHLCVColumns, tuple(getattr(self, name) for name in COLUMNS)
+
+    def detach(self):
+        """
+        Detach from the shared memory block, the arrays cannot be used after this
+        """
+        if self._shm is None:
+            return
+        for name in COLUMNS:
+            setattr(self, name, None)
+        self._shm.close()
+        self._shm = None
+
+    def unlink(self):
+        """
+        Detach and free the shared memory block, only the creator should call this
+        """
+        shm = self._shm
+        owner = self._shm_owner
+        self.detach()
+        if shm is not None and owner:
+            shm.unlink()
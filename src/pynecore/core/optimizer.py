@@ -0,0 +1,301 @@
+"""
+Parameter sweep engine for strategies
+
+The script is imported only once per worker process, then it is reset and re-run with different
+input values on the same data. Combinations are distributed between worker processes.
+"""
+from typing import Iterable, Iterator, Callable, Any, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from itertools import product, islice
+from concurrent.futures import Executor, ProcessPoolExecutor, Future, as_completed
+import os
+import random
+
+from .syminfo import SymInfo
+from .script_runner import ScriptRunner
+from .ohlcv_file import OHLCVReader
+from .ohlcv_columns import OHLCVColumns
+
+__all__ = ['OptimizationResult', 'grid_space', 'random_space', 'frange', 'collect_stats', 'optimize']
+
+
+@dataclass(kw_only=True)
+class OptimizationResult:
+    """
+    Result of one input combination
+    """
+    inputs: dict[str, Any]
+    stats: dict[str, float | int] = field(default_factory=dict)
+
+
+def frange(start: float, stop: float, step: float) -> list[float]:
+    """
+    Inclusive float range, useful for building parameter spaces
+
+    :param start: The first value
+    :param stop: The last value (inclusive)
+    :param step: The step between values
+    :return: List of values
+    :raises ValueError: If step is not positive
+    """
+    if step <= 0:
+        raise ValueError("Step must be positive!")
+    count = int(round((stop - start) / step, 9)) + 1
+    return [round(start + i * step, 12) for i in range(max(count, 0))]
+
+
+def grid_space(params: dict[str, Sequence[Any]]) -> Iterator[dict[str, Any]]:
+    """
+    Generate all combinations of the given input values (grid search)
+
+    :param params: Input id -> list of possible values
+    :return: Iterator of input combinations
+    """
+    names = list(params.keys())
+    for values in product(*(params[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def random_space(params: dict[str, Sequence[Any]], samples: int,
+                 seed: int | None = None) -> Iterator[dict[str, Any]]:
+    """
+    Generate random unique combinations of the given input values (random search)
+
+    :param params: Input id -> list of possible values
+    :param samples: Number of combinations to generate, if it is more than the number of
+                    possible combinations, all combinations are generated
+    :param seed: Random seed for reproducible results
+    :return: Iterator of input combinations
+    """
+    rnd = random.Random(seed)
+    names = list(params.keys())
+    sizes = [len(params[name]) for name in names]
+    total = 1
+    for size in sizes:
+        total *= size
+    samples = min(samples, total)
+
+    seen: set[tuple[int, ...]] = set()
+    while len(seen) < samples:
+        indices = tuple(rnd.randrange(size) for size in sizes)
+        if indices in seen:
+            continue
+        seen.add(indices)
+        yield {name: params[name][i] for name, i in zip(names, indices)}
+
+
+def collect_stats(runner: ScriptRunner) -> dict[str, float | int]:
+    """
+    Collect the performance statistics of a strategy after a run
+
+    :param runner: The script runner after the run
+    :return: Dictionary of statistics
+    """
+    position = runner.script.position
+    assert position is not None
+    position.sync()
+    initial_capital = runner.script.initial_capital
+    stats = position.stats
+    return dict(
+        net_profit=position.netprofit,
+        net_profit_percent=position.netprofit / initial_capital * 100.0 if initial_capital else 0.0,
+        gross_profit=stats.grossprofit,
+        gross_loss=stats.grossloss,
+        profit_factor=stats.profit_factor,
+        total_trades=stats.total_trades,
+        winning_trades=stats.wintrades,
+        losing_trades=stats.losstrades,
+        percent_profitable=stats.percent_profitable,
+        avg_trade=stats.avg_trade,
+        avg_winning_trade=stats.avg_winning_trade,
+        avg_losing_trade=stats.avg_losing_trade,
+        ratio_avg_win_loss=stats.ratio_avg_win_loss,
+        largest_winning_trade=stats.largest_win,
+        largest_losing_trade=stats.largest_loss,
+        max_consecutive_wins=stats.max_consecutive_wins,
+        max_consecutive_losses=stats.max_consecutive_losses,
+        max_drawdown=position.max_drawdown,
+        max_runup=position.max_runup,
+        sharpe_ratio=stats.sharpe_ratio,
+        sortino_ratio=stats.sortino_ratio,
+        open_profit=position.openprofit,
+    )
+
+
+class _Worker:
+    """
+    The state of a worker: the imported script and the data
+    """
+
+    __slots__ = ('runner', 'data', 'time_from', 'time_to')
+
+    def __init__(self, script_path: Path, data: Path | OHLCVColumns, syminfo: SymInfo,
+                 time_from: int | None, time_to: int | None, precompute: bool = False, fast: bool = False):
+        if isinstance(data, Path):
+            reader = OHLCVReader(str(data))
+            reader.open()
+            self.data = reader
+            self.time_from = time_from if time_from is not None else reader.start_timestamp
+            self.time_to = time_to if time_to is not None else reader.end_timestamp
+            size = reader.get_size(self.time_from, self.time_to)
+        else:
+            # The columns are already filtered by time
+            self.data = data
+            self.time_from = self.time_to = 0
+            size = len(data)
+
+        self.runner = ScriptRunner(script_path, iter(()), syminfo, last_bar_index=size - 1,
+                                   precompute=precompute, fast=fast)
+        if self.runner.script.position is None:
+            raise ValueError("Only strategies can be optimized!")
+
+    def run(self, inputs: dict[str, Any]) -> OptimizationResult:
+        """
+        Run the script with the given inputs
+
+        :param inputs: The input values to use
+        :return: The result of the run
+        """
+        runner = self.runner
+        runner.reset()
+        runner.set_inputs(**inputs)
+        if isinstance(self.data, OHLCVReader):
+            runner.ohlcv_iter = self.data.read_from(self.time_from, self.time_to)
+        else:
+            runner.ohlcv_iter = self.data
+        runner.run()
+        return OptimizationResult(inputs=inputs, stats=collect_stats(runner))
+
+    def close(self):
+        """
+        Close the data
+        """
+        if isinstance(self.data, OHLCVReader):
+            self.data.close()
+
+
+# The worker of the current process
+_worker: _Worker | None = None
+
+
+def _init_worker(script_path: Path, data: Path | OHLCVColumns, syminfo: SymInfo,
+                 time_from: int | None, time_to: int | None, precompute: bool, fast: bool):
+    """
+    Process pool initializer, it imports the script once per process
+    """
+    global _worker
+    # Workers must not write the toml file of the script concurrently
+    os.environ['PYNE_SAVE_SCRIPT_TOML'] = '0'
+    _worker = _Worker(script_path, data, syminfo, time_from, time_to, precompute, fast)
+
+
+def _run_in_worker(inputs: dict[str, Any]) -> OptimizationResult:
+    """
+    Run one combination in the worker of the current process
+    """
+    assert _worker is not None
+    return _worker.run(inputs)
+
+
+def _run_chunk(func: Callable[[Any], Any], chunk: list) -> list:
+    """
+    Run a chunk of items in a worker
+    """
+    return [func(item) for item in chunk]
+
+
+def _run_chunks(executor: Executor, func: Callable[[Any], Any], items: Iterable, chunksize: int,
+                on_result: Callable[[Any], None] | None) -> list:
+    """
+    Run the items in chunks in the pool, `on_result` is called with the results of every chunk as soon
+    as the chunk is ready, so a slow chunk does not hold back the others
+
+    :return: The results in the order of the items
+    """
+    chunks: dict[Future, int] = {}
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunksize)):
+        chunks[executor.submit(_run_chunk, func, chunk)] = len(chunks)
+
+    chunk_results: list[list] = [[] for _ in chunks]
+    try:
+        for future in as_completed(chunks):
+            chunk_result = chunk_results[chunks[future]] = future.result()
+            if on_result:
+                for result in chunk_result:
+                    on_result(result)
+    except BaseException:
+        # The chunks which are not started are not needed anymore
+        for future in chunks:
+            future.cancel()
+        raise
+    return [result for chunk_result in chunk_results for result in chunk_result]
+
+
+def optimize(script_path: Path, data_path: Path, syminfo: SymInfo, space: Iterable[dict[str, Any]], *,
+             time_from: int | None = None, time_to: int | None = None,
+             workers: int | None = None, chunksize: int = 1, precompute: bool = False, fast: bool = False,
+             on_result: Callable[[OptimizationResult], None] | None = None) -> list[OptimizationResult]:
+    """
+    Run a strategy with all input combinations of the parameter space
+
+    If NumPy is installed, the data is decoded only once and shared with the workers through
+    shared memory.
+
+    :param script_path: The path of the strategy script
+    :param data_path: The path of the OHLCV data file
+    :param syminfo: Symbol information
+    :param space: Iterable of input combinations, see `grid_space` and `random_space`
+    :param time_from: Start timestamp (UTC seconds), if None, the first bar of the data is used
+    :param time_to: End timestamp (UTC seconds), if None, the last bar of the data is used
+    :param workers: Number of worker processes, if None, the number of CPUs is used,
+                    if 1, the combinations are run in the current process
+    :param chunksize: Number of combinations sent to a worker at once
+    :param precompute: Precompute bar-invariant ta calls in a vectorized way, needs NumPy
+    :param fast: Fast backtest mode, the bars without pending orders are processed in a vectorized way,
+                 needs NumPy
+    :param on_result: Callback called with every result as soon as it is ready, with more workers
+                      the results may come in a different order than the parameter space
+    :return: List of results in the order of the parameter space
+    :raises ValueError: If the script is not a strategy
+    :raises KeyError: If an input of the space is not an input of the script
+    :raises ImportError: If precompute or fast mode is enabled, but NumPy is not installed
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    results: list[OptimizationResult] = []
+
+    # Decode the data only once if NumPy is available, workers share it through shared memory
+    data: Path | OHLCVColumns = data_path
+    try:
+        data = OHLCVColumns.from_file(data_path, time_from, time_to)
+    except ImportError:
+        if precompute or fast:
+            raise
+
+    if workers <= 1:
+        worker = _Worker(script_path, data, syminfo, time_from, time_to, precompute, fast)
+        try:
+            for inputs in space:
+                result = worker.run(inputs)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+        finally:
+            worker.close()
+        return results
+
+    if isinstance(data, OHLCVColumns):
+        data = data.share()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(script_path, data, syminfo, time_from, time_to, precompute,
+                                           fast)) as executor:
+            results = _run_chunks(executor, _run_in_worker, space, chunksize, on_result)
+    finally:
+        if isinstance(data, OHLCVColumns):
+            data.unlink()
+
+    return results
@@ -0,0 +1,159 @@
+"""
+Pending orders of a strategy, indexed by their trigger prices
+
+`OrderBook` works like the dictionary of the pending orders (order id -> order), but it keeps the stop
+and limit prices of the orders in sorted lists, by side. A buy stop or a sell limit can be filled only if
+the high of the bar reaches its price, a sell stop or a buy limit only if the low of the bar reaches it,
+so the orders which can be filled on a bar are found by bisecting the lists, instead of checking every
+pending order (e.g. the resting orders of grid strategies) on every bar.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Iterator
+from bisect import bisect_left, bisect_right, insort
+
+if TYPE_CHECKING:
+    from ..lib.strategy import Order
+
+__all__ = ['OrderBook']
+
+
+class OrderBook:
+    """
+    Pending orders by id in insertion order (like a dict), with price indexes of the stop and limit orders.
+
+    Every order gets a sequence number when its id is added, replacing the order of an existing id keeps
+    the number, so the sequence numbers follow the iteration order of a dict. Orders must not be modified
+    while they are in the book, they should be replaced (e.g. `book[order_id] = order`) instead.
+    """
+
+    __slots__ = ('_orders', '_seqs', '_next_seq', '_by_seq', '_entries', '_market',
+                 '_buy_stops', '_sell_limits', '_sell_stops', '_buy_limits')
+
+    def __init__(self):
+        self._orders: dict[Any, Order] = {}
+        self._seqs: dict[Any, int] = {}
+        self._next_seq = 0
+        self._by_seq: dict[int, Order] = {}
+        # The index entries of the orders by id, to remove them
+        self._entries: dict[Any, list[tuple[list, tuple[float, int]]]] = {}
+        # Sequence numbers of the market orders
+        self._market: set[int] = set()
+        # Sorted (price, sequence number) lists
+        self._buy_stops: list[tuple[float, int]] = []
+        self._sell_limits: list[tuple[float, int]] = []
+        self._sell_stops: list[tuple[float, int]] = []
+        self._buy_limits: list[tuple[float, int]] = []
+
+    #
+    # Dict interface
+    #
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._orders)
+
+    def __contains__(self, order_id: Any) -> bool:
+        return order_id in self._orders
+
+    def __getitem__(self, order_id: Any) -> Order:
+        return self._orders[order_id]
+
+    def __setitem__(self, order_id: Any, order: Order):
+        if order_id in self._orders:
+            self._unindex(order_id)
+            seq = self._seqs[order_id]
+        else:
+            seq = self._seqs[order_id] = self._next_seq
+            self._next_seq += 1
+        self._orders[order_id] = order
+        self._index(order_id, order, seq)
+
+    def __delitem__(self, order_id: Any):
+        del self._orders[order_id]
+        self._unindex(order_id)
+        del self._by_seq[self._seqs.pop(order_id)]
+
+    def __repr__(self) -> str:
+        return f"OrderBook({self._orders!r})"
+
+    def get(self, order_id: Any, default: Any = None) -> Any:
+        return self._orders.get(order_id, default)
+
+    def pop(self, order_id: Any, *default: Any) -> Any:
+        if order_id not in self._orders:
+            if default:
+                return default[0]
+            raise KeyError(order_id)
+        order = self._orders[order_id]
+        del self[order_id]
+        return order
+
+    def keys(self):
+        return self._orders.keys()
+
+    def values(self):
+        return self._orders.values()
+
+    def items(self):
+        return self._orders.items()
+
+    def clear(self):
+        self._orders.clear()
+        self._seqs.clear()
+        self._by_seq.clear()
+        self._entries.clear()
+        self._market.clear()
+        self._buy_stops.clear()
+        self._sell_limits.clear()
+        self._sell_stops.clear()
+        self._buy_limits.clear()
+
+    #
+    # Price index
+    #
+
+    def _index(self, order_id: Any, order: Order, seq: int):
+        self._by_seq[seq] = order
+        entries = []
+        if not order.limit and not order.stop:
+            self._market.add(seq)
+        elif order.size:
+            buy = order.size > 0.0
+            if order.stop:
+                entries.append((self._buy_stops if buy else self._sell_stops, (order.stop, seq)))
+            if order.limit:
+                entries.append((self._buy_limits if buy else self._sell_limits, (order.limit, seq)))
+            for prices, entry in entries:
+                insort(prices, entry)
+        self._entries[order_id] = entries
+
+    def _unindex(self, order_id: Any):
+        self._market.discard(self._seqs[order_id])
+        for prices, entry in self._entries.pop(order_id):
+            del prices[bisect_left(prices, entry)]
+
+    def candidates(self, *, high: float | None = None, low: float | None = None,
+                   market: bool = False) -> list[Order]:
+        """
+        Get the orders which can be filled when the price reaches a high or a low, in the order of the book.
+        The list is a snapshot, the book can be changed while it is processed.
+
+        :param high: The highest price, buy stops and sell limits at or below it are returned
+        :param low: The lowest price, sell stops and buy limits at or above it are returned
+        :param market: Return the market orders too
+        :return: The orders, in the order they were added to the book
+        """
+        seqs: list[int] = []
+        if market:
+            seqs.extend(self._market)
+        if high is not None:
+            for prices in (self._buy_stops, self._sell_limits):
+                seqs.extend(seq for _, seq in prices[:bisect_right(prices, (high, float('inf')))])
+        if low is not None:
+            for prices in (self._sell_stops, self._buy_limits):
+                seqs.extend(seq for _, seq in prices[bisect_left(prices, (low, -1)):])
+        # An order can be in more lists (stop and limit)
+        by_seq = self._by_seq
+        return [by_seq[seq] for seq in sorted(set(seqs))]
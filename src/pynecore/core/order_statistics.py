@@ -0,0 +1,623 @@
+"""
+Order statistics of rolling windows
+
+`SortedList` is a sorted multiset stored as a list of sorted blocks, with a Fenwick tree over the block
+lengths. Adding, removing, ranking and indexing values are O(log n) (plus moving at most a block's worth
+of references), so rank based indicators (median, percentiles, percent rank, mode, RCI) don't need to
+sort the whole window on every bar. Optionally it keeps the sums of the blocks, so the sum of the values
+below a limit can be calculated without iterating the whole list (e.g. for the mean absolute deviation).
+
+`RollingWindow` keeps the values of the last `length` bars in a `SortedList`.
+
+`RollingExtremum` is a monotonic deque of the maximum (or minimum) candidates of the last `length`
+bars, so the extremum of the window is amortized O(1) per bar.
+
+All of them can be rolled back to a mark (like series, see `SeriesImpl.mark`): after `mark` the changes are
+recorded, and `rollback` undoes them, so the realtime bar can be recalculated without copying them.
+"""
+from __future__ import annotations
+from typing import Any, Iterator
+from bisect import bisect_left, bisect_right, insort
+from copy import copy
+from itertools import chain
+
+from ..types.na import NA
+
+__all__ = ['SortedList', 'RollingWindow', 'RollingExtremum']
+
+
+class SortedList:
+    """
+    Sorted multiset with O(log n) add, remove, rank and index operations.
+
+    The values are stored in sorted blocks of `load` to `2 * load` values (except when there are
+    fewer values). The blocks are found by bisecting their maximums, the positions by a Fenwick tree
+    over the block lengths, which is rebuilt only if a block is split or merged.
+
+    If `sums` is true, the sums of the blocks are kept too. They are recalculated from the values of the
+    block on every change instead of being updated, so there is no floating point drift.
+    """
+
+    __slots__ = ('_blocks', '_maxes', '_index', '_top', '_size', '_load', '_sums', '_journal')
+
+    def __init__(self, values: Any = (), load: int = 64, sums: bool = False):
+        """
+        :param values: Initial values
+        :param load: Size of the blocks
+        :param sums: Keep the sums of the blocks, needed by `sum_left` and `total`
+        """
+        self._load = load
+        self._blocks: list[list] = []
+        self._maxes: list = []
+        self._index: list[int] = [0]
+        self._top = 0
+        self._size = 0
+        self._sums: list | None = [] if sums else None
+        # The changes since the last mark: (True, value) for added, (False, value) for removed values and
+        # (None, state) for clearing, None if the changes are not recorded
+        self._journal: list[tuple[bool | None, Any]] | None = None
+        values = sorted(values)
+        if values:
+            self._blocks = [values[i:i + load] for i in range(0, len(values), load)]
+            self._maxes = [block[-1] for block in self._blocks]
+            self._size = len(values)
+            self._build_index()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(self._blocks)
+
+    def __repr__(self) -> str:
+        return f"SortedList({list(self)!r})"
+
+    def __copy__(self) -> SortedList:
+        """
+        Copy the list, the blocks are copied too, so the copies are independent
+        """
+        other = SortedList.__new__(SortedList)
+        other._blocks = [block.copy() for block in self._blocks]
+        other._maxes = self._maxes.copy()
+        other._index = self._index.copy()
+        other._top = self._top
+        other._size = self._size
+        other._load = self._load
+        other._sums = None if self._sums is None else self._sums.copy()
+        other._journal = None
+        return other
+
+    def _build_index(self) -> None:
+        """
+        Build the Fenwick tree of the block lengths (and the block sums if they are kept)
+        """
+        if self._sums is not None:
+            self._sums = [sum(block) for block in self._blocks]
+        index = [0]
+        index.extend(len(block) for block in self._blocks)
+        size = len(index)
+        for i in range(1, size):
+            j = i + (i & -i)
+            if j < size:
+                index[j] += index[i]
+        self._index = index
+        top = 1
+        while top * 2 < size:
+            top *= 2
+        self._top = top if size > 1 else 0
+
+    def _update(self, block: int, delta: int) -> None:
+        """
+        Change the length of a block in the Fenwick tree
+        """
+        index = self._index
+        size = len(index)
+        i = block + 1
+        while i < size:
+            index[i] += delta
+            i += i & -i
+
+    def _offset(self, block: int) -> int:
+        """
+        Number of values before a block
+        """
+        index = self._index
+        total = 0
+        while block:
+            total += index[block]
+            block &= block - 1
+        return total
+
+    def _locate(self, pos: int) -> tuple[int, int]:
+        """
+        Find the block and the position in the block of the `pos`-th value
+        """
+        index = self._index
+        size = len(index)
+        block = 0
+        bit = self._top
+        while bit:
+            i = block + bit
+            if i < size and index[i] <= pos:
+                block = i
+                pos -= index[i]
+            bit >>= 1
+        return block, pos
+
+    def add(self, value: Any) -> None:
+        """
+        Add a value
+
+        :param value: The value to add
+        """
+        if self._journal is not None:
+            self._journal.append((True, value))
+        blocks = self._blocks
+        maxes = self._maxes
+        self._size += 1
+        if not maxes:
+            blocks.append([value])
+            maxes.append(value)
+            self._build_index()
+            return
+
+        b = bisect_right(maxes, value)
+        if b == len(maxes):
+            b -= 1
+            block = blocks[b]
+            block.append(value)
+            maxes[b] = value
+        else:
+            block = blocks[b]
+            insort(block, value)
+
+        load = self._load
+        if len(block) > load + load:
+            # Split the block
+            blocks.insert(b + 1, block[load:])
+            del block[load:]
+            maxes[b] = block[-1]
+            maxes.insert(b + 1, blocks[b + 1][-1])
+            self._build_index()
+        else:
+            self._update(b, 1)
+            if self._sums is not None:
+                self._sums[b] = sum(block)
+
+    def remove(self, value: Any) -> None:
+        """
+        Remove a value
+
+        :param value: The value to remove
+        :raises ValueError: If the value is not in the list
+        """
+        maxes = self._maxes
+        b = bisect_left(maxes, value)
+        if b == len(maxes):
+            raise ValueError(f"{value!r} is not in the list")
+        blocks = self._blocks
+        block = blocks[b]
+        i = bisect_left(block, value)
+        if block[i] != value:
+            raise ValueError(f"{value!r} is not in the list")
+        del block[i]
+        self._size -= 1
+        if self._journal is not None:
+            self._journal.append((False, value))
+
+        if len(block) >= self._load >> 1 or (block and len(blocks) == 1):
+            maxes[b] = block[-1]
+            self._update(b, -1)
+            if self._sums is not None:
+                self._sums[b] = sum(block)
+            return
+
+        # Merge the small block into a neighbour
+        if not block:
+            del blocks[b]
+            del maxes[b]
+        else:
+            if b == len(blocks) - 1:
+                b -= 1
+            blocks[b].extend(blocks.pop(b + 1))
+            del maxes[b + 1]
+            block = blocks[b]
+            maxes[b] = block[-1]
+            load = self._load
+            if len(block) > load + load:
+                blocks.insert(b + 1, block[load:])
+                del block[load:]
+                maxes[b] = block[-1]
+                maxes.insert(b + 1, blocks[b + 1][-1])
+        self._build_index()
+
+    def clear(self) -> None:
+        """
+        Remove all values
+        """
+        if self._journal is not None:
+            self._journal.append((None, (self._blocks, self._maxes, self._index, self._top, self._size,
+                                         self._sums)))
+        self._blocks = []
+        self._maxes = []
+        self._index = [0]
+        self._top = 0
+        self._size = 0
+        if self._sums is not None:
+            self._sums = []
+
+    def mark(self) -> int:
+        """
+        Start recording the changes, so the list can be rolled back to its current state by `rollback`.
+        The changes recorded before are dropped, so only the last mark is valid.
+
+        :return: The mark of the current state
+        """
+        self._journal = []
+        return 0
+
+    def rollback(self, mark: int) -> None:
+        """
+        Undo the changes since `mark`, it is O(log n) per change. The values are the same as at the
+        mark, but the blocks may be split differently.
+
+        :param mark: The mark returned by `mark`
+        """
+        journal = self._journal
+        if not journal:
+            return
+        # The undo operations must not be recorded
+        self._journal = None
+        try:
+            for i in range(len(journal) - 1, mark - 1, -1):
+                added, value = journal[i]
+                if added:
+                    self.remove(value)
+                elif added is None:
+                    self._blocks, self._maxes, self._index, self._top, self._size, self._sums = value
+                else:
+                    self.add(value)
+        finally:
+            del journal[mark:]
+            self._journal = journal
+
+    def unmark(self) -> None:
+        """
+        Stop recording the changes
+        """
+        self._journal = None
+
+    def rank_left(self, value: Any) -> int:
+        """
+        Number of values less than the value
+
+        :param value: The value to rank
+        :return: The number of values less than `value`
+        """
+        maxes = self._maxes
+        b = bisect_left(maxes, value)
+        if b == len(maxes):
+            return self._size
+        return self._offset(b) + bisect_left(self._blocks[b], value)
+
+    def rank_right(self, value: Any) -> int:
+        """
+        Number of values less than or equal to the value
+
+        :param value: The value to rank
+        :return: The number of values less than or equal to `value`
+        """
+        maxes = self._maxes
+        b = bisect_right(maxes, value)
+        if b == len(maxes):
+            return self._size
+        return self._offset(b) + bisect_right(self._blocks[b], value)
+
+    def sum_left(self, value: Any) -> Any:
+        """
+        Sum of the values less than the value, the block sums must be kept. It is O(n / load + load).
+
+        :param value: The limit
+        :return: The sum of the values less than `value`
+        """
+        maxes = self._maxes
+        sums = self._sums
+        b = bisect_left(maxes, value)
+        if b == len(maxes):
+            return sum(sums)
+        block = self._blocks[b]
+        return sum(sums[:b]) + sum(block[:bisect_left(block, value)])
+
+    def total(self) -> Any:
+        """
+        Sum of all values, the block sums must be kept
+
+        :return: The sum of the values
+        """
+        return sum(self._sums)
+
+    def __getitem__(self, pos: int) -> Any:
+        """
+        The `pos`-th smallest value, negative positions count from the largest
+
+        :raises IndexError: If the position is out of range
+        """
+        size = self._size
+        if pos < 0:
+            pos += size
+        if not 0 <= pos < size:
+            raise IndexError("SortedList index out of range")
+        blocks = self._blocks
+        if pos < len(blocks[0]):
+            return blocks[0][pos]
+        b, i = self._locate(pos)
+        return blocks[b][i]
+
+
+class RollingWindow:
+    """
+    The values of the last `length` bars in a `SortedList`.
+
+    NA values take their place in the window, but they are not added to the sorted list. If
+    `positions` is true, the sorted list contains `(value, position)` tuples, where position is the
+    number of values pushed before the value, so the age of the values can be calculated. If `sums` is
+    true, the sorted list keeps the sums of its blocks.
+    """
+
+    __slots__ = ('length', 'sorted', 'positions', 'pos', '_ring', '_journal')
+
+    def __init__(self, length: int, positions: bool = False, sums: bool = False):
+        """
+        :param length: The number of bars in the window
+        :param positions: Store `(value, position)` tuples in the sorted list
+        :param sums: Keep the block sums of the sorted list
+        """
+        self.length = length
+        self.sorted = SortedList(sums=sums)
+        self.positions = positions
+        # Number of pushed values
+        self.pos = 0
+        # Entries of the sorted list in push order, None for NA values
+        self._ring: list = [None] * length
+        # The overwritten ring entries since the last mark, None if the changes are not recorded
+        self._journal: list[tuple[int, Any]] | None = None
+
+    def __len__(self) -> int:
+        """
+        Number of bars in the window (including NA values)
+        """
+        return self.pos if self.pos < self.length else self.length
+
+    def __copy__(self) -> RollingWindow:
+        """
+        Copy the window, the sorted list and the ring are copied too, so the copies are independent
+        """
+        other = RollingWindow.__new__(RollingWindow)
+        other.length = self.length
+        other.sorted = copy(self.sorted)
+        other.positions = self.positions
+        other.pos = self.pos
+        other._ring = self._ring.copy()
+        other._journal = None
+        return other
+
+    def push(self, value: Any) -> Any:
+        """
+        Add the value of the current bar, and remove the value of the bar which leaves the window
+
+        :param value: The new value, can be NA
+        :return: The entry of the sorted list which has left the window, None if there was no entry
+        """
+        ring = self._ring
+        i = self.pos % self.length
+        old = ring[i]
+        if self._journal is not None:
+            self._journal.append((i, old))
+        if old is not None:
+            self.sorted.remove(old)
+        if isinstance(value, NA) or value is None:
+            ring[i] = None
+        else:
+            entry = (value, self.pos) if self.positions else value
+            ring[i] = entry
+            self.sorted.add(entry)
+        self.pos += 1
+        return old
+
+    def mark(self) -> tuple[int, int]:
+        """
+        Start recording the changes, so the window can be rolled back to its current state by
+        `rollback`. The changes recorded before are dropped, so only the last mark is valid.
+
+        :return: The mark of the current state
+        """
+        self._journal = []
+        return self.pos, self.sorted.mark()
+
+    def rollback(self, mark: tuple[int, int]) -> None:
+        """
+        Undo the pushes since `mark`, it is O(log n) per push
+
+        :param mark: The mark returned by `mark`
+        """
+        pos, sorted_mark = mark
+        self.sorted.rollback(sorted_mark)
+        journal = self._journal
+        if journal:
+            ring = self._ring
+            for i, old in reversed(journal):
+                ring[i] = old
+            journal.clear()
+        self.pos = pos
+
+    def unmark(self) -> None:
+        """
+        Stop recording the changes
+        """
+        self._journal = None
+        self.sorted.unmark()
+
+
+class RollingExtremum:
+    """
+    Monotonic deque of the maximum (or minimum) candidates of the last `length` bars.
+
+    The candidates are stored with their positions (the number of the pushes until the value) between
+    head and tail of a buffer of `2 * length + 2` slots, from the oldest extremum at the head, a value
+    drops the candidates it dominates from the tail. The deque is moved to the start of the buffer when
+    the tail reaches its end, at most once in `length + 1` pushes. On ties the position of the
+    extremum (`extreme_pos`) is not always the one of the head.
+    """
+
+    __slots__ = ('length', 'lowest', 'pos', 'extreme_pos', '_positions', '_values', '_head', '_tail',
+                 '_journal')
+
+    def __init__(self, length: int, lowest: bool = False, history: Any = ()):
+        """
+        :param length: The number of bars in the window
+        :param lowest: Keep the minimum instead of the maximum
+        :param history: The values of the bars before the first push (oldest first, NA values are
+                        skipped), at most `length - 1`
+        """
+        self.length = length
+        self.lowest = lowest
+        # Number of pushed values (history included)
+        self.pos = 0
+        # The position of the extremum, 0 if there is no value in the window
+        self.extreme_pos = 0
+        self._positions: list[int] = [0] * (2 * length + 2)
+        self._values: list = [0.0] * (2 * length + 2)
+        self._head = 0
+        self._tail = 0
+        # The overwritten slots since the last mark, None if the changes are not recorded
+        self._journal: list[tuple] | None = None
+        for value in history:
+            self.pos += 1
+            if not isinstance(value, NA):
+                self._append(value)
+        if self._tail > self._head:
+            self.extreme_pos = self._positions[self._head]
+
+    def __copy__(self) -> RollingExtremum:
+        """
+        Copy the deque, the buffers are copied too, so the copies are independent
+        """
+        other = RollingExtremum.__new__(RollingExtremum)
+        other.length = self.length
+        other.lowest = self.lowest
+        other.pos = self.pos
+        other.extreme_pos = self.extreme_pos
+        other._positions = self._positions.copy()
+        other._values = self._values.copy()
+        other._head = self._head
+        other._tail = self._tail
+        other._journal = None
+        return other
+
+    @property
+    def value(self) -> Any:
+        """
+        The extremum of the window, it is valid only if `extreme_pos` is not 0
+        """
+        return self._values[self._head]
+
+    def _append(self, value: Any) -> None:
+        """
+        Drop the dominated candidates from the tail and append the value
+        """
+        positions = self._positions
+        values = self._values
+        head = self._head
+        tail = self._tail
+        if self.lowest:
+            while tail > head and values[tail - 1] > value:
+                tail -= 1
+        else:
+            while tail > head and values[tail - 1] < value:
+                tail -= 1
+        journal = self._journal
+        if tail == len(values):
+            # Move the deque to the start of the buffer
+            size = tail - head
+            if journal is not None:
+                journal.append((None, positions[:size], values[:size]))
+            positions[:size] = positions[head:tail]
+            values[:size] = values[head:tail]
+            tail = size
+            self._head = 0
+        if journal is not None:
+            journal.append((tail, positions[tail], values[tail]))
+        positions[tail] = self.pos
+        values[tail] = value
+        self._tail = tail + 1
+
+    def push(self, value: Any, check_eq: bool = False) -> None:
+        """
+        Add the value of the current bar, and remove the value of the bar which leaves the window
+
+        :param value: The new value, can be NA
+        :param check_eq: A value equal to the extremum is the new extremum (otherwise the older one is kept)
+        """
+        self.pos += 1
+        pos = self.pos
+        if not isinstance(value, NA):
+            if self._tail == self._head:
+                self.extreme_pos = pos
+            else:
+                extreme = self._values[self._head]
+                if (extreme > value if self.lowest else extreme < value) or (check_eq and extreme == value):
+                    self.extreme_pos = pos
+            self._append(value)
+
+        # At most one value can leave the window in a push
+        positions = self._positions
+        head = self._head
+        tail = self._tail
+        start = pos - self.length
+        if tail > head and positions[head] <= start:
+            head = self._head = head + 1
+        # The extremum has left the window: the current value if it is an extremum, otherwise the oldest one
+        if self.extreme_pos <= start:
+            values = self._values
+            if tail == head:
+                self.extreme_pos = 0
+            elif positions[tail - 1] == pos and values[tail - 1] == values[head]:
+                self.extreme_pos = pos
+            else:
+                self.extreme_pos = positions[head]
+
+    def mark(self) -> tuple[int, int, int, int]:
+        """
+        Start recording the changes, so the deque can be rolled back to its current state by
+        `rollback`. The changes recorded before are dropped, so only the last mark is valid.
+
+        :return: The mark of the current state
+        """
+        self._journal = []
+        return self.pos, self.extreme_pos, self._head, self._tail
+
+    def rollback(self, mark: tuple[int, int, int, int]) -> None:
+        """
+        Undo the pushes since `mark`, it is O(1) per push (except moving the deque)
+
+        :param mark: The mark returned by `mark`
+        """
+        journal = self._journal
+        if journal:
+            positions = self._positions
+            values = self._values
+            for i, old_position, old_value in reversed(journal):
+                if i is None:
+                    positions[:len(old_position)] = old_position
+                    values[:len(old_value)] = old_value
+                else:
+                    positions[i] = old_position
+                    values[i] = old_value
+            journal.clear()
+        self.pos, self.extreme_pos, self._head, self._tail = mark
+
+    def unmark(self) -> None:
+        """
+        Stop recording the changes
+        """
+        self._journal = None
@@ -15,22 +15,28 @@ __scope_id__ = ""
 
 
 class Implementation:
-    __slots__ = ('func', 'sig', 'type_hints', 'param_types')
+    __slots__ = ('func', 'sig', 'type_hints', 'param_types', 'call_id', 'slot')
     func: Callable
     sig: Any  # Signature object
     type_hints: dict
     param_types: tuple  # Cached parameter types for quick checking
+    call_id: str  # Call ID of the implementation in the isolated dispatcher
+    slot: int  # Call site slot of the implementation in the isolated dispatcher, its index in the registry
 
-    def __init__(self, func: Callable, sig: Any, type_hints: dict, param_types: tuple):
+    def __init__(self, func: Callable, sig: Any, type_hints: dict, param_types: tuple, slot: int):
         self.func = func
         self.sig = sig
         self.type_hints = type_hints
         self.param_types = param_types
+        self.slot = slot
+        self.call_id = f"__overloaded__{slot}"
 
 
 _registry: dict[str, list[Implementation]] = defaultdict(list)
 _implementations: dict[str, Implementation] = {}  # Store implementations separately
 _dispatchers: dict[str, Callable] = {}  # Store dispatchers separately
+# Resolved implementations of dispatchers by the types of the arguments
+_dispatch_caches: dict[str, dict[tuple, Implementation]] = defaultdict(dict)
 
 
 def _check_type(value: Any, expected_type: Type) -> bool:
@@ -60,13 +66,58 @@ def _check_type(value: Any, expected_type: Type) -> bool:
     return False
 
 
+def _get_type_key(values: tuple) -> tuple:
+    """
+    Get the dispatch cache key of argument values: their types, NA values are keyed by their type too,
+    because they match only implementations of their own type
+    """
+    key = tuple(map(type, values))
+    if NA in key:
+        key = tuple((NA, value.type) if value_type is NA else value_type
+                    for value, value_type in zip(values, key))
+    return key
+
+
+def _find_implementation(implementations: list[Implementation], qualname: str,
+                         args: tuple, kwargs: dict) -> Implementation:
+    """
+    Find the first matching implementation of an overloaded function by checking the argument types
+
+    :raises TypeError: If there is no matching implementation
+    """
+    # Quick path: try direct positional args match first
+    if not kwargs:
+        for impl in implementations:
+            if len(args) == len(impl.param_types):
+                if all(_check_type(arg, type_)
+                       for arg, (_, type_) in zip(args, impl.param_types)):
+                    return impl
+
+    # Slower path: handle mixed args/kwargs
+    for impl in implementations:
+        try:
+            bound = impl.sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+
+            if all(_check_type(value, impl.type_hints.get(name, Any))
+                   for name, value in bound.arguments.items()):
+                return impl
+        except TypeError:
+            continue
+
+    raise TypeError(f"No matching implementation found for {qualname}")
+
+
 def overload(func: Callable[..., T]) -> Callable[..., T]:
     """
     Optimized function overloading decorator with:
-    - Type checking cache
+    - Dispatch cache by argument types
     - Pre-calculated signatures and type hints
     - Quick parameter matching
     - IDE type checking support via typing.overload
+
+    The implementations are available in the `__overloads__` list of the dispatcher, so they can be
+    called directly if the implementation is known at compile time (see `OverloadTransformer`).
     """
     global __scope_id__
 
@@ -98,36 +149,37 @@ def overload(func: Callable[..., T]) -> Callable[..., T]:
             (name, get_type_hints(func).get(name, Any))
             for name in signature(func).parameters
         ),
+        slot=len(_registry[qualname]),
     )
     _implementations[qualname_with_line] = impl
 
+    # The cached resolutions may change with the new implementation
+    cache = _dispatch_caches[qualname]
+    cache.clear()
+
     if qualname not in _dispatchers:
+        implementations = _registry[qualname]
+
         # noinspection PyShadowingNames
         def dispatcher(*args: Any, **kwargs: Any) -> Any:
-            # Quick path: try direct positional args match first
-            if not kwargs:
-                for impl in _registry[qualname]:
-                    if len(args) == len(impl.param_types):
-                        if all(_check_type(arg, type_)
-                               for arg, (_, type_) in zip(args, impl.param_types)):
-                            return isolate_function(impl.func, '__overloaded__', __scope_id__)(*args)
-
-            # Slower path: handle mixed args/kwargs
-            for impl in _registry[qualname]:
-                try:
-                    bound = impl.sig.bind(*args, **kwargs)
-                    bound.apply_defaults()
-
-                    if all(_check_type(value, impl.type_hints.get(name, Any))
-                           for name, value in bound.arguments.items()):
-                        return isolate_function(impl.func, '__overloaded__', __scope_id__)(*args, **kwargs)
-                except TypeError:
-                    continue
-
-            raise TypeError(f"No matching implementation found for {qualname}")
+            if kwargs:
+                key = (_get_type_key(args), tuple(kwargs), _get_type_key(tuple(kwargs.values())))
+            else:
+                key = _get_type_key(args)
+            try:
+                impl = cache[key]
+            except KeyError:
+                impl = cache[key] = _find_implementation(implementations, qualname, args, kwargs)
+
+            # Implementations have their own call site in the isolated dispatcher, the not isolated
+            # dispatcher (empty scope) could share slots with the calls of the main function
+            if __scope_id__:
+                return isolate_function(impl.func, impl.call_id, __scope_id__, impl.slot)(*args, **kwargs)
+            return isolate_function(impl.func, impl.call_id, __scope_id__)(*args, **kwargs)
 
         # Store implementation and dispatcher
-        _registry[qualname].append(impl)
+        implementations.append(impl)
+        dispatcher.__overloads__ = implementations  # type: ignore
 
         _dispatcher = dispatcher
 
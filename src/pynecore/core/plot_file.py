@@ -0,0 +1,349 @@
+"""
+Binary plot file
+
+Writing the plot data as CSV formats every value as text, and the bars are written one by one through
+a queue. A plot file stores the values as binary numbers: the values of a bar are appended to a buffer
+with a single C call and the buffer is written in chunks, and the file can be memory mapped for
+analysis, every column is a NumPy array (a view of the file) without parsing.
+
+The file structure:
+ - magic: `PYNEPLOT` (8 bytes)
+ - header size: uint32 (4 bytes)
+ - header: JSON object with the version and the column names (`time`, `open`, `high`, `low`, `close`,
+   `volume`, the extra fields of the bars and the plot titles), padded with spaces, so the records
+   start at a multiple of 8 bytes
+ - records: one per bar, one little endian float64 value per column. `na` is NaN, `bool` values are
+   0 and 1, the time is the UNIX timestamp in seconds.
+
+The records have a fixed size (like in the OHLCV file), so the file can be continued at any bar (e.g.
+from a checkpoint), and the columns are strided views of a 2D array of the records.
+"""
+from __future__ import annotations
+from typing import Any, Iterator, TYPE_CHECKING
+from array import array
+from datetime import datetime, UTC
+from pathlib import Path
+import io
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+
+from pynecore.types.ohlcv import OHLCV
+from pynecore.types.na import NA
+
+if TYPE_CHECKING:
+    import numpy as np
+
+__all__ = ['PlotWriter', 'PlotReader', 'PLOT_SUFFIX']
+
+PLOT_SUFFIX = '.plot'
+
+MAGIC = b'PYNEPLOT'
+VERSION = 1
+OHLCV_COLUMNS = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+_NAN = float('nan')
+
+
+def _to_float(name: str, value: Any) -> float:
+    """
+    Convert a value to be written to a plot file
+
+    :param name: The name of the column, for the error message
+    :param value: The value to convert
+    :return: The value as float, `na` is NaN
+    :raises ValueError: If the value is not a number
+    """
+    if value is None or isinstance(value, NA):
+        return _NAN
+    if isinstance(value, (int, float)):
+        return float(value)
+    raise ValueError(f"The value of '{name}' is not a number ({value!r}), "
+                     f"it can't be written to a binary plot file!")
+
+
+def _read_header(file: io.BufferedReader) -> tuple[list[str], int]:
+    """
+    Read the header of a plot file
+
+    :return: The column names and the position of the first record
+    :raises ValueError: If the file is not a plot file
+    """
+    prefix = file.read(len(MAGIC) + 4)
+    if len(prefix) < len(MAGIC) + 4 or not prefix.startswith(MAGIC):
+        raise ValueError(f"'{file.name}' is not a plot file!")
+    size = struct.unpack('<I', prefix[len(MAGIC):])[0]
+    header = json.loads(file.read(size))
+    if header.get('version') != VERSION:
+        raise ValueError(f"Unsupported plot file version: {header.get('version')}!")
+    return header['columns'], len(prefix) + size
+
+
+class PlotWriter:
+    """
+    Binary plot file writer, it has the same interface as `CSVWriter` for the plot output of the runner
+    """
+
+    __slots__ = ('path', 'chunk_size', '_file', '_headers', '_keys', '_width', '_buffer')
+
+    def __init__(self, path: Path, *, chunk_size: int = 16384, headers: tuple | list | None = None):
+        """
+        :param path: Output file path
+        :param chunk_size: The number of bars written to the file at once
+        :param headers: The column names, if None, they are the ones of the first bar
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self._file: io.BufferedWriter | None = None
+        self._headers: list[str] | None = None
+        # The extra field names and plot titles of the bars, if the keys of a bar are the same,
+        # its values can be written without lookups
+        self._keys: tuple[str, ...] | None = None
+        self._width = 0
+        self._buffer = array('d')
+        if headers:
+            self._set_headers(headers)
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def is_open(self) -> bool:
+        """Check if the writer is open"""
+        return self._file is not None
+
+    @property
+    def headers(self) -> list[str] | None:
+        """The column names of the file, if they are known already"""
+        return self._headers
+
+    def open(self, append_at: int | None = None, headers: tuple | list | None = None) -> PlotWriter:
+        """
+        Open the plot file
+
+        :param append_at: Continue an existing file from this position (in bytes), everything after
+                          it is truncated
+        :param headers: The column names of the existing file, if None, they are read from the file
+        """
+        if self._file is not None:
+            return self
+
+        if headers is not None:
+            self._set_headers(headers)
+        if not append_at:
+            self._file = open(self.path, 'wb')
+            # The header is written with the first bar if the columns are not known yet
+            if self._headers is not None:
+                self._write_header()
+        else:
+            if self._headers is None:
+                with open(self.path, 'rb') as f:
+                    self._set_headers(_read_header(f)[0])
+            os.truncate(self.path, append_at)
+            self._file = open(self.path, 'ab')
+        return self
+
+    def _set_headers(self, headers: tuple | list):
+        """ Set the column names """
+        self._headers = list(headers)
+        self._width = len(headers)
+        self._keys = tuple(headers[len(OHLCV_COLUMNS):])
+
+    def _write_header(self):
+        """ Write the header of the file """
+        assert self._file is not None and self._headers is not None
+        header = json.dumps(dict(version=VERSION, columns=self._headers)).encode('utf-8')
+        # Records are aligned to 8 bytes
+        header += b' ' * (-(len(MAGIC) + 4 + len(header)) % 8)
+        self._file.write(MAGIC + struct.pack('<I', len(header)) + header)
+
+    def write_bar(self, candle: OHLCV, plot_data: dict[str, Any]):
+        """
+        Write the OHLCV data, the extra fields and the plot data of a bar
+
+        :param candle: The bar
+        :param plot_data: The plotted values by title
+        :raises ValueError: If a value is not a number
+        """
+        if self._file is None:
+            raise RuntimeError("Writer not opened!")
+        extra_fields = candle.extra_fields
+        keys = (*extra_fields, *plot_data) if extra_fields else tuple(plot_data)
+        if self._headers is None:
+            self._set_headers((*OHLCV_COLUMNS, *keys))
+            self._write_header()
+
+        buffer = self._buffer
+        start = len(buffer)
+        try:
+            buffer.extend(candle[:6])
+            if extra_fields:
+                buffer.extend(extra_fields.values())
+            buffer.extend(plot_data.values())
+            written = keys == self._keys
+        except TypeError:
+            written = False
+        # Not numbers (e.g. `na`) or different columns than on the first bar
+        if not written:
+            del buffer[start:]
+            values = dict(zip(OHLCV_COLUMNS, candle[:6]))
+            if extra_fields:
+                values.update(extra_fields)
+            values.update(plot_data)
+            # Columns which were not written on the first bar are dropped (like in CSV files)
+            assert self._headers is not None
+            buffer.extend(_to_float(name, values.get(name)) for name in self._headers)
+
+        if len(buffer) >= self.chunk_size * self._width:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered bars to the file
+        """
+        if self._file is None or not self._buffer:
+            return
+        if sys.byteorder == 'big':
+            self._buffer.byteswap()
+        self._buffer.tofile(self._file)
+        self._file.flush()
+        del self._buffer[:]
+
+    def close(self):
+        """
+        Write the buffered bars and close the file
+        """
+        if self._file is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class PlotReader:
+    """
+    Binary plot file reader using memory mapping
+    """
+
+    __slots__ = ('path', '_file', '_mmap', '_columns', '_offset', '_size', '_array')
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._file: io.BufferedReader | None = None
+        self._mmap: mmap.mmap | None = None
+        self._columns: list[str] = []
+        self._offset = 0
+        self._size = 0
+        self._array: np.ndarray | None = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def columns(self) -> list[str]:
+        """ The column names """
+        return self._columns
+
+    @property
+    def size(self) -> int:
+        """ The number of bars """
+        return self._size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def open(self) -> PlotReader:
+        """
+        Open the file and create memory mapping
+
+        :raises ValueError: If the file is not a plot file
+        """
+        self._file = open(self.path, 'rb')
+        self._columns, self._offset = _read_header(self._file)
+        # An incomplete last record (e.g. the writer was killed) is not read
+        self._size = (os.path.getsize(self.path) - self._offset) // (8 * len(self._columns))
+        if self._size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def close(self):
+        """
+        Close the file, the arrays returned by the reader are still valid
+        """
+        self._array = None
+        if self._mmap:
+            self._mmap.close()
+            self._mmap = None
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def to_array(self) -> np.ndarray:
+        """
+        All values as a read only 2D array (bars x columns), mapped to the file (needs NumPy)
+        """
+        if self._array is None:
+            from .ohlcv_columns import _import_numpy
+            np = _import_numpy()
+            if self._size:
+                self._array = np.memmap(self.path, dtype='<f8', mode='r', offset=self._offset,
+                                        shape=(self._size, len(self._columns)))
+            else:
+                self._array = np.empty((0, len(self._columns)), dtype='<f8')
+        return self._array
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """
+        The values of a column, mapped to the file (needs NumPy)
+
+        :param column: The name of the column
+        :raises KeyError: If there is no such column
+        """
+        try:
+            index = self._columns.index(column)
+        except ValueError:
+            raise KeyError(column) from None
+        return self.to_array()[:, index]
+
+    def __iter__(self) -> Iterator[tuple[float, ...]]:
+        """
+        Iterate the values of the bars
+        """
+        if self._mmap is None:
+            return
+        record = struct.Struct('<' + 'd' * len(self._columns))
+        end = self._offset + self._size * record.size
+        # The records are read in chunks
+        chunk = record.size * 4096
+        for pos in range(self._offset, end, chunk):
+            yield from record.iter_unpack(self._mmap[pos:min(pos + chunk, end)])
+
+    def to_csv(self, path: Path, float_fmt: str = '.8g'):
+        """
+        Convert the file to CSV, it is the same as the CSV plot output of the runner, except that
+        `bool` values are written as 1 and 0
+
+        :param path: Output file path
+        :param float_fmt: Format string for float values
+        """
+        from .csv_file import CSVWriter
+
+        na = NA(float)
+        isnan = math.isnan
+        with CSVWriter(path, float_fmt=float_fmt, headers=self._columns) as writer:
+            for timestamp, *values in self:
+                writer.write(datetime.fromtimestamp(int(timestamp), UTC),
+                             *(na if isnan(value) else value for value in values))
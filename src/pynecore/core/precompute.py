@@ -0,0 +1,186 @@
+"""
+Vectorized precompute mode for ta functions
+
+Some ta function calls have bar-invariant arguments: the source is a built-in price series and the
+length is a constant or an input. The results of these calls depend only on the OHLCV data, so they
+can be calculated for the whole data in one vectorized pass before the script runs. Then the
+calls are served by simple lookups instead of running the function on every bar.
+
+The `PrecomputeTransformer` collects these calls at compile time. Precompute mode is opt-in and
+needs NumPy and columnar data (`OHLCVColumns`).
+"""
+from __future__ import annotations
+from typing import Any, Callable, TYPE_CHECKING
+from types import ModuleType
+from inspect import signature
+import math
+
+from ..types.na import NA
+from . import function_isolation
+
+if TYPE_CHECKING:
+    import numpy as np
+    from .ohlcv_columns import OHLCVColumns
+
+__all__ = ['PRECOMPUTABLE_FUNCTIONS', 'PRICE_SOURCES', 'precompute_calls']
+
+PRECOMPUTABLE_FUNCTIONS = frozenset(('sma', 'ema', 'rma', 'stdev', 'variance', 'highest', 'lowest'))
+PRICE_SOURCES = frozenset(('open', 'high', 'low', 'close', 'volume', 'hl2', 'hlc3', 'ohlc4', 'hlcc4'))
+
+# Maximum number of temporary array elements, it limits memory usage of windowed calculations
+CHUNK_ELEMENTS = 1 << 20
+
+
+class _Precomputed:
+    """
+    Serve precomputed values by bar index, it is used instead of the isolated ta function
+    """
+
+    __slots__ = ('values', 'lib')
+
+    def __init__(self, values: list, lib: ModuleType):
+        self.values = values
+        self.lib = lib
+
+    def __call__(self, *_, **__) -> Any:
+        return self.values[self.lib.bar_index]
+
+
+def _source(np, columns: OHLCVColumns, name: str) -> np.ndarray:
+    """
+    Get the source array, calculated the same way as the runner calculates lib properties
+    """
+    if name == 'hl2':
+        return (columns.high + columns.low) / 2.0
+    if name == 'hlc3':
+        return (columns.high + columns.low + columns.close) / 3.0
+    if name == 'ohlc4':
+        return (columns.open + columns.high + columns.low + columns.close) / 4.0
+    if name == 'hlcc4':
+        return (columns.high + columns.low + 2 * columns.close) / 4.0
+    return getattr(columns, name)
+
+
+def _windowed(np, x: np.ndarray, length: int, func: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    """
+    Apply a function on every full window of the array, the first `length - 1` results are NaN
+    """
+    result = np.full(len(x), np.nan)
+    if len(x) < length:
+        return result
+    windows = np.lib.stride_tricks.sliding_window_view(x, length)
+    step = max(CHUNK_ELEMENTS // length, 1)
+    for start in range(0, len(windows), step):
+        result[start + length - 1:start + step + length - 1] = func(windows[start:start + step])
+    return result
+
+
+def _sma(np, x: np.ndarray, length: int) -> np.ndarray:
+    return _windowed(np, x, length, lambda w: w.sum(axis=1) / length)
+
+
+def _variance(np, x: np.ndarray, length: int, biased: bool = True) -> np.ndarray:
+    if length == 1:
+        return np.zeros(len(x))
+
+    def var(w):
+        centered = w - w.mean(axis=1, keepdims=True)
+        return (centered * centered).sum(axis=1) / (length if biased else length - 1)
+
+    return _windowed(np, x, length, var)
+
+
+def _stdev(np, x: np.ndarray, length: int, biased: bool = True) -> np.ndarray:
+    return np.sqrt(_variance(np, x, length, biased))
+
+
+def _ema(np, x: np.ndarray, length: int, alpha: float | None = None) -> np.ndarray:
+    if length == 1:
+        return x
+    alpha = alpha or (2 / (length + 1))
+    values = x.tolist()
+    result = [math.nan] * len(values)
+    if len(values) < length:
+        return np.array(result)
+    # SMA in warming stage, summed sequentially like `math.sum`
+    summ = 0.0
+    for v in values[:length]:
+        summ += v
+    last = result[length - 1] = summ / length
+    # The recursion cannot be vectorized, but it is a tight loop on plain floats
+    beta = 1 - alpha
+    for i in range(length, len(values)):
+        last = result[i] = alpha * values[i] + beta * last
+    return np.array(result)
+
+
+def _rma(np, x: np.ndarray, length: int) -> np.ndarray:
+    return _ema(np, x, length, 1 / length)
+
+
+def _highest(np, x: np.ndarray, length: int) -> np.ndarray:
+    return _windowed(np, x, length, lambda w: w.max(axis=1))
+
+
+def _lowest(np, x: np.ndarray, length: int) -> np.ndarray:
+    return _windowed(np, x, length, lambda w: w.min(axis=1))
+
+
+_IMPLEMENTATIONS = {
+    'sma': _sma,
+    'ema': _ema,
+    'rma': _rma,
+    'stdev': _stdev,
+    'variance': _variance,
+    'highest': _highest,
+    'lowest': _lowest,
+}
+
+
+def precompute_calls(module: ModuleType, columns: OHLCVColumns) -> int:
+    """
+    Precompute the precomputable ta calls of a script module and register them in function isolation.
+    It must be called after `function_isolation.reset()`.
+
+    :param module: The imported script module
+    :param columns: The OHLCV data the script will run on
+    :return: The number of precomputed calls
+    """
+    specs: dict[str, tuple] = module.__dict__.get('__precompute_calls__')
+    if not specs:
+        return 0
+
+    from .ohlcv_columns import _import_numpy
+    from .. import lib
+    np = _import_numpy()
+
+    # Resolve inputs, they are the defaults of the main function
+    inputs = {name: param.default for name, param in signature(module.main).parameters.items()}
+    scope_id = module.__dict__.get('__scope_id__', '')
+
+    sources: dict[str, np.ndarray] = {}
+    na = NA(float)
+    count = 0
+    for call_id, (func_name, source_name, length, *rest) in specs.items():
+        if isinstance(length, str):
+            length = inputs.get(length)
+        # Fall back to normal calculation if the length is not usable
+        if type(length) is not int or length <= 0:
+            continue
+
+        try:
+            source = sources[source_name]
+        except KeyError:
+            source = sources[source_name] = np.asarray(_source(np, columns, source_name), dtype=np.float64)
+        # NA values need the per-bar logic
+        if np.isnan(source).any():
+            continue
+
+        result = _IMPLEMENTATIONS[func_name](np, source, length, *rest)
+        values = [na if v != v else v for v in result.tolist()]
+
+        # Unconditional calls of main are called exactly once per bar
+        function_isolation.register_precomputed(f"{scope_id}->{call_id}#1", _Precomputed(values, lib))
+        count += 1
+
+    return count
@@ -0,0 +1,182 @@
+"""
+Higher timeframe bars from lower timeframe bars
+
+A new higher timeframe bar starts where `timeframe.change` of the library detects a change, so the
+bars respect the sessions and the anchor points of the symbol the same way. `HTFAggregator` builds the
+bars in the bar loop of a script (e.g. for `request.security`), `resample` and `resample_file` build
+them from data files, `resample_file` caches them in an .ohlcv file.
+"""
+from typing import Iterable, Iterator, Any
+from types import FunctionType
+from dataclasses import replace
+from pathlib import Path
+
+from ..types.ohlcv import OHLCV
+from .syminfo import SymInfo
+from .ohlcv_file import OHLCVReader, OHLCVWriter
+
+__all__ = ['HTFAggregator', 'resample', 'resample_file', 'resampled_path']
+
+
+def _change_function() -> FunctionType:
+    """
+    Create an instance of `timeframe.change` with its own persistent state
+    """
+    from ..lib import timeframe
+    func = timeframe.change
+    return FunctionType(func.__code__, dict(func.__globals__), func.__name__, func.__defaults__, func.__closure__)
+
+
+def _change_state_names(change: FunctionType) -> list[str]:
+    return change.__globals__['__persistent_function_vars__']['change']
+
+
+class HTFAggregator:
+    """
+    Streaming aggregator of higher timeframe bars
+
+    It is updated with every bar of the chart, the library must be in the context of the bar (`bar_index`,
+    time, symbol information), because the start of a new bar is detected by `timeframe.change`. A bar is
+    confirmed when the next one starts, so only confirmed bars are final (non-repainting).
+    """
+
+    __slots__ = ('timeframe', 'bar_index', 'index', 'bar', 'confirmed', '_base', '_change')
+
+    def __init__(self, timeframe: str):
+        """
+        :param timeframe: The higher timeframe in TradingView format
+        """
+        self.timeframe = timeframe
+        # The index of the last chart bar
+        self.bar_index = -1
+        # The index of the last confirmed bar, -1 if there is no confirmed bar yet
+        self.index = -1
+        # The open bar, it contains the last chart bar
+        self.bar: OHLCV | None = None
+        # The last confirmed bar
+        self.confirmed: OHLCV | None = None
+        # The open bar before the last chart bar, updates of the same chart bar are applied on it
+        self._base: OHLCV | None = None
+        self._change = _change_function()
+
+    def update(self, candle: OHLCV, bar_index: int) -> bool:
+        """
+        Add a bar of the chart. It can be called again with updates of the same bar (realtime), then the
+        open bar is recalculated from its state before the chart bar.
+
+        :param candle: The bar of the chart
+        :param bar_index: The index of the bar of the chart
+        :return: True if a bar was confirmed by this chart bar
+        """
+        confirmed = False
+        if bar_index != self.bar_index:
+            self.bar_index = bar_index
+            if self._change(self.timeframe) and self.bar is not None:
+                self.confirmed = self.bar
+                self.index += 1
+                self._base = None
+                confirmed = True
+            else:
+                self._base = self.bar
+
+        base = self._base
+        if base is None:
+            self.bar = candle._replace(extra_fields=None)
+        else:
+            self.bar = OHLCV(timestamp=base.timestamp, open=base.open,
+                             high=max(base.high, candle.high), low=min(base.low, candle.low),
+                             close=candle.close, volume=base.volume + candle.volume)
+        return confirmed
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = {name: getattr(self, name) for name in self.__slots__ if name != '_change'}
+        change_globals = self._change.__globals__
+        state['_change'] = {name: change_globals[name] for name in _change_state_names(self._change)}
+        return state
+
+    def __setstate__(self, state: dict[str, Any]):
+        state = dict(state)
+        change_state = state.pop('_change')
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._change = _change_function()
+        self._change.__globals__.update(change_state)
+
+
+# noinspection PyProtectedMember
+def resample(ohlcv_iter: Iterable[OHLCV], timeframe: str, syminfo: SymInfo) -> Iterator[OHLCV]:
+    """
+    Build higher timeframe bars from the bars of a symbol. It sets the library into the context of
+    the bars, so it must not be used while a script is running.
+
+    :param ohlcv_iter: The bars of the symbol
+    :param timeframe: The higher timeframe in TradingView format
+    :param syminfo: The symbol information of the bars
+    :return: The higher timeframe bars, the last one may not be complete
+    :raises ValueError: If the timeframe is lower than the timeframe of the bars
+    """
+    from .. import lib
+    from ..lib.timeframe import in_seconds
+    from .script_runner import _set_lib_properties, _set_lib_syminfo_properties
+
+    if in_seconds(timeframe) < in_seconds(syminfo.period):
+        raise ValueError(f"Timeframe '{timeframe}' is lower than the timeframe of the data ({syminfo.period})!")
+
+    _set_lib_syminfo_properties(syminfo, lib)
+    tz = lib._parse_timezone(lib.syminfo.timezone)
+
+    aggregator = HTFAggregator(timeframe)
+    for bar_index, candle in enumerate(ohlcv_iter):
+        _set_lib_properties(candle, bar_index, tz, lib)
+        if aggregator.update(candle, bar_index):
+            assert aggregator.confirmed is not None
+            yield aggregator.confirmed
+    if aggregator.bar is not None:
+        yield aggregator.bar
+
+
+def resampled_path(data_path: Path, timeframe: str) -> Path:
+    """
+    The path of the cached higher timeframe data of a data file
+
+    :param data_path: The path of the .ohlcv file
+    :param timeframe: The higher timeframe in TradingView format
+    :return: The path of the higher timeframe .ohlcv file
+    """
+    return data_path.with_name(f"{data_path.stem}@{timeframe}.ohlcv")
+
+
+def resample_file(data_path: Path, timeframe: str, output_path: Path | None = None) -> Path:
+    """
+    Build higher timeframe bars from an .ohlcv file and save them with their symbol information (toml).
+    The file is built only if it does not exist or the data file is newer.
+
+    :param data_path: The path of the .ohlcv file, its symbol information is the toml file with the same name
+    :param timeframe: The higher timeframe in TradingView format
+    :param output_path: The path of the higher timeframe .ohlcv file, if None, it is next to the data file
+                        (see `resampled_path`)
+    :return: The path of the higher timeframe .ohlcv file
+    :raises FileNotFoundError: If the data file or its symbol information is not found
+    :raises ValueError: If the timeframe is lower than the timeframe of the data
+    """
+    if output_path is None:
+        output_path = resampled_path(data_path, timeframe)
+    toml_path = output_path.with_suffix(".toml")
+
+    data_mtime = data_path.stat().st_mtime
+    try:
+        if output_path.stat().st_mtime >= data_mtime and toml_path.exists():
+            return output_path
+    except FileNotFoundError:
+        pass
+
+    syminfo = SymInfo.load_toml(data_path.with_suffix(".toml"))
+    # Write to a temporary file, so an interrupted run does not leave a partial cache
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    with OHLCVReader(str(data_path)) as reader, OHLCVWriter(tmp_path) as writer:
+        for bar in resample(reader.read_from(reader.start_timestamp, reader.end_timestamp), timeframe, syminfo):
+            writer.write(bar)
+    replace(syminfo, period=timeframe).save_toml(toml_path)
+    tmp_path.replace(output_path)
+    return output_path
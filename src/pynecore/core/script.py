@@ -444,7 +444,7 @@ class Script:
         script.dynamic_requests = dynamic_requests
         script.behind_chart = behind_chart
 
-        script.position = _strategy.Position()
+        script.position = _strategy.Position(risk_free_rate)
 
         return script._decorate()
 
@@ -1,12 +1,18 @@
-from typing import Iterable, Iterator, Callable, TYPE_CHECKING, Any
+from typing import Iterable, Iterator, AsyncIterable, AsyncIterator, Callable, TYPE_CHECKING, Any
 from types import ModuleType
+from inspect import signature
+from itertools import dropwhile
 import sys
 from pathlib import Path
 from datetime import datetime, UTC
 
 from pynecore.types.ohlcv import OHLCV
 from pynecore.core.syminfo import SymInfo
+from pynecore.core.session_calendar import SessionCalendar
 from pynecore.core.csv_file import CSVWriter
+from pynecore.core.plot_file import PlotWriter, PLOT_SUFFIX
+from pynecore.core.checkpoint import Checkpoint, fingerprint
+from pynecore.core.state_journal import StateJournal, copy_state_value
 
 from pynecore.types import script_type
 
@@ -86,10 +92,68 @@ def _set_lib_syminfo_properties(syminfo: SymInfo, lib: ModuleType):
 
     lib.syminfo.root = syminfo.ticker
     lib.syminfo.ticker = syminfo.prefix + ':' + syminfo.ticker
+    lib.syminfo.tickerid = lib.syminfo.ticker
 
     lib.syminfo._opening_hours = syminfo.opening_hours
     lib.syminfo._session_starts = syminfo.session_starts
     lib.syminfo._session_ends = syminfo.session_ends
+    # The calendar and its caches are kept while the sessions are the same (e.g. if syminfo is updated in
+    # every run), it is in the local time of the exchange, so it does not depend on the timezone
+    sessions = (tuple(syminfo.opening_hours), tuple(syminfo.session_starts), tuple(syminfo.session_ends))
+    if lib.syminfo._calendar.sessions != sessions:
+        lib.syminfo._calendar = SessionCalendar(syminfo.opening_hours, syminfo.session_starts,
+                                                syminfo.session_ends)
+
+
+def _state_names(module_globals: dict[str, Any]) -> list[str]:
+    """
+    Get the names of the persistent and series globals of a module
+    """
+    return [key for key in module_globals
+            if (key.startswith('__persistent_') or key.startswith('__series_')) and not key.endswith('_vars__')]
+
+
+def _snapshot_state(module_globals: dict[str, Any]) -> dict[str, Any]:
+    """
+    Copy the persistent and series globals of a module, so the module can be reset to this state later
+    (copied, because mutable values are modified in place by the runs)
+    """
+    return {key: copy_state_value(module_globals[key]) for key in _state_names(module_globals)}
+
+
+def _restore_state(module_globals: dict[str, Any], state: dict[str, Any]) -> None:
+    """
+    Reset the globals of a module to a state saved by `_snapshot_state`, series are recreated empty
+    """
+    from .series import SeriesImpl
+
+    for key, value in state.items():
+        if isinstance(value, SeriesImpl):
+            # noinspection PyProtectedMember
+            module_globals[key] = type(value)(value._max_bars_back)
+        else:
+            module_globals[key] = copy_state_value(value)
+
+
+def _convert_input_value(value: Any, input_type: str | None) -> Any:
+    """
+    Convert an input value to the type of the input, the same way as it would be loaded from toml
+    """
+    from . import safe_convert
+    if input_type == 'int':
+        return safe_convert.safe_int(value)
+    if input_type == 'float':
+        return safe_convert.safe_float(value)
+    if input_type == 'bool':
+        if isinstance(value, str):
+            return value.strip().lower() in ('true', '1', 'yes', 'on')
+        return bool(value)
+    if input_type in ('string', 'str', 'source'):
+        return str(value)
+    if input_type == 'color' and isinstance(value, str):
+        from ..types.color import Color
+        return Color(value)
+    return value
 
 
 class ScriptRunner:
@@ -98,28 +162,49 @@ class ScriptRunner:
     """
 
     __slots__ = ('script_module', 'script', 'ohlcv_iter', 'syminfo', 'update_syminfo_every_run',
-                 'bar_index', 'tz', 'plot_writer', 'strat_writer', 'equity_writer', 'last_bar_index')
+                 'bar_index', 'tz', 'plot_writer', 'strat_writer', 'equity_writer', 'last_bar_index',
+                 'precompute', 'fast', 'checkpoint_path', 'resume', '_initial_state', '_initial_library_state',
+                 '_initial_defaults',
+                 '_trade_num', '_last_timestamp')
 
     def __init__(self, script_path: Path, ohlcv_iter: Iterable[OHLCV], syminfo: SymInfo, *,
                  plot_path: Path | None = None, strat_path: Path | None = None,
                  equity_path: Path | None = None,
-                 update_syminfo_every_run: bool = False, last_bar_index=0):
+                 update_syminfo_every_run: bool = False, last_bar_index=0, precompute: bool = False,
+                 fast: bool = False, checkpoint_path: Path | None = None, resume: bool = False):
         """
         Initialize the script runner
 
         :param script_path: The path to the script to run
         :param ohlcv_iter: Iterator of OHLCV data
         :param syminfo: Symbol information
-        :param plot_path: Path to save the plot data
+        :param plot_path: Path to save the plot data, CSV or binary plot file (`.plot`, see `PlotWriter`)
         :param strat_path: Path to save the strategy results
         :param equity_path: Path to save the equity data of the strategy
         :param update_syminfo_every_run: If it is needed to update the syminfo lib in every run,
                                          needed for parallel script executions
         :param last_bar_index: Last bar index, the index of the last bar of the historical data
+        :param precompute: Precompute bar-invariant ta calls in a vectorized way before running,
+                           `ohlcv_iter` must be an `OHLCVColumns` object (needs NumPy)
+        :param fast: Fast backtest mode for strategies: the bars without pending orders are processed in a
+                     vectorized way (see `FastPosition`), `ohlcv_iter` must be an `OHLCVColumns` object
+                     (needs NumPy)
+        :param checkpoint_path: Path to save the state of the script after the last bar
+        :param resume: Continue from the checkpoint if it is valid for the script, its inputs, the symbol and
+                       the PyneCore version: the bars up to the checkpoint are skipped, the output files are
+                       continued. If there is no valid checkpoint, the script runs from the first bar.
+        :raises ValueError: If resume is requested without checkpoint path or in precompute or fast mode
         :raises ImportError: If the script does not have a 'main' function
         :raises ImportError: If the 'main' function is not decorated with @script.[indicator|strategy|library]
         :raises OSError: If the plot file could not be opened
         """
+        if resume and not checkpoint_path:
+            raise ValueError("Resume needs a checkpoint path!")
+        if checkpoint_path and precompute:
+            raise ValueError("Checkpoints can't be used in precompute mode!")
+        if checkpoint_path and fast:
+            raise ValueError("Checkpoints can't be used in fast mode!")
+
         self.script_module = import_script(script_path)
 
         if not hasattr(self.script_module.main, 'script'):
@@ -128,6 +213,15 @@ class ScriptRunner:
 
         self.script: script = self.script_module.main.script
 
+        # Save the initial state of the script and of the libraries it uses (they are registered by
+        # importing them) to be able to run it again without re-importing
+        # noinspection PyProtectedMember
+        from .script import _registered_libraries
+        self._initial_state = _snapshot_state(self.script_module.__dict__)
+        self._initial_library_state = [(main_func.__globals__, _snapshot_state(main_func.__globals__))
+                                       for _, main_func in _registered_libraries]
+        self._initial_defaults = self.script_module.main.__defaults__
+
         # noinspection PyProtectedMember
         from ..lib import _parse_timezone
 
@@ -135,18 +229,38 @@ class ScriptRunner:
         self.syminfo = syminfo
         self.update_syminfo_every_run = update_syminfo_every_run
         self.last_bar_index = last_bar_index
+        self.precompute = precompute
+        self.fast = fast
+        self.checkpoint_path = checkpoint_path
+        self.resume = resume
         self.bar_index = 0
+        self._trade_num = 0
+        self._last_timestamp = -1
 
         self.tz = _parse_timezone(syminfo.timezone)
 
-        self.plot_writer = CSVWriter(
-            plot_path, float_fmt=f".{self.script.precision or 8}g"
-        ) if plot_path else None
-        self.strat_writer = CSVWriter(strat_path) if strat_path else None
+        self.set_output_paths(plot_path=plot_path, strat_path=strat_path, equity_path=equity_path)
+
+    def set_output_paths(self, *, plot_path: Path | None = None, strat_path: Path | None = None,
+                         equity_path: Path | None = None):
+        """
+        Set the output files of the next run, outputs without path are not written
+
+        :param plot_path: Path to save the plot data, CSV or binary plot file (`.plot`, see `PlotWriter`)
+        :param strat_path: Path to save the strategy results
+        :param equity_path: Path to save the equity data of the strategy
+        """
+        currency = self.syminfo.currency
+        self.plot_writer: CSVWriter | PlotWriter | None = None
+        if plot_path and plot_path.suffix == PLOT_SUFFIX:
+            self.plot_writer = PlotWriter(plot_path)
+        elif plot_path:
+            self.plot_writer = CSVWriter(plot_path, float_fmt=f".{self.script.precision or 8}g")
+        self.strat_writer = CSVWriter(strat_path, headers=("Statistic", "Value")) if strat_path else None
         self.equity_writer = CSVWriter(equity_path, headers=(
-            "Trade #", "Bar Index", "Type", "Signal", "Date/Time", f"Price {syminfo.currency}",
-            "Contracts", f"Profit {syminfo.currency}", "Profit %", f"Cumulative profit {syminfo.currency}",
-            "Cumulative profit %", f"Run-up {syminfo.currency}", "Run-up %", f"Drawdown {syminfo.currency}",
+            "Trade #", "Bar Index", "Type", "Signal", "Date/Time", f"Price {currency}",
+            "Contracts", f"Profit {currency}", "Profit %", f"Cumulative profit {currency}",
+            "Cumulative profit %", f"Run-up {currency}", "Run-up %", f"Drawdown {currency}",
             "Drawdown %",
         )) if equity_path else None
 
@@ -159,9 +273,10 @@ class ScriptRunner:
         :param on_progress: Callback to call on every iteration
         :return: Return a dictionary with all data the sctipt plotted
         :raises AssertionError: If the 'main' function does not return a dictionary
+        :raises ValueError: If precompute or fast mode is enabled, but the data is not columnar
         """
         from .. import lib
-        from ..lib import _parse_timezone, barstate, string
+        from ..lib import _parse_timezone, barstate
         from pynecore.core import function_isolation
         from . import script
 
@@ -172,6 +287,28 @@ class ScriptRunner:
         # Reset function isolation
         function_isolation.reset()
 
+        # Precompute bar-invariant ta calls on the whole data
+        if self.precompute:
+            from .ohlcv_columns import OHLCVColumns
+            from .precompute import precompute_calls
+            if not isinstance(self.ohlcv_iter, OHLCVColumns):
+                raise ValueError("Precompute mode needs columnar data (OHLCVColumns)!")
+            precompute_calls(self.script_module, self.ohlcv_iter)
+
+        # Trade counter
+        trade_num = 0
+        self._last_timestamp = -1
+
+        # Continue from the checkpoint if there is a valid one
+        checkpoint = self._load_checkpoint(is_strat) if self.resume else None
+        ohlcv_iter = self.ohlcv_iter
+        if checkpoint:
+            self._restore_checkpoint(checkpoint)
+            trade_num = checkpoint.trade_num
+            barstate.isfirst = False
+            # Skip the bars which are already processed
+            ohlcv_iter = dropwhile(lambda c: c.timestamp <= checkpoint.timestamp, ohlcv_iter)
+
         # Set script data
         lib._script = self.script  # Store script object in lib
 
@@ -182,25 +319,27 @@ class ScriptRunner:
 
         # Open plot writer if we have one
         if self.plot_writer:
-            self.plot_writer.open()
+            self.plot_writer.open(*checkpoint.writers['plot'] if checkpoint else ())
 
         # If the script is a strategy, we open strategy output files too
         if is_strat:
             # Open equity writer if we have one
             if self.equity_writer:
-                self.equity_writer.open()
+                self.equity_writer.open(*checkpoint.writers['equity'] if checkpoint else ())
 
         # Clear plot data
         lib._plot_data.clear()
 
-        # Trade counter
-        trade_num = 0
-
         # Position shortcut
+        if is_strat:
+            self._prepare_position()
         position = self.script.position
 
+        # The last processed bar
+        candle = None
+
         try:
-            for candle in self.ohlcv_iter:
+            for candle in ohlcv_iter:
                 # Update syminfo lib properties if needed, other ScriptRunner instances may have changed them
                 if self.update_syminfo_every_run:
                     _set_lib_syminfo_properties(self.syminfo, lib)
@@ -235,12 +374,7 @@ class ScriptRunner:
 
                 # Write plot data to CSV if we have a writer
                 if self.plot_writer and lib._plot_data:
-                    # Create a new dictionary combining extra_fields (if any) with plot data
-                    extra_fields = {} if candle.extra_fields is None else dict(candle.extra_fields)
-                    extra_fields.update(lib._plot_data)
-                    # Create a new OHLCV instance with updated extra_fields
-                    updated_candle = candle._replace(extra_fields=extra_fields)
-                    self.plot_writer.write_ohlcv(updated_candle)
+                    self._write_plot(candle, lib._plot_data)
 
                 # Yield plot data to be able to process in a subclass
                 if not is_strat:
@@ -249,43 +383,8 @@ class ScriptRunner:
                     yield candle, lib._plot_data, position.new_closed_trades
 
                 # Save equity data if we have a writer
-                if is_strat and self.equity_writer and position:
-                    for trade in position.new_closed_trades:
-                        trade_num += 1  # Start from 1
-                        self.equity_writer.write(
-                            trade_num,
-                            trade.entry_bar_index,
-                            "Entry long" if trade.size > 0 else "Entry short",
-                            trade.entry_id,
-                            string.format_time(trade.entry_time),  # type: ignore
-                            trade.entry_price,
-                            abs(trade.size),
-                            trade.profit,
-                            f"{trade.profit_percent:.2f}",
-                            trade.cum_profit,
-                            f"{trade.cum_profit_percent:.2f}",
-                            trade.max_runup,
-                            f"{trade.max_runup_percent:.2f}",
-                            trade.max_drawdown,
-                            f"{trade.max_drawdown_percent:.2f}",
-                        )
-                        self.equity_writer.write(
-                            trade_num,
-                            trade.exit_bar_index,
-                            "Exit long" if trade.size > 0 else "Exit short",
-                            trade.exit_id,
-                            string.format_time(trade.exit_time),  # type: ignore
-                            trade.exit_price,
-                            abs(trade.size),
-                            trade.profit,
-                            f"{trade.profit_percent:.2f}",
-                            trade.cum_profit,
-                            f"{trade.cum_profit_percent:.2f}",
-                            trade.max_runup,
-                            f"{trade.max_runup_percent:.2f}",
-                            trade.max_drawdown,
-                            f"{trade.max_drawdown_percent:.2f}",
-                        )
+                if is_strat and self.equity_writer and position and position.new_closed_trades:
+                    trade_num = self._write_trades(position.new_closed_trades, trade_num)
 
                 # Clear plot data
                 lib._plot_data.clear()
@@ -300,12 +399,26 @@ class ScriptRunner:
                 # It is no longer the first bar
                 barstate.isfirst = False
 
+            # Save the state after the last bar
+            if self.checkpoint_path and candle is not None:
+                self._save_checkpoint(candle.timestamp, trade_num, is_strat)
+
+            # Write the performance statistics of the strategy
+            if is_strat and self.strat_writer and position:
+                self._write_report()
+
             if on_progress:
                 on_progress(datetime.max)
 
         except GeneratorExit:
             pass
         finally:  # Python reference counter will close this even if the iterator is not exhausted
+            # Needed to continue in realtime
+            self._trade_num = trade_num
+            if candle is not None:
+                self._last_timestamp = candle.timestamp
+            elif checkpoint:
+                self._last_timestamp = checkpoint.timestamp
             # Close the plot writer
             if self.plot_writer:
                 self.plot_writer.close()
@@ -313,6 +426,369 @@ class ScriptRunner:
             if self.equity_writer:
                 self.equity_writer.close()
 
+    def _prepare_position(self):
+        """
+        Use a `FastPosition` in fast mode, and a normal one otherwise
+        """
+        from .fast_backtest import FastPosition
+        from .ohlcv_columns import OHLCVColumns
+
+        position = self.script.position
+        if self.fast:
+            if not isinstance(self.ohlcv_iter, OHLCVColumns):
+                raise ValueError("Fast mode needs columnar data (OHLCVColumns)!")
+            if not isinstance(position, FastPosition):
+                position = self.script.position = FastPosition(self.script.risk_free_rate)
+            position.set_columns(self.ohlcv_iter)
+        elif isinstance(position, FastPosition):
+            # Without columns it works like a normal position
+            position.set_columns(None)
+
+    # noinspection PyProtectedMember
+    async def run_realtime(self, updates: AsyncIterable[OHLCV],
+                           on_progress: Callable[[datetime], None] | None = None) \
+            -> AsyncIterator[tuple[OHLCV, dict[str, Any], bool]]:
+        """
+        Run the script on the historical data, then on the updates of the realtime bar
+
+        An update is the OHLCV of the realtime bar so far. The bar is updated until an update with a
+        later timestamp arrives, then it is calculated once more with its last update as a confirmed
+        bar. Every calculation of the realtime bar starts from the state of the last confirmed bar
+        (rollback), like in Pine. Strategies are calculated only on confirmed bars (like Pine
+        strategies by default). Only confirmed bars are written to the output files, and they are written
+        at once (not buffered).
+
+        :param updates: Async iterator of the updates of the realtime bar, the updates of bars which
+                        are already confirmed (e.g. the last historical bar) are ignored
+        :param on_progress: Callback to call on every confirmed bar
+        :return: The bar (or its update), the plot data and if the bar is confirmed
+        :raises AssertionError: If the 'main' function does not return a dictionary
+        :raises ValueError: In precompute mode, the precomputed values end with the historical data
+        """
+        if self.precompute:
+            raise ValueError("Realtime can't be used in precompute mode!")
+
+        from .. import lib
+        from ..lib import _parse_timezone, barstate
+        from pynecore.core import function_isolation
+        from . import script
+
+        is_strat = self.script.script_type == script_type.strategy
+
+        # Historical bars
+        for candle, plot_data, *_ in self.run_iter(on_progress=on_progress):
+            yield candle, plot_data, True
+
+        position = self.script.position if is_strat else None
+        trade_num = self._trade_num
+
+        # Continue the output files
+        if self.plot_writer:
+            self.plot_writer.open(self.plot_writer.path.stat().st_size)
+        if is_strat and self.equity_writer:
+            self.equity_writer.open(self.equity_writer.path.stat().st_size)
+
+        # Journal of the state of the last confirmed bar
+        journal = StateJournal()
+        journal.track(self.script_module.__dict__, self._initial_state)
+        for library_title, main_func in script._registered_libraries:
+            journal.track(main_func.__globals__, _state_names(main_func.__globals__))
+        for instance_globals, names in function_isolation.get_instance_globals():
+            journal.track(instance_globals, names)
+        # Function instances created on the realtime bar are tracked from their initial state
+        function_isolation.set_instance_hook(journal.track)
+
+        def calculate(bar_update: OHLCV, confirmed: bool, isnew: bool) -> bool:
+            """
+            Calculate the realtime bar from the state of the last confirmed bar
+
+            :return: True if the script was run
+            """
+            journal.rollback()
+            if is_strat and not confirmed:
+                return False
+            if self.update_syminfo_every_run:
+                _set_lib_syminfo_properties(self.syminfo, lib)
+                self.tz = _parse_timezone(lib.syminfo.timezone)
+
+            barstate._isconfirmed = confirmed
+            barstate._isnew = isnew
+            _set_lib_properties(bar_update, self.bar_index, self.tz, lib)
+            function_isolation.reset_step()
+
+            if position:
+                position.process_orders()
+
+            lib._lib_semaphore = True
+            for _, library_main in script._registered_libraries:
+                library_main()
+            lib._lib_semaphore = False
+
+            res = self.script_module.main()
+            if res is not None:
+                assert isinstance(res, dict), "The 'main' function must return a dictionary!"
+                lib._plot_data.update(res)
+            return True
+
+        barstate._isrealtime = True
+        barstate.islast = True
+        lib._plot_data.clear()
+
+        # The last update of the realtime bar and if it has been calculated already
+        bar: OHLCV | None = None
+        calculated = False
+        try:
+            async for update in updates:
+                if update.timestamp <= self._last_timestamp:
+                    continue
+
+                # A new bar, the last update of the previous one is its closing state
+                if bar is not None and update.timestamp > bar.timestamp:
+                    if calculate(bar, True, not calculated):
+                        if self.plot_writer and lib._plot_data:
+                            self._write_plot(bar, lib._plot_data)
+                            # Realtime bars are not buffered, the file can be followed while running
+                            if isinstance(self.plot_writer, PlotWriter):
+                                self.plot_writer.flush()
+                        yield bar, lib._plot_data, True
+                        if position and self.equity_writer and position.new_closed_trades:
+                            trade_num = self._write_trades(position.new_closed_trades, trade_num)
+                        lib._plot_data.clear()
+                    journal.commit()
+                    self._last_timestamp = bar.timestamp
+
+                    if on_progress:
+                        assert lib._datetime is not None
+                        on_progress(lib._datetime.replace(tzinfo=None))
+
+                    self.bar_index += 1
+                    barstate.isfirst = False
+                    calculated = False
+
+                elif bar is not None and update.timestamp < bar.timestamp:
+                    continue  # Late update of a previous bar
+
+                bar = update
+                if calculate(bar, False, not calculated):
+                    calculated = True
+                    yield bar, lib._plot_data, False
+                    lib._plot_data.clear()
+
+        finally:
+            # Restore the state of the last confirmed bar
+            function_isolation.set_instance_hook(None)
+            journal.rollback()
+            journal.close()
+            lib._plot_data.clear()
+            barstate._isrealtime = False
+            barstate._isconfirmed = True
+            barstate._isnew = False
+            self._trade_num = trade_num
+            if self.plot_writer:
+                self.plot_writer.close()
+            if self.equity_writer:
+                self.equity_writer.close()
+
+    def _write_report(self):
+        """
+        Write the performance statistics of the strategy to the strategy results file
+        """
+        from .optimizer import collect_stats
+
+        assert self.strat_writer is not None
+        with self.strat_writer:
+            for name, value in collect_stats(self).items():
+                self.strat_writer.write(name, value)
+
+    def _write_plot(self, candle: OHLCV, plot_data: dict[str, Any]):
+        """
+        Write the plot data of a bar to the plot file
+        """
+        assert self.plot_writer is not None
+        if isinstance(self.plot_writer, PlotWriter):
+            self.plot_writer.write_bar(candle, plot_data)
+            return
+        # Create a new dictionary combining extra_fields (if any) with plot data
+        extra_fields = {} if candle.extra_fields is None else dict(candle.extra_fields)
+        extra_fields.update(plot_data)
+        # Create a new OHLCV instance with updated extra_fields
+        self.plot_writer.write_ohlcv(candle._replace(extra_fields=extra_fields))
+
+    def _write_trades(self, trades: list['Trade'], trade_num: int) -> int:
+        """
+        Write the closed trades to the equity file
+
+        :param trades: The new closed trades
+        :param trade_num: The number of the last written trade
+        :return: The number of the last written trade
+        """
+        from ..lib import string
+
+        assert self.equity_writer is not None
+        for trade in trades:
+            trade_num += 1  # Start from 1
+            self.equity_writer.write(
+                trade_num,
+                trade.entry_bar_index,
+                "Entry long" if trade.size > 0 else "Entry short",
+                trade.entry_id,
+                string.format_time(trade.entry_time),  # type: ignore
+                trade.entry_price,
+                abs(trade.size),
+                trade.profit,
+                f"{trade.profit_percent:.2f}",
+                trade.cum_profit,
+                f"{trade.cum_profit_percent:.2f}",
+                trade.max_runup,
+                f"{trade.max_runup_percent:.2f}",
+                trade.max_drawdown,
+                f"{trade.max_drawdown_percent:.2f}",
+            )
+            self.equity_writer.write(
+                trade_num,
+                trade.exit_bar_index,
+                "Exit long" if trade.size > 0 else "Exit short",
+                trade.exit_id,
+                string.format_time(trade.exit_time),  # type: ignore
+                trade.exit_price,
+                abs(trade.size),
+                trade.profit,
+                f"{trade.profit_percent:.2f}",
+                trade.cum_profit,
+                f"{trade.cum_profit_percent:.2f}",
+                trade.max_runup,
+                f"{trade.max_runup_percent:.2f}",
+                trade.max_drawdown,
+                f"{trade.max_drawdown_percent:.2f}",
+            )
+        return trade_num
+
+    def _fingerprint(self) -> str:
+        """
+        The fingerprint of the script with the current inputs and symbol, checkpoints are valid only for it
+        """
+        script_source = Path(self.script_module.__file__).read_bytes()
+        return fingerprint(script_source, self.script_module.main.__defaults__, self.syminfo)
+
+    def _load_checkpoint(self, is_strat: bool) -> Checkpoint | None:
+        """
+        Load the checkpoint if it is valid and the output files can be continued from it
+        """
+        assert self.checkpoint_path is not None
+        checkpoint = Checkpoint.load(self.checkpoint_path, self._fingerprint())
+        if checkpoint is None:
+            return None
+        writers = [('plot', self.plot_writer)]
+        if is_strat:
+            writers.append(('equity', self.equity_writer))
+        for name, writer in writers:
+            if writer is None:
+                continue
+            # The output file must be the one written by the checkpointed run (or a longer one)
+            try:
+                size, _ = checkpoint.writers[name]
+                if writer.path.stat().st_size < size:
+                    return None
+            except (KeyError, OSError):
+                return None
+        return checkpoint
+
+    # noinspection PyProtectedMember
+    def _restore_checkpoint(self, checkpoint: Checkpoint):
+        """
+        Restore the state of the script from the checkpoint
+        """
+        from pynecore.core import function_isolation
+        from . import script
+
+        self.script_module.__dict__.update(checkpoint.module_state)
+        for library_title, main_func in script._registered_libraries:
+            try:
+                main_func.__globals__.update(checkpoint.library_state[library_title])
+            except KeyError:
+                pass
+        function_isolation.restore_state(checkpoint.function_state)
+        if checkpoint.position is not None:
+            self.script.position = checkpoint.position
+        self.bar_index = checkpoint.bar_index + 1
+
+    # noinspection PyProtectedMember
+    def _save_checkpoint(self, timestamp: int, trade_num: int, is_strat: bool):
+        """
+        Save the state of the script after the last bar, the output files are closed to know their sizes
+        """
+        from pynecore.core import function_isolation
+        from . import script
+
+        assert self.checkpoint_path is not None
+        writers = {}
+        for name, writer in (('plot', self.plot_writer), ('equity', self.equity_writer if is_strat else None)):
+            if writer is not None:
+                writer.close()
+                writers[name] = (writer.path.stat().st_size, writer.headers)
+
+        module_globals = self.script_module.__dict__
+        library_state = {}
+        for library_title, main_func in script._registered_libraries:
+            library_globals = main_func.__globals__
+            library_state[library_title] = {key: library_globals[key] for key in _state_names(library_globals)}
+
+        Checkpoint(
+            self._fingerprint(), self.bar_index - 1, timestamp,
+            trade_num=trade_num,
+            module_state={key: module_globals[key] for key in self._initial_state},
+            library_state=library_state,
+            function_state=function_isolation.get_state(),
+            position=self.script.position,
+            writers=writers,
+        ).save(self.checkpoint_path)
+
+    def set_inputs(self, **values: Any):
+        """
+        Override input values of the script for the next run. Inputs which are not specified will
+        use their original values (from the script or from the toml file).
+
+        :param values: Input values by input id (the argument name of the `main` function)
+        :raises KeyError: If the script has no input with the given id
+        """
+        main = self.script_module.main
+        params = list(signature(main).parameters)
+        defaults = list(self._initial_defaults or ())
+        # Defaults belong to the last parameters
+        offset = len(params) - len(defaults)
+
+        for input_id, value in values.items():
+            try:
+                index = params.index(input_id) - offset
+            except ValueError:
+                index = -1
+            if index < 0 or input_id not in self.script.inputs:
+                raise KeyError(f"Script has no input '{input_id}'!")
+            defaults[index] = _convert_input_value(value, self.script.inputs[input_id].input_type)
+
+        main.__defaults__ = tuple(defaults)
+
+    # noinspection PyProtectedMember
+    def reset(self):
+        """
+        Reset the state of the script and of its libraries to the state right after import, so it can
+        be run again on the same or on another data without re-importing it
+        """
+        from .. import lib
+        from ..lib import barstate
+
+        _restore_state(self.script_module.__dict__, self._initial_state)
+        for library_globals, state in self._initial_library_state:
+            _restore_state(library_globals, state)
+
+        if self.script.position:
+            self.script.position.reset()
+
+        barstate.isfirst = True
+        barstate.islast = False
+        lib._plot_data.clear()
+        self.bar_index = 0
+
     def run(self, on_progress: Callable[[datetime], None] | None = None):
         """
         Run the script on the data
@@ -1,13 +1,17 @@
 from __future__ import annotations
-from typing import TypeVar, Generic, Iterator
+from typing import TypeVar, Generic, Iterator, Any, Callable
 
 from types import ModuleType
+from array import array
+import math
 
 # noinspection PyProtectedMember
 from ..types.na import NA
 
 T = TypeVar('T')
 
+__all__ = ['SeriesImpl', 'FloatSeriesImpl', 'IntSeriesImpl', 'BoolSeriesImpl', 'ReadOnlySeriesView']
+
 
 class SeriesImpl(Generic[T]):
     """
@@ -21,7 +25,7 @@ class SeriesImpl(Generic[T]):
     __slots__ = ('_buffer',
                  '_max_bars_back', '_max_bars_back_set',
                  '_capacity', '_write_pos', '_size',
-                 '_last_bar_index')
+                 '_last_bar_index', '_evicted')
 
     DEFAULT_MAX_BARS_BACK = 500  # This can be set globally by indicator or strategy commands
     MAXIMUM_MAX_BARS_BACK = 5000  # This is the maximum allowed value
@@ -57,6 +61,11 @@ class SeriesImpl(Generic[T]):
         # The last bar index that was accessed
         self._last_bar_index = -1
 
+        # The value overwritten by the last add, valid only if the buffer is full and has been wrapped
+        # (`_write_pos > _capacity`). It is the value of the index `_capacity`, which is kept if the
+        # buffer grows (see `_grow`).
+        self._evicted: Any = None
+
     @property
     def max_bars_back(self) -> int:
         """
@@ -141,7 +150,9 @@ class SeriesImpl(Generic[T]):
         else:
             # The buffer is full: overwrite in circular fashion
             pos = self._write_pos % self._capacity
-            self._buffer[pos] = value
+            buffer = self._buffer
+            self._evicted = buffer[pos]
+            buffer[pos] = value
             self._write_pos += 1
 
         # Store the last bar index to prevent adding more than one value per bar
@@ -163,6 +174,47 @@ class SeriesImpl(Generic[T]):
         self._buffer[pos] = value
         return value
 
+    def mark(self) -> tuple:
+        """
+        Get the current position of the series, the series can be rolled back to it by `rollback`.
+        Only the value which is overwritten by the next `add` is saved, so it is O(1).
+
+        :return: The mark of the current position
+        """
+        oldest = self._buffer[self._write_pos % self._capacity] if self._size == self._capacity else None
+        return (type(self), self._capacity, self._write_pos, self._size, self._last_bar_index, oldest,
+                self._evicted)
+
+    def rollback(self, mark: tuple) -> None:
+        """
+        Roll back to a position saved by `mark`, the value added since then (at most one, the
+        series is not advanced more than once per bar) is dropped.
+
+        :param mark: The mark returned by `mark`
+        """
+        cls, capacity, write_pos, size, last_bar_index, oldest, evicted = mark
+        if self._last_bar_index == last_bar_index:
+            return  # Nothing was added
+        self._evicted = evicted
+
+        buffer = self._buffer
+        if cls is type(self) and capacity == self._capacity:
+            self._write_pos = write_pos
+            self._size = size
+            if size == capacity:
+                # Restore the value which was overwritten
+                pos = write_pos % capacity
+                buffer[pos] = oldest
+                if not isinstance(buffer, list):
+                    buffer[pos + capacity] = oldest
+        else:
+            # The buffer has been linearized since the mark, the newest value is the last one
+            self._write_pos -= 1
+            self._size -= 1
+        if isinstance(buffer, list):
+            del buffer[self._size:]
+        self._last_bar_index = last_bar_index
+
     def __getitem__(self, key: int | slice) -> T | NA[T] | ReadOnlySeriesView[T]:
         """
         Get item(s) using Pine indexing with slice support.
@@ -177,7 +229,9 @@ class SeriesImpl(Generic[T]):
             if key < 0:
                 raise IndexError("Negative indices not supported!")
             if key >= self._size:
-                return NA(T)
+                # After growing the index may be available (see `_grow`)
+                if key < self._capacity or not self._grow(key) or key >= self._size:
+                    return NA(T)
             pos = (self._write_pos - 1 - key) % self._capacity
             return self._buffer[pos]
 
@@ -193,7 +247,8 @@ class SeriesImpl(Generic[T]):
                 raise ValueError("Step value not supported in slice!")
 
             if stop > self._size:
-                raise IndexError("Slice stop index out of range!")
+                if stop <= self._capacity or not self._grow(stop - 1) or stop > self._size:
+                    raise IndexError("Slice stop index out of range!")
 
             # Ensure start <= stop
             if start > stop:
@@ -210,6 +265,37 @@ class SeriesImpl(Generic[T]):
 
         raise TypeError("Series indices must be integers or slices")
 
+    def _grow(self, key: int) -> bool:
+        """
+        Grow the buffer if an index is out of its capacity. The max_bars_back of a series may be
+        inferred from its constant indices at compile time, this is the runtime guard for larger
+        (dynamic) indices. The value overwritten by the last add is kept, so the index of the old
+        capacity is available right after growing, older values are lost, but the next bars will
+        have enough history.
+
+        :param key: The index which is out of the capacity
+        :return: True if the buffer has been grown
+        """
+        if key > self.MAXIMUM_MAX_BARS_BACK:
+            return False
+        wrapped = self._write_pos > self._capacity
+        evicted = self._evicted
+        # Grow at least to the default and exponentially, so growing in a loop is not quadratic
+        self.max_bars_back = min(max(key, 2 * self._max_bars_back, self.DEFAULT_MAX_BARS_BACK),
+                                 self.MAXIMUM_MAX_BARS_BACK)
+        # The buffer is linearized by the resize, the evicted value is the oldest one
+        if wrapped:
+            self._prepend(evicted)
+        return True
+
+    def _prepend(self, value: Any) -> None:
+        """
+        Insert a value before the oldest one of a linearized buffer which is not full
+        """
+        self._buffer.insert(0, value)
+        self._size += 1
+        self._write_pos += 1
+
     def __len__(self) -> int:
         """
         Returns the number of valid data points in the buffer (<= capacity).
@@ -217,13 +303,269 @@ class SeriesImpl(Generic[T]):
         return self._size
 
 
+# NA values of typed series
+_NA_FLOAT = NA(float)
+_NA_INT = NA(int)
+_NA_BOOL = NA(bool)
+
+
+class TypedSeriesImpl(SeriesImpl[T]):
+    """
+    A circular buffer backed by a typed `array` instead of a list of Python objects.
+
+    NA values are stored as a sentinel value (NaN for floats), so the values are not boxed and
+    the memory usage is predictable. The buffer is allocated at once with double capacity: every
+    value is written to two positions (`pos` and `pos + capacity`), so the last N values are
+    always contiguous, and they can be accessed without copying by `window()`.
+
+    If a value cannot be stored in the array (e.g. a string in a float series), the series
+    is converted to a generic `SeriesImpl` permanently.
+    """
+
+    __slots__ = ()
+
+    TYPECODE = 'd'
+    NA_TYPE: type = float
+    NA_VALUE: Any = math.nan
+
+    def __init__(self, max_bars_back: int | None = None):
+        super().__init__(max_bars_back)
+        self._buffer = array(self.TYPECODE, (self.NA_VALUE,)) * (2 * self._capacity)  # type: ignore
+
+    @classmethod
+    def _load(cls, value: Any) -> T | NA[T]:
+        """
+        Convert a stored value to a Python value, the sentinel value to NA. This is the generic
+        implementation for subclasses which only set `TYPECODE`, `NA_TYPE` and `NA_VALUE`, the
+        built-in subclasses have faster specialized ones.
+        """
+        na_value = cls.NA_VALUE
+        # NaN is not equal to itself
+        if value == na_value or (value != value and na_value != na_value):
+            return NA(cls.NA_TYPE)
+        return cls.NA_TYPE(value)
+
+    def _degrade(self) -> None:
+        """
+        Convert to a generic `SeriesImpl`, the buffer is linearized
+        """
+        items = [self._load(v) for v in self.window(self._size)]
+        self.__class__ = SeriesImpl  # type: ignore
+        self._buffer = items
+        self._write_pos = self._size
+
+    @property
+    def max_bars_back(self) -> int:
+        """
+        Returns the current max_bars_back, i.e. how many historical bars can be indexed.
+        """
+        return self._max_bars_back
+
+    @max_bars_back.setter
+    def max_bars_back(self, new_max_bars_back: int) -> None:
+        """
+        Resizes the circular buffer capacity to (new_value + 1), the most recent items are kept.
+
+        :param new_max_bars_back: The new 'max_bars_back' value.
+        :raises ValueError: If new_value <= 0.
+        """
+        if new_max_bars_back <= 0:
+            raise ValueError("The max_bars_back must be a positive integer!")
+        if new_max_bars_back > SeriesImpl.MAXIMUM_MAX_BARS_BACK:
+            raise ValueError(f"The max_bars_back cannot exceed {self.MAXIMUM_MAX_BARS_BACK}!")
+
+        if new_max_bars_back == self._max_bars_back:
+            return  # No change
+
+        new_capacity = new_max_bars_back + 1
+        items = self.window(min(self._size, new_capacity)).tolist()
+        size = len(items)
+
+        buffer = array(self.TYPECODE, (self.NA_VALUE,)) * (2 * new_capacity)  # type: ignore
+        buffer[0:size] = array(self.TYPECODE, items)  # type: ignore
+        buffer[new_capacity:new_capacity + size] = buffer[0:size]
+
+        self._buffer = buffer
+        self._max_bars_back = new_max_bars_back
+        self._max_bars_back_set = new_max_bars_back
+        self._capacity = new_capacity
+        self._size = size
+        self._write_pos = size
+
+    def add(self, value: T | NA[T]) -> T | NA[T]:
+        """
+        Adds a new candle (data point) to the buffer, overwriting the oldest one if it is full.
+
+        :param value: The new data to be added.
+        :return: The same value that was added (for chaining or inline usage).
+        """
+        # Set data instead of adding a new one if the bar index is the same
+        if self._last_bar_index == self._lib.bar_index:
+            return self.set(value)
+
+        capacity = self._capacity
+        pos = self._write_pos % capacity
+        buffer = self._buffer
+        evicted = buffer[pos]
+        try:
+            buffer[pos] = buffer[pos + capacity] = self.NA_VALUE if isinstance(value, NA) else value
+        except (TypeError, OverflowError):
+            self._degrade()
+            return SeriesImpl.add(self, value)
+        self._evicted = evicted
+
+        self._write_pos += 1
+        if self._size < capacity:
+            self._size += 1
+
+        # Store the last bar index to prevent adding more than one value per bar
+        self._last_bar_index = self._lib.bar_index
+
+        return value
+
+    def set(self, value: T | NA[T]) -> T | NA[T]:
+        """
+        Overwrites the most recently added (current) candle value.
+        If there is no data yet, returns na.
+
+        :param value: The new value for the current candle.
+        :return: The value that was set, or na if buffer is empty.
+        """
+        if self._size == 0:
+            return NA(self.NA_TYPE)
+
+        capacity = self._capacity
+        pos = (self._write_pos - 1) % capacity
+        try:
+            self._buffer[pos] = self._buffer[pos + capacity] = self.NA_VALUE if isinstance(value, NA) else value
+        except (TypeError, OverflowError):
+            self._degrade()
+            return SeriesImpl.set(self, value)
+        return value
+
+    def __getitem__(self, key: int | slice) -> T | NA[T] | ReadOnlySeriesView[T]:
+        """
+        Get item(s) using Pine indexing with slice support.
+
+        :param key: Integer index or slice
+        :return: Single value for integer index, ReadOnlySeriesView for slice
+        :raises IndexError: If index is out of range or negative
+        :raises TypeError: If key is not int or slice
+        """
+        if isinstance(key, int):
+            if key < 0:
+                raise IndexError("Negative indices not supported!")
+            if key >= self._size:
+                # After growing the index may be available (see `_grow`)
+                if key < self._capacity or not self._grow(key) or key >= self._size:
+                    return NA(self.NA_TYPE)
+            return self._load(self._buffer[(self._write_pos - 1 - key) % self._capacity])
+
+        view = super().__getitem__(key)
+        view._load = self._load  # type: ignore
+        return view
+
+    def _prepend(self, value: Any) -> None:
+        """
+        Insert a stored value before the oldest one of a linearized buffer which is not full
+        """
+        buffer = self._buffer
+        size = self._size
+        capacity = self._capacity
+        buffer[1:size + 1] = buffer[0:size]
+        buffer[0] = value
+        buffer[capacity:capacity + size + 1] = buffer[0:size + 1]
+        self._size = size + 1
+        self._write_pos += 1
+
+    def window(self, length: int) -> memoryview:
+        """
+        Get the last `length` values (or less, if there are not enough values yet) without copying.
+        The values are in chronological order (the current value is the last one), NA values are
+        stored as `NA_VALUE`. The view is valid until the next `add` or `set`.
+
+        :param length: The number of values
+        :return: A memoryview of the raw values
+        """
+        length = min(length, self._size)
+        end = (self._write_pos - 1) % self._capacity + self._capacity + 1
+        return memoryview(self._buffer)[end - length:end]  # type: ignore
+
+
+class FloatSeriesImpl(TypedSeriesImpl[float]):
+    """
+    Series of floats, NA is stored as NaN
+
+    This is a deliberate difference from `SeriesImpl`: a NaN stored by the script (e.g.
+    `float('nan')`) is read back as `na`, so `na(x)` is true for it. This is the same as in Pine
+    Script, where the `na` of floats is NaN. Use a generic series (e.g. an untyped `Series`) if NaN
+    and `na` must be distinguished.
+    """
+
+    __slots__ = ()
+
+    TYPECODE = 'd'
+    NA_TYPE = float
+    NA_VALUE = math.nan
+
+    @staticmethod
+    def _load(value: float) -> float | NA[float]:
+        return _NA_FLOAT if value != value else value
+
+    def __getitem__(self, key: int | slice) -> float | NA[float] | ReadOnlySeriesView[float]:
+        # Fast path of the most common case, it is inlined for performance
+        if isinstance(key, int) and 0 <= key < self._size:
+            value = self._buffer[(self._write_pos - 1 - key) % self._capacity]
+            return _NA_FLOAT if value != value else value
+        return TypedSeriesImpl.__getitem__(self, key)
+
+
+class IntSeriesImpl(TypedSeriesImpl[int]):
+    """
+    Series of 64-bit integers, NA is stored as the smallest int64 value (so it cannot be stored)
+    """
+
+    __slots__ = ()
+
+    TYPECODE = 'q'
+    NA_TYPE = int
+    NA_VALUE = -2 ** 63
+
+    @staticmethod
+    def _load(value: int) -> int | NA[int]:
+        return _NA_INT if value == -2 ** 63 else value
+
+    def __getitem__(self, key: int | slice) -> int | NA[int] | ReadOnlySeriesView[int]:
+        # Fast path of the most common case, it is inlined for performance
+        if isinstance(key, int) and 0 <= key < self._size:
+            value = self._buffer[(self._write_pos - 1 - key) % self._capacity]
+            return _NA_INT if value == -2 ** 63 else value
+        return TypedSeriesImpl.__getitem__(self, key)
+
+
+class BoolSeriesImpl(TypedSeriesImpl[bool]):
+    """
+    Series of booleans, NA is stored as -1, other values are stored as integers and loaded as booleans
+    """
+
+    __slots__ = ()
+
+    TYPECODE = 'b'
+    NA_TYPE = bool
+    NA_VALUE = -1
+
+    @staticmethod
+    def _load(value: int) -> bool | NA[bool]:
+        return _NA_BOOL if value < 0 else value != 0
+
+
 class ReadOnlySeriesView(Generic[T]):
     """
     A read-only view for a circular buffer slice that follows Pine-like indexing.
     Supports positive slice notation [start:stop] where start and stop refer to
     bar indices from the most recent bar.
     """
-    __slots__ = ('_buffer', '_capacity', '_write_pos', '_size', '_start', '_stop')
+    __slots__ = ('_buffer', '_capacity', '_write_pos', '_size', '_start', '_stop', '_load')
 
     def __init__(self, buffer: list[T | NA[T]], capacity: int, write_pos: int, size: int,
                  start: int, stop: int) -> None:
@@ -243,6 +585,8 @@ class ReadOnlySeriesView(Generic[T]):
         self._size = size
         self._start = start
         self._stop = min(stop, size)
+        # Converter of stored values of typed series
+        self._load: Callable[[Any], T | NA[T]] | None = None
 
     def __getitem__(self, idx: int) -> T | NA[T]:
         """Get item using Pine indexing"""
@@ -255,6 +599,8 @@ class ReadOnlySeriesView(Generic[T]):
 
         actual_idx = idx + self._start
         pos = (self._write_pos - 1 - actual_idx) % self._capacity
+        if self._load is not None:
+            return self._load(self._buffer[pos])
         return self._buffer[pos]
 
     def __len__(self) -> int:
@@ -263,9 +609,10 @@ class ReadOnlySeriesView(Generic[T]):
 
     def __iter__(self) -> Iterator[T | NA[T]]:
         """Iterate through items from newest to oldest"""
+        load = self._load
         for i in range(self._start, self._stop):
             pos = (self._write_pos - 1 - i) % self._capacity
-            yield self._buffer[pos]
+            yield self._buffer[pos] if load is None else load(self._buffer[pos])
 
     def __repr__(self) -> str:
         """Get string representation"""
@@ -0,0 +1,201 @@
+"""
+Precomputed session calendar of a symbol
+
+The session rules of a symbol (opening hours, session starts and ends) repeat every week in the local
+time of the exchange. All datetime arithmetic of the library is wall-clock arithmetic in the exchange
+timezone, so every session question about a bar depends only on the position of the bar in the week
+and on the timeframe. The calendar answers these questions from per-weekday tables, and caches the
+answers by (second of the week, timeframe), so repeated questions are simple dictionary lookups.
+"""
+from typing import Iterator
+from datetime import datetime, time, timedelta
+
+from .syminfo import SymInfoInterval, SymInfoSession
+
+__all__ = ['SessionCalendar']
+
+DAY = 24 * 60 * 60
+WEEK = 7 * DAY
+
+
+def _seconds(t: time) -> int:
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def _week_seconds(dt: datetime) -> int:
+    """
+    The position of a datetime in its week in seconds, from Monday 00:00:00 (wall-clock)
+
+    :param dt: The datetime in the exchange timezone
+    :return: Seconds since the start of the week
+    """
+    return dt.weekday() * DAY + dt.hour * 3600 + dt.minute * 60 + dt.second
+
+
+class SessionCalendar:
+    """
+    Session calendar built from the opening hours and session starts/ends of a symbol
+    """
+
+    __slots__ = ('sessions', '_starts', '_ends', '_overnight_starts', '_opening_hours', '_first_starts',
+                 '_new_session', '_in_session', '_first_bar', '_last_bar')
+
+    def __init__(self, opening_hours: list[SymInfoInterval], session_starts: list[SymInfoSession],
+                 session_ends: list[SymInfoSession]):
+        """
+        :param opening_hours: The opening hours of the symbol
+        :param session_starts: The session starts of the symbol
+        :param session_ends: The session ends of the symbol
+        """
+        # The session rules the calendar is built from, to check if it can be reused
+        self.sessions = (tuple(opening_hours), tuple(session_starts), tuple(session_ends))
+        # Seconds of the day by weekday, in the original order
+        self._starts: list[tuple[int, ...]] = [
+            tuple(_seconds(t) for d, t in session_starts if d == day) for day in range(7)]
+        self._ends: list[tuple[int, ...]] = [
+            tuple(_seconds(t) for d, t in session_ends if d == day) for day in range(7)]
+        # Starts of sessions that end on the next day
+        self._overnight_starts: list[tuple[int, ...]] = [
+            tuple(_seconds(ss) for d, ss, se in opening_hours if d == day and se < ss) for day in range(7)]
+        # Opening hours as (start, end) seconds, the end of overnight intervals is on the next day
+        self._opening_hours: list[tuple[tuple[int, int], ...]] = [
+            tuple((_seconds(ss), _seconds(se) + (DAY if se < ss else 0))
+                  for d, ss, se in opening_hours if d == day) for day in range(7)]
+        self._first_starts: list[time | None] = [
+            min((t for d, t in session_starts if d == day), default=None) for day in range(7)]
+
+        # Caches by timeframe, then by the second of the week
+        self._new_session: dict[int, dict[int, bool]] = {}
+        self._in_session: dict[int, dict[int, bool]] = {}
+        self._first_bar: dict[int, dict[int, bool]] = {}
+        self._last_bar: dict[int, dict[int, bool]] = {}
+
+    def first_session_start(self, weekday: int) -> time | None:
+        """
+        The first session start of a weekday
+
+        :param weekday: The weekday (Monday is 0)
+        :return: The earliest session start time of the day, None if there is no session start on the day
+        """
+        return self._first_starts[weekday]
+
+    def _calc_new_session(self, w: int, tf_sec: int) -> bool:
+        day, t = divmod(w, DAY)
+        prev_day = ((w - tf_sec) // DAY) % 7
+        starts = self._starts[day]
+        if prev_day != day:
+            starts = starts + self._overnight_starts[prev_day]
+        for s in starts:
+            # Starts later in the day are moved to the previous day, if the previous bar is on another day
+            if prev_day != day and s > t:
+                s -= DAY
+            if t <= s < t + tf_sec and s > t - tf_sec:
+                return True
+        return False
+
+    def is_new_session(self, dt: datetime, tf_sec: int) -> bool:
+        """
+        Check if a bar starts a new session, the previous bar is the one just before it (`dt - tf_sec`)
+
+        :param dt: The start of the bar in the exchange timezone
+        :param tf_sec: The timeframe of the bar in seconds
+        :return: True if a session starts in the bar
+        """
+        return self._cached_new_session(_week_seconds(dt), tf_sec)
+
+    def new_session_bars(self, start: datetime, end: datetime, tf_sec: int) -> Iterator[datetime]:
+        """
+        The bars starting a new session between two datetimes, without checking every bar
+
+        :param start: The start of the first bar in the exchange timezone
+        :param end: The end of the range (exclusive)
+        :param tf_sec: The timeframe of the bars in seconds, the bars are `start + k * tf_sec`
+        :return: The start of the bars, which start a new session
+        """
+        if WEEK % tf_sec:
+            dt = start
+            while dt < end:
+                if self.is_new_session(dt, tf_sec):
+                    yield dt
+                dt += timedelta(seconds=tf_sec)
+            return
+
+        # Sessions repeat every week, so the offsets of one week are enough
+        w0 = _week_seconds(start)
+        offsets = [k * tf_sec for k in range(WEEK // tf_sec)
+                   if self._cached_new_session((w0 + k * tf_sec) % WEEK, tf_sec)]
+        if not offsets:
+            return
+        base = 0
+        while True:
+            for offset in offsets:
+                dt = start + timedelta(seconds=base + offset)
+                if dt >= end:
+                    return
+                yield dt
+            base += WEEK
+
+    def _cached_new_session(self, w: int, tf_sec: int) -> bool:
+        cache = self._new_session.setdefault(tf_sec, {})
+        try:
+            return cache[w]
+        except KeyError:
+            res = cache[w] = self._calc_new_session(w, tf_sec)
+            return res
+
+    def _calc_in_session(self, w: int, tf_sec: int) -> bool:
+        day, t = divmod(w, DAY)
+        for ss, se in self._opening_hours[day]:
+            if t + tf_sec >= ss and t < se:
+                return True
+        return False
+
+    def in_session(self, dt: datetime, tf_sec: int) -> bool:
+        """
+        Check if a bar overlaps with any trading session of its day
+
+        :param dt: The start of the bar in the exchange timezone
+        :param tf_sec: The timeframe of the bar in seconds
+        :return: True if the bar overlaps with a session
+        """
+        w = _week_seconds(dt)
+        try:
+            return self._in_session[tf_sec][w]
+        except KeyError:
+            res = self._calc_in_session(w, tf_sec)
+            self._in_session.setdefault(tf_sec, {})[w] = res
+            return res
+
+    def is_first_bar(self, dt: datetime, tf_sec: int) -> bool:
+        """
+        Check if a session starts in a bar
+
+        :param dt: The start of the bar in the exchange timezone
+        :param tf_sec: The timeframe of the bar in seconds
+        :return: True if a session of the day starts in the bar
+        """
+        w = _week_seconds(dt)
+        try:
+            return self._first_bar[tf_sec][w]
+        except KeyError:
+            day, t = divmod(w, DAY)
+            res = any(t <= s < t + tf_sec for s in self._starts[day])
+            self._first_bar.setdefault(tf_sec, {})[w] = res
+            return res
+
+    def is_last_bar(self, dt: datetime, tf_sec: int) -> bool:
+        """
+        Check if a session ends in a bar (not at its start)
+
+        :param dt: The start of the bar in the exchange timezone
+        :param tf_sec: The timeframe of the bar in seconds
+        :return: True if a session of the day ends in the bar
+        """
+        w = _week_seconds(dt)
+        try:
+            return self._last_bar[tf_sec][w]
+        except KeyError:
+            day, t = divmod(w, DAY)
+            res = any(t < e < t + tf_sec for e in self._ends[day])
+            self._last_bar.setdefault(tf_sec, {})[w] = res
+            return res
@@ -0,0 +1,126 @@
+"""
+Commit/rollback journal of script state
+
+In realtime the last bar is calculated on every update, and every calculation must start from the
+state of the last confirmed bar, like in Pine. Copying the whole state on every update would be too
+slow, so the journal keeps only references to the committed values:
+
+- immutable values (numbers, strings, na, tuples) are restored by reference,
+- series are rolled back to their marks (O(1), see `SeriesImpl.mark`), the rolling windows, sorted
+  lists and extremum deques of the ta functions are rolled back by undoing their changes (see
+  `RollingWindow.mark`), so the cost depends on the changes, not on the length of the window,
+- other objects (lists, dicts, dataclasses, ...) are never modified by the script: every calculation
+  gets its own shallow copy of the committed object. The copy is shallow, so nested mutable objects (a
+  list in a persistent list, a list field of a dataclass) are shared, their in-place changes are not
+  rolled back.
+"""
+from __future__ import annotations
+from typing import Any, Iterable, cast
+from dataclasses import is_dataclass, replace as dataclass_replace
+from copy import copy
+
+from ..types.na import NA
+from .series import SeriesImpl
+from .order_statistics import SortedList, RollingWindow, RollingExtremum
+
+__all__ = ['StateJournal', 'copy_state_value']
+
+# Types which are restored by reference
+_IMMUTABLE_TYPES = frozenset((int, float, bool, str, bytes, tuple, frozenset, type(None), NA))
+
+# Types which are rolled back to their marks by their `rollback` method
+_MARKED_TYPES = (SeriesImpl, SortedList, RollingWindow, RollingExtremum)
+
+# Kinds of committed values
+_REFERENCE = 0
+_MARKED = 1
+_COPY = 2
+
+
+def copy_state_value(value: Any) -> Any:
+    """
+    Copy a persistent value, so the original value is never modified by a run. Lists, dicts and
+    dataclasses are copied shallowly, other objects by `copy.copy`.
+
+    :param value: The value to copy
+    :return: The copy of the value
+    """
+    if isinstance(value, (dict, list)):
+        return value.copy()
+    if is_dataclass(value):
+        return dataclass_replace(cast(Any, value))
+    return copy(value)
+
+
+class StateJournal:
+    """
+    Commit/rollback journal of the persistent and series globals of scopes (modules and isolated
+    function instances)
+    """
+
+    __slots__ = ('_scopes',)
+
+    def __init__(self):
+        # Tracked scopes: the globals, the tracked names and the committed values
+        self._scopes: list[tuple[dict[str, Any], tuple[str, ...], list[tuple[str, int, Any, Any]]]] = []
+
+    def track(self, scope_globals: dict[str, Any], names: Iterable[str]) -> None:
+        """
+        Track globals of a scope, their current values are committed. It can be called during a
+        calculation too (e.g. for new function instances), the scope gets copies of the committed objects.
+
+        :param scope_globals: The globals of the scope
+        :param names: The names of the persistent and series globals
+        """
+        scope = (scope_globals, tuple(name for name in names if name in scope_globals), [])
+        self._scopes.append(scope)
+        self._commit(scope)
+        self._rollback(scope)
+
+    def commit(self) -> None:
+        """
+        Commit the current values of all tracked scopes
+        """
+        for scope in self._scopes:
+            self._commit(scope)
+
+    def rollback(self) -> None:
+        """
+        Restore the committed values of all tracked scopes
+        """
+        for scope in self._scopes:
+            self._rollback(scope)
+
+    def close(self) -> None:
+        """
+        Stop recording the changes of the rolling windows, sorted lists and extremum deques, they are not
+        rolled back anymore. It should be called after the last rollback.
+        """
+        for _, _, committed in self._scopes:
+            for _, kind, value, _ in committed:
+                if kind == _MARKED and isinstance(value, (SortedList, RollingWindow, RollingExtremum)):
+                    value.unmark()
+        self._scopes.clear()
+
+    @staticmethod
+    def _commit(scope: tuple[dict[str, Any], tuple[str, ...], list[tuple[str, int, Any, Any]]]) -> None:
+        scope_globals, names, committed = scope
+        committed.clear()
+        for name in names:
+            value = scope_globals[name]
+            if type(value) in _IMMUTABLE_TYPES:
+                committed.append((name, _REFERENCE, value, None))
+            elif isinstance(value, _MARKED_TYPES):
+                committed.append((name, _MARKED, value, value.mark()))
+            else:
+                committed.append((name, _COPY, value, None))
+
+    @staticmethod
+    def _rollback(scope: tuple[dict[str, Any], tuple[str, ...], list[tuple[str, int, Any, Any]]]) -> None:
+        scope_globals, _, committed = scope
+        for name, kind, value, mark in committed:
+            if kind == _MARKED:
+                value.rollback(mark)
+            elif kind == _COPY:
+                value = copy_state_value(value)
+            scope_globals[name] = value
@@ -0,0 +1,190 @@
+"""
+Performance statistics of strategies, updated incrementally
+
+`TradeStatistics` is updated with every closed trade and with the equity of every bar, and it keeps only
+counters and running sums, so the statistics (profit factor, win rate, average win and loss, streaks,
+Sharpe and Sortino ratios) can be read in O(1) at any bar, without iterating the closed trades or the
+equity series.
+
+The Sharpe and Sortino ratios are calculated from the monthly returns of the equity (like in
+TradingView). The mean and variance of the returns are updated with Welford's algorithm, the current
+(not finished) month is included in the ratios as if it ended on the last bar.
+"""
+from __future__ import annotations
+from math import sqrt
+
+__all__ = ['TradeStatistics']
+
+
+class TradeStatistics:
+    """
+    Counters and running sums of the closed trades and the monthly returns of the equity
+    """
+
+    __slots__ = ('risk_free_rate', 'wintrades', 'losstrades', 'eventrades', 'grossprofit', 'grossloss',
+                 'largest_win', 'largest_loss', 'max_consecutive_wins', 'max_consecutive_losses',
+                 '_win_streak', '_loss_streak',
+                 '_period', '_period_equity', '_last_equity', '_returns', '_mean', '_m2', '_downside')
+
+    def __init__(self, risk_free_rate: float = 2.0):
+        """
+        :param risk_free_rate: The annual risk-free rate of return in percent, used by the Sharpe and
+                               Sortino ratios
+        """
+        self.risk_free_rate = risk_free_rate
+        self.reset()
+
+    def reset(self):
+        """ Reset all statistics """
+        self.wintrades = 0
+        self.losstrades = 0
+        self.eventrades = 0
+        self.grossprofit = 0.0
+        self.grossloss = 0.0
+        self.largest_win = 0.0
+        self.largest_loss = 0.0
+        self.max_consecutive_wins = 0
+        self.max_consecutive_losses = 0
+        self._win_streak = 0
+        self._loss_streak = 0
+
+        # The current month (year * 12 + month), the equity at its start and the last equity
+        self._period = -1
+        self._period_equity = 0.0
+        self._last_equity = 0.0
+        # Number, mean, sum of squared deviations and sum of squared downside deviations of the
+        # returns of the finished months
+        self._returns = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._downside = 0.0
+
+    #
+    # Updates
+    #
+
+    def add_trade(self, profit: float):
+        """
+        Add a closed trade
+
+        :param profit: The profit of the trade (negative if it is a loss)
+        """
+        if profit > 0.0:
+            self.wintrades += 1
+            self.grossprofit += profit
+            self.largest_win = max(self.largest_win, profit)
+            self._win_streak += 1
+            self._loss_streak = 0
+            self.max_consecutive_wins = max(self.max_consecutive_wins, self._win_streak)
+        elif profit < 0.0:
+            self.losstrades += 1
+            self.grossloss -= profit
+            self.largest_loss = max(self.largest_loss, -profit)
+            self._loss_streak += 1
+            self._win_streak = 0
+            self.max_consecutive_losses = max(self.max_consecutive_losses, self._loss_streak)
+        else:
+            self.eventrades += 1
+            self._win_streak = self._loss_streak = 0
+
+    def add_equity(self, period: int, equity: float):
+        """
+        Add the equity at the close of a bar
+
+        :param period: The month of the bar (`year * 12 + month`)
+        :param equity: The equity at the close of the bar
+        """
+        if period != self._period:
+            if self._period < 0:
+                self._period_equity = equity
+            else:
+                # The month is finished at the close of its last bar
+                self._add_return(self._period_return())
+                self._period_equity = self._last_equity
+            self._period = period
+        self._last_equity = equity
+
+    def _period_return(self) -> float:
+        """ The return of the current month so far """
+        return self._last_equity / self._period_equity - 1.0 if self._period_equity else 0.0
+
+    def _add_return(self, ret: float):
+        self._returns, self._mean, self._m2, self._downside = self._with_return(ret)
+
+    def _with_return(self, ret: float) -> tuple[int, float, float, float]:
+        """ The running sums of the returns with one more return """
+        n = self._returns + 1
+        delta = ret - self._mean
+        mean = self._mean + delta / n
+        m2 = self._m2 + delta * (ret - mean)
+        downside = min(ret - self._target, 0.0)
+        return n, mean, m2, self._downside + downside * downside
+
+    @property
+    def _target(self) -> float:
+        """ The monthly risk-free rate """
+        return self.risk_free_rate / 100.0 / 12.0
+
+    #
+    # Statistics
+    #
+
+    @property
+    def total_trades(self) -> int:
+        """ The number of closed trades """
+        return self.wintrades + self.losstrades + self.eventrades
+
+    @property
+    def profit_factor(self) -> float:
+        """ Gross profit / gross loss, infinite if there are no losses """
+        return self.grossprofit / self.grossloss if self.grossloss else float('inf')
+
+    @property
+    def percent_profitable(self) -> float:
+        """ The percent of the winning trades from all closed trades """
+        total = self.total_trades
+        return self.wintrades / total * 100.0 if total else 0.0
+
+    @property
+    def avg_trade(self) -> float:
+        """ The average profit of the closed trades """
+        total = self.total_trades
+        return (self.grossprofit - self.grossloss) / total if total else 0.0
+
+    @property
+    def avg_winning_trade(self) -> float:
+        """ The average profit of the winning trades """
+        return self.grossprofit / self.wintrades if self.wintrades else 0.0
+
+    @property
+    def avg_losing_trade(self) -> float:
+        """ The average loss of the losing trades (a positive number) """
+        return self.grossloss / self.losstrades if self.losstrades else 0.0
+
+    @property
+    def ratio_avg_win_loss(self) -> float:
+        """ Average winning trade / average losing trade """
+        avg_loss = self.avg_losing_trade
+        return self.avg_winning_trade / avg_loss if avg_loss else 0.0
+
+    def _moments(self) -> tuple[int, float, float, float]:
+        """ The running sums of the monthly returns, with the current month """
+        if self._period < 0:
+            return 0, 0.0, 0.0, 0.0
+        return self._with_return(self._period_return())
+
+    @property
+    def sharpe_ratio(self) -> float:
+        """ Sharpe ratio of the monthly returns, zero if there are less than 2 months or no volatility """
+        n, mean, m2, _ = self._moments()
+        if n < 2 or m2 <= 0.0:
+            return 0.0
+        return (mean - self._target) / sqrt(m2 / n)
+
+    @property
+    def sortino_ratio(self) -> float:
+        """ Sortino ratio of the monthly returns, zero if there are less than 2 months or no month below the target """
+        n, mean, _, downside = self._moments()
+        if n < 2 or downside <= 0.0:
+            return 0.0
+        return (mean - self._target) / sqrt(downside / n)
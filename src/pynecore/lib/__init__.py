@@ -4,6 +4,7 @@ Builtin library of Pyne
 from typing import TypeAlias, Any, Callable
 
 import sys
+import importlib
 
 from functools import lru_cache
 from datetime import datetime, UTC
@@ -21,7 +22,7 @@ from . import plot_style as _plot_style
 from . import hline_style as _hline_style
 
 from . import syminfo  # This should be imported before core.datetime to avoid circular import!
-from . import barstate, string, log, math
+from . import barstate
 
 from pynecore.core.overload import overload
 from pynecore.core.datetime import parse_datestring as _parse_datestring, parse_timezone as _parse_timezone
@@ -50,6 +51,14 @@ __all__ = [
     'time', 'na',
 ]
 
+# Submodules which are imported only when they are first used (see `__getattr__`), so scripts load only
+# the modules they need. E.g. `log` imports `logging` and `rich`, `array` imports `statistics`.
+_LAZY_SUBMODULES = frozenset((
+    'adjustment', 'alert', 'array', 'chart', 'color', 'currency', 'display', 'format', 'label', 'line',
+    'location', 'log', 'map', 'math', 'matrix', 'order', 'runtime', 'scale', 'session', 'shape', 'size',
+    'request', 'strategy', 'string', 'ta', 'timeframe', 'xloc', 'yloc',
+))
+
 #
 # Constants
 #
@@ -470,3 +479,21 @@ def year(time: int | None = None, timezone: str | None = None) -> int:
     :return: The year
     """
     return _get_dt(time, timezone).year
+
+
+#
+# Lazy submodules
+#
+
+def __getattr__(name: str) -> Any:
+    """
+    Import submodules on first access. Importing a submodule sets it as an attribute of the package,
+    so this is called only once per submodule.
+
+    :param name: The name of the attribute
+    :return: The submodule
+    :raises AttributeError: If the attribute is not a lazily imported submodule
+    """
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,14 +10,17 @@ __all__ = [
     'isrealtime'
 ]
 
-# TODO: support live trading
-
 isfirst = True
 """ Returns true if current bar is first bar in barset, false otherwise."""
 
 islast = False
 """ Returns true if current bar is the last bar in barset, false otherwise. """
 
+# The state of realtime calculations, they are set by the script runner
+_isrealtime = False
+_isconfirmed = True
+_isnew = False
+
 
 @module_property
 def isconfirmed() -> bool:
@@ -26,8 +29,7 @@ def isconfirmed() -> bool:
 
     :return: True if the script is calculating the last (closing) update of the current bar
     """
-    # TODO: now it is always true, but if we implement bar magnifier, it should be calculated
-    return True
+    return _isconfirmed
 
 
 @module_property
@@ -37,8 +39,7 @@ def ishistory() -> bool:
 
     :return: True if script is calculating on historical bars, false otherwise
     """
-    # TODO: now it is always true, but for live trading it should be implemented
-    return True
+    return not _isrealtime
 
 
 @module_property
@@ -61,8 +62,7 @@ def isnew() -> bool:
 
     :return: True if script is currently calculating on new bar, false otherwise
     """
-    # TODO: now it is always false, but if we implement bar magnifier, it should be calculated
-    return False
+    return _isnew
 
 
 @module_property
@@ -72,5 +72,4 @@ def isrealtime() -> bool:
 
     :return: True if script is calculating on real-time bars, false otherwise
     """
-    # TODO: now it is always false, but for live trading it should be implemented
-    return False
+    return _isrealtime
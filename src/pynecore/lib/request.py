@@ -0,0 +1,101 @@
+"""
+Requesting data from other contexts (timeframes)
+"""
+from typing import Any, Callable, TypeVar
+
+from .. import lib
+from . import syminfo as _syminfo
+from ..types.na import NA
+from ..types.ohlcv import OHLCV
+from ..core import function_isolation as _function_isolation
+from ..core.resampler import HTFAggregator as _HTFAggregator
+from ..core.script_runner import _set_lib_properties
+from .timeframe import in_seconds as _in_seconds
+
+__all__ = [
+    'security',
+]
+
+T = TypeVar('T')
+
+__persistent_function_vars__ = {}
+
+__persistent_security_index: int = -1
+__persistent_security_value: Any = NA(None)
+__persistent_function_vars__['security'] = ['__persistent_security_index', '__persistent_security_value']
+
+
+# noinspection PyProtectedMember
+def _evaluate(aggregator: _HTFAggregator, timeframe: str, expression: Callable[[], T]) -> T:
+    """
+    Evaluate the expression in the context of the last confirmed higher timeframe bar
+    """
+    bar = aggregator.confirmed
+    assert bar is not None
+
+    # Save the context of the chart bar
+    saved = (lib.bar_index, lib.open, lib.high, lib.low, lib.close, lib.volume,
+             lib.hl2, lib.hlc3, lib.ohlc4, lib.hlcc4, lib._datetime, lib._time)
+    period = _syminfo.period
+
+    _set_lib_properties(bar, aggregator.index, lib._datetime.tzinfo, lib)
+    _syminfo.period = timeframe
+    try:
+        return expression()
+    finally:
+        (lib.bar_index, lib.open, lib.high, lib.low, lib.close, lib.volume,
+         lib.hl2, lib.hlc3, lib.ohlc4, lib.hlcc4, lib._datetime, lib._time) = saved
+        _syminfo.period = period
+
+
+# noinspection PyProtectedMember
+def security(symbol: str, timeframe: str, expression: Callable[[], T]) -> T | NA:
+    """
+    Request the value of an expression on a higher timeframe of the chart symbol
+
+    The higher timeframe bars are built from the chart bars, a new bar starts where `timeframe.change`
+    detects a change. The expression is evaluated once per higher timeframe bar, when the bar is
+    confirmed (the first chart bar of the next one), and its value is returned until the next one is
+    confirmed. This is the non-repainting behavior of Pine's `request.security(symbol, tf, expr[1],
+    lookahead=barmerge.lookahead_on)`: historical and realtime results are the same. The bars are
+    aggregated only once per timeframe, all calls with the same timeframe share them.
+
+    Example: ``daily_sma = request.security(syminfo.tickerid, "D", lambda: ta.sma(close, 20))``
+
+    :param symbol: The symbol, only the chart symbol is supported (e.g. `syminfo.tickerid`)
+    :param timeframe: The timeframe, an empty string means the chart timeframe
+    :param expression: Function without arguments to evaluate, the library variables (`close`, `time`,
+                       `bar_index`, ...) are the ones of the higher timeframe bar in it. History
+                       references (e.g. `close[1]`) in the function refer to the chart bars, use `ta`
+                       functions for higher timeframe history.
+    :return: The value of the expression on the last confirmed higher timeframe bar, na before the first one
+    :raises ValueError: If the symbol is not the chart symbol or the timeframe is lower than the chart timeframe
+    :raises TypeError: If the expression is not callable
+    """
+    global __persistent_security_index, __persistent_security_value
+
+    chart_symbols = [name for name in (_syminfo.tickerid, _syminfo.ticker, _syminfo.root) if isinstance(name, str)]
+    if symbol not in chart_symbols:
+        raise ValueError(f"Only the chart symbol can be requested, not '{symbol}'!")
+    if not callable(expression):
+        raise TypeError("The expression must be a function without arguments, e.g. `lambda: close`!")
+
+    if not timeframe:
+        return expression()
+    tf_sec = _in_seconds(timeframe)
+    chart_tf_sec = _in_seconds(_syminfo.period)
+    if tf_sec == chart_tf_sec:
+        return expression()
+    if tf_sec < chart_tf_sec:
+        raise ValueError(f"Timeframe '{timeframe}' is lower than the chart timeframe ({_syminfo.period})!")
+
+    # The bars of a timeframe are shared by all calls
+    aggregator = _function_isolation.get_shared(f"request.security|{timeframe}",
+                                                lambda: _HTFAggregator(timeframe))
+    aggregator.update(OHLCV(lib._time // 1000, lib.open, lib.high, lib.low, lib.close, lib.volume),
+                      lib.bar_index)
+
+    if aggregator.index > __persistent_security_index:
+        __persistent_security_index = aggregator.index
+        __persistent_security_value = _evaluate(aggregator, timeframe, expression)
+    return __persistent_security_value
@@ -1,5 +1,3 @@
-from datetime import datetime, timedelta
-
 from ..types.session import Session
 
 from ..core.module_property import module_property
@@ -28,38 +26,6 @@ regular = Session()
 extended = Session()
 
 
-#
-# Functions
-#
-
-# noinspection PyProtectedMember
-def _check_session(dt: datetime, tf_sec: int) -> bool:
-    """
-    Check if candle overlaps with any trading session.
-
-    :param dt: Start datetime of the candle
-    :param tf_sec: Timeframe in seconds
-    :return: True if candle overlaps with any session
-    """
-    candle_end = dt + timedelta(seconds=tf_sec)
-    candle_start = dt
-
-    for day, ss, se in syminfo._opening_hours:
-        if day != dt.weekday():
-            continue
-
-        ssdt = dt.replace(hour=ss.hour, minute=ss.minute, second=ss.second, microsecond=0)
-        sedt = dt.replace(hour=se.hour, minute=se.minute, second=se.second, microsecond=0)
-        if sedt < ssdt:  # Overnight session
-            sedt += timedelta(days=1)
-
-        # Check if candle overlaps with session
-        if candle_end >= ssdt and candle_start < sedt:
-            return True
-
-    return False
-
-
 #
 # Module properties
 #
@@ -73,14 +39,7 @@ def isfirstbar_regular() -> bool:
 
     :return: True if the current candle is the first of the trading session
     """
-    tf_sec = timeframe.in_seconds(syminfo.period)
-    for ss in syminfo._session_starts:
-        if ss.day == lib._datetime.weekday():
-            ssdt = lib._datetime.replace(hour=ss.time.hour, minute=ss.time.minute, second=ss.time.second,
-                                         microsecond=ss.time.microsecond)
-            if lib._datetime <= ssdt < lib._datetime + timedelta(seconds=tf_sec):
-                return True
-    return False
+    return syminfo._calendar.is_first_bar(lib._datetime, timeframe.in_seconds(syminfo.period))
 
 
 # noinspection PyProtectedMember
@@ -95,14 +54,7 @@ def isfirstbar() -> bool:
     :return: True if the current candle is the first of the trading session
     """
     # TODO: support pre market sessions
-    tf_sec = timeframe.in_seconds(syminfo.period)
-    for ss in syminfo._session_starts:
-        if ss.day == lib._datetime.weekday():
-            ssdt = lib._datetime.replace(hour=ss.time.hour, minute=ss.time.minute, second=ss.time.second,
-                                         microsecond=ss.time.microsecond)
-            if lib._datetime <= ssdt < lib._datetime + timedelta(seconds=tf_sec):
-                return True
-    return False
+    return syminfo._calendar.is_first_bar(lib._datetime, timeframe.in_seconds(syminfo.period))
 
 
 # noinspection PyProtectedMember
@@ -114,14 +66,7 @@ def islastbar_regular() -> bool:
 
     :return: True if the current candle is the last of the trading session
     """
-    tf_sec = timeframe.in_seconds(syminfo.period)
-    for se in syminfo._session_ends:
-        if se.day == lib._datetime.weekday():
-            sedt = lib._datetime.replace(hour=se.time.hour, minute=se.time.minute, second=se.time.second,
-                                         microsecond=se.time.microsecond)
-            if lib._datetime < sedt < lib._datetime + timedelta(seconds=tf_sec):
-                return True
-    return False
+    return syminfo._calendar.is_last_bar(lib._datetime, timeframe.in_seconds(syminfo.period))
 
 
 # noinspection PyProtectedMember
@@ -134,14 +79,7 @@ def islastbar() -> bool:
 
     :return: True if the current candle is the last of the trading session
     """
-    tf_sec = timeframe.in_seconds(syminfo.period)
-    for se in syminfo._session_ends:
-        if se.day == lib._datetime.weekday():
-            sedt = lib._datetime.replace(hour=se.time.hour, minute=se.time.minute, second=se.time.second,
-                                         microsecond=se.time.microsecond)
-            if lib._datetime < sedt < lib._datetime + timedelta(seconds=tf_sec):
-                return True
-    return False
+    return syminfo._calendar.is_last_bar(lib._datetime, timeframe.in_seconds(syminfo.period))
 
 
 # noinspection PyProtectedMember
@@ -152,8 +90,7 @@ def ismarket() -> bool:
 
     :return:  True if the current candle is within a trading session
     """
-    tf_sec = timeframe.in_seconds(syminfo.period)
-    return _check_session(lib._datetime, tf_sec)
+    return syminfo._calendar.in_session(lib._datetime, timeframe.in_seconds(syminfo.period))
 
 
 @module_property
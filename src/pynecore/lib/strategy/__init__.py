@@ -1,12 +1,16 @@
 from typing import cast
 
 from datetime import datetime, UTC
-from collections import deque
 from copy import copy
+from bisect import bisect_left, bisect_right
 
 from ... import lib
 from .. import syminfo
 
+from ...core.module_property import module_property
+from ...core.order_book import OrderBook
+from ...core.bounded_list import BoundedList
+from ...core.trade_statistics import TradeStatistics
 from ...types.strategy import QtyType
 from ...types.base import IntEnum
 from ...types.na import NA
@@ -19,7 +23,10 @@ __all__ = [
     "long", "short",
 
     'Trade', 'Order', 'Position',
-    "cancel", "cancel_all", "close", "close_all", "entry", "exit"
+    "cancel", "cancel_all", "close", "close_all", "entry", "exit",
+
+    "equity", "netprofit", "openprofit", "grossprofit", "grossloss", "wintrades", "losstrades", "eventrades",
+    "avg_trade", "avg_winning_trade", "avg_losing_trade", "max_drawdown", "max_runup",
 ]
 
 
@@ -54,6 +61,7 @@ _order_type_close = _OrderType()
 if True:
     # We need to import this here to avoid circular imports
     from . import risk
+    from . import closedtrades, opentrades
 
 
 #
@@ -182,19 +190,15 @@ class Position:
     """
     netprofit: float = 0.0
     openprofit: float = 0.0
-    grossprofit: float = 0.0
-    grossloss: float = 0.0
 
-    orders: dict[str, Order]
+    orders: OrderBook
 
     open_trades: list[Trade]
-    closed_trades: deque[Trade]
+    closed_trades: BoundedList[Trade]
     new_closed_trades: list[Trade]
     closed_trades_count: int
 
-    wintrades: int
-    eventrades: int
-    losstrades: int
+    stats: TradeStatistics
 
     size: float = 0.0
     sign: float = 0.0
@@ -202,11 +206,14 @@ class Position:
 
     cum_profit: float = 0.0
 
-    def __init__(self):
-        self.orders = {}
+    def __init__(self, risk_free_rate: float = 2.0):
+        """
+        :param risk_free_rate: The annual risk-free rate of return in percent, for the Sharpe and Sortino ratios
+        """
+        self.orders = OrderBook()
 
         self.open_trades = []
-        self.closed_trades = deque(maxlen=9000)  # 9000 is the limit of TV
+        self.closed_trades = BoundedList(9000)  # 9000 is the limit of TV
         self.closed_trades_count = 0
         self.new_closed_trades = []
 
@@ -218,15 +225,21 @@ class Position:
         self.max_drawdown = 0.0
         self.max_runup = 0.0
 
-        self.wintrades = 0
-        self.eventrades = 0
-        self.losstrades = 0
+        # Win/loss counters, gross profit and loss and the other performance statistics
+        self.stats = TradeStatistics(risk_free_rate)
 
         self.entry_summ = 0.0
         self.open_commission = 0.0
 
         self.o = self.h = self.l = self.c = 0.0
 
+        # The per-trade values of the open trades are updated lazily, these are the extremes of the bars
+        # since their last update (the trades and the average price don't change between fills)
+        self._pending = False
+        self._pending_high = self._pending_low = self._pending_close = 0.0
+        # Open trades sorted by commission / size with suffix sums (see `_open_drawdown_runup`)
+        self._trade_index: tuple[list[float], list[float], list[float]] | None = None
+
     def reset(self):
         """ Reset position variables """
         self.orders.clear()
@@ -241,9 +254,7 @@ class Position:
         self.runup_summ = 0.0
         self.max_drawdown = 0.0
         self.max_runup = 0.0
-        self.wintrades = 0
-        self.eventrades = 0
-        self.losstrades = 0
+        self.stats.reset()
         self.entry_summ = 0.0
         self.open_commission = 0.0
         self.size = 0.0
@@ -251,9 +262,9 @@ class Position:
         self.avg_price = 0.0
         self.netprofit = 0.0
         self.openprofit = 0.0
-        self.grossprofit = 0.0
-        self.grossloss = 0.0
         self.cum_profit = 0.0
+        self._pending = False
+        self._trade_index = None
 
     @property
     def equity(self) -> float:
@@ -261,6 +272,126 @@ class Position:
         assert lib._script is not None
         return lib._script.initial_capital + self.netprofit + self.openprofit
 
+    @property
+    def wintrades(self) -> int:
+        """ The number of winning trades """
+        return self.stats.wintrades
+
+    @property
+    def losstrades(self) -> int:
+        """ The number of losing trades """
+        return self.stats.losstrades
+
+    @property
+    def eventrades(self) -> int:
+        """ The number of breakeven trades """
+        return self.stats.eventrades
+
+    @property
+    def grossprofit(self) -> float:
+        """ The total profit of the winning trades """
+        return self.stats.grossprofit
+
+    @property
+    def grossloss(self) -> float:
+        """ The total loss of the losing trades """
+        return self.stats.grossloss
+
+    def sync(self):
+        """
+        Bring the per-bar values (open profit, drawdown, runup and the equity statistics) up to date with
+        the current bar. `Position` updates them on every bar, so it does nothing, but subclasses may
+        update them later (see `FastPosition`).
+        """
+
+    def update_open_trades(self):
+        """
+        Update the profit, max drawdown and max runup of the open trades with the bars since their last
+        update. The drawdown and runup of a trade are monotonic in the high and the low, so the extremes
+        of these bars give the same maximums as updating the trades on every bar.
+        """
+        if not self._pending:
+            return
+        self._pending = False
+        h = self._pending_high
+        l = self._pending_low
+        c = self._pending_close
+
+        for trade in self.open_trades:
+            # Profit of trade
+            trade.profit = trade.size * (c - trade.entry_price) - 2 * trade.commission
+
+            # P/L from high/low to calculate drawdown and runup
+            hprofit = trade.size * (h - self.avg_price) - trade.commission
+            lprofit = trade.size * (l - self.avg_price) - trade.commission
+            # Drawdown
+            drawdown = -min(hprofit, lprofit, 0.0)
+            trade.max_drawdown = max(drawdown, trade.max_drawdown)
+            # Runup
+            runup = max(hprofit, lprofit, 0.0)
+            trade.max_runup = max(runup, trade.max_runup)
+
+            # Calculate percentage values for drawdown and runup
+            # This part is missing in the original code
+            trade_value = abs(trade.size) * trade.entry_price
+            if trade_value > 0:
+                # Calculate drawdown percentage
+                trade.max_drawdown_percent = max(
+                    (drawdown / trade_value) * 100.0 if drawdown > 0 else 0.0,
+                    trade.max_drawdown_percent
+                )
+
+                # Calculate runup percentage
+                trade.max_runup_percent = max(
+                    (runup / trade_value) * 100.0 if runup > 0 else 0.0,
+                    trade.max_runup_percent
+                )
+
+    def _open_trade_index(self) -> tuple[list[float], list[float], list[float]]:
+        """
+        The `commission / abs(size)` ratios of the open trades in ascending order, with the suffix sums of
+        their sizes and commissions. It is rebuilt only after fills.
+        """
+        index = self._trade_index
+        if index is None:
+            items = sorted((trade.commission / abs(trade.size), abs(trade.size), trade.commission)
+                           for trade in self.open_trades)
+            ratios = [ratio for ratio, _, _ in items]
+            size_sums = [0.0] * (len(items) + 1)
+            commission_sums = [0.0] * (len(items) + 1)
+            for i in range(len(items) - 1, -1, -1):
+                size_sums[i] = size_sums[i + 1] + items[i][1]
+                commission_sums[i] = commission_sums[i + 1] + items[i][2]
+            index = self._trade_index = (ratios, size_sums, commission_sums)
+        return index
+
+    def _open_drawdown_runup(self) -> tuple[float, float]:
+        """
+        Sum of the drawdowns and the runups of the open trades on the current bar
+
+        All open trades are on the same side. With `u = abs(size)`, `c = commission` and the worst and
+        best price moves of the bar from the average price (`w`, `b`), the drawdown of a trade is
+        `max(0, c - u * w)` and its runup is `max(0, u * b - c)`. They are positive only if `c / u` is
+        above `w` or below `b`, so with the trades sorted by `c / u` and the suffix sums of `c` and `u`,
+        the sums are found by bisecting.
+
+        :return: The sum of the drawdowns and the sum of the runups
+        """
+        ratios, size_sums, commission_sums = self._open_trade_index()
+
+        if self.sign > 0.0:
+            worst = self.l - self.avg_price
+            best = self.h - self.avg_price
+        else:
+            worst = self.avg_price - self.h
+            best = self.avg_price - self.l
+
+        i = bisect_right(ratios, worst)
+        drawdown = commission_sums[i] - size_sums[i] * worst
+        i = bisect_left(ratios, best)
+        runup = (size_sums[0] - size_sums[i]) * best - (commission_sums[0] - commission_sums[i])
+        return max(drawdown, 0.0), max(runup, 0.0)
+
     def _fill_order(self, order: Order, price: float, h: float, l: float):
         """
         Fill an order (actually)
@@ -270,6 +401,10 @@ class Position:
         :param h: The high price
         :param l: The low price
         """
+        # The open trades and the average price are about to change
+        self.update_open_trades()
+        self._trade_index = None
+
         script = lib._script
         assert script is not None
         commission_type = script.commission_type
@@ -368,14 +503,7 @@ class Position:
                     order.size -= size
 
                     # Gross P/L and counters
-                    if closed_trade.profit == 0.0:
-                        self.eventrades += 1
-                    elif closed_trade.profit > 0.0:
-                        self.wintrades += 1
-                        self.grossprofit += closed_trade.profit
-                    else:
-                        self.losstrades += 1
-                        self.grossloss -= closed_trade.profit
+                    self.stats.add_trade(closed_trade.profit)
 
                     # Average entry price
                     if self.size:
@@ -563,8 +691,12 @@ class Position:
         self.drawdown_summ = self.runup_summ = 0.0
         self.new_closed_trades.clear()
 
-        # Process open orders
-        for order in list(self.orders.values()):
+        # Process open orders, only the ones which can be filled in the range of the bar
+        if ohlc:
+            orders = self.orders.candidates(high=self.h, market=True)
+        else:
+            orders = self.orders.candidates(low=self.l, market=True)
+        for order in orders:
             # Market orders
             if not order.limit and not order.stop:
                 # open → high → low → close
@@ -585,7 +717,11 @@ class Position:
                     self._check_low(order)
 
         # 2nd round of process open orders
-        for order in list(self.orders.values()):
+        if ohlc:
+            orders = self.orders.candidates(low=self.l)
+        else:
+            orders = self.orders.candidates(high=self.h)
+        for order in orders:
             # Here all market orders should be gone
             # open → high → low → close
             if ohlc:
@@ -601,40 +737,20 @@ class Position:
             # Unrealized P&L
             self.openprofit = self.size * (self.c - self.avg_price)
 
-            # Calculate open drawdowns and runups
-            for trade in self.open_trades:
-                # Profit of trade
-                trade.profit = trade.size * (self.c - trade.entry_price) - 2 * trade.commission
-
-                # P/L from high/low to calculate drawdown and runup
-                hprofit = trade.size * (self.h - self.avg_price) - trade.commission
-                lprofit = trade.size * (self.l - self.avg_price) - trade.commission
-                # Drawdown
-                drawdown = -min(hprofit, lprofit, 0.0)
-                trade.max_drawdown = max(drawdown, trade.max_drawdown)
-                # Runup
-                runup = max(hprofit, lprofit, 0.0)
-                trade.max_runup = max(runup, trade.max_runup)
-
-                # Calculate percentage values for drawdown and runup
-                # This part is missing in the original code
-                trade_value = abs(trade.size) * trade.entry_price
-                if trade_value > 0:
-                    # Calculate drawdown percentage
-                    trade.max_drawdown_percent = max(
-                        (drawdown / trade_value) * 100.0 if drawdown > 0 else 0.0,
-                        trade.max_drawdown_percent
-                    )
-
-                    # Calculate runup percentage
-                    trade.max_runup_percent = max(
-                        (runup / trade_value) * 100.0 if runup > 0 else 0.0,
-                        trade.max_runup_percent
-                    )
-
-                # Drawdown summ runup summ
-                self.drawdown_summ += drawdown
-                self.runup_summ += runup
+            # The per-trade values are updated only when they are needed
+            if self._pending:
+                self._pending_high = max(self._pending_high, self.h)
+                self._pending_low = min(self._pending_low, self.l)
+            else:
+                self._pending = True
+                self._pending_high = self.h
+                self._pending_low = self.l
+            self._pending_close = self.c
+
+            # Drawdown summ runup summ
+            drawdown, runup = self._open_drawdown_runup()
+            self.drawdown_summ += drawdown
+            self.runup_summ += runup
 
         if self.drawdown_summ or self.runup_summ:
             self.max_drawdown = max(self.max_drawdown, self.max_equity - self.entry_equity + self.drawdown_summ)
@@ -662,6 +778,10 @@ class Position:
                 # Modify entry equity, for max drawdown and runup
                 self.entry_equity += closed_trade.profit
 
+        # The equity series of the Sharpe and Sortino ratios
+        dt = lib._datetime
+        self.stats.add_equity(dt.year * 12 + dt.month, self.equity)
+
 
 #
 # Functions
@@ -970,3 +1090,145 @@ def exit(id: str, from_entry: str | NA[str] = NA(str),
     order = Order(from_entry, size, exit_id=id, order_type=_order_type_close, limit=limit, stop=stop,
                   oca_name=oca_name, comment=comment, alert_message=alert_message)
     position.orders[id] = order
+
+
+#
+# Properties
+#
+
+# noinspection PyProtectedMember
+def _position() -> Position:
+    assert lib._script is not None and lib._script.position is not None
+    position = lib._script.position
+    position.sync()
+    return position
+
+
+@module_property
+def equity() -> float:
+    """
+    Current equity (initial capital + net profit + open profit)
+
+    :return: The current equity
+    """
+    return _position().equity
+
+
+@module_property
+def netprofit() -> float:
+    """
+    Total currency value of all completed trades
+
+    :return: The net profit
+    """
+    return _position().netprofit
+
+
+@module_property
+def openprofit() -> float:
+    """
+    Current unrealized profit or loss for all open positions
+
+    :return: The open profit
+    """
+    return _position().openprofit
+
+
+@module_property
+def grossprofit() -> float:
+    """
+    Total currency value of all completed winning trades
+
+    :return: The gross profit
+    """
+    return _position().stats.grossprofit
+
+
+@module_property
+def grossloss() -> float:
+    """
+    Total currency value of all completed losing trades
+
+    :return: The gross loss
+    """
+    return _position().stats.grossloss
+
+
+@module_property
+def wintrades() -> int:
+    """
+    Number of profitable trades for the whole trading range
+
+    :return: The number of winning trades
+    """
+    return _position().stats.wintrades
+
+
+@module_property
+def losstrades() -> int:
+    """
+    Number of unprofitable trades for the whole trading range
+
+    :return: The number of losing trades
+    """
+    return _position().stats.losstrades
+
+
+@module_property
+def eventrades() -> int:
+    """
+    Number of breakeven trades for the whole trading range
+
+    :return: The number of breakeven trades
+    """
+    return _position().stats.eventrades
+
+
+@module_property
+def avg_trade() -> float:
+    """
+    Average amount of money gained or lost per closed trade
+
+    :return: The average profit of the closed trades
+    """
+    return _position().stats.avg_trade
+
+
+@module_property
+def avg_winning_trade() -> float:
+    """
+    Average amount of money gained per winning trade
+
+    :return: The average profit of the winning trades
+    """
+    return _position().stats.avg_winning_trade
+
+
+@module_property
+def avg_losing_trade() -> float:
+    """
+    Average amount of money lost per losing trade
+
+    :return: The average loss of the losing trades
+    """
+    return _position().stats.avg_losing_trade
+
+
+@module_property
+def max_drawdown() -> float:
+    """
+    Maximum equity drawdown value for the whole trading interval
+
+    :return: The maximum drawdown
+    """
+    return _position().max_drawdown
+
+
+@module_property
+def max_runup() -> float:
+    """
+    Maximum equity run-up value for the whole trading interval
+
+    :return: The maximum run-up
+    """
+    return _position().max_runup
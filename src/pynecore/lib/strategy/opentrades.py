@@ -7,6 +7,16 @@ __all__ = [
 ]
 
 
+# noinspection PyProtectedMember
+def _updated_trade(trade_num: int):
+    """
+    Get an open trade with its profit, drawdown and runup updated to the current bar
+    """
+    position = lib._script.position
+    position.update_open_trades()
+    return position.open_trades[trade_num]
+
+
 # noinspection PyProtectedMember
 def commission(trade_num: int) -> float | NA:
     """
@@ -114,7 +124,7 @@ def max_drawdown(trade_num: int) -> float | NA:
     if trade_num < 0:
         return NA
     try:
-        return lib._script.position.open_trades[trade_num].max_drawdown
+        return _updated_trade(trade_num).max_drawdown
     except IndexError:
         return 0.0
 
@@ -130,7 +140,7 @@ def max_drawdown_percent(trade_num: int) -> float | NA:
     if trade_num < 0:
         return NA
     try:
-        return lib._script.position.open_trades[trade_num].max_drawdown_percent
+        return _updated_trade(trade_num).max_drawdown_percent
     except IndexError:
         return 0.0
 
@@ -146,7 +156,7 @@ def max_runup(trade_num: int) -> float | NA:
     if trade_num < 0:
         return NA
     try:
-        return lib._script.position.open_trades[trade_num].max_runup
+        return _updated_trade(trade_num).max_runup
     except IndexError:
         return 0.0
 
@@ -162,7 +172,7 @@ def max_runup_percent(trade_num: int) -> float | NA:
     if trade_num < 0:
         return NA
     try:
-        return lib._script.position.open_trades[trade_num].max_runup_percent
+        return _updated_trade(trade_num).max_runup_percent
     except IndexError:
         return 0.0
 
@@ -177,7 +187,7 @@ def profit(trade_num: int) -> float | NA:
     if trade_num < 0:
         return NA
     try:
-        return lib._script.position.open_trades[trade_num].profit
+        return _updated_trade(trade_num).profit
     except IndexError:
         return 0.0
 
@@ -4,6 +4,7 @@ from ..types.session import Session
 from .session import regular
 
 from ..core.syminfo import SymInfoSession, SymInfoInterval
+from ..core.session_calendar import SessionCalendar
 
 __all__ = [
     "prefix", "description", "ticker", "root", "tickerid", "currency", "basecurrency", "period", "type", "volumetype",
@@ -14,6 +15,8 @@ __all__ = [
 _opening_hours: list[SymInfoInterval] = []
 _session_starts: list[SymInfoSession] = []
 _session_ends: list[SymInfoSession] = []
+# Precomputed session lookups of the opening hours and sessions above
+_calendar: SessionCalendar = SessionCalendar([], [], [])
 
 prefix: str | NA[str] = NA(str)
 description: str | NA[str] = NA(str)
@@ -5,7 +5,7 @@ from typing import TypeVar, cast
 
 import builtins
 import math
-import heapq
+import operator
 
 from collections import deque
 
@@ -14,9 +14,12 @@ from ..core.module_property import module_property
 from pynecore.core.overload import overload
 
 from ..core import safe_convert
+from ..core.order_statistics import RollingWindow, RollingExtremum, SortedList
 
 # We need to use this kind of import to make transformer work
-from pynecore.lib import open, high, low, close, volume, bar_index, array, session, math as lib_math
+from pynecore.lib import open, high, low, close, volume, bar_index
+# The `math` and `session` submodules of lib are used through `lib`, so they are imported on first use
+from pynecore import lib
 
 TFIB = TypeVar('TFIB', float, int, bool)
 TFI = TypeVar('TFI', float, int)
@@ -96,28 +99,9 @@ __all__ = [
 
 EPSILON = 1e-14
 
-
-def _avgrank(values: list[float], val_to_compare: float) -> float:
-    """
-    Helper function to calculate rank with proper tie handling
-
-    :param values: The list of values
-    :param val_to_compare: The value to compare
-    :return: The average rank of the value
-    """
-    rank_sum = 0.0
-    tie_count = 0
-
-    # Count values less than current and ties
-    for vi in values:
-        diff = vi - val_to_compare
-        if diff > EPSILON:
-            rank_sum += 1
-        elif abs(diff) < EPSILON:
-            tie_count += 1
-
-    # Return average rank for ties
-    return rank_sum + (tie_count - 1) / 2.0 + 1
+# The running sums of the windows are recalculated from the source history in every this many bars, so the
+# floating point errors of the updates don't accumulate
+RENORMALIZE_BARS = 1000
 
 
 #
@@ -164,27 +148,46 @@ def alma(source: Series[float], length: int, offset: float = 0.85, sigma: float
     :return: The ALMA of the source series
     """
     assert length > 0, "Invalid length, length must be greater than 0!"
-    if isinstance(source, NA):
-        return NA(float)
-
-    # Use persistent weights to avoid recalculation
+    # Weights from the oldest to the newest value of the window
     weights: Persistent[list[float]] = []
     norm: Persistent[float] = 0.0
-
-    # Calculate weights only once
-    if not weights:
+    params: Persistent[tuple | None] = None
+    # The window in a ring buffer, every value is stored twice, so the window is always a contiguous slice
+    values: Persistent[list[float]] = []
+    pos: Persistent[int] = 0
+    na_count: Persistent[int] = 0  # Number of na values in the window
+
+    if params != (length, offset, sigma, floor):
+        # Calculate the weights and build the window from the history of the source if a parameter has changed
+        params = (length, offset, sigma, floor)
         m = offset * (length - 1) if not floor else math.floor(offset * (length - 1))
         s = length / sigma
         weights = [math.exp(-1 * ((i - m) ** 2) / (2 * s ** 2)) for i in builtins.range(length)]
-        weights.reverse()  # This is faster then using backward range or index subtraction
         norm = sum(weights)
+        values = [NA(float)] * (2 * length)
+        na_count = length
+        pos = 0
+        for i in builtins.range(length - 1, 0, -1):
+            value = source[i]
+            if not isinstance(value, NA):
+                na_count -= 1
+            values[pos] = values[pos + length] = value
+            pos += 1
+
+    if isinstance(values[pos], NA):
+        na_count -= 1
+    if isinstance(source, NA):
+        na_count += 1
+    values[pos] = values[pos + length] = source
+    start = pos + 1
+    pos = start if start < length else 0
 
-    # Vectorized calculation using dot product
+    if na_count:
+        return NA(float)
+
+    # Dot product of the weights and the window
     try:
-        summ = 0.0
-        for i, w in enumerate(weights):
-            summ += w * source[i]
-        return summ / norm
+        return sum(map(operator.mul, weights, values[start:start + length])) / norm
     except ZeroDivisionError:
         return source
 
@@ -294,8 +297,8 @@ def cmo(source: float, length: int) -> float | NA:
     momentum = change(source)
     if isinstance(momentum, NA):
         return NA(float)
-    sum1 = lib_math.sum(momentum if momentum >= 0.0 else 0.0, length)
-    sum2 = lib_math.sum(0.0 if momentum >= 0.0 else -momentum, length)
+    sum1 = lib.math.sum(momentum if momentum >= 0.0 else 0.0, length)
+    sum2 = lib.math.sum(0.0 if momentum >= 0.0 else -momentum, length)
     try:
         return 100 * (sum1 - sum2) / (sum1 + sum2)
     except ZeroDivisionError:
@@ -318,6 +321,7 @@ def cog(source: Series[float], length: int) -> float | NA[float]:
     summ: Persistent[float] = 0.0
     weighted_summ: Persistent[float] = 0.0
     val: Persistent[float] = NA(float)
+    updates: Persistent[int] = 0
 
     # Warming up phase
     if count < length:
@@ -329,9 +333,19 @@ def cog(source: Series[float], length: int) -> float | NA[float]:
 
     # Normal calculation phase
     else:
-        new_summ = summ + source - source[length]
-        weighted_summ = weighted_summ + summ - length * source[length]
-        summ = new_summ
+        updates += 1
+        if updates == RENORMALIZE_BARS:
+            # Recalculate the sums from the window, the weight of a value is its age
+            updates = 0
+            summ = 0.0
+            weighted_summ = 0.0
+            for i in builtins.range(length):
+                summ += source[i]
+                weighted_summ += source[i] * i
+        else:
+            new_summ = summ + source - source[length]
+            weighted_summ = weighted_summ + summ - length * source[length]
+            summ = new_summ
     try:
         val = -weighted_summ / summ - 1.0
     except ZeroDivisionError:
@@ -363,6 +377,7 @@ def correlation(source1: Series[float], source2: Series[float], length: int) ->
     sum_x2: Persistent[float] = 0.0
     sum_y2: Persistent[float] = 0.0
     count: Persistent[int] = 0
+    updates: Persistent[int] = 0
 
     if count < length:
         sum_x += source1
@@ -374,15 +389,29 @@ def correlation(source1: Series[float], source2: Series[float], length: int) ->
         if count < length:
             return NA(float)
     else:
-        x_toremove = source1[length]
-        y_toremove = source2[length]
+        updates += 1
+        if updates == RENORMALIZE_BARS:
+            # Recalculate the sums from the window
+            updates = 0
+            sum_x = sum_y = sum_xy = sum_x2 = sum_y2 = 0.0
+            for i in builtins.range(length):
+                x = source1[i]
+                y = source2[i]
+                sum_x += x
+                sum_y += y
+                sum_xy += x * y
+                sum_x2 += x * x
+                sum_y2 += y * y
+        else:
+            x_toremove = source1[length]
+            y_toremove = source2[length]
 
-        sum_x += source1 - source1[length]
-        sum_y += source2 - source2[length]
+            sum_x += source1 - source1[length]
+            sum_y += source2 - source2[length]
 
-        sum_xy += (source1 * source2) - (x_toremove * y_toremove)
-        sum_x2 += (source1 * source1) - (x_toremove * x_toremove)
-        sum_y2 += (source2 * source2) - (y_toremove * y_toremove)
+            sum_xy += (source1 * source2) - (x_toremove * y_toremove)
+            sum_x2 += (source1 * source1) - (x_toremove * x_toremove)
+            sum_y2 += (source2 * source2) - (y_toremove * y_toremove)
     try:
         numerator = (length * sum_xy) - (sum_x * sum_y)
         denominator = math.sqrt((length * sum_x2 - sum_x * sum_x) * (length * sum_y2 - sum_y * sum_y))
@@ -459,15 +488,28 @@ def dev(source: Series[float], length: int, _mean: float | None = None) -> float
     if length == 1:
         return 0.0
 
-    mean = _mean if _mean is not None else sma(source, length)
+    # The window in sorted order with sums, so the deviations below and above the mean can be summed
+    # without iterating the window
+    window: Persistent[RollingWindow | None] = None
+    if window is None or window.length != length:
+        # Build the window from the history of the source if the length has changed
+        window = RollingWindow(length, sums=True)
+        for i in builtins.range(length - 1, 0, -1):
+            window.push(source[i])
+    window.push(source)
+
+    values = window.sorted
+    if len(values) < length:  # Warmup or there are na values in the window
+        return NA(float)
+    total = values.total()
+    mean = _mean if _mean is not None else total / length
     if isinstance(mean, NA):
         return NA(float)
 
-    summ = 0.0
-    for i in builtins.range(length):
-        summ += abs(source[i] - mean)
-
-    return summ / length
+    # sum(|x - mean|) = sum(x >= mean) - sum(x < mean) - mean * (count(x >= mean) - count(x < mean))
+    below = values.rank_left(mean)
+    sum_below = values.sum_left(mean)
+    return (total - sum_below - sum_below - mean * (length - below - below)) / length
 
 
 # noinspection PyPep8Naming
@@ -573,32 +615,23 @@ def highest(source: Series[float], length: int, _bars: bool = False, _tuple: boo
     :param _check_eq: If true, check for equality too, internal use only
     :return: The highest value of the source series
     """
-    last_max: Persistent[float | NA] = NA(float)
-    last_max_index: Persistent[int] = 0
+    # Monotonic deque of the maximum candidates of the window
+    window: Persistent[RollingExtremum | None] = None
 
-    if last_max < source or isinstance(last_max, NA) or (_check_eq and last_max == source):
-        last_max = source
-        last_max_index = 0
+    if window is None or window.length != length:
+        # Build the deque from the history of the source if the length has changed
+        history = [source[i] for i in builtins.range(length - 1, 0, -1)]
+        window = RollingExtremum(length, history=history)
+    window.push(source, _check_eq)
 
-    if last_max_index >= length:
-        last_max = source
-        last_max_index = 0
-        for i in builtins.range(length - 1, 0, -1):
-            if source[i] > last_max:
-                last_max = source[i]
-                last_max_index = i
-
-    max_index = last_max_index
-    last_max_index += 1
-
-    if bar_index < length - 1:
+    if bar_index < length - 1 or not window.extreme_pos:
         return NA(float) if not _tuple else (NA(float), NA(float))
 
     if _bars:
-        return -max_index
+        return window.extreme_pos - window.pos
     if _tuple:
-        return cast(float | tuple[float | NA[float], float | NA[float]], (last_max, -max_index))
-    return cast(float | NA[float], last_max)
+        return window.value, window.extreme_pos - window.pos
+    return window.value
 
 
 @overload
@@ -724,6 +757,7 @@ def linreg(source: Series[float], length: int, offset: int) -> float | Series[fl
     bar_count: Persistent[int] = 0
     sum_y: Persistent[float] = 0.0  # Sum of source values in the window
     sum_xy: Persistent[float] = 0.0  # Weighted sum: sum((window_size - 1 - i) * source[i])
+    updates: Persistent[int] = 0
 
     # Warm-up phase: accumulate values until the window is full
     if bar_count < window_size:
@@ -736,11 +770,21 @@ def linreg(source: Series[float], length: int, offset: int) -> float | Series[fl
         if bar_count < window_size:
             return NA(float)
     else:
-        # Rolling update: remove the oldest value when the window is full
-        dropped_value = source[window_size]
-        prev_sum_y = sum_y
-        sum_y = prev_sum_y + source - dropped_value
-        sum_xy = (window_size - 1) * source + sum_xy - prev_sum_y + dropped_value
+        updates += 1
+        if updates == RENORMALIZE_BARS:
+            # Recalculate the sums from the window
+            updates = 0
+            sum_y = 0.0
+            sum_xy = 0.0
+            for i in builtins.range(window_size):
+                sum_y += source[i]
+                sum_xy += (window_size - 1 - i) * source[i]
+        else:
+            # Rolling update: remove the oldest value when the window is full
+            dropped_value = source[window_size]
+            prev_sum_y = sum_y
+            sum_y = prev_sum_y + source - dropped_value
+            sum_xy = (window_size - 1) * source + sum_xy - prev_sum_y + dropped_value
 
     try:
         # Compute slope and intercept
@@ -770,33 +814,23 @@ def lowest(source: Series[float], length: int,
     :param _check_eq: If true, check for equality too, internal use only
     :return: The lowest value of the source series
     """
-    last_min: Persistent[float | NA[float]] = NA(float)
-    last_min_index: Persistent[int] = 0
+    # Monotonic deque of the minimum candidates of the window
+    window: Persistent[RollingExtremum | None] = None
 
-    if last_min > source or isinstance(last_min, NA) or (_check_eq and last_min == source):
-        last_min = source
-        last_min_index = 0
-
-    if last_min_index >= length:
-        last_min = source
-        last_min_index = 0
-        for i in builtins.range(length - 1, 0, -1):
-            s = source[i]
-            if s < last_min:
-                last_min = s
-                last_min_index = i
+    if window is None or window.length != length:
+        # Build the deque from the history of the source if the length has changed
+        history = [source[i] for i in builtins.range(length - 1, 0, -1)]
+        window = RollingExtremum(length, lowest=True, history=history)
+    window.push(source, _check_eq)
 
-    min_index = last_min_index
-    last_min_index += 1
-
-    if bar_index < length - 1:
+    if bar_index < length - 1 or not window.extreme_pos:
         return NA(float) if not _tuple else (NA(float), NA(int))
 
     if _bars:
-        return -min_index
+        return window.extreme_pos - window.pos
     if _tuple:
-        return cast(float | tuple[float | NA[float], float | NA[float]], (last_min, -min_index))
-    return cast(float | NA[float], last_min)
+        return window.value, window.extreme_pos - window.pos
+    return window.value
 
 
 @overload
@@ -880,46 +914,27 @@ def median(source: Series[TFI], length: int) -> TFI | NA[TFI] | Series[TFI]:
     if isinstance(source, NA):
         return NA(cast(type[TFI], type(source)))  # type: ignore
 
-    # Store heaps and window
-    heap_low: Persistent[list[TFI]] = []  # Max heap (negative values)
-    heap_high: Persistent[list[TFI]] = []  # Min heap
-    window: Persistent[list[TFI]] = []  # Recent values for removal
-
-    # Add new value and balance heaps
-    value = source
-    window.append(cast(TFI, value))
-    heapq.heappush(heap_low, -cast(TFI, value))
-    heapq.heappush(heap_high, -heapq.heappop(heap_low))
-
-    if len(heap_low) < len(heap_high):
-        heapq.heappush(heap_low, -heapq.heappop(heap_high))
-
-    # Remove old value if window full
-    if len(window) > length:
-        old = window.pop(0)
-
-        # Remove from correct heap
-        if old <= -heap_low[0]:
-            heap_low.remove(-old)
-            heapq.heapify(heap_low)
-        else:
-            heap_high.remove(old)
-            heapq.heapify(heap_high)
-
-        # Rebalance if needed
-        if len(heap_low) < len(heap_high):
-            heapq.heappush(heap_low, -heapq.heappop(heap_high))
-        elif len(heap_low) > len(heap_high) + 1:
-            heapq.heappush(heap_high, -heapq.heappop(heap_low))
+    # The last `length` values in sorted order
+    window: Persistent[RollingWindow | None] = None
+    if window is None or window.length != length:
+        # Build the window from the history of the source if the length has changed, na values are skipped
+        window = RollingWindow(length)
+        for i in builtins.range(length - 1, 0, -1):
+            if not isinstance(source[i], NA):
+                window.push(source[i])
+    window.push(source)
 
     # Return na during warmup
-    if len(window) < length:
+    values = window.sorted
+    n = len(values)
+    if n < length:
         return NA(cast(type[TFI], type(source)))  # type: ignore
 
-    # Return median based on heap sizes
-    if len(heap_low) > len(heap_high):
-        return -heap_low[0]  # Max heap root
-    return -heap_low[0] if isinstance(source, int) else (-heap_low[0] + heap_high[0]) / 2  # type: ignore
+    # For even lengths it is the lower middle value for int sources, the average of the middle values otherwise
+    middle = values[(n - 1) // 2]
+    if n % 2 or isinstance(source, int):
+        return middle
+    return (middle + values[n // 2]) / 2  # type: ignore
 
 
 def mfi(source: float, length: int) -> float | NA[float]:
@@ -934,8 +949,8 @@ def mfi(source: float, length: int) -> float | NA[float]:
     if isinstance(source, NA):
         return NA(float)
     chg = change(source)
-    upper = lib_math.sum(volume * (0.0 if chg is not NA(float) and chg <= 0 else source), length)
-    lower = lib_math.sum(volume * (0.0 if chg is not NA(float) and chg >= 0 else source), length)
+    upper = lib.math.sum(volume * (0.0 if chg is not NA(float) and chg <= 0 else source), length)
+    lower = lib.math.sum(volume * (0.0 if chg is not NA(float) and chg >= 0 else source), length)
     if isinstance(upper, NA) or isinstance(lower, NA):
         return NA(float)
     try:
@@ -969,32 +984,41 @@ def mode(source: Series[TFI], length: int) -> TFI | NA:
              the smallest value instead. Returns na during warm-up period.
     """
     assert length > 0, "Invalid length, length must be greater than 0!"
-    if isinstance(source, NA) or bar_index < length - 1:
-        return NA(float)
-
-    # Store values for quick access
-    values = [source[i] for i in builtins.range(length) if source[i] is not NA(float)]
-    if not values:
+    # The window, the frequencies of its values, and the values ordered by descending frequency and
+    # ascending value, so the mode is the first one
+    window: Persistent[RollingWindow | None] = None
+    counts: Persistent[dict[TFI, int]] = {}
+    frequencies: Persistent[SortedList | None] = None
+
+    values = [source]
+    if window is None or window.length != length:
+        # Build the window from the history of the source if the length has changed
+        window = RollingWindow(length)
+        counts = {}
+        frequencies = SortedList()
+        values = [source[i] for i in builtins.range(length - 1, -1, -1)]
+
+    for value in values:
+        old = window.push(value)
+        if old is not None:
+            count = counts[old]
+            frequencies.remove((-count, old))
+            if count > 1:
+                counts[old] = count - 1
+                frequencies.add((1 - count, old))
+            else:
+                del counts[old]
+        if not isinstance(value, NA):
+            count = 1
+            if value in counts:
+                count = counts[value] + 1
+                frequencies.remove((1 - count, value))
+            counts[value] = count
+            frequencies.add((-count, value))
+
+    if isinstance(source, NA) or bar_index < length - 1 or not len(frequencies):
         return NA(float)
-
-    # Find mode - sort values to handle equal frequencies
-    values.sort()  # Ensure we pick smallest value when frequencies are equal
-    mode_val = values[0]
-    current_val = values[0]
-    max_freq = curr_freq = 1
-
-    # Single pass through sorted values
-    for i in builtins.range(1, len(values)):
-        if values[i] == current_val:
-            curr_freq += 1
-            if curr_freq > max_freq:
-                max_freq = curr_freq
-                mode_val = current_val
-        else:
-            current_val = values[i]
-            curr_freq = 1
-
-    return mode_val
+    return frequencies[0][1]
 
 
 def mom(source: float, length: int) -> float | NA:
@@ -1063,13 +1087,33 @@ def percentile_linear_interpolation(source: Series[float], length: int, percenta
     :return: The percentile of the source series
     """
     assert length > 0, "Invalid length, length must be greater than 0!"
-    if isinstance(source, NA):
-        return NA(float)
+    window: Persistent[RollingWindow | None] = None
+    if window is None or window.length != length:
+        # Build the window from the history of the source if the length has changed
+        window = RollingWindow(length)
+        for i in builtins.range(length - 1, 0, -1):
+            window.push(source[i])
+    window.push(source)
 
-    if bar_index < length - 1:
+    if isinstance(source, NA) or bar_index < length - 1:
         return NA(float)
-
-    return array.percentile_linear_interpolation(source[:length], percentage)  # type: ignore
+    if not (0 <= percentage <= 100):
+        raise ValueError("Percentage must be between 0 and 100")
+
+    # Same as `array.percentile_linear_interpolation`, on the sorted window
+    values = window.sorted
+    n = len(values)
+    pos = n * percentage / 100.0
+    if pos < 1:
+        return values[0]
+    if pos >= n:
+        return values[-1]
+    if pos.is_integer():
+        pos_int = int(pos)
+        return (values[pos_int - 1] + values[pos_int]) / 2.0
+    lower_index = int(pos)
+    lower = values[lower_index]
+    return lower + (pos - lower_index) * (values[lower_index + 1] - lower)
 
 
 def percentile_nearest_rank(source: Series[float], length: int, percentage: int | float) \
@@ -1083,13 +1127,26 @@ def percentile_nearest_rank(source: Series[float], length: int, percentage: int
     :return: The percentile of the source series
     """
     assert length > 0, "Invalid length, length must be greater than 0!"
-    if isinstance(source, NA):
-        return NA(float)
+    window: Persistent[RollingWindow | None] = None
+    if window is None or window.length != length:
+        # Build the window from the history of the source if the length has changed
+        window = RollingWindow(length)
+        for i in builtins.range(length - 1, 0, -1):
+            window.push(source[i])
+    window.push(source)
 
-    if bar_index < length - 1:
+    if isinstance(source, NA) or bar_index < length - 1:
         return NA(float)
+    if not (0 <= percentage <= 100):
+        raise ValueError("Percentage must be between 0 and 100")
 
-    return array.percentile_nearest_rank(source[:length], percentage)  # type: ignore
+    # Same as `array.percentile_nearest_rank`, on the sorted window
+    values = window.sorted
+    if percentage == 0:
+        return values[0]
+    n = len(values)
+    rank = builtins.max(1, builtins.min(math.ceil(percentage * n / 100), n))
+    return values[rank - 1]
 
 
 def percentrank(source: Series[float], length: int) -> float | NA[float] | Series[float]:
@@ -1102,10 +1159,19 @@ def percentrank(source: Series[float], length: int) -> float | NA[float] | Serie
     :return: The percentage of values less than or equal to the current value
     """
     assert length > 0, "Invalid length, length must be greater than 0!"
+    # The current value and the previous `length` values
+    window: Persistent[RollingWindow | None] = None
+    if window is None or window.length != length + 1:
+        # Build the window from the history of the source if the length has changed
+        window = RollingWindow(length + 1)
+        for i in builtins.range(length, 0, -1):
+            window.push(source[i])
+    window.push(source)
+
     if isinstance(source, NA) or bar_index < length:
         return NA(float)
 
-    return array.percentrank(source[:length + 1], 0)  # type: ignore
+    return (window.sorted.rank_right(source) - 1) * 100 / length
 
 
 @overload
@@ -1257,33 +1323,45 @@ def rci(source: Series[float], length: int) -> float | NA[float]:
     :return: RCI value between -100 and 100, or na during warmup
     """
     assert length > 0, "Invalid length, length must be greater than 0!"
+    # The values of the window with their positions, to know their age
+    window: Persistent[RollingWindow | None] = None
+    if window is None or window.length != length:
+        # Build the window from the history of the source if the length has changed
+        window = RollingWindow(length, positions=True)
+        for i in builtins.range(length - 1, 0, -1):
+            window.push(source[i])
+    window.push(source)
 
     if isinstance(source, NA) or bar_index < length:
         return NA(float)
 
-    # Collect values for performance
-    try:
-        values = cast(list[float], source[:length])  # type: ignore
-        # log.warning("values: {0}", values)
-    except IndexError:
+    entries = list(window.sorted)
+    n = length
+    if len(entries) < n:  # There are na values in the window
         return NA(float)
 
-    # Calculate sums for correlation
-    sum_x = sum_y = sum_xy = sum_x2 = sum_y2 = 0.0
-
-    for i in builtins.range(length):
-        x = i + 1  # Time rank (newest value gets highest rank)
-        y = _avgrank(values, values[i])  # Data rank  # type: ignore
-
-        sum_x += x
-        sum_y += y
-        sum_xy += x * y
-        sum_x2 += x * x
-        sum_y2 += y * y
+    # The time rank (x) is the age of the value + 1, the data rank (y) is the rank in descending order,
+    # values closer than EPSILON to each other get their average rank
+    newest = window.pos - 1
+    sum_y = sum_xy = sum_y2 = 0.0
+    end = n
+    while end:
+        start = end - 1
+        top = entries[start][0]
+        while start and top - entries[start - 1][0] < EPSILON:
+            start -= 1
+        y = (n - end + 1 + n - start) / 2.0
+        ties = end - start
+        sum_y += y * ties
+        sum_y2 += y * y * ties
+        for i in builtins.range(start, end):
+            sum_xy += (newest - entries[i][1] + 1) * y
+        end = start
+    sum_x = n * (n + 1) / 2.0
+    sum_x2 = n * (n + 1) * (2 * n + 1) / 6.0
 
     # Calculate correlation coefficient
     try:
-        n = length
         numerator = n * sum_xy - sum_x * sum_y
         denominator = math.sqrt((n * sum_x2 - sum_x * sum_x) * (n * sum_y2 - sum_y * sum_y))
         return (numerator / denominator) * 100
@@ -1462,7 +1540,7 @@ def sma(source: float, length: int) -> float | NA[float]:
     :param length: The length of the moving average
     :return: The Simple Moving Average (SMA)
     """
-    return lib_math.sum(source, length) / length
+    return lib.math.sum(source, length) / length
 
 
 def stdev(source: float, length: int, biased=True) -> float | NA[float]:
@@ -1753,7 +1831,7 @@ def vwap(source: Series[float], anchor: bool | None = None, stdev_mult: float |
     had_anchor: Persistent[bool] = False
 
     if anchor is None:
-        anchor = session.isfirstbar
+        anchor = lib.session.isfirstbar
 
     # Reset calculations if anchor condition is met
     if anchor is not None and anchor:
@@ -1827,6 +1905,7 @@ def wma(source: Series[float], length: int) -> float | NA[float]:
     count: Persistent[int] = 0
     summ: Persistent[float] = 0.0
     weighted_summ: Persistent[float] = 0.0
+    updates: Persistent[int] = 0
 
     # Warming up phase
     if count < length:
@@ -1838,11 +1917,21 @@ def wma(source: Series[float], length: int) -> float | NA[float]:
 
     # Normal calculation phase
     else:
-        old_summ = summ
-        # Substract the oldest value and add the newest value
-        summ -= source[length] - source
-        # Substract the oldest weighted value and add the newest weighted value
-        weighted_summ -= old_summ - length * source
+        updates += 1
+        if updates == RENORMALIZE_BARS:
+            # Recalculate the sums from the window
+            updates = 0
+            summ = 0.0
+            weighted_summ = 0.0
+            for i in builtins.range(length):
+                summ += source[i]
+                weighted_summ += source[i] * (length - i)
+        else:
+            old_summ = summ
+            # Substract the oldest value and add the newest value
+            summ -= source[length] - source
+            # Substract the oldest weighted value and add the newest weighted value
+            weighted_summ -= old_summ - length * source
 
     try:
         val = weighted_summ / denom
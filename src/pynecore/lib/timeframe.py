@@ -83,20 +83,10 @@ def _get_first_session_start_in_day(dt: datetime) -> datetime | None:
     :return: First session start time in UTC
     """
     local_dt = dt.astimezone(_parse_timezone(_syminfo.timezone))
-    weekday = local_dt.weekday()
-
-    # Get all session starts for current weekday
-    day_starts = [
-        time for day, time in _syminfo._session_starts
-        if day == weekday
-    ]
-
-    if not day_starts:
+    first_start = _syminfo._calendar.first_session_start(local_dt.weekday())
+    if first_start is None:
         return None
 
-    # Get the earliest session start for the day
-    first_start = min(day_starts)
-
     # Create datetime with the session start time
     ssdt = local_dt.replace(
         hour=first_start.hour,
@@ -129,59 +119,17 @@ def _get_new_year_session(dt: datetime) -> datetime | None:
 
 
 # noinspection PyProtectedMember
-def _is_new_session(current_dt: datetime, prev_dt: datetime | None = None, tf_sec: int | None = None) -> bool:
+def _is_new_session(current_dt: datetime, tf_sec: int | None = None) -> bool:
     """
-    Check if current bar starts a new session.
+    Check if current bar starts a new session, the previous bar is the one just before it.
 
     :param current_dt: Current candle datetime (in local exchange timezone)
-    :param prev_dt: Previous candle datetime (in local exchange timezone)
     :param tf_sec: Timeframe width in seconds
     :return: True if this is the first candle of a new session
     """
     if tf_sec is None:
         tf_sec = in_seconds(_syminfo.period)
-    if prev_dt is None:
-        prev_dt = current_dt - timedelta(seconds=tf_sec)
-
-    current_weekday = current_dt.weekday()
-    prev_weekday = prev_dt.weekday()
-
-    # Get all possible session starts:
-    # 1. Current day sessions
-    # 2. If previous day different, then previous day's overnight sessions
-    session_starts = [
-        ss for day, ss in _syminfo._session_starts
-        if day == current_weekday
-    ]
-
-    if prev_weekday != current_weekday:
-        prev_day_starts = [
-            (ss, se) for day, ss, se in _syminfo._opening_hours
-            if day == prev_weekday and se < ss  # Only overnight sessions
-        ]
-        # Add overnight session starts to check
-        for ss, se in prev_day_starts:
-            session_starts.append(ss)
-
-    # For each session start
-    for start_time in session_starts:
-        session_start = current_dt.replace(
-            hour=start_time.hour,
-            minute=start_time.minute,
-            second=start_time.second,
-            microsecond=0
-        )
-
-        # If it crosses the day boundary, we set it to the previous day
-        if prev_weekday != current_weekday and start_time > current_dt.time():
-            session_start = session_start - timedelta(days=1)
-
-        # If session starts in this bar
-        if (current_dt <= session_start < current_dt + timedelta(seconds=tf_sec) and
-                session_start > prev_dt):
-            return True
-
-    return False
+    return _syminfo._calendar.is_new_session(current_dt, tf_sec)
 
 
 __persistent_next_new_year_session: datetime | None = None
@@ -243,16 +191,12 @@ def change(timeframe: str) -> bool:
 
         # Daily timeframe's anchor is the first session of the year
         if _modifier == 'D':
-            _dt = nydt
-
-            while _dt < dt:
-                if _is_new_session(_dt, _dt - timedelta(seconds=xchg_tf_sec), xchg_tf_sec):
-                    __persistent_cycle -= 1
-                    if __persistent_cycle <= 0:
-                        __persistent_last_signal = _dt
-                        __persistent_cycle = _multiplier
-
-                _dt += timedelta(seconds=xchg_tf_sec)
+            # Only the bars starting a new session are visited
+            for _dt in _syminfo._calendar.new_session_bars(nydt, dt, xchg_tf_sec):
+                __persistent_cycle -= 1
+                if __persistent_cycle <= 0:
+                    __persistent_last_signal = _dt
+                    __persistent_cycle = _multiplier
 
         # Weekly timeframe's anchor is the first Monday of the year
         elif _modifier == 'W':
@@ -293,12 +237,11 @@ def change(timeframe: str) -> bool:
 
     # We need to check every virtual candles, even if they are missing in the dataset
     while __persistent_last_dt < dt:
-        prev_dt = __persistent_last_dt
         __persistent_last_dt += timedelta(seconds=xchg_tf_sec)
 
         if is_intraday:
             # The anchor point is the session start
-            if _is_new_session(__persistent_last_dt, prev_dt, xchg_tf_sec):
+            if _is_new_session(__persistent_last_dt, xchg_tf_sec):
                 # We need to round the session start to the nearest hour
                 __persistent_last_signal = __persistent_last_dt.replace(minute=0, second=0, microsecond=0)
             assert __persistent_last_signal is not None
@@ -319,7 +262,7 @@ def change(timeframe: str) -> bool:
                     __persistent_next_new_year_session + timedelta(days=367))
                 __persistent_cycle = 0
 
-            if _is_new_session(__persistent_last_dt, prev_dt, xchg_tf_sec):
+            if _is_new_session(__persistent_last_dt, xchg_tf_sec):
                 __persistent_cycle -= 1
                 assert __persistent_last_signal is not None
                 if __persistent_cycle <= 0:
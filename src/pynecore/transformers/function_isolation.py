@@ -370,7 +370,8 @@ class FunctionIsolationTransformer(ast.NodeTransformer):
         if self._is_stdlib_function(node.func):
             return node
 
-        # Create call ID based on full scope path and function name
+        # Create call ID based on full scope path and function name, the counter is the slot of the call site
+        slot = self._call_id_counter
         call_id = self._create_call_id(node.func)
         if not call_id:
             return node
@@ -382,7 +383,8 @@ class FunctionIsolationTransformer(ast.NodeTransformer):
                 args=[
                     node.func,
                     ast.Constant(value=call_id),
-                    ast.Name(id='__scope_id__', ctx=ast.Load())
+                    ast.Name(id='__scope_id__', ctx=ast.Load()),
+                    ast.Constant(value=slot)
                 ],
                 keywords=[]
             ),
@@ -0,0 +1,153 @@
+from typing import Callable, Iterable
+import ast
+
+__all__ = ['SKIP', 'FusableTransformer', 'FusedTransformer']
+
+# Return value of enter hooks: do not visit the children of the node with the transformer
+SKIP = frozenset(('*',))
+
+_Hook = Callable[[ast.AST], object] | None
+
+
+class FusableTransformer(ast.NodeTransformer):
+    """
+    Base class of transformers which can share one traversal with other transformers.
+
+    Instead of `visit_<Node>` methods these transformers implement hooks:
+    - `enter_<Node>(node)`: called before the children are visited. It can return `SKIP` to not
+      visit the children with this transformer, or a collection of field names to skip only those
+      fields. `enter_node(node)` is called for node types without specific enter hook.
+    - `leave_<Node>(node)`: called after the children are visited. It returns the new node, a list
+      of nodes or None to remove the node, like `visit_<Node>` methods of `ast.NodeTransformer`.
+
+    Used alone, it works like any other `ast.NodeTransformer`.
+    """
+
+    def visit(self, node: ast.AST) -> ast.AST | list[ast.AST] | None:
+        return FusedTransformer(self).visit(node)
+
+
+class FusedTransformer(ast.NodeTransformer):
+    """
+    Run multiple fusable transformers in a single traversal.
+
+    Hooks are called in the order of the transformers, so the result is the same as running them one
+    after the other, if every transformer only depends on the output of the previous ones in the nodes
+    it has already visited. Nodes created by a leave hook are not visited by the next transformers,
+    only their leave hook is called on them.
+    """
+
+    def __init__(self, *transformers: FusableTransformer):
+        self.transformers = transformers
+        self._all = tuple(range(len(transformers)))
+        # Enter and leave hooks of every transformer by node type
+        self._hooks: dict[type, tuple[tuple[_Hook, ...], tuple[_Hook, ...]]] = {}
+
+    def _get_hooks(self, cls: type) -> tuple[tuple[_Hook, ...], tuple[_Hook, ...]]:
+        """
+        Get (and cache) the enter and leave hooks of a node type
+        """
+        try:
+            return self._hooks[cls]
+        except KeyError:
+            pass
+        name = cls.__name__
+        enters = tuple(getattr(t, 'enter_' + name, None) or getattr(t, 'enter_node', None)
+                       for t in self.transformers)
+        leaves = tuple(getattr(t, 'leave_' + name, None) for t in self.transformers)
+        hooks = self._hooks[cls] = (enters, leaves)
+        return hooks
+
+    def visit(self, node: ast.AST) -> ast.AST | list[ast.AST] | None:
+        return self._visit(node, self._all)
+
+    def _visit(self, node: ast.AST, active: tuple[int, ...]) -> ast.AST | list[ast.AST] | None:
+        """
+        Visit a node with the active transformers (by index)
+        """
+        enters, leaves = self._get_hooks(node.__class__)
+
+        # Enter hooks, they decide which transformers visit the children
+        children = active
+        skipped: dict[str, set[int]] | None = None
+        for i in active:
+            enter = enters[i]
+            if enter is None:
+                continue
+            skip = enter(node)
+            if not skip:
+                continue
+            if skip is SKIP:
+                children = tuple(j for j in children if j != i)
+            else:
+                if skipped is None:
+                    skipped = {}
+                for field in skip:  # type: ignore
+                    skipped.setdefault(field, set()).add(i)
+
+        if children:
+            self._visit_children(node, children, skipped)
+
+        # Leave hooks, every transformer gets the result of the previous one
+        result: ast.AST | list[ast.AST] | None = node
+        for i in active:
+            if result is None:
+                break
+            if isinstance(result, ast.AST):
+                leave = leaves[i] if result is node else self._get_hooks(result.__class__)[1][i]
+                if leave is not None:
+                    result = leave(result)  # type: ignore
+            else:
+                result = self._leave_all(result, i)
+        return result
+
+    def _leave_all(self, nodes: Iterable[ast.AST], i: int) -> list[ast.AST]:
+        """
+        Call the leave hook of a transformer on a list of nodes
+        """
+        results = []
+        for node in nodes:
+            leave = self._get_hooks(node.__class__)[1][i]
+            result = node if leave is None else leave(node)
+            if result is None:
+                continue
+            if isinstance(result, ast.AST):
+                results.append(result)
+            else:
+                results.extend(result)  # type: ignore
+        return results
+
+    def _visit_children(self, node: ast.AST, children: tuple[int, ...], skipped: dict[str, set[int]] | None):
+        """
+        Visit the children of a node, like `ast.NodeTransformer.generic_visit`
+        """
+        for field in node._fields:
+            try:
+                old_value = getattr(node, field)
+            except AttributeError:
+                continue
+
+            active = children
+            if skipped is not None and field in skipped:
+                active = tuple(i for i in children if i not in skipped[field])
+                if not active:
+                    continue
+
+            if isinstance(old_value, list):
+                new_values = []
+                for value in old_value:
+                    if isinstance(value, ast.AST):
+                        value = self._visit(value, active)
+                        if value is None:
+                            continue
+                        elif not isinstance(value, ast.AST):
+                            new_values.extend(value)
+                            continue
+                    new_values.append(value)
+                old_value[:] = new_values
+            elif isinstance(old_value, ast.AST):
+                new_node = self._visit(old_value, active)
+                if new_node is None:
+                    delattr(node, field)
+                else:
+                    setattr(node, field, new_node)
@@ -18,6 +18,12 @@ class ImportLifterTransformer(ast.NodeTransformer):
                 (node.module == 'pynecore.lib' or
                  node.module.startswith('pynecore.lib.')))
 
+    def visit(self, node: ast.AST) -> ast.AST:
+        """Imports are statements, so expressions are not traversed"""
+        if isinstance(node, ast.expr):
+            return node
+        return super().visit(node)
+
     def visit_Module(self, node: ast.Module) -> ast.Module:
         """Process module and add lifted imports at the top"""
         # Process the entire module first to collect all imports
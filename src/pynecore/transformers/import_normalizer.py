@@ -1,6 +1,10 @@
 import ast
 from typing import Dict, Set, List, Optional, cast
 
+from .fused import FusableTransformer
+# noinspection PyProtectedMember
+from ..lib import _LAZY_SUBMODULES
+
 NON_MODULE_ATTRS = {
     'input',  # class
     'script',  # class
@@ -9,7 +13,7 @@ NON_MODULE_ATTRS = {
 }
 
 
-class ImportNormalizerTransformer(ast.NodeTransformer):
+class ImportNormalizerTransformer(FusableTransformer):
     """
     AST transformer that normalizes pynecore.lib imports.
     - Converts all lib-related imports to 'from pynecore import lib'
@@ -29,6 +33,9 @@ class ImportNormalizerTransformer(ast.NodeTransformer):
         self.function_imports: List[ast.ImportFrom] = []
         # Current function being processed
         self.current_function: Optional[str] = None
+        self.previous_functions: List[Optional[str]] = []
+        # If the module already has 'from pynecore import lib'
+        self.has_lib_import = False
         # Track direct module imports: alias -> module_path
         self.module_imports: Dict[str, str] = {}
         # Track wildcard imports: module_path -> set of exposed names
@@ -142,14 +149,12 @@ class ImportNormalizerTransformer(ast.NodeTransformer):
                 asname = alias.asname or parts[-1]
                 self.module_imports[asname] = 'lib.' + '.'.join(parts[2:])
 
-    def visit_Module(self, node: ast.Module) -> ast.Module:
-        """Handle module level transformations"""
-        # First collect all imports
-        has_lib_import = False
+    def enter_Module(self, node: ast.Module):
+        """Collect all imports before processing the rest of the module"""
         for stmt in node.body:
             if isinstance(stmt, ast.ImportFrom):
                 if stmt.module == 'pynecore' and any(n.name == 'lib' for n in stmt.names):
-                    has_lib_import = True
+                    self.has_lib_import = True
 
             if isinstance(stmt, (ast.ImportFrom, ast.Import)):
                 self._validate_import(stmt)
@@ -158,9 +163,8 @@ class ImportNormalizerTransformer(ast.NodeTransformer):
                 else:
                     self._handle_import(cast(ast.Import, stmt))
 
-        # Process the rest of the module to collect attribute usages
-        node = cast(ast.Module, self.generic_visit(node))
-
+    def leave_Module(self, node: ast.Module) -> ast.Module:
+        """Handle module level transformations"""
         # Filter out old lib imports
         new_body = []
         for stmt in node.body:
@@ -180,7 +184,7 @@ class ImportNormalizerTransformer(ast.NodeTransformer):
         imports = []
 
         # Add base lib import if needed and not present
-        if self.needs_lib_import and not has_lib_import:
+        if self.needs_lib_import and not self.has_lib_import:
             imports.append(
                 ast.ImportFrom(
                     module='pynecore',
@@ -189,8 +193,8 @@ class ImportNormalizerTransformer(ast.NodeTransformer):
                 )
             )
 
-        # Add required submodule imports
-        for submodule in sorted(self.required_submodules):
+        # Add required submodule imports, lazy submodules of lib are imported on first use
+        for submodule in sorted(self.required_submodules - _LAZY_SUBMODULES):
             imports.append(
                 ast.Import(
                     names=[ast.alias(name=f'pynecore.lib.{submodule}', asname=None)]
@@ -209,11 +213,8 @@ class ImportNormalizerTransformer(ast.NodeTransformer):
         node.body = new_body
         return node
 
-    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+    def leave_Attribute(self, node: ast.Attribute) -> ast.AST:
         """Track lib.xxx usage to detect required submodules"""
-        # Process children first
-        node = cast(ast.Attribute, self.generic_visit(node))
-
         # Extract the full chain
         parts = []
         current = node
@@ -242,7 +243,7 @@ class ImportNormalizerTransformer(ast.NodeTransformer):
                         raise SyntaxError(
                             "'lib' must be imported as itself, not as an alias")
 
-    def visit_Name(self, node: ast.Name) -> ast.AST:
+    def leave_Name(self, node: ast.Name) -> ast.AST:
         """Transform variable references"""
         if isinstance(node.ctx, ast.Load):
             # Handle regular imports
@@ -283,14 +284,12 @@ class ImportNormalizerTransformer(ast.NodeTransformer):
                         return result
         return node
 
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
-        """Process function definitions and handle imports"""
-        old_function = self.current_function
+    def enter_FunctionDef(self, node: ast.FunctionDef):
+        """Enter function context"""
+        self.previous_functions.append(self.current_function)
         self.current_function = node.name
 
-        # Process function
-        node = cast(ast.FunctionDef, self.generic_visit(node))
-
-        # Reset function context
-        self.current_function = old_function
+    def leave_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
+        """Reset function context"""
+        self.current_function = self.previous_functions.pop()
         return node
@@ -1,8 +1,10 @@
 from typing import cast
 import ast
 
+from .fused import FusableTransformer, SKIP
 
-class InputTransformer(ast.NodeTransformer):
+
+class InputTransformer(FusableTransformer):
     """
     Transform input function calls:
     1. Add _id parameter to input calls
@@ -14,6 +16,7 @@ class InputTransformer(ast.NodeTransformer):
     def __init__(self):
         self.function_source_vars = {}  # function_name -> {var_name -> source_str}
         self.current_function = None
+        self.previous_functions: list[str | None] = []
         self.has_source_inputs = False
         self.imported_names: set[str] = set()  # Track what's already imported
 
@@ -35,10 +38,10 @@ class InputTransformer(ast.NodeTransformer):
                 node.func.value.value.id == 'lib' and
                 node.func.value.attr == 'input')
 
-    def visit_arguments(self, node: ast.arguments) -> ast.arguments:
+    def enter_arguments(self, node: ast.arguments):
         """Add _id to input calls in function arguments and collect source vars"""
         if self.current_function is None:
-            return node
+            return SKIP
 
         # Loop through arguments and defaults together
         for arg, default in zip(node.args[-len(node.defaults):], node.defaults):
@@ -82,17 +85,17 @@ class InputTransformer(ast.NodeTransformer):
                                 self.function_source_vars[self.current_function][arg.arg] = attr.attr
                                 self.has_source_inputs = True
 
-        return node
+        # The input calls are processed as they are, their children are not needed
+        return SKIP
 
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
-        """Insert getattr calls at the start of functions for source inputs"""
+    def enter_FunctionDef(self, node: ast.FunctionDef):
+        """Track the current function"""
         # Save previous function name
-        previous_function = self.current_function
+        self.previous_functions.append(self.current_function)
         self.current_function = node.name
 
-        # Process function arguments and body
-        node = cast(ast.FunctionDef, self.generic_visit(node))
-
+    def leave_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
+        """Insert getattr calls at the start of functions for source inputs"""
         # Add getattr for each source input in this function
         source_vars = self.function_source_vars.get(self.current_function, {})
         for var_name, source_str in source_vars.items():
@@ -116,14 +119,11 @@ class InputTransformer(ast.NodeTransformer):
             node.body.insert(0, assign)
 
         # Restore previous function name
-        self.current_function = previous_function
+        self.current_function = self.previous_functions.pop()
         return node
 
-    def visit_Module(self, node: ast.Module) -> ast.Module:
+    def leave_Module(self, node: ast.Module) -> ast.Module:
         """Add required imports if not present"""
-        # Process the module first to collect existing imports
-        node = cast(ast.Module, self.generic_visit(node))
-
         if not self.has_source_inputs:
             return node
 
@@ -1,8 +1,10 @@
 import ast
-from typing import Dict, Set, cast
+from typing import Dict, Set
 
+from .fused import FusableTransformer
 
-class LibrarySeriesTransformer(ast.NodeTransformer):
+
+class LibrarySeriesTransformer(FusableTransformer):
     """
     AST transformer that prepares library Series variables for the SeriesTransformer.
     When a library variable is used with indexing, it creates a local Series variable
@@ -35,13 +37,12 @@ class LibrarySeriesTransformer(ast.NodeTransformer):
             )
         return result
 
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
-        """Track current function and insert Series declarations"""
+    def enter_FunctionDef(self, node: ast.FunctionDef):
+        """Track current function"""
         self.current_function = node.name
 
-        # Process function body first
-        node = cast(ast.FunctionDef, self.generic_visit(node))
-
+    def leave_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
+        """Insert Series declarations"""
         # Insert declarations for used Series at the start of the function
         if self.current_function in self.declarations_to_insert:
             node.body = self.declarations_to_insert[self.current_function] + node.body
@@ -84,8 +85,11 @@ class LibrarySeriesTransformer(ast.NodeTransformer):
 
         return local_name
 
-    def visit_Subscript(self, node: ast.Subscript) -> ast.AST:
-        """Convert library Series access when used with indexing"""
+    def leave_Subscript(self, node: ast.Subscript) -> ast.AST:
+        """
+        Convert library Series access when used with indexing. It is called after the children
+        are visited, so the references of the subscript are already normalized to lib.xxx
+        """
 
         # Get the full attribute chain
         def get_attribute_chain(_node):
@@ -103,4 +107,4 @@ class LibrarySeriesTransformer(ast.NodeTransformer):
                 # Replace lib.xxx.yyy[idx] with local_name[idx]
                 node.value = ast.Name(id=local_name, ctx=ast.Load())
 
-        return self.generic_visit(node)
+        return node
@@ -3,8 +3,10 @@ import json
 from pathlib import Path
 from typing import cast
 
+from .fused import FusableTransformer
 
-class ModulePropertyTransformer(ast.NodeTransformer):
+
+class ModulePropertyTransformer(FusableTransformer):
     """
     Transform lib.xxx references based on JSON configuration.
     If module+name exists in config:
@@ -20,6 +22,8 @@ class ModulePropertyTransformer(ast.NodeTransformer):
         self.module_info: dict[str, dict[str, dict[str, any]]] = {}
         # Track if we're inside isolate_function args
         self.in_isolate_function = False
+        # The entered isolate_function calls with the context before them
+        self.isolate_calls: list[tuple[ast.Call, bool]] = []
 
         # Load config
         try:
@@ -28,17 +32,12 @@ class ModulePropertyTransformer(ast.NodeTransformer):
         except (IOError, json.JSONDecodeError) as e:
             raise RuntimeError(f"Failed to load module properties config: {e}")
 
-    def visit(self, node: ast.AST) -> ast.AST:
+    def enter_node(self, node: ast.AST):
         """
-        Override the generic visit method to:
+        Called before visiting the children of any node to:
         1. Set .parent on each child node for chain detection
         2. Track isolate_function context
         """
-        # Check if entering isolate_function call
-        is_isolate_call = (isinstance(node, ast.Call) and
-                           isinstance(node.func, ast.Name) and
-                           node.func.id == 'isolate_function')
-
         # Set parent on children
         for field, value in ast.iter_fields(node):
             if isinstance(value, ast.AST):
@@ -48,20 +47,21 @@ class ModulePropertyTransformer(ast.NodeTransformer):
                     if isinstance(item, ast.AST):
                         item.parent = node
 
-        # Handle isolate_function context
-        if is_isolate_call:
-            old_context = self.in_isolate_function
+        # Check if entering isolate_function call
+        if (isinstance(node, ast.Call) and
+                isinstance(node.func, ast.Name) and
+                node.func.id == 'isolate_function'):
+            self.isolate_calls.append((node, self.in_isolate_function))
             self.in_isolate_function = True
-            result = super().visit(node)
-            self.in_isolate_function = old_context
-            return result
 
-        return super().visit(node)
+    def leave_Call(self, node: ast.Call) -> ast.AST:
+        """Restore the isolate_function context when leaving the call."""
+        if self.isolate_calls and self.isolate_calls[-1][0] is node:
+            self.in_isolate_function = self.isolate_calls.pop()[1]
+        return node
 
-    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+    def leave_Attribute(self, node: ast.Attribute) -> ast.AST:
         """Process attribute access, but skip if inside isolate_function args."""
-        node = cast(ast.Attribute, self.generic_visit(node))
-
         # Skip if inside isolate_function
         if self.in_isolate_function:
             return node
@@ -0,0 +1,257 @@
+from typing import Any
+from inspect import Parameter, Signature
+import ast
+import builtins
+import importlib
+
+from .fused import FusableTransformer
+
+# Placeholder of arguments whose value is not known at compile time
+_UNKNOWN = object()
+
+
+class _UnknownType:
+    """ Type annotation which can't be evaluated at compile time """
+
+
+class _LocalImplementation:
+    """
+    Implementation of an overloaded function defined in the transformed module, created from its AST,
+    with the same attributes the dispatcher uses
+    """
+    __slots__ = ('slot', 'sig', 'type_hints', 'param_types')
+
+    def __init__(self, node: ast.FunctionDef, slot: int):
+        self.slot = slot
+        params = []
+        args = node.args
+        positional = args.posonlyargs + args.args
+        defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+        for i, (arg, default) in enumerate(zip(positional, defaults)):
+            kind = Parameter.POSITIONAL_ONLY if i < len(args.posonlyargs) else Parameter.POSITIONAL_OR_KEYWORD
+            params.append(self._parameter(arg, kind, default))
+        if args.vararg:
+            params.append(self._parameter(args.vararg, Parameter.VAR_POSITIONAL, None))
+        for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+            params.append(self._parameter(arg, Parameter.KEYWORD_ONLY, default))
+        if args.kwarg:
+            params.append(self._parameter(args.kwarg, Parameter.VAR_KEYWORD, None))
+        self.sig = Signature(params)
+        self.type_hints = {arg.arg: self._annotation_type(arg.annotation)
+                           for arg in positional + args.kwonlyargs if arg.annotation}
+        self.param_types = tuple((param.name, self.type_hints.get(param.name, Any)) for param in params)
+
+    @staticmethod
+    def _parameter(arg: ast.arg, kind: Any, default: ast.expr | None) -> Parameter:
+        if default is None:
+            return Parameter(arg.arg, kind)
+        try:
+            value = ast.literal_eval(default)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            value = _UNKNOWN
+        return Parameter(arg.arg, kind, default=value)
+
+    @staticmethod
+    def _annotation_type(annotation: ast.expr) -> Any:
+        """ Only builtin types (e.g. `int`, `float`, `str`) are known at compile time """
+        if isinstance(annotation, ast.Name):
+            value = getattr(builtins, annotation.id, None)
+            if isinstance(value, type):
+                return value
+        return _UnknownType
+
+
+class OverloadTransformer(FusableTransformer):
+    """
+    Resolve calls of overloaded library functions at compile time.
+
+    The dispatcher of an `@overload`-ed function checks the types of the arguments on every call to
+    find the implementation. If the implementation can be decided from the number of arguments, the
+    keywords and the literal arguments, the isolated call is rewritten to call the implementation
+    directly, e.g.:
+
+        isolate_function(lib.ta.highest, 'main|lib.ta.highest|0', __scope_id__, 0)(14)
+
+    becomes
+
+        isolate_function(lib.ta.highest.__overloads__[1].func, 'main|lib.ta.highest|0',
+                         __scope_id__, 0)(14)
+
+    Calls of overloaded functions defined in the transformed module itself (e.g. `highest` in the `ta`
+    library) are resolved from their AST, only builtin type annotations are checked for them.
+
+    Calls which can't be resolved are left as is, the dispatcher resolves them at runtime.
+    """
+
+    def __init__(self):
+        # Implementations of the overloaded functions of the module by name
+        self.local_overloads: dict[str, list[_LocalImplementation]] = {}
+
+    def enter_Module(self, node: ast.Module):
+        """
+        Collect the overloaded functions of the module, in the order they are registered
+        """
+        functions: dict[str, list[ast.FunctionDef]] = {}
+        overloaded = set()
+        for stmt in node.body:
+            if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                functions.setdefault(stmt.name, []).append(stmt)
+                if any(isinstance(d, ast.Name) and d.id == 'overload' for d in stmt.decorator_list):
+                    overloaded.add(stmt.name)
+        for name in overloaded:
+            # All definitions of the name must be overloads, otherwise the name is rebound
+            if all(any(isinstance(d, ast.Name) and d.id == 'overload' for d in f.decorator_list)
+                   for f in functions[name]):
+                self.local_overloads[name] = [_LocalImplementation(f, slot)
+                                              for slot, f in enumerate(functions[name])]
+
+    def leave_Call(self, node: ast.Call) -> ast.Call:
+        """
+        Check isolated calls of overloaded library functions
+        """
+        isolate_call = node.func
+        if not (isinstance(isolate_call, ast.Call)
+                and isinstance(isolate_call.func, ast.Name)
+                and isolate_call.func.id == 'isolate_function'
+                and isolate_call.args):
+            return node
+
+        func = isolate_call.args[0]
+        implementations = self._get_implementations(func)
+        if not implementations:
+            return node
+
+        index = self._resolve(implementations, node)
+        if index is None:
+            return node
+
+        isolate_call.args[0] = ast.Attribute(
+            value=ast.Subscript(
+                value=ast.Attribute(value=func, attr='__overloads__', ctx=ast.Load()),
+                slice=ast.Constant(value=index),
+                ctx=ast.Load()
+            ),
+            attr='func',
+            ctx=ast.Load()
+        )
+        return node
+
+    def _get_implementations(self, node: ast.expr) -> list | None:
+        """
+        Get the implementations of an overloaded `lib.xxx` function or an overloaded function of the
+        module referenced by the node
+
+        :return: The implementations or None if it is not an overloaded function
+        """
+        if isinstance(node, ast.Name):
+            return self.local_overloads.get(node.id)
+
+        attrs = []
+        current = node
+        while isinstance(current, ast.Attribute):
+            attrs.append(current.attr)
+            current = current.value
+        if not attrs or not isinstance(current, ast.Name) or current.id != 'lib':
+            return None
+
+        try:
+            obj = importlib.import_module('pynecore.lib')
+            for attr in reversed(attrs):
+                obj = getattr(obj, attr)
+        except (ImportError, AttributeError):
+            return None
+        return getattr(obj, '__overloads__', None)
+
+    @staticmethod
+    def _get_value(node: ast.expr) -> Any:
+        """
+        Get the value of a literal argument
+        """
+        try:
+            return ast.literal_eval(node)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            return _UNKNOWN
+
+    def _resolve(self, implementations: list, node: ast.Call) -> int | None:
+        """
+        Find the implementation which would be chosen by the dispatcher at runtime
+
+        :return: The index of the implementation or None if it can't be decided at compile time
+        """
+        if any(isinstance(arg, ast.Starred) for arg in node.args) \
+                or any(kw.arg is None for kw in node.keywords):
+            return None
+
+        args = tuple(self._get_value(arg) for arg in node.args)
+        kwargs = {kw.arg: self._get_value(kw.value) for kw in node.keywords}
+
+        # The order the dispatcher tries the implementations
+        checks = []
+        if not kwargs:
+            checks.extend((impl, self._match_positional) for impl in implementations)
+        checks.extend((impl, self._match_bound) for impl in implementations)
+
+        # Implementations which may match, depending on the runtime types
+        candidates = set()
+        try:
+            for impl, check in checks:
+                result = check(impl, args, kwargs)
+                if result is False:
+                    continue
+                candidates.add(impl.slot)
+                if result is True:
+                    break
+        except TypeError:
+            return None
+
+        # If only one implementation can match, the dispatcher either calls it or raises TypeError
+        if len(candidates) == 1:
+            return candidates.pop()
+        return None
+
+    @staticmethod
+    def _check(value: Any, expected_type: Any) -> bool | None:
+        """
+        Check the type of a value like the dispatcher, None means it is only known at runtime
+        """
+        # noinspection PyProtectedMember
+        from ..core.overload import _check_type
+        if value is _UNKNOWN or expected_type is _UnknownType:
+            return None
+        return _check_type(value, expected_type)
+
+    def _match_positional(self, impl: Any, args: tuple, _: dict) -> bool | None:
+        """
+        Match the quick path of the dispatcher: positional arguments only, without defaults
+        """
+        if len(args) != len(impl.param_types):
+            return False
+        result = True
+        for arg, (_, type_) in zip(args, impl.param_types):
+            match = self._check(arg, type_)
+            if match is False:
+                return False
+            if match is None:
+                result = None
+        return result
+
+    def _match_bound(self, impl: Any, args: tuple, kwargs: dict) -> bool | None:
+        """
+        Match the slow path of the dispatcher: bound arguments with defaults
+        """
+        try:
+            bound = impl.sig.bind(*args, **kwargs)
+        except TypeError:
+            return False
+        bound.apply_defaults()
+        result = True
+        for name, value in bound.arguments.items():
+            try:
+                match = self._check(value, impl.type_hints.get(name, Any))
+            except TypeError:  # The dispatcher skips the implementation in this case
+                return False
+            if match is False:
+                return False
+            if match is None:
+                result = None
+        return result
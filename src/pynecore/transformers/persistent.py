@@ -1,8 +1,10 @@
 from typing import cast
 import ast
 
+from .fused import FusableTransformer, SKIP
 
-class PersistentTransformer(ast.NodeTransformer):
+
+class PersistentTransformer(FusableTransformer):
     """
     Transform Persistent type annotations and assignments to global variables
     """
@@ -50,7 +52,7 @@ class PersistentTransformer(ast.NodeTransformer):
 
         return None
 
-    def visit_ImportFrom(self, node: ast.ImportFrom) -> ast.ImportFrom | None:
+    def leave_ImportFrom(self, node: ast.ImportFrom) -> ast.ImportFrom | None:
         """Handle imports, only remove Persistent while keeping other imports"""
         if node.module and node.module.startswith('pynecore'):
             # Filter out Persistent from names
@@ -62,11 +64,8 @@ class PersistentTransformer(ast.NodeTransformer):
             node.names = new_names
         return node
 
-    def visit_Module(self, node: ast.Module) -> ast.Module:
+    def leave_Module(self, node: ast.Module) -> ast.Module:
         """Add module level assignments before first function or assignment"""
-        # Process the entire module first
-        node = cast(ast.Module, self.generic_visit(node))
-
         # Save persistent variable mappings for final verification
         # Format: {(scope, var_name): global_name}
         for scope, vars_map in self.persistent_vars.items():
@@ -253,8 +252,8 @@ class PersistentTransformer(ast.NodeTransformer):
                 setattr(node, field, new_node)
         return node
 
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
-        """Process function definitions"""
+    def enter_FunctionDef(self, node: ast.FunctionDef):
+        """Enter the scope of the function"""
         if node.name == "main":
             # Handle main function specially
             self.scope_stack.append("main")
@@ -274,9 +273,8 @@ class PersistentTransformer(ast.NodeTransformer):
         for arg in node.args.args:
             self.local_vars[self.current_scope].add(arg.arg)
 
-        # Process function body
-        node = cast(ast.FunctionDef, self.generic_visit(node))
-
+    def leave_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
+        """Declare the modified persistent variables of the function as globals"""
         # *** FŐ MÓDOSÍTÁS: Csak azokat a változókat adjuk hozzá a global utasításhoz,
         # amelyeket ténylegesen módosítunk (írunk) a függvényben ***
         globals_to_declare = set()
@@ -353,11 +351,10 @@ class PersistentTransformer(ast.NodeTransformer):
             return node.id == 'na'
         return False
 
-    def visit_Call(self, node: ast.Call) -> ast.AST:
+    def leave_Call(self, node: ast.Call) -> ast.AST:
         """Handle function calls and ensure arguments get proper transformation"""
-        # Visit children first (function, args, keywords) to process nested calls
-        # IMPORTANT: store the result, or nested transformations might be lost
-        visited_node = cast(ast.Call, self.generic_visit(node))
+        # The children (function, args, keywords) are already visited
+        visited_node = node
 
         # Now transform args
         for i, arg in enumerate(visited_node.args):
@@ -391,116 +388,132 @@ class PersistentTransformer(ast.NodeTransformer):
 
         return visited_node
 
-    def visit_AnnAssign(self, node: ast.AnnAssign) -> ast.AST | None:
-        """Convert any Persistent type annotated assignments"""
-        if not isinstance(node.target, ast.Name):
-            return node
+    def enter_AnnAssign(self, node: ast.AnnAssign):
+        """Register Persistent type annotated variables, only their non-literal values are visited"""
+        if not isinstance(node.target, ast.Name) or not self._is_persistent_type(node.annotation):
+            return SKIP
 
-        if self._is_persistent_type(node.annotation):
-            var_name = node.target.id
+        var_name = node.target.id
 
-            # Mark this variable as a Persistent declaration in this scope
-            self.persistent_declarations.setdefault(self.current_scope, set())
-            self.persistent_declarations[self.current_scope].add(var_name)
+        # Mark this variable as a Persistent declaration in this scope
+        self.persistent_declarations.setdefault(self.current_scope, set())
+        self.persistent_declarations[self.current_scope].add(var_name)
 
-            # Add to local vars to track the variable in this scope
-            self.local_vars.setdefault(self.current_scope, set())
-            self.local_vars[self.current_scope].add(var_name)
+        # Add to local vars to track the variable in this scope
+        self.local_vars.setdefault(self.current_scope, set())
+        self.local_vars[self.current_scope].add(var_name)
 
-            # Generate global name using current scope
-            global_name = f"__persistent_{self.current_scope}·{var_name}__"
+        # Generate global name using current scope
+        global_name = f"__persistent_{self.current_scope}·{var_name}__"
 
-            # Initialize scope dict if needed
-            if self.current_scope not in self.persistent_vars:
-                self.persistent_vars[self.current_scope] = {}
+        # Initialize scope dict if needed
+        if self.current_scope not in self.persistent_vars:
+            self.persistent_vars[self.current_scope] = {}
 
-            # Store the mapping
-            self.persistent_vars[self.current_scope][var_name] = global_name
+        # Store the mapping
+        self.persistent_vars[self.current_scope][var_name] = global_name
 
-            # Track this variable in current scope
-            if self.current_scope:
-                if self.current_scope not in self.scope_vars:
-                    self.scope_vars[self.current_scope] = set()
-                self.scope_vars[self.current_scope].add(global_name)
+        # Track this variable in current scope
+        if self.current_scope:
+            if self.current_scope not in self.scope_vars:
+                self.scope_vars[self.current_scope] = set()
+            self.scope_vars[self.current_scope].add(global_name)
 
-                # *** JAVÍTÁS: Csak akkor jelöljük módosítottként, ha nem literál az érték ***
-                if node.value and not self._is_literal_or_na(node.value):
-                    if self.current_scope not in self.modified_vars:
-                        self.modified_vars[self.current_scope] = set()
-                    self.modified_vars[self.current_scope].add(global_name)
+            # *** JAVÍTÁS: Csak akkor jelöljük módosítottként, ha nem literál az érték ***
+            if node.value and not self._is_literal_or_na(node.value):
+                if self.current_scope not in self.modified_vars:
+                    self.modified_vars[self.current_scope] = set()
+                self.modified_vars[self.current_scope].add(global_name)
 
-            # Handle module level assignments and initialization
-            if node.value:
-                if self._is_literal_or_na(node.value):
-                    # For literals, just add module level assignment
-                    self.module_level_assigns.append(
-                        ast.Assign(
-                            targets=[ast.Name(id=global_name, ctx=ast.Store())],
-                            value=node.value
-                        )
-                    )
-                else:
-                    # For non-literal values:
-                    # 1. Initialize with None at module level
-                    self.module_level_assigns.append(
-                        ast.Assign(
-                            targets=[ast.Name(id=global_name, ctx=ast.Store())],
-                            value=ast.Constant(value=None)
-                        )
-                    )
-                    # 2. Add initialization flag
-                    init_flag = f"{global_name}_initialized__"
-                    self.module_level_assigns.append(
-                        ast.Assign(
-                            targets=[ast.Name(id=init_flag, ctx=ast.Store())],
-                            value=ast.Constant(value=False)
-                        )
+        # Handle module level assignments and initialization
+        if node.value:
+            if self._is_literal_or_na(node.value):
+                # For literals, just add module level assignment
+                self.module_level_assigns.append(
+                    ast.Assign(
+                        targets=[ast.Name(id=global_name, ctx=ast.Store())],
+                        value=node.value
                     )
-                    # 3. Register the initialization flag
-                    if self.current_scope:
-                        if self.current_scope not in self.scope_vars:
-                            self.scope_vars[self.current_scope] = set()
-                        self.scope_vars[self.current_scope].add(init_flag)
-
-                        # Mark initialization flag as modified since we'll be writing to it
-                        if self.current_scope not in self.modified_vars:
-                            self.modified_vars[self.current_scope] = set()
-                        self.modified_vars[self.current_scope].add(init_flag)
-
-                        if self.current_scope not in self.initialized_flags:
-                            self.initialized_flags[self.current_scope] = set()
-                        self.initialized_flags[self.current_scope].add(init_flag)
-
-                    return cast(ast.AST, ast.If(
-                        test=ast.UnaryOp(
-                            op=ast.Not(),
-                            operand=ast.Name(id=init_flag, ctx=ast.Load())
-                        ),
-                        body=[
-                            ast.Assign(
-                                targets=[ast.Name(id=global_name, ctx=ast.Store())],
-                                value=self.visit(cast(ast.AST, node.value))
-                            ),
-                            ast.Assign(
-                                targets=[ast.Name(id=init_flag, ctx=ast.Store())],
-                                value=ast.Constant(value=True)
-                            )
-                        ],
-                        orelse=[]
-                    ))
+                )
+                return SKIP
             else:
-                # No initial value, initialize with na
+                # For non-literal values:
+                # 1. Initialize with None at module level
                 self.module_level_assigns.append(
                     ast.Assign(
                         targets=[ast.Name(id=global_name, ctx=ast.Store())],
-                        value=ast.Name(id='na', ctx=ast.Load())
+                        value=ast.Constant(value=None)
+                    )
+                )
+                # 2. Add initialization flag
+                init_flag = f"{global_name}_initialized__"
+                self.module_level_assigns.append(
+                    ast.Assign(
+                        targets=[ast.Name(id=init_flag, ctx=ast.Store())],
+                        value=ast.Constant(value=False)
                     )
                 )
+                # 3. Register the initialization flag
+                if self.current_scope:
+                    if self.current_scope not in self.scope_vars:
+                        self.scope_vars[self.current_scope] = set()
+                    self.scope_vars[self.current_scope].add(init_flag)
+
+                    # Mark initialization flag as modified since we'll be writing to it
+                    if self.current_scope not in self.modified_vars:
+                        self.modified_vars[self.current_scope] = set()
+                    self.modified_vars[self.current_scope].add(init_flag)
+
+                    if self.current_scope not in self.initialized_flags:
+                        self.initialized_flags[self.current_scope] = set()
+                    self.initialized_flags[self.current_scope].add(init_flag)
+
+                # Only the value is visited
+                return 'target', 'annotation'
+        else:
+            # No initial value, initialize with na
+            self.module_level_assigns.append(
+                ast.Assign(
+                    targets=[ast.Name(id=global_name, ctx=ast.Store())],
+                    value=ast.Name(id='na', ctx=ast.Load())
+                )
+            )
+            return SKIP
+
+    def leave_AnnAssign(self, node: ast.AnnAssign) -> ast.AST | None:
+        """Convert any Persistent type annotated assignments"""
+        if not isinstance(node.target, ast.Name) or not self._is_persistent_type(node.annotation):
+            return node
+
+        # Literal and no values are initialized at module level
+        if not node.value or self._is_literal_or_na(node.value):
             return None
-        return node
 
-    def visit_Assign(self, node: ast.Assign) -> ast.Assign:
-        """Convert normal assignments to persistent variables"""
+        global_name = self.persistent_vars[self.current_scope][node.target.id]
+        init_flag = f"{global_name}_initialized__"
+        return cast(ast.AST, ast.If(
+            test=ast.UnaryOp(
+                op=ast.Not(),
+                operand=ast.Name(id=init_flag, ctx=ast.Load())
+            ),
+            body=[
+                ast.Assign(
+                    targets=[ast.Name(id=global_name, ctx=ast.Store())],
+                    value=node.value
+                ),
+                ast.Assign(
+                    targets=[ast.Name(id=init_flag, ctx=ast.Store())],
+                    value=ast.Constant(value=True)
+                )
+            ],
+            orelse=[]
+        ))
+
+    def enter_Assign(self, node: ast.Assign):
+        """
+        Register the assigned local variable, the single name target is not visited. Other targets
+        (subscripts, attributes, tuples, chained assignments) are visited, so their names are converted.
+        """
         if len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
             target = cast(ast.Name, node.targets[0])
             var_name = target.id
@@ -526,20 +539,22 @@ class PersistentTransformer(ast.NodeTransformer):
                     self.modified_vars.setdefault(self.current_scope, set())
                     self.modified_vars[self.current_scope].add(global_name)
 
-                # Visit the value part first to transform any references in it
-                transformed_value = self.visit(cast(ast.AST, node.value))
+            # Only the value part is visited
+            return 'targets',
 
+    def leave_Assign(self, node: ast.Assign) -> ast.Assign:
+        """Convert normal assignments to persistent variables"""
+        if len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            global_name = self._get_scope_persistents(cast(ast.Name, node.targets[0]).id)
+            if global_name:
                 return ast.Assign(
                     targets=[ast.Name(id=global_name, ctx=ast.Store())],
-                    value=transformed_value
+                    value=node.value
                 )
-
-        # If not a persistent assignment, still visit the value part
-        node.value = self.visit(cast(ast.AST, node.value))
         return node
 
-    def visit_AugAssign(self, node: ast.AugAssign) -> ast.AugAssign:
-        """Handle augmented assignments (+=, *=, etc.)"""
+    def enter_AugAssign(self, node: ast.AugAssign):
+        """Track augmented assignments (+=, *=, etc.) of persistent variables"""
         if isinstance(node.target, ast.Name):
             var_name = node.target.id
             global_name = self._get_scope_persistents(var_name)
@@ -549,14 +564,21 @@ class PersistentTransformer(ast.NodeTransformer):
                 self.modified_vars.setdefault(self.current_scope, set())
                 self.modified_vars[self.current_scope].add(global_name)
 
+                # The target is replaced, only the value is visited
+                return 'target',
+
+    def leave_AugAssign(self, node: ast.AugAssign) -> ast.AugAssign:
+        """Handle augmented assignments (+=, *=, etc.)"""
+        if isinstance(node.target, ast.Name):
+            global_name = self._get_scope_persistents(node.target.id)
+
+            if global_name and self.current_scope:
                 # Replace with the global name
                 node.target = ast.Name(id=global_name, ctx=ast.Store())
-                node.value = self.visit(cast(ast.AST, node.value))
-                return node
 
-        return cast(ast.AugAssign, self.generic_visit(node))
+        return node
 
-    def visit_Name(self, node: ast.Name) -> ast.Name:
+    def leave_Name(self, node: ast.Name) -> ast.Name:
         """Convert variable references using scope-aware lookup"""
         var_name = node.id
         global_name = self._get_scope_persistents(var_name)
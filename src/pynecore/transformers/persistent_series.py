@@ -1,13 +1,15 @@
 import ast
 
+from .fused import FusableTransformer, SKIP
 
-class PersistentSeriesTransformer(ast.NodeTransformer):
+
+class PersistentSeriesTransformer(FusableTransformer):
     """
     Transform PersistentSeries declarations into Persistent + Series combination.
     Must be applied before PersistentTransformer and SeriesTransformer.
     """
 
-    def visit_ImportFrom(self, node):
+    def leave_ImportFrom(self, node):
         """Handle imports, only remove Series while keeping other imports"""
         if node.module and node.module.startswith('pynecore'):
             # Filter out Persistent from names
@@ -19,7 +21,12 @@ class PersistentSeriesTransformer(ast.NodeTransformer):
             node.names = new_names
         return node
 
-    def visit_AnnAssign(self, node: ast.AnnAssign) -> ast.AST | list[ast.AnnAssign]:
+    @staticmethod
+    def enter_AnnAssign(_node: ast.AnnAssign):
+        """The parts of annotated assignments are not transformed"""
+        return SKIP
+
+    def leave_AnnAssign(self, node: ast.AnnAssign) -> ast.AST | list[ast.AnnAssign]:
         """Transform PersistentSeries type annotations into separate Persistent and Series declarations"""
         if hasattr(node, '_ps_transformed'):
             return node
@@ -0,0 +1,59 @@
+import ast
+
+from .import_lifter import ImportLifterTransformer
+from .import_normalizer import ImportNormalizerTransformer
+from .persistent_series import PersistentSeriesTransformer
+from .lib_series import LibrarySeriesTransformer
+from .function_isolation import FunctionIsolationTransformer
+from .precompute import PrecomputeTransformer
+from .overload import OverloadTransformer
+from .module_property import ModulePropertyTransformer
+from .series import SeriesTransformer
+from .persistent import PersistentTransformer
+from .input_transformer import InputTransformer
+from .safe_convert_transformer import SafeConvertTransformer
+from .fused import FusedTransformer
+
+__all__ = ['transform']
+
+
+def transform(tree: ast.Module) -> ast.Module:
+    """
+    Run the transformer pipeline on the AST of a Pyne module.
+
+    The transformers are applied in this order:
+    ImportLifter, ImportNormalizer, PersistentSeries, LibrarySeries, FunctionIsolation, Precompute,
+    Overload, ModuleProperty, Series, Persistent, Input, SafeConvert.
+
+    Consecutive transformers which only depend on the already visited part of the output of the
+    previous ones share one traversal (see `FusedTransformer`). The others need the whole output of
+    the previous transformer, so they run in separate passes.
+
+    Args:
+        tree: The AST of the module
+
+    Returns:
+        ast.Module: The transformed AST
+    """
+    tree = ImportLifterTransformer().visit(tree)
+    tree = FusedTransformer(
+        ImportNormalizerTransformer(),
+        PersistentSeriesTransformer(),
+        LibrarySeriesTransformer(),
+    ).visit(tree)
+    # It checks whole subtrees of the normalized calls
+    tree = FunctionIsolationTransformer().visit(tree)
+    # It needs the isolated calls of the whole main function
+    tree = PrecomputeTransformer().visit(tree)
+    tree = FusedTransformer(
+        OverloadTransformer(),
+        ModulePropertyTransformer(),
+        SeriesTransformer(),
+    ).visit(tree)
+    # It needs the result of the Series transformation, which is created when leaving the nodes
+    tree = FusedTransformer(
+        PersistentTransformer(),
+        InputTransformer(),
+        SafeConvertTransformer(),
+    ).visit(tree)
+    return tree
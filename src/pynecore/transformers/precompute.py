@@ -0,0 +1,155 @@
+from typing import cast
+import ast
+
+from ..core.precompute import PRECOMPUTABLE_FUNCTIONS, PRICE_SOURCES
+
+# Positional parameter names of the precomputable functions
+FUNCTION_PARAMS = {
+    'sma': ('source', 'length'),
+    'ema': ('source', 'length'),
+    'rma': ('source', 'length'),
+    'stdev': ('source', 'length', 'biased'),
+    'variance': ('source', 'length', 'biased'),
+    'highest': ('source', 'length'),
+    'lowest': ('source', 'length'),
+}
+
+# Default source of functions which can be called with length only
+DEFAULT_SOURCES = {
+    'highest': 'high',
+    'lowest': 'low',
+}
+
+# Expressions where only some parts are evaluated on every bar
+CONDITIONAL_EXPRESSIONS = (ast.IfExp, ast.BoolOp, ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp,
+                           ast.GeneratorExp)
+
+# Statements which are evaluated on every bar, if they are in the top level of the main function
+UNCONDITIONAL_STATEMENTS = (ast.Assign, ast.AnnAssign, ast.AugAssign, ast.Expr, ast.Return)
+
+
+class PrecomputeTransformer(ast.NodeTransformer):
+    """
+    Collect ta function calls of the `main` function which can be precomputed in a vectorized way.
+    A call can be precomputed if:
+    - it is called on every bar (top level of `main`, not in a condition, loop or short-circuit expression)
+    - the source is a built-in price series (close, hl2, ...)
+    - the length is a constant or an input (an argument of `main` which is never reassigned)
+
+    The collected calls are stored in the `__precompute_calls__` module variable. The runner uses them
+    only if precompute mode is enabled.
+    Must be applied after FunctionIsolationTransformer.
+    """
+
+    def __init__(self):
+        self.calls: dict[str, tuple] = {}
+        self.invariant_args: set[str] = set()
+
+    def visit_Module(self, node: ast.Module) -> ast.Module:
+        """Find main function and add the precompute registry if needed"""
+        for stmt in node.body:
+            if isinstance(stmt, ast.FunctionDef) and stmt.name == 'main':
+                self._process_main(stmt)
+
+        if not self.calls:
+            return node
+
+        registry = ast.Assign(
+            targets=[ast.Name(id='__precompute_calls__', ctx=ast.Store())],
+            value=ast.Dict(
+                keys=[ast.Constant(value=call_id) for call_id in self.calls],
+                values=[ast.Constant(value=spec) for spec in self.calls.values()]
+            )
+        )
+
+        # Insert after the scope id, which is inserted after the imports
+        insert_pos = 0
+        for i, stmt in enumerate(node.body):
+            if (isinstance(stmt, ast.Assign) and isinstance(stmt.targets[0], ast.Name)
+                    and cast(ast.Name, stmt.targets[0]).id == '__scope_id__'):
+                insert_pos = i + 1
+                break
+        node.body.insert(insert_pos, registry)
+        return node
+
+    def _process_main(self, node: ast.FunctionDef):
+        """Collect precomputable calls of the main function"""
+        # Early returns make the rest of the function conditional
+        returns = [n for n in ast.walk(node) if isinstance(n, ast.Return)]
+        if returns and (len(returns) > 1 or node.body[-1] is not returns[0]):
+            return
+
+        # Arguments with defaults (inputs), which are never reassigned are invariant during a run
+        args = node.args
+        with_defaults = {a.arg for a in args.args[len(args.args) - len(args.defaults):]}
+        with_defaults |= {a.arg for a, d in zip(args.kwonlyargs, args.kw_defaults) if d is not None}
+        assigned = {n.id for n in ast.walk(node) if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Store)}
+        self.invariant_args = with_defaults - assigned
+
+        for stmt in node.body:
+            if isinstance(stmt, UNCONDITIONAL_STATEMENTS):
+                self._collect(stmt)
+
+    def _collect(self, node: ast.AST):
+        """Recursively collect calls, which are evaluated unconditionally"""
+        if isinstance(node, CONDITIONAL_EXPRESSIONS):
+            return
+        if isinstance(node, ast.Call):
+            self._check_call(node)
+        for child in ast.iter_child_nodes(node):
+            self._collect(child)
+
+    def _check_call(self, node: ast.Call):
+        """Check if the call is an isolated precomputable ta function call"""
+        isolate_call = node.func
+        if not (isinstance(isolate_call, ast.Call) and isinstance(isolate_call.func, ast.Name)
+                and isolate_call.func.id == 'isolate_function' and len(isolate_call.args) == 4):
+            return
+        func, call_id = isolate_call.args[0], isolate_call.args[1]
+        if not (isinstance(func, ast.Attribute) and func.attr in PRECOMPUTABLE_FUNCTIONS
+                and isinstance(func.value, ast.Attribute) and func.value.attr == 'ta'
+                and isinstance(func.value.value, ast.Name) and func.value.value.id == 'lib'
+                and isinstance(call_id, ast.Constant) and isinstance(call_id.value, str)):
+            return
+
+        func_name = func.attr
+        params = FUNCTION_PARAMS[func_name]
+
+        # Map arguments to parameter names
+        arguments: dict[str, ast.expr] = {}
+        positional = node.args
+        if func_name in DEFAULT_SOURCES and len(positional) == 1 and not node.keywords:
+            positional = [ast.Attribute(value=ast.Name(id='lib', ctx=ast.Load()),
+                                        attr=DEFAULT_SOURCES[func_name], ctx=ast.Load())] + positional
+        if len(positional) > len(params) or any(isinstance(arg, ast.Starred) for arg in positional):
+            return
+        arguments.update(zip(params, positional))
+        for kw in node.keywords:
+            if kw.arg not in params or kw.arg in arguments:
+                return
+            arguments[kw.arg] = kw.value
+
+        # Source must be a built-in price series
+        source = arguments.get('source')
+        if not (isinstance(source, ast.Attribute) and source.attr in PRICE_SOURCES
+                and isinstance(source.value, ast.Name) and source.value.id == 'lib'):
+            return
+
+        # Length must be a positive integer constant or an invariant argument
+        length = arguments.get('length')
+        if isinstance(length, ast.Constant) and type(length.value) is int and length.value > 0:
+            length_spec = length.value
+        elif isinstance(length, ast.Name) and length.id in self.invariant_args:
+            length_spec = length.id
+        else:
+            return
+
+        spec: tuple = (func_name, source.attr, length_spec)
+
+        if 'biased' in arguments:
+            biased = arguments['biased']
+            if not (isinstance(biased, ast.Constant) and isinstance(biased.value, bool)):
+                return
+            spec += (biased.value,)
+
+        self.calls[call_id.value] = spec
@@ -1,8 +1,10 @@
 from typing import cast, List, Optional
 import ast
 
+from .fused import FusableTransformer
 
-class SafeConvertTransformer(ast.NodeTransformer):
+
+class SafeConvertTransformer(FusableTransformer):
     """
     Transformer that converts float(na) and int(na) calls to safe alternatives
     that preserve Pine Script semantics.
@@ -16,13 +18,10 @@ class SafeConvertTransformer(ast.NodeTransformer):
         self.has_safe_convert_import = False
         self.has_convert_functions = False  # Track if float()/int() is used
     
-    def visit_Call(self, node: ast.Call) -> ast.AST:
+    def leave_Call(self, node: ast.Call) -> ast.AST:
         """
-        Visit Call nodes and transform float() and int() calls
+        Transform float() and int() calls (after the children are transformed)
         """
-        # Continue normal transformation for children
-        self.generic_visit(node)
-        
         # Check if it's a built-in float() or int() call
         if (isinstance(node.func, ast.Name) and 
                 node.func.id in ('float', 'int')):
@@ -47,13 +46,10 @@ class SafeConvertTransformer(ast.NodeTransformer):
             
         return node
     
-    def visit_Module(self, node: ast.Module) -> ast.Module:
+    def leave_Module(self, node: ast.Module) -> ast.Module:
         """
         Add safe_convert import if needed
         """
-        # Process the module first
-        node = cast(ast.Module, self.generic_visit(node))
-        
         # Only add the import if we actually transformed any functions
         if not self.has_convert_functions:
             return node
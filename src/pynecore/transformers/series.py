@@ -1,9 +1,24 @@
 from typing import cast
 import ast
 
+from ..core.series import SeriesImpl
+from .fused import FusableTransformer, SKIP
 
-class SeriesTransformer(ast.NodeTransformer):
-    """Transform Series type variables in AST"""
+# Series implementations of simple types, they store values in typed arrays
+TYPED_SERIES_CLASSES = {
+    'float': 'FloatSeriesImpl',
+    'int': 'IntSeriesImpl',
+    'bool': 'BoolSeriesImpl',
+}
+
+
+class SeriesTransformer(FusableTransformer):
+    """
+    Transform Series type variables in AST.
+
+    The max_bars_back of a Series is inferred from its indices: if all of them are constants,
+    the buffer is only as large as the largest index needs, otherwise the default is used.
+    """
 
     def __init__(self):
         # Mapping of scopes to variables
@@ -15,20 +30,28 @@ class SeriesTransformer(ast.NodeTransformer):
         # Current function tracking
         self.current_function: str | None = None
         self.parent_functions: list[str] = []
+        # Previous function and Series parameter initializations of the visited functions
+        self.function_stack: list[tuple[str | None, list[ast.stmt]]] = []
 
         # Tracking created Series
         self.collected_series: set[str] = set()
+        # Implementation class of created Series
+        self.series_classes: dict[str, str] = {}
+        # The largest constant index of Series, and Series which are indexed dynamically
+        self.series_lookbacks: dict[str, int] = {}
+        self.dynamic_series: set[str] = set()
 
         # Import tracking
         self.has_series_import: bool = False
 
-    def _register_series(self, var_name: str, scope: str | None = None) -> str:
+    def _register_series(self, var_name: str, scope: str | None = None, annotation: ast.expr | None = None) -> str:
         """
         Register a Series variable and return its global instance name.
 
         Args:
             var_name: The variable name to register
             scope: The scope where the variable is defined (default: current scope)
+            annotation: The Series type annotation, used to select the implementation class
 
         Returns:
             str: The generated global instance name
@@ -43,8 +66,66 @@ class SeriesTransformer(ast.NodeTransformer):
         self.series_vars[scope][var_name] = series_name
         self.collected_series.add(series_name)
 
+        # Typed implementation only if all declarations have the same simple type
+        series_class = self._get_series_class(annotation)
+        if self.series_classes.setdefault(series_name, series_class) != series_class:
+            self.series_classes[series_name] = 'SeriesImpl'
+
         return series_name
 
+    @staticmethod
+    def _get_series_class(annotation: ast.expr | None) -> str:
+        """
+        Get the implementation class name of a Series type annotation.
+
+        Args:
+            annotation: The type annotation expression
+
+        Returns:
+            str: Typed implementation for Series[float], Series[int] and Series[bool], SeriesImpl otherwise
+        """
+        if (isinstance(annotation, ast.Subscript) and isinstance(annotation.slice, ast.Name)
+                and annotation.slice.id in TYPED_SERIES_CLASSES):
+            return TYPED_SERIES_CLASSES[annotation.slice.id]
+        return 'SeriesImpl'
+
+    @staticmethod
+    def _get_lookback(index: ast.expr) -> int | None:
+        """
+        Get the number of bars back an index (or slice) needs.
+
+        Args:
+            index: The index expression of a subscript
+
+        Returns:
+            int or None: The largest bar offset, or None if it is not known at compile time
+        """
+        if isinstance(index, ast.Constant) and type(index.value) is int and index.value >= 0:
+            return index.value
+        if isinstance(index, ast.Slice):
+            bounds = [bound for bound in (index.lower, index.upper, index.step) if bound is not None]
+            if not all(isinstance(bound, ast.Constant) and type(bound.value) is int and bound.value >= 0
+                       for bound in bounds):
+                return None
+            # The stop index is exclusive, without stop the slice is limited by the size of the Series
+            return max(cast(ast.Constant, index.upper).value - 1, 0) if index.upper is not None else 0
+        return None
+
+    def _get_max_bars_back(self, series_name: str) -> int | None:
+        """
+        Get the inferred max_bars_back of a Series.
+
+        Args:
+            series_name: The global instance name of the Series
+
+        Returns:
+            int or None: The max_bars_back if all indices are constant, None to use the default
+        """
+        if series_name in self.dynamic_series:
+            return None
+        lookback = self.series_lookbacks.get(series_name, 0)
+        return min(max(lookback, 1), SeriesImpl.MAXIMUM_MAX_BARS_BACK)
+
     def _get_current_scope(self) -> str:
         """
         Get current scope path.
@@ -72,7 +153,7 @@ class SeriesTransformer(ast.NodeTransformer):
         return None
 
     # noinspection PyShadowingBuiltins
-    def visit_Module(self, node: ast.Module) -> ast.Module:
+    def leave_Module(self, node: ast.Module) -> ast.Module:
         """
         Create global SeriesImpl instances and register function-variable mapping.
 
@@ -82,8 +163,6 @@ class SeriesTransformer(ast.NodeTransformer):
         Returns:
             ast.Module: The transformed module
         """
-        node = cast(ast.Module, self.generic_visit(node))
-
         if not self.collected_series:
             return node
 
@@ -124,10 +203,13 @@ class SeriesTransformer(ast.NodeTransformer):
         )
 
         # Create SeriesImpl import and instances
+        used_classes = set(self.series_classes.values())
         imports = [
             ast.ImportFrom(
                 module='pynecore.core.series',
-                names=[ast.alias(name='SeriesImpl', asname=None)],
+                names=[ast.alias(name=class_name, asname=None)
+                       for class_name in ('SeriesImpl', *TYPED_SERIES_CLASSES.values())
+                       if class_name in used_classes],
                 level=0
             )
         ]
@@ -136,12 +218,13 @@ class SeriesTransformer(ast.NodeTransformer):
             ast.Assign(
                 targets=[ast.Name(id=name, ctx=ast.Store())],
                 value=ast.Call(
-                    func=ast.Name(id='SeriesImpl', ctx=ast.Load()),
-                    args=[],
+                    func=ast.Name(id=self.series_classes[name], ctx=ast.Load()),
+                    args=[ast.Constant(value=max_bars_back)] if max_bars_back is not None else [],
                     keywords=[]
                 )
             )
             for name in sorted(self.collected_series)
+            for max_bars_back in (self._get_max_bars_back(name),)
         ]
 
         # Add the function-variable registry
@@ -174,15 +257,12 @@ class SeriesTransformer(ast.NodeTransformer):
         node.body = pre_body + assignments + post_body
         return node
 
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
+    def enter_FunctionDef(self, node: ast.FunctionDef):
         """
-        Handle function scope and Series parameters.
+        Enter function scope and handle Series parameters.
 
         Args:
             node: The function definition node
-
-        Returns:
-            ast.FunctionDef: The transformed function
         """
         # Store old state
         old_function = self.current_function
@@ -199,7 +279,7 @@ class SeriesTransformer(ast.NodeTransformer):
         series_initializations = []
         for arg in node.args.args:
             if arg.annotation and self._is_series_type(arg.annotation):
-                series_name = self._register_series(arg.arg)
+                series_name = self._register_series(arg.arg, annotation=arg.annotation)
                 # Extract inner type from Series[T]
                 if isinstance(arg.annotation, ast.Subscript):
                     arg.annotation = arg.annotation.slice
@@ -222,8 +302,19 @@ class SeriesTransformer(ast.NodeTransformer):
                     )
                 )
 
-        # Process function body
-        node = cast(ast.FunctionDef, self.generic_visit(node))
+        self.function_stack.append((old_function, series_initializations))
+
+    def leave_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
+        """
+        Insert Series parameter initializations and leave function scope.
+
+        Args:
+            node: The function definition node
+
+        Returns:
+            ast.FunctionDef: The transformed function
+        """
+        old_function, series_initializations = self.function_stack.pop()
 
         # Find the right position to insert initializations after docstring if exists
         insert_pos = 0
@@ -244,7 +335,23 @@ class SeriesTransformer(ast.NodeTransformer):
 
         return node
 
-    def visit_AnnAssign(self, node: ast.AnnAssign) -> ast.AST | ast.Assign | None:
+    def enter_AnnAssign(self, node: ast.AnnAssign):
+        """
+        Register Series type annotated variables.
+
+        Args:
+            node: The annotated assignment node
+
+        Returns:
+            Skipped fields: only the value of Series declarations is visited
+        """
+        if not isinstance(node.target, ast.Name) or not self._is_series_type(node.annotation):
+            return SKIP
+
+        self._register_series(node.target.id, annotation=node.annotation)
+        return 'target', 'annotation'
+
+    def leave_AnnAssign(self, node: ast.AnnAssign) -> ast.AST | ast.Assign | None:
         """
         Handle Series type annotations and first value assignment.
 
@@ -254,33 +361,58 @@ class SeriesTransformer(ast.NodeTransformer):
         Returns:
             AST node: The transformed node
         """
-        if not isinstance(node.target, ast.Name):
+        if not isinstance(node.target, ast.Name) or not self._is_series_type(node.annotation):
             return node
 
-        if self._is_series_type(node.annotation):
-            var_name = node.target.id
-            series_name = self._register_series(var_name)
+        if node.value is None:
+            return None
 
-            if node.value is None:
-                return None
+        var_name = node.target.id
+        series_name = self._get_series_in_current_scope(var_name)
 
-            # First assignment uses add()
-            return ast.Assign(
-                targets=[ast.Name(id=var_name, ctx=ast.Store())],
-                value=ast.Call(
-                    func=ast.Attribute(
-                        value=ast.Name(id=series_name, ctx=ast.Load()),
-                        attr='add',
-                        ctx=ast.Load()
-                    ),
-                    args=[self.visit(cast(ast.AST, node.value))],
-                    keywords=[]
-                )
+        # First assignment uses add()
+        return ast.Assign(
+            targets=[ast.Name(id=var_name, ctx=ast.Store())],
+            value=ast.Call(
+                func=ast.Attribute(
+                    value=ast.Name(id=series_name, ctx=ast.Load()),
+                    attr='add',
+                    ctx=ast.Load()
+                ),
+                args=[node.value],
+                keywords=[]
             )
+        )
 
-        return node
+    def _get_assigned_series(self, target: ast.expr) -> str | None:
+        """
+        Get the series name of an assignment target.
+
+        Args:
+            target: The assignment target
 
-    def visit_Assign(self, node: ast.Assign) -> ast.AST | ast.Assign:
+        Returns:
+            str or None: The series name if the target is a Series variable, None otherwise
+        """
+        if not isinstance(target, ast.Name):
+            return None
+        return self._get_series_in_current_scope(target.id)
+
+    def enter_Assign(self, node: ast.Assign):
+        """
+        Do not visit the target of Series value assignments.
+
+        Args:
+            node: The assignment node
+
+        Returns:
+            Skipped fields: only the value of Series assignments is visited
+        """
+        if len(node.targets) == 1 and self._get_assigned_series(node.targets[0]):
+            return 'targets',
+        return None
+
+    def leave_Assign(self, node: ast.Assign) -> ast.AST | ast.Assign:
         """
         Handle Series value assignments using set().
 
@@ -290,30 +422,42 @@ class SeriesTransformer(ast.NodeTransformer):
         Returns:
             AST node: The transformed node
         """
-        if len(node.targets) != 1 or not isinstance(node.targets[0], ast.Name):
-            return self.generic_visit(node)
-
-        var_name = cast(ast.Name, node.targets[0]).id
-        series_name = self._get_series_in_current_scope(var_name)
+        if len(node.targets) != 1:
+            return node
+        series_name = self._get_assigned_series(node.targets[0])
 
         if series_name:
             # Regular assignment uses set()
             return ast.Assign(
-                targets=[ast.Name(id=var_name, ctx=ast.Store())],
+                targets=[ast.Name(id=cast(ast.Name, node.targets[0]).id, ctx=ast.Store())],
                 value=ast.Call(
                     func=ast.Attribute(
                         value=ast.Name(id=series_name, ctx=ast.Load()),
                         attr='set',
                         ctx=ast.Load()
                     ),
-                    args=[self.visit(cast(ast.AST, node.value))],
+                    args=[node.value],
                     keywords=[]
                 )
             )
 
-        return self.generic_visit(node)
+        return node
+
+    def enter_AugAssign(self, node: ast.AugAssign):
+        """
+        Do not visit the target of Series augmented assignments.
+
+        Args:
+            node: The augmented assignment node
+
+        Returns:
+            Skipped fields: only the value of Series assignments is visited
+        """
+        if self._get_assigned_series(node.target):
+            return 'target',
+        return None
 
-    def visit_AugAssign(self, node: ast.AugAssign) -> ast.AST | ast.Assign:
+    def leave_AugAssign(self, node: ast.AugAssign) -> ast.AST | ast.Assign:
         """
         Handle augmented assignments (+=, -=, etc).
 
@@ -323,13 +467,10 @@ class SeriesTransformer(ast.NodeTransformer):
         Returns:
             AST node: The transformed node
         """
-        if not isinstance(node.target, ast.Name):
-            return self.generic_visit(node)
-
-        var_name = node.target.id
-        series_name = self._get_series_in_current_scope(var_name)
+        series_name = self._get_assigned_series(node.target)
 
         if series_name:
+            var_name = cast(ast.Name, node.target).id
             # Convert augmented assignment to set() with operation
             return ast.Assign(
                 targets=[ast.Name(id=var_name, ctx=ast.Store())],
@@ -343,16 +484,16 @@ class SeriesTransformer(ast.NodeTransformer):
                         ast.BinOp(
                             left=ast.Name(id=var_name, ctx=ast.Load()),
                             op=node.op,
-                            right=self.visit(cast(ast.AST, node.value))
+                            right=node.value
                         )
                     ],
                     keywords=[]
                 )
             )
 
-        return self.generic_visit(node)
+        return node
 
-    def visit_Name(self, node: ast.Name) -> ast.AST | ast.Name:
+    def leave_Name(self, node: ast.Name) -> ast.AST | ast.Name:
         """
         Transform Series references - ONLY when parent is indexing.
 
@@ -370,20 +511,34 @@ class SeriesTransformer(ast.NodeTransformer):
                     return ast.Name(id=series_name, ctx=node.ctx)
         return node
 
-    def visit_Subscript(self, node: ast.Subscript) -> ast.AST:
+    @staticmethod
+    def enter_Subscript(node: ast.Subscript):
         """
         Set parent for indexing operations.
 
+        Args:
+            node: The subscript node
+        """
+        if isinstance(node.value, ast.AST):
+            node.value.parent = node
+
+    def leave_Subscript(self, node: ast.Subscript) -> ast.AST:
+        """
+        Collect the indices of Series.
+
         Args:
             node: The subscript node
 
         Returns:
             AST node: The transformed node
         """
-        if isinstance(node.value, ast.AST):
-            node.value.parent = node
-        node.value = self.visit(cast(ast.AST, node.value))
-        node.slice = self.visit(cast(ast.AST, node.slice))
+        # Collect the indices of Series to infer their max_bars_back
+        if isinstance(node.value, ast.Name) and node.value.id in self.collected_series:
+            lookback = self._get_lookback(node.slice)
+            if lookback is None:
+                self.dynamic_series.add(node.value.id)
+            elif lookback > self.series_lookbacks.get(node.value.id, 0):
+                self.series_lookbacks[node.value.id] = lookback
         return node
 
     @staticmethod
@@ -404,7 +559,7 @@ class SeriesTransformer(ast.NodeTransformer):
             return annotation.id == 'Series'
         return False
 
-    def visit_ImportFrom(self, node: ast.ImportFrom) -> ast.AST | None:
+    def leave_ImportFrom(self, node: ast.ImportFrom) -> ast.AST | None:
         """
         Handle imports, remove Series import.
 
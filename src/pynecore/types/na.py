@@ -53,6 +53,12 @@ class NA(Generic[T]):
         """
         return hash(self.type)
 
+    def __reduce__(self) -> tuple:
+        """
+        Pickle NA values by their type, so the cached instance is used when they are unpickled
+        """
+        return NA, (self.type,)
+
     def __int__(self) -> NA[int]:
         # We solve this with an AST Transformer
         raise TypeError("NA cannot be converted to int")
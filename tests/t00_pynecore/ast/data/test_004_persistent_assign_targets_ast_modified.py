@@ -0,0 +1,18 @@
+"""
+@pyne
+"""
+__persistent_main·buf__ = None
+__persistent_main·buf___initialized__ = False
+__persistent_main·head__ = 0
+__persistent_main·tail__ = 0
+__persistent_function_vars__ = {'main': ['__persistent_main·buf__', '__persistent_main·head__', '__persistent_main·tail__', '__persistent_main·buf___initialized__']}
+
+def main():
+    global __persistent_main·buf__, __persistent_main·buf___initialized__, __persistent_main·head__, __persistent_main·tail__
+    if not __persistent_main·buf___initialized__:
+        __persistent_main·buf__ = [0.0, 0.0]
+        __persistent_main·buf___initialized__ = True
+    __persistent_main·buf__[__persistent_main·head__] = 1.0
+    __persistent_main·head__, __persistent_main·tail__ = (__persistent_main·tail__, __persistent_main·head__ + 1)
+    __persistent_main·head__ = __persistent_main·tail__ = __persistent_main·tail__ + 1
+    print(__persistent_main·buf__, __persistent_main·head__, __persistent_main·tail__)
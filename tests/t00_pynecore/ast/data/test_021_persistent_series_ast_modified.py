@@ -1,12 +1,12 @@
 """
 @pyne
 """
-from pynecore.core.series import SeriesImpl
+from pynecore.core.series import FloatSeriesImpl, IntSeriesImpl
 __persistent_main·t·s__ = 1
 __persistent_main·s2__ = 0.5
 __persistent_function_vars__ = {'main.t': ['__persistent_main·t·s__'], 'main': ['__persistent_main·s2__']}
-__series_main·s2__ = SeriesImpl()
-__series_main·t·s__ = SeriesImpl()
+__series_main·s2__ = FloatSeriesImpl(1)
+__series_main·t·s__ = IntSeriesImpl()
 __series_function_vars__ = {'main.t': ['__series_main·t·s__'], 'main': ['__series_main·s2__']}
 
 def main():
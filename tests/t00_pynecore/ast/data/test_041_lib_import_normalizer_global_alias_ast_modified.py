@@ -2,7 +2,6 @@
 @pyne
 """
 from pynecore import lib
-import pynecore.lib.ta
 
 def main():
     print(lib.ta)
@@ -1,9 +1,9 @@
 """
 @pyne
 """
-from pynecore.core.series import SeriesImpl
+from pynecore.core.series import FloatSeriesImpl
 from pynecore.core.function_isolation import isolate_function
-__series_main·t·a__ = SeriesImpl()
+__series_main·t·a__ = FloatSeriesImpl(1)
 __series_function_vars__ = {'main.t': ['__series_main·t·a__']}
 __scope_id__ = ''
 
@@ -14,7 +14,7 @@ def main():
         a = __series_main·t·a__.add(1)
         a = __series_main·t·a__.set(a + 1)
         return __series_main·t·a__[1]
-    a = isolate_function(t, 'main|t|0', __scope_id__)()
+    a = isolate_function(t, 'main|t|0', __scope_id__, 0)()
     print(a)
-    b = isolate_function(t, 'main|t|1', __scope_id__)()
+    b = isolate_function(t, 'main|t|1', __scope_id__, 1)()
     print(b)
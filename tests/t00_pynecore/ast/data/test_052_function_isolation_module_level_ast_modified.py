@@ -1,10 +1,10 @@
 """
 @pyne
 """
-from pynecore.core.series import SeriesImpl
+from pynecore.core.series import FloatSeriesImpl
 from pynecore.core.function_isolation import isolate_function
-__series_t1·a__ = SeriesImpl()
-__series_t2·a__ = SeriesImpl()
+__series_t1·a__ = FloatSeriesImpl(1)
+__series_t2·a__ = FloatSeriesImpl(1)
 __series_function_vars__ = {'t1': ['__series_t1·a__'], 't2': ['__series_t2·a__']}
 __scope_id__ = ''
 
@@ -20,9 +20,9 @@ def t2():
 
 def main():
     global __scope_id__
-    a = isolate_function(t1, 'main|t1|0', __scope_id__)()
+    a = isolate_function(t1, 'main|t1|0', __scope_id__, 0)()
     print(a)
-    b = isolate_function(t1, 'main|t1|1', __scope_id__)()
+    b = isolate_function(t1, 'main|t1|1', __scope_id__, 1)()
     print(b)
-    c = isolate_function(t2, 'main|t2|2', __scope_id__)()
+    c = isolate_function(t2, 'main|t2|2', __scope_id__, 2)()
     print(c)
@@ -1,15 +1,15 @@
 """
 @pyne
 """
-from pynecore.core.series import SeriesImpl
+from pynecore.core.series import FloatSeriesImpl
 from pynecore import lib
-import pynecore.lib.ta
 from pynecore.core.function_isolation import isolate_function
-__series_main·e__ = SeriesImpl()
+__series_main·e__ = FloatSeriesImpl(1)
 __series_function_vars__ = {'main': ['__series_main·e__']}
 __scope_id__ = ''
+__precompute_calls__ = {'main|lib.ta.ema|0': ('ema', 'close', 9)}
 
 def main():
     global __scope_id__
-    e = __series_main·e__.add(isolate_function(lib.ta.ema, 'main|lib.ta.ema|0', __scope_id__)(lib.close, 9))
+    e = __series_main·e__.add(isolate_function(lib.ta.ema, 'main|lib.ta.ema|0', __scope_id__, 0)(lib.close, 9))
     print(__series_main·e__[1])
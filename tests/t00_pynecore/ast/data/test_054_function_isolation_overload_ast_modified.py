@@ -0,0 +1,17 @@
+"""
+@pyne
+"""
+from pynecore.core.series import FloatSeriesImpl
+from pynecore import lib
+from pynecore.core.function_isolation import isolate_function
+__series_main·h__ = FloatSeriesImpl(1)
+__series_function_vars__ = {'main': ['__series_main·h__']}
+__scope_id__ = ''
+__precompute_calls__ = {'main|lib.ta.highest|0': ('highest', 'close', 14), 'main|lib.ta.lowest|1': ('lowest', 'low', 14)}
+
+def main():
+    global __scope_id__
+    h = __series_main·h__.add(isolate_function(lib.ta.highest.__overloads__[0].func, 'main|lib.ta.highest|0', __scope_id__, 0)(lib.close, 14))
+    l: float = isolate_function(lib.ta.lowest.__overloads__[1].func, 'main|lib.ta.lowest|1', __scope_id__, 1)(14)
+    p = isolate_function(lib.ta.pivothigh.__overloads__[0].func, 'main|lib.ta.pivothigh|2', __scope_id__, 2)(lib.high, 2, 2)
+    print(__series_main·h__[1], l, p)
@@ -1,10 +1,10 @@
 """
 @pyne
 """
-from pynecore.core.series import SeriesImpl
+from pynecore.core.series import SeriesImpl, FloatSeriesImpl
 from pynecore import lib
-__series_main·_lib_close__ = SeriesImpl()
-__series_main·a__ = SeriesImpl()
+__series_main·_lib_close__ = SeriesImpl(10)
+__series_main·a__ = FloatSeriesImpl(1)
 __series_function_vars__ = {'main': ['__series_main·_lib_close__', '__series_main·a__']}
 
 def main():
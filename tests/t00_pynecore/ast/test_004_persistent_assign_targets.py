@@ -0,0 +1,23 @@
+"""
+@pyne
+"""
+from pynecore import Persistent
+
+
+def main():
+    buf: Persistent[list] = [0.0, 0.0]
+    head: Persistent[int] = 0
+    tail: Persistent[int] = 0
+    buf[head] = 1.0
+    head, tail = tail, head + 1
+    head = tail = tail + 1
+    print(buf, head, tail)
+
+
+def __test_persistent_assign_targets__(ast_transformed_code, file_reader, log):
+    """ Persistent variables in subscript, tuple and chained assignment targets """
+    try:
+        assert ast_transformed_code == file_reader(subdir="data", suffix="_ast_modified.py")
+    except AssertionError:
+        log.error("AST transformed code:\n%s\n", ast_transformed_code)
+        raise
@@ -0,0 +1,23 @@
+"""
+@pyne
+"""
+from pynecore import Series
+from pynecore.lib import close, high, ta
+
+
+def main():
+    h: Series[float] = ta.highest(close, 14)
+    l: float = ta.lowest(14)
+    p = ta.pivothigh(high, 2, 2)
+    print(h[1], l, p)
+
+
+def __test_function_isolation_overload__(log, ast_transformed_code, file_reader):
+    """
+    Function Isolation - overloaded lib functions resolved at compile time
+    """
+    try:
+        assert ast_transformed_code == file_reader(subdir="data", suffix="_ast_modified.py")
+    except AssertionError:
+        log.error("AST transformed code:\n%s\n", ast_transformed_code)
+        raise
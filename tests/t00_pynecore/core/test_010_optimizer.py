@@ -0,0 +1,143 @@
+"""
+@pyne
+"""
+import sys
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from pynecore.lib import script, close, strategy, input, ta
+from pynecore.core.ohlcv_file import OHLCVWriter, OHLCVReader
+from pynecore.core.optimizer import optimize, grid_space, random_space, frange, collect_stats, _run_chunks
+from pynecore.core.script_runner import ScriptRunner
+
+
+@script.strategy("Optimizer Test", overlay=True)
+def main(
+        length=input.int(10, "Length")
+):
+    fast = ta.sma(close, length)
+    slow = ta.sma(close, length * 2)
+    if ta.crossover(fast, slow):
+        strategy.entry("Long", strategy.long)
+    if ta.crossunder(fast, slow):
+        strategy.entry("Short", strategy.short)
+
+
+LIBRARY = '''"""
+@pyne
+"""
+from pynecore import Persistent
+from pynecore.lib import script, close
+
+
+@script.library("Rerun Library")
+def main():
+    global total
+    summ: Persistent[float] = 0.0
+    summ += close
+    total = summ
+'''
+
+LIBRARY_USER = '''"""
+@pyne
+"""
+from pynecore.lib import script
+import rerun_library
+
+
+@script.indicator("Rerun Library User")
+def main():
+    return {"total": rerun_library.total}
+'''
+
+
+def _create_data(tmp_path: Path) -> Path:
+    """ Convert the strategy test data to ohlcv format """
+    data_path = tmp_path / "optimizer.ohlcv"
+    csv_path = Path(__file__).parent.parent.parent / "t01_lib" / "t30_strategy" / "data" / "strat_ohlcv.csv"
+    with OHLCVWriter(data_path) as writer:
+        writer.load_from_csv(csv_path)
+    return data_path
+
+
+def __test_optimizer_spaces__():
+    """ Grid and random parameter spaces """
+    params = dict(a=[1, 2, 3], b=['x', 'y'])
+    grid = list(grid_space(params))
+    assert len(grid) == 6
+    assert grid[0] == dict(a=1, b='x') and grid[-1] == dict(a=3, b='y')
+
+    rnd = list(random_space(params, 4, seed=42))
+    assert len(rnd) == 4
+    assert len({tuple(c.items()) for c in rnd}) == 4
+    assert rnd == list(random_space(params, 4, seed=42))
+    assert len(list(random_space(params, 100))) == 6
+
+    assert frange(0.5, 1.5, 0.25) == [0.5, 0.75, 1.0, 1.25, 1.5]
+
+
+def __test_run_chunks__():
+    """ Results are reported as soon as they are ready, and returned in the order of the items """
+    released = threading.Event()
+    reported = []
+
+    def run(item: int) -> int:
+        # The first item is ready only after another result is reported
+        if item == 0:
+            released.wait(5.0)
+        return item * 10
+
+    def on_result(result: int):
+        reported.append(result)
+        released.set()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = _run_chunks(executor, run, range(7), 2, on_result)
+    assert results == [i * 10 for i in range(7)]
+    assert reported[0] != 0 and sorted(reported) == results
+
+
+def __test_optimizer_rerun__(tmp_path, script_path, syminfo, runner):
+    """ Re-running the script gives the same results as a fresh run """
+    data_path = _create_data(tmp_path)
+    time_to = 1641160800 + 1500 * 3600
+
+    # Fresh run
+    with OHLCVReader(data_path) as reader:
+        r = runner(reader.read_from(reader.start_timestamp, time_to))
+        r.set_inputs(length=20)
+        r.run()
+        stats = collect_stats(r)
+        assert stats['total_trades'] > 0
+
+    results = optimize(script_path, data_path, syminfo, [dict(length=10), dict(length=20), dict(length=10)],
+                       time_to=time_to, workers=1)
+    assert len(results) == 3
+    assert results[0].stats == results[2].stats
+    assert results[0].stats != results[1].stats
+    assert results[1].stats == stats
+
+
+def __test_rerun_library__(tmp_path, syminfo):
+    """ Re-running resets the persistent state of the libraries the script uses too """
+    from pynecore.core import script as script_module
+
+    (tmp_path / "rerun_library.py").write_text(LIBRARY)
+    script_path = tmp_path / "rerun_library_user.py"
+    script_path.write_text(LIBRARY_USER)
+    libraries = list(script_module._registered_libraries)  # noqa
+    sys.path.insert(0, str(tmp_path))
+    try:
+        with OHLCVReader(_create_data(tmp_path)) as reader:
+            candles = list(reader.read_from(reader.start_timestamp, 1641160800 + 100 * 3600))
+        r = ScriptRunner(script_path, candles, syminfo)
+        expected = [plot["total"] for _, plot in r.run_iter()]
+        assert expected[-1] > expected[0] > 0
+        r.reset()
+        assert [plot["total"] for _, plot in r.run_iter()] == expected
+    finally:
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("rerun_library", None)
+        sys.modules.pop("rerun_library_user", None)
+        script_module._registered_libraries[:] = libraries  # noqa
@@ -0,0 +1,63 @@
+"""
+@pyne
+"""
+import math
+import pytest
+
+from pynecore.lib import script, close, hl2, input, ta, na
+from pynecore.core import function_isolation
+
+
+@script.indicator("Precompute Test")
+def main(
+        length=input.int(14, "Length")
+):
+    return {
+        "sma": ta.sma(close, length),
+        "ema": ta.ema(close, length),
+        "rma": ta.rma(hl2, 10),
+        "stdev": ta.stdev(close, length),
+        "variance": ta.variance(close, length, False),
+        "highest": ta.highest(length),
+        "lowest": ta.lowest(close, 5),
+    }
+
+
+def _run(runner, columns, precompute: bool) -> tuple[list[dict], dict]:
+    r = runner(columns)
+    r.precompute = precompute
+    return [dict(res) for _, res in r.run_iter()], r.script_module.__precompute_calls__
+
+
+def __test_precompute__(csv_reader, runner):
+    """ Precomputed ta results are the same as normally calculated ones """
+    try:
+        from pynecore.core.ohlcv_columns import OHLCVColumns
+        import numpy  # noqa
+    except ImportError:
+        pytest.skip("NumPy library not available")
+
+    with csv_reader('series_if_for.csv', subdir="data") as cr:
+        columns = OHLCVColumns(*map(numpy.array, zip(*((c.timestamp, c.open, c.high, c.low, c.close, c.volume)
+                                                        for c in cr))))
+
+    expected, _ = _run(runner, columns, False)
+    precomputed, calls = _run(runner, columns, True)
+
+    assert len(calls) == 7
+    # noinspection PyProtectedMember
+    assert len(function_isolation._precomputed) == 7
+    assert len(expected) == len(precomputed) == len(columns)
+    for exp, res in zip(expected, precomputed):
+        for key, value in exp.items():
+            if na(value):
+                assert na(res[key]), key
+            else:
+                assert math.isclose(res[key], value, rel_tol=1e-9, abs_tol=1e-9), key
+
+    # Precompute mode needs columnar data
+    with csv_reader('series_if_for.csv', subdir="data") as cr:
+        r = runner(cr)
+        r.precompute = True
+        with pytest.raises(ValueError):
+            r.run()
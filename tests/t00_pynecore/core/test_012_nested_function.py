@@ -0,0 +1,46 @@
+"""
+@pyne
+"""
+from pynecore import Series, Persistent
+from pynecore.lib import script, bar_index, na
+
+
+@script.indicator(title="Nested Function")
+def main():
+    global late
+    p: Persistent[int] = 0
+    p += 1
+    offset = bar_index * 10
+    # A module global, which is created only after the first bars
+    if bar_index >= 3:
+        late = bar_index
+
+    def counter(step):
+        c: Persistent[int] = 0
+        c += step
+        # Outer persistent and closure variables must be up to date
+        return c + offset + p * 1000
+
+    def prev(v):
+        s: Series[int] = v
+        return s[1]
+
+    def get_late():
+        return late if bar_index >= 3 else -1
+
+    return {"a": counter(1), "b": counter(2), "prev": prev(bar_index), "late": get_late()}
+
+
+def __test_nested_function__(csv_reader, runner):
+    """ Nested functions keep their own state between bars """
+    with csv_reader('series_if_for.csv', subdir="data") as cr:
+        for i, (_, res) in enumerate(runner(cr).run_iter()):
+            assert res["a"] == (i + 1) + 10 * i + 1000 * (i + 1)
+            assert res["b"] == 2 * (i + 1) + 10 * i + 1000 * (i + 1)
+            if i == 0:
+                assert na(res["prev"])
+            else:
+                assert res["prev"] == i - 1
+            assert res["late"] == (i if i >= 3 else -1)
+            if i > 50:
+                break
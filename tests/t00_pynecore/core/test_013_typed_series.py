@@ -0,0 +1,183 @@
+"""
+@pyne
+"""
+import math
+
+from pynecore import lib
+from pynecore.types.na import NA
+from pynecore.core.series import SeriesImpl, TypedSeriesImpl, FloatSeriesImpl, IntSeriesImpl, BoolSeriesImpl
+
+
+def main():
+    """
+    Dummy main function to be a valid Pyne script
+    """
+    pass
+
+
+def _add(series: SeriesImpl, values: list) -> None:
+    """ Add values on consecutive bars """
+    for value in values:
+        lib.bar_index += 1
+        series.add(value)
+
+
+def __test_typed_series_same_as_generic__():
+    """ Typed series behave the same as the generic one """
+    lib.bar_index = 0
+    values = [1.5, NA(float), 3.0, -4.25, 5.0, NA(float), 7.0, 8.5]
+    generic, typed = SeriesImpl(4), FloatSeriesImpl(4)
+    for value in values:
+        lib.bar_index += 1
+        generic.add(value)
+        typed.add(value)
+        assert len(generic) == len(typed)
+        for i in range(5):
+            assert generic[i] == typed[i] or (isinstance(generic[i], NA) and isinstance(typed[i], NA))
+        if len(typed) >= 3:
+            assert list(generic[1:3]) == list(typed[1:3])
+
+    # Set the current value
+    typed.set(10.0)
+    assert typed[0] == 10.0 and typed[1] == 7.0
+    typed.set(NA(float))
+    assert isinstance(typed[0], NA)
+
+    # NaN is stored as NA (like in Pine Script), the generic series keeps it as NaN
+    _add(typed, [math.nan])
+    assert isinstance(typed[0], NA) and lib.na(typed[0])
+    _add(generic, [math.nan])
+    assert math.isnan(generic[0]) and not lib.na(generic[0])
+
+
+def __test_typed_series_window__():
+    """ Windows are contiguous and in chronological order, even after wrapping """
+    lib.bar_index = 0
+    series = FloatSeriesImpl(3)
+    _add(series, [1.0, 2.0])
+    assert series.window(5).tolist() == [1.0, 2.0]
+    _add(series, [3.0, 4.0, 5.0, 6.0])
+    assert series.window(4).tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert series.window(2).tolist() == [5.0, 6.0]
+
+    # Resize keeps the most recent values
+    series.max_bars_back = 1
+    assert series.window(5).tolist() == [5.0, 6.0]
+    series.max_bars_back = 5
+    _add(series, [7.0])
+    assert series.window(5).tolist() == [5.0, 6.0, 7.0]
+    assert series[2] == 5.0
+
+
+def __test_typed_series_int_bool__():
+    """ Integer and boolean series """
+    lib.bar_index = 0
+    ints = IntSeriesImpl(3)
+    _add(ints, [1, NA(int), 3])
+    assert ints[0] == 3 and isinstance(ints[1], NA) and ints[2] == 1
+    assert isinstance(ints[3], NA)
+
+    bools = BoolSeriesImpl(3)
+    _add(bools, [True, NA(bool), False])
+    assert bools[0] is False and isinstance(bools[1], NA) and bools[2] is True
+
+
+def __test_typed_series_generic_load__():
+    """ Subclasses which only set the type of the array use the generic `_load` """
+
+    class Float32SeriesImpl(TypedSeriesImpl[float]):
+        __slots__ = ()
+        TYPECODE = 'f'
+
+    class UIntSeriesImpl(TypedSeriesImpl[int]):
+        __slots__ = ()
+        TYPECODE = 'L'
+        NA_TYPE = int
+        NA_VALUE = 2 ** 32 - 1
+
+    lib.bar_index = 0
+    floats, ints = Float32SeriesImpl(3), UIntSeriesImpl(3)
+    for value in (1.5, NA(float), 3.0):
+        lib.bar_index += 1
+        floats.add(value)
+        ints.add(NA(int) if isinstance(value, NA) else int(value))
+    assert floats[0] == 3.0 and isinstance(floats[1], NA) and floats[2] == 1.5
+    assert ints[0] == 3 and isinstance(ints[1], NA) and ints[2] == 1
+    view = list(floats[0:3])
+    assert view[0] == 3.0 and isinstance(view[1], NA) and view[2] == 1.5
+
+    # Degraded to a generic series with the loaded values
+    lib.bar_index += 1
+    ints.add("text")
+    assert type(ints) is SeriesImpl and ints[0] == "text" and isinstance(ints[2], NA) and ints[1] == 3
+
+
+def __test_typed_series_degrade__():
+    """ Values which cannot be stored convert the series to a generic one """
+    lib.bar_index = 0
+    series = IntSeriesImpl(3)
+    _add(series, [1, 2, 3, 4])
+    _add(series, [4.5])
+    assert type(series) is SeriesImpl
+    assert [series[i] for i in range(4)] == [4.5, 4, 3, 2]
+
+    series = FloatSeriesImpl(3)
+    _add(series, [1.0])
+    series.set("text")
+    assert type(series) is SeriesImpl
+    assert series[0] == "text"
+
+
+def __test_series_grow__():
+    """ Indices out of the capacity grow the buffer """
+    lib.bar_index = 0
+    for series in (SeriesImpl(2), FloatSeriesImpl(2)):
+        _add(series, [1.0, 2.0, 3.0, 4.0])
+        assert series[2] == 2.0
+        # The index of the old capacity is the value overwritten by the last add, it is kept
+        assert series[3] == 1.0
+        assert series.max_bars_back == SeriesImpl.DEFAULT_MAX_BARS_BACK
+        _add(series, [5.0, 6.0, 7.0])
+        assert series[3] == 4.0 and series[5] == 2.0 and series[6] == 1.0 and isinstance(series[7], NA)
+
+    for series in (SeriesImpl(2), FloatSeriesImpl(2)):
+        _add(series, [1.0, 2.0, 3.0, 4.0, 5.0])
+        # Older values are lost
+        assert isinstance(series[4], NA)
+        assert series[3] == 2.0 and series[0] == 5.0
+
+    for series in (SeriesImpl(2), FloatSeriesImpl(2)):
+        _add(series, [1.0, 2.0, 3.0, 4.0])
+        # Slices too
+        assert list(series[0:4]) == [4.0, 3.0, 2.0, 1.0]
+
+    for series in (SeriesImpl(2), FloatSeriesImpl(2)):
+        _add(series, [1.0, 2.0, 3.0, 4.0])
+        mark = series.mark()
+        _add(series, [5.0])
+        series.rollback(mark)
+        # The value overwritten before the mark is kept, not the one of the rolled back add
+        assert series[3] == 1.0 and series[0] == 4.0
+
+        # Too large indices are not supported
+        assert isinstance(series[SeriesImpl.MAXIMUM_MAX_BARS_BACK + 1], NA)
+        assert series.max_bars_back == SeriesImpl.DEFAULT_MAX_BARS_BACK
+
+
+def __test_series_rollback__():
+    """ Values added after a mark are dropped by rollback, also the overwritten oldest value is restored """
+    lib.bar_index = 0
+    for series in (SeriesImpl(3), FloatSeriesImpl(3)):
+        expected = []
+        for value in range(1, 10):
+            lib.bar_index += 1
+            mark = series.mark()
+            for update in (100.0, 200.0):
+                series.rollback(mark)
+                series.add(update)
+                assert series[0] == update
+            series.rollback(mark)
+            series.add(float(value))
+            expected.insert(0, float(value))
+            assert len(series) == min(value, 4)
+            assert [series[i] for i in range(len(series))] == expected[:4]
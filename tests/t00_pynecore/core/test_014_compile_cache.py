@@ -0,0 +1,78 @@
+"""
+@pyne
+"""
+from pathlib import Path
+
+import pytest
+
+SCRIPT = '''"""
+@pyne
+"""
+from pynecore import Series
+
+
+def main():
+    a: Series[float] = 1.0
+    return a[1]
+'''
+
+
+def main():
+    """
+    Dummy main function to be a valid Pyne script
+    """
+    pass
+
+
+def __test_compile_cache__(tmp_path, monkeypatch):
+    """ Transformed scripts are cached and the cache is invalidated by source changes """
+    # Importing the import hook installs it, so it must not be imported at collection time
+    from pynecore.core import import_hook
+    from pynecore.core.import_hook import PyneLoader, precompile
+
+    script_path = tmp_path / "cached_script.py"
+    script_path.write_text(SCRIPT)
+    plain_path = tmp_path / "plain_module.py"
+    plain_path.write_text("x = 1\n")
+
+    assert precompile(script_path)
+    assert not precompile(plain_path)
+    # noinspection PyProtectedMember
+    cache_path = import_hook._get_cache_path(str(script_path))
+    assert cache_path.exists()
+
+    # The cached code is used without transforming the source again
+    def fail(*_, **__):
+        raise AssertionError("Source should not be transformed")
+
+    with monkeypatch.context() as m:
+        m.setattr(PyneLoader, 'source_to_code', fail)
+        code = PyneLoader('cached_script', str(script_path)).get_code('cached_script')
+    assert '__series_function_vars__' in code.co_names
+
+    # Changed source invalidates the cache
+    script_path.write_text(SCRIPT.replace('a[1]', 'a[2]'))
+    with monkeypatch.context() as m:
+        m.setattr(PyneLoader, 'source_to_code', fail)
+        with pytest.raises(AssertionError):
+            PyneLoader('cached_script', str(script_path)).get_code('cached_script')
+    assert precompile(script_path)
+    code = PyneLoader('cached_script', str(script_path)).get_code('cached_script')
+    assert 2 in code.co_consts  # FloatSeriesImpl(2)
+
+    # Corrupted cache files are ignored
+    cache_path.write_bytes(b'garbage')
+    assert PyneLoader('cached_script', str(script_path)).get_code('cached_script') is not None
+
+
+def __test_pipeline_files__():
+    """ The sources of the library subpackages invalidate the cache too """
+    from pynecore.core import import_hook
+
+    # noinspection PyProtectedMember
+    files = import_hook._get_pipeline_files()
+    package_dir = Path(import_hook.__file__).parent.parent
+    relative = {file_path.relative_to(package_dir).as_posix() for file_path in files}
+    assert 'lib/ta.py' in relative
+    assert 'lib/strategy/__init__.py' in relative
+    assert len(files) == len(set(files))
@@ -0,0 +1,43 @@
+"""
+@pyne
+"""
+import subprocess
+import sys
+
+# It runs in a new interpreter, because other tests may have imported the submodules already
+CODE = '''
+import sys
+import pynecore.lib as lib
+
+lazy = ('pynecore.lib.log', 'pynecore.lib.array', 'pynecore.lib.ta')
+assert not any(name in sys.modules for name in lazy), [name for name in lazy if name in sys.modules]
+
+# `ta` uses `math` of lib only when it is called
+import pynecore.lib.ta
+lazy = ('pynecore.lib.log', 'pynecore.lib.array', 'pynecore.lib.math', 'statistics')
+assert not any(name in sys.modules for name in lazy), [name for name in lazy if name in sys.modules]
+
+assert lib.log.info is sys.modules['pynecore.lib.log'].info
+from pynecore.lib import array
+assert array is sys.modules['pynecore.lib.array']
+
+try:
+    lib.not_existing
+except AttributeError:
+    pass
+else:
+    raise AssertionError("AttributeError expected")
+'''
+
+
+def main():
+    """
+    Dummy main function to be a valid Pyne script
+    """
+    pass
+
+
+def __test_lazy_submodules__():
+    """ Submodules of lib are imported on first use """
+    result = subprocess.run([sys.executable, '-c', CODE], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
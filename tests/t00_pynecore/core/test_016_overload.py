@@ -0,0 +1,62 @@
+"""
+@pyne
+"""
+from pynecore.core.overload import overload, _dispatch_caches
+from pynecore.types.na import NA
+
+
+def main():
+    """
+    Dummy main function to be a valid Pyne script
+    """
+    pass
+
+
+@overload
+def kind(value: int) -> tuple:
+    return "int", value
+
+
+@overload
+def kind(value: float) -> tuple:
+    return "float", value
+
+
+@overload
+def kind(value: str, repeat: int = 1) -> tuple:
+    return "str", value * repeat
+
+
+def __test_overload_dispatch_cache__():
+    """ Calls are dispatched by the argument types, the resolutions are cached by the types """
+    assert kind(1) == ("int", 1)
+    assert kind(1.5) == ("float", 1.5)
+    assert kind("a") == ("str", "a")
+    assert kind("a", 2) == ("str", "aa")
+    assert kind("a", repeat=3) == ("str", "aaa")
+    # Same types, different values
+    assert kind(2) == ("int", 2)
+    assert kind("b", repeat=2) == ("str", "bb")
+
+    cache = _dispatch_caches[kind.__overloads__[0].func.__module__ + '.kind']
+    assert cache[(int,)] is kind.__overloads__[0]
+    assert cache[(float,)] is kind.__overloads__[1]
+    assert cache[((str,), ('repeat',), (int,))] is kind.__overloads__[2]
+
+
+def __test_overload_dispatch_na__():
+    """ NA values are dispatched by their type """
+    assert kind(NA(float))[0] == "float"
+    assert kind(NA(int))[0] == "int"
+    assert kind(NA(float))[0] == "float"
+
+
+def __test_overload_no_match__():
+    """ Calls without matching implementation raise TypeError every time """
+    for _ in range(2):
+        try:
+            kind(b"x")
+        except TypeError:
+            pass
+        else:
+            assert False, "TypeError expected"
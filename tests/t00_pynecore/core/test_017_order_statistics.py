@@ -0,0 +1,179 @@
+"""
+@pyne
+"""
+from bisect import bisect_left, bisect_right, insort
+from copy import copy
+import random
+
+from pynecore.core.order_statistics import SortedList, RollingWindow, RollingExtremum
+from pynecore.types.na import NA
+
+
+def main():
+    """
+    Dummy main function to be a valid Pyne script
+    """
+    pass
+
+
+def __test_sorted_list__():
+    """ Random adds and removes with small blocks, compared with a sorted list """
+    rnd = random.Random(0)
+    values = SortedList(load=4)
+    expected = []
+    for step in range(3000):
+        if expected and rnd.random() < 0.45:
+            value = rnd.choice(expected)
+            values.remove(value)
+            expected.remove(value)
+        else:
+            value = rnd.randint(0, 40)
+            values.add(value)
+            insort(expected, value)
+
+        if step % 10 == 0:
+            assert list(values) == expected
+            assert len(values) == len(expected)
+            assert [values[i] for i in range(len(expected))] == expected
+            if expected:
+                assert values[-1] == expected[-1]
+            for value in (-1, 10, 20, 41):
+                assert values.rank_left(value) == bisect_left(expected, value)
+                assert values.rank_right(value) == bisect_right(expected, value)
+
+
+def __test_sorted_list_sums__():
+    """ The sums of the values below a limit are calculated from the block sums """
+    rnd = random.Random(1)
+    values = SortedList(load=4, sums=True)
+    expected = []
+    for step in range(2000):
+        if expected and rnd.random() < 0.45:
+            value = rnd.choice(expected)
+            values.remove(value)
+            expected.remove(value)
+        else:
+            value = rnd.randint(0, 40) / 4
+            values.add(value)
+            insort(expected, value)
+
+        if step % 10 == 0:
+            assert values.total() == sum(expected)
+            for limit in (-1, 2.5, 5, 11):
+                assert values.sum_left(limit) == sum(v for v in expected if v < limit)
+
+
+def __test_sorted_list_errors__():
+    """ Removing a missing value raises ValueError, indexing out of range raises IndexError """
+    values = SortedList([3, 1, 2])
+    assert list(values) == [1, 2, 3]
+    for value in (0, 1.5, 4):
+        try:
+            values.remove(value)
+            assert False, value
+        except ValueError:
+            pass
+    for index in (3, -4):
+        try:
+            _ = values[index]
+            assert False, index
+        except IndexError:
+            pass
+    values.clear()
+    assert len(values) == 0 and values.rank_right(1) == 0
+
+
+def __test_rolling_window__():
+    """ The window keeps the values of the last bars, na values take their place """
+    window = RollingWindow(3)
+    assert window.push(1.0) is None
+    window.push(NA(float))
+    window.push(3.0)
+    assert list(window.sorted) == [1.0, 3.0] and len(window) == 3
+    assert window.push(2.0) == 1.0
+    assert window.push(5.0) is None
+    assert list(window.sorted) == [2.0, 3.0, 5.0]
+
+    window = RollingWindow(2, positions=True)
+    for value in (4.0, 2.0, 3.0):
+        window.push(value)
+    assert list(window.sorted) == [(2.0, 1), (3.0, 2)] and window.pos == 3
+
+
+def __test_rolling_window_copy__():
+    """ Copies of a window are independent """
+    window = RollingWindow(3, sums=True)
+    for value in (1.0, 2.0, 3.0):
+        window.push(value)
+    other = copy(window)
+    other.push(4.0)
+    assert list(window.sorted) == [1.0, 2.0, 3.0] and window.sorted.total() == 6.0 and window.pos == 3
+    assert list(other.sorted) == [2.0, 3.0, 4.0] and other.sorted.total() == 9.0 and other.pos == 4
+
+
+def __test_rollback__():
+    """ The changes since the mark are undone by rollback, the changes before it are kept """
+    rnd = random.Random(2)
+    values = SortedList(range(0, 60, 3), load=4, sums=True)
+    mark = values.mark()
+    expected = list(values)
+    for _ in range(5):
+        # Enough changes to split and merge blocks
+        for _ in range(30):
+            if rnd.random() < 0.5:
+                values.remove(rnd.choice(list(values)))
+            else:
+                values.add(rnd.randint(0, 60))
+        values.rollback(mark)
+        assert list(values) == expected and len(values) == len(expected)
+        assert values.total() == sum(expected)
+    values.clear()
+    values.add(1)
+    values.rollback(mark)
+    assert list(values) == expected
+
+    window = RollingWindow(4, positions=True)
+    for value in (5.0, 1.0, NA(float), 3.0, 2.0):
+        window.push(value)
+    expected = copy(window)
+    mark = window.mark()
+    for _ in range(3):
+        for value in (7.0, NA(float), 0.5, 9.0, 4.0):
+            window.push(value)
+        window.rollback(mark)
+        assert list(window.sorted) == list(expected.sorted) and window.pos == expected.pos
+    # The same as pushing to the window at the mark
+    assert window.push(6.0) == expected.push(6.0)
+    assert list(window.sorted) == list(expected.sorted)
+
+
+def __test_rolling_extremum__():
+    """ The extremum of the window is the same as the one of the last values, also after rollbacks """
+    rnd = random.Random(3)
+    for lowest in (False, True):
+        history = [3.0, NA(float), 1.0]
+        window = RollingExtremum(4, lowest=lowest, history=history)
+        # Updated the same way as the window, but without rollbacks
+        expected = copy(window)
+        values = list(history)
+        for _ in range(300):
+            # Updates of the realtime bar, enough of them to move the deque to the start of the buffer
+            mark = window.mark()
+            for _ in range(rnd.randint(1, 6)):
+                window.push(rnd.choice((NA(float), float(rnd.randint(0, 5)))))
+                window.rollback(mark)
+            value = rnd.choice((NA(float), float(rnd.randint(0, 5))))
+            window.push(value, check_eq=True)
+            expected.push(value, check_eq=True)
+            values.append(value)
+
+            assert (window.pos, window.extreme_pos) == (expected.pos, expected.extreme_pos)
+            last = [v for v in values[-4:] if not isinstance(v, NA)]
+            if not last:
+                assert window.extreme_pos == 0
+            else:
+                assert window.value == expected.value == (min(last) if lowest else max(last))
+                # The position of the extremum is the position of a value equal to it
+                age = window.pos - window.extreme_pos
+                assert values[len(values) - 1 - age] == window.value
+        window.unmark()
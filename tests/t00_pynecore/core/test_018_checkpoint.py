@@ -0,0 +1,92 @@
+"""
+@pyne
+"""
+from pathlib import Path
+import sys
+
+from pynecore import Persistent
+from pynecore.lib import script, close, strategy, input, ta
+from pynecore.core.ohlcv_file import OHLCVWriter, OHLCVReader
+from pynecore.core.script_runner import ScriptRunner
+from pynecore.core.optimizer import collect_stats
+
+
+@script.strategy("Checkpoint Test", overlay=True)
+def main(
+        length=input.int(10, "Length")
+):
+    bars: Persistent[int] = 0
+    bars += 1
+    fast = ta.sma(close, length)
+    slow = ta.sma(close, length * 2)
+    if ta.crossover(fast, slow):
+        strategy.entry("Long", strategy.long)
+    if ta.crossunder(fast, slow):
+        strategy.entry("Short", strategy.short)
+    return {
+        "bars": bars,
+        "change": close - close[5],
+        "median": ta.median(close, 20),
+        "rsi": ta.rsi(close, 14),
+    }
+
+
+def _create_data(tmp_path: Path) -> Path:
+    """ Convert the strategy test data to ohlcv format """
+    data_path = tmp_path / "checkpoint.ohlcv"
+    csv_path = Path(__file__).parent.parent.parent / "t01_lib" / "t30_strategy" / "data" / "strat_ohlcv.csv"
+    with OHLCVWriter(data_path) as writer:
+        writer.load_from_csv(csv_path)
+    return data_path
+
+
+def _run(script_path: Path, syminfo, data_path: Path, time_to: int, out: str, *,
+         length: int = 10, checkpoint_path: Path | None = None) -> tuple[int, dict]:
+    """ Run the script in a freshly imported module, return the number of processed bars and the stats """
+    sys.modules.pop(script_path.stem, None)
+    with OHLCVReader(data_path) as reader:
+        r = ScriptRunner(script_path, reader.read_from(reader.start_timestamp, time_to), syminfo,
+                         plot_path=data_path.with_name(f"{out}.csv"),
+                         equity_path=data_path.with_name(f"{out}_equity.csv"),
+                         checkpoint_path=checkpoint_path, resume=checkpoint_path is not None)
+        r.reset()
+        r.set_inputs(length=length)
+        bars = sum(1 for _ in r.run_iter())
+        return bars, collect_stats(r)
+
+
+def __test_checkpoint_resume__(tmp_path, script_path, syminfo, runner):
+    """ Resuming from a checkpoint gives the same outputs and results as a full run """
+    # The runner fixture reloads the library with the import hook, then every run imports the script again
+    runner(())
+    data_path = _create_data(tmp_path)
+    checkpoint_path = tmp_path / "checkpoint.checkpoint"
+    start = 1641160800
+    split, end = start + 1200 * 3600, start + 2000 * 3600
+
+    full_bars, full_stats = _run(script_path, syminfo, data_path, end, "full")
+    assert full_stats['total_trades'] > 0
+
+    # There is no checkpoint yet, so it runs from the first bar
+    first_bars, _ = _run(script_path, syminfo, data_path, split, "inc",
+                         checkpoint_path=checkpoint_path)
+    assert checkpoint_path.exists()
+    # Only the new bars are processed
+    new_bars, stats = _run(script_path, syminfo, data_path, end, "inc",
+                           checkpoint_path=checkpoint_path)
+    assert new_bars == full_bars - first_bars > 0
+
+    assert stats == full_stats
+    for suffix in ('', '_equity'):
+        full = data_path.with_name(f"full{suffix}.csv").read_text()
+        assert data_path.with_name(f"inc{suffix}.csv").read_text() == full, suffix
+
+    # Nothing to do if there is no new bar
+    bars, stats = _run(script_path, syminfo, data_path, end, "inc", checkpoint_path=checkpoint_path)
+    assert bars == 0 and stats == full_stats
+    assert data_path.with_name("inc.csv").read_text() == data_path.with_name("full.csv").read_text()
+
+    # The checkpoint is not valid with other inputs
+    bars, _ = _run(script_path, syminfo, data_path, end, "inc", length=20,
+                   checkpoint_path=checkpoint_path)
+    assert bars == full_bars
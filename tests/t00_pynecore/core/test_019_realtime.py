@@ -0,0 +1,137 @@
+"""
+@pyne
+"""
+import asyncio
+import random
+
+import pytest
+
+from pynecore import Persistent
+from pynecore.lib import script, close, high, ta, barstate, math
+from pynecore.types.ohlcv import OHLCV
+from pynecore.core.csv_file import CSVWriter
+from pynecore.core.plot_file import PlotWriter, PlotReader
+
+
+@script.indicator("Realtime Test")
+def main():
+    bars: Persistent[int] = 0
+    bars += 1
+    closes: Persistent[list[float]] = []
+    closes.append(close)
+    directions: Persistent[dict[str, int]] = {"up": 0, "down": 0}
+    directions["up" if close > close[1] else "down"] += 1
+    return {
+        "bars": bars,
+        "closes": len(closes),
+        "ups": directions["up"],
+        "downs": directions["down"],
+        "mode": ta.mode(math.round(close), 9),
+        "percentrank": ta.percentrank(close, 6),
+        "change": close - close[3],
+        "sma": ta.sma(close, 5),
+        "median": ta.median(close, 7),
+        "highest": ta.highest(high, 4),
+        # Long windows, their deques are rolled back on every update
+        "highest_long": ta.highest(high, 30),
+        "lowestbars_long": ta.lowestbars(close, 25),
+        "confirmed": barstate.isconfirmed,
+        "realtime": barstate.isrealtime,
+    }
+
+
+def _ohlcv(bars: int) -> list[OHLCV]:
+    rnd = random.Random(3)
+    price = 100.0
+    candles = []
+    for i in range(bars):
+        open_ = price
+        price += rnd.gauss(0.0, 1.0)
+        candles.append(OHLCV(timestamp=1672531200 + i * 60, open=open_, high=max(open_, price) + 0.5,
+                             low=min(open_, price) - 0.5, close=price, volume=10.0))
+    return candles
+
+
+async def _updates(candles: list[OHLCV]):
+    """ Every bar is updated 3 times, the last update is the final bar """
+    for candle in candles:
+        for close_ in (candle.open, (candle.high + candle.low) / 2):
+            yield candle._replace(high=max(candle.open, close_), low=min(candle.open, close_), close=close_)
+        yield candle
+    # The first update of the next bar confirms the last bar
+    yield candles[-1]._replace(timestamp=candles[-1].timestamp + 60)
+
+
+def _values(plot: dict) -> dict:
+    return {key: value for key, value in plot.items() if key not in ('confirmed', 'realtime')}
+
+
+def __test_realtime_rollback__(runner, tmp_path):
+    """ Realtime updates are calculated from the state of the last confirmed bar """
+    candles = _ohlcv(60)
+    history = 40
+
+    r = runner(candles)
+    r.plot_writer = CSVWriter(tmp_path / "full.csv")
+    expected = [_values(plot) for _, plot in r.run_iter()]
+
+    r.reset()
+    r.ohlcv_iter = candles[:history]
+    r.plot_writer = CSVWriter(tmp_path / "realtime.csv")
+
+    async def run():
+        return [(candle, dict(plot), confirmed) async for candle, plot, confirmed in r.run_realtime(_updates(candles))]
+
+    results = asyncio.run(run())
+
+    confirmed = [plot for _, plot, is_confirmed in results if is_confirmed]
+    assert [_values(plot) for plot in confirmed] == expected
+    assert [plot["realtime"] for plot in confirmed] == [False] * history + [True] * (len(candles) - history)
+    assert all(plot["confirmed"] for plot in confirmed)
+
+    updates = [(candle, plot) for candle, plot, is_confirmed in results if not is_confirmed]
+    assert len(updates) == 3 * (len(candles) - history) + 1
+    for i, (candle, plot) in enumerate(updates[:-1]):
+        index = history + i // 3
+        assert plot["realtime"] and not plot["confirmed"]
+        assert plot["bars"] == plot["closes"] == plot["ups"] + plot["downs"] == index + 1
+        # The last update is the final bar, the previous updates are rolled back
+        if i % 3 == 2:
+            assert candle == candles[index]
+            assert _values(plot) == expected[index]
+
+    # Only the confirmed bars are written (the last column is the realtime flag)
+    lines = [line.rsplit(',', 1)[0] for line in (tmp_path / "realtime.csv").read_text().splitlines()]
+    assert lines == [line.rsplit(',', 1)[0] for line in (tmp_path / "full.csv").read_text().splitlines()]
+
+    # The confirmed realtime bars are in the plot file at once, so it can be followed while running
+    r.reset()
+    r.ohlcv_iter = candles[:history]
+    r.plot_writer = PlotWriter(tmp_path / "realtime.plot")
+
+    async def follow():
+        sizes = []
+        async for _, plot, is_confirmed in r.run_realtime(_updates(candles)):
+            if is_confirmed and plot["realtime"]:
+                with PlotReader(tmp_path / "realtime.plot") as reader:
+                    sizes.append(len(reader))
+        return sizes
+
+    assert asyncio.run(follow()) == list(range(history + 1, len(candles) + 1))
+
+    # Precomputed values end with the historical data, so precompute mode can't continue in realtime
+    try:
+        import numpy
+    except ImportError:
+        return
+    from pynecore.core.ohlcv_columns import OHLCVColumns
+
+    r.reset()
+    r.ohlcv_iter = OHLCVColumns(*(numpy.array(column, dtype=numpy.int64 if i == 0 else numpy.float64)
+                                  for i, column in enumerate(zip(*(candle[:6] for candle in candles[:history])))))
+    r.precompute = True
+    r.plot_writer = None
+    assert len(list(r.run_iter())) == history
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    r.precompute = False
@@ -0,0 +1,110 @@
+"""
+@pyne
+"""
+from pathlib import Path
+import sys
+
+from pynecore import Persistent
+from pynecore import lib
+from pynecore.lib import script, close, strategy, input, ta, plot
+from pynecore.core.ohlcv_file import OHLCVWriter, OHLCVReader
+from pynecore.core.multi_script_runner import MultiScriptRunner
+from pynecore.core.optimizer import collect_stats
+
+INDICATOR = '''"""
+@pyne
+"""
+from pynecore import Persistent
+from pynecore.lib import script, close, high, ta, plot
+
+
+@script.indicator("Multi Script Indicator")
+def main():
+    bars: Persistent[int] = 0
+    bars += 1
+    plot(ta.ema(close, 10), "ema")
+    return {
+        "bars": bars,
+        "sma": ta.sma(close, 10),
+        "highest": ta.highest(high, 20),
+    }
+'''
+
+
+@script.strategy("Multi Script Strategy", overlay=True)
+def main(
+        length=input.int(10, "Length")
+):
+    bars: Persistent[int] = 0
+    bars += 1
+    fast = ta.sma(close, length)
+    slow = ta.sma(close, length * 2)
+    if ta.crossover(fast, slow):
+        strategy.entry("Long", strategy.long)
+    if ta.crossunder(fast, slow):
+        strategy.entry("Short", strategy.short)
+    plot(fast, "fast")
+    return {
+        "bars": bars,
+        "sma": ta.sma(close, 10),
+        "slow": slow,
+    }
+
+
+def __test_multi_script_runner__(tmp_path, script_path, syminfo, runner):
+    """ Scripts run in one pass give the same outputs and results as separate runs """
+    # The runner fixture reloads the library with the import hook
+    runner(())
+    data_path = tmp_path / "multi.ohlcv"
+    csv_path = Path(__file__).parent.parent.parent / "t01_lib" / "t30_strategy" / "data" / "strat_ohlcv.csv"
+    with OHLCVWriter(data_path) as writer:
+        writer.load_from_csv(csv_path)
+    indicator_path = tmp_path / "multi_script_indicator.py"
+    indicator_path.write_text(INDICATOR)
+
+    sys.modules.pop(script_path.stem, None)
+    sys.modules.pop(indicator_path.stem, None)
+
+    with OHLCVReader(data_path) as reader:
+        start, end = reader.start_timestamp, reader.start_timestamp + 1500 * 3600
+        multi = MultiScriptRunner(reader.read_from(start, end), syminfo)
+        strat = multi.add_script(script_path, plot_path=tmp_path / "multi_strat.csv",
+                                 equity_path=tmp_path / "multi_equity.csv")
+        indicator = multi.add_script(indicator_path, plot_path=tmp_path / "multi_ind.csv")
+
+        # The script object and the plot data of lib are restored after the run, even if it is stopped
+        original = lib._script, lib._plot_data
+        for _ in multi.run_iter():
+            break
+        assert lib._script is original[0] and lib._plot_data is original[1]
+        multi.reset()
+        multi.ohlcv_iter = reader.read_from(start, end)
+
+        results = [(candle, [dict(plot_data) for plot_data in plots]) for candle, plots in multi.run_iter()]
+        assert lib._script is original[0] and lib._plot_data is original[1]
+        stats = collect_stats(strat)
+        assert stats['total_trades'] > 0
+        assert [plots[1]["bars"] for _, plots in results] == list(range(1, len(results) + 1))
+        assert set(results[0][1][0]) == {"fast", "bars", "sma", "slow"}
+        assert set(results[0][1][1]) == {"ema", "bars", "sma", "highest"}
+
+        # Separate runs of the same scripts
+        for r, out in ((strat, "strat"), (indicator, "ind")):
+            r.reset()
+            r.ohlcv_iter = reader.read_from(start, end)
+            r.plot_writer.path = tmp_path / f"{out}.csv"
+            if r.equity_writer:
+                r.equity_writer.path = tmp_path / "equity.csv"
+            expected = [dict(plot_data) for _, plot_data, *_ in r.run_iter()]
+            assert expected == [plots[r is indicator] for _, plots in results]
+
+        assert collect_stats(strat) == stats
+        for out in ("strat", "equity", "ind"):
+            assert (tmp_path / f"multi_{out}.csv").read_text() == (tmp_path / f"{out}.csv").read_text(), out
+
+        # The same script can't be added twice
+        try:
+            multi.add_script(indicator_path)
+            assert False, "ValueError expected"
+        except ValueError:
+            pass
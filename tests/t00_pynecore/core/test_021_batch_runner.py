@@ -0,0 +1,85 @@
+"""
+@pyne
+"""
+from pathlib import Path
+from dataclasses import replace
+import csv
+
+from pynecore.lib import script, close, strategy, input, ta
+from pynecore.core.ohlcv_file import OHLCVWriter, OHLCVReader
+from pynecore.core.optimizer import collect_stats
+from pynecore.core.batch_runner import run_batch, write_summary
+
+
+@script.strategy("Batch Runner Test", overlay=True)
+def main(
+        length=input.int(10, "Length")
+):
+    fast = ta.sma(close, length)
+    slow = ta.sma(close, length * 2)
+    if ta.crossover(fast, slow):
+        strategy.entry("Long", strategy.long)
+    if ta.crossunder(fast, slow):
+        strategy.entry("Short", strategy.short)
+    return {"fast": fast}
+
+
+def _create_data(tmp_path: Path, name: str, syminfo, end: int | None = None) -> Path:
+    """ Convert the strategy test data to ohlcv format, with symbol information """
+    data_path = tmp_path / f"{name}.ohlcv"
+    csv_path = Path(__file__).parent.parent.parent / "t01_lib" / "t30_strategy" / "data" / "strat_ohlcv.csv"
+    with OHLCVWriter(data_path) as writer:
+        writer.load_from_csv(csv_path)
+        if end is not None:
+            writer.seek_to_timestamp(end)
+            writer.truncate()
+    replace(syminfo, ticker=name).save_toml(data_path.with_suffix(".toml"))
+    return data_path
+
+
+def __test_batch_runner__(tmp_path, script_path, syminfo, runner):
+    """ Every symbol gives the same results as a separate run, errors are reported per symbol """
+    start = 1641160800
+    short_path = _create_data(tmp_path, "SHORT", syminfo, start + 800 * 3600)
+    long_path = _create_data(tmp_path, "LONG", syminfo, start + 1500 * 3600)
+    bad_path = tmp_path / "BAD.ohlcv"
+    bad_path.write_bytes(b"")
+
+    # Separate runs
+    expected = []
+    for data_path in (short_path, long_path):
+        with OHLCVReader(data_path) as reader:
+            r = runner(reader.read_from(reader.start_timestamp, reader.end_timestamp))
+            # The module is imported only once
+            r.reset()
+            r.run()
+            expected.append(collect_stats(r))
+
+    output_dir = tmp_path / "out"
+    results = run_batch(script_path, [short_path, bad_path, long_path], output_dir=output_dir, workers=1)
+    assert [res.symbol for res in results] == ["SHORT", "BAD", "LONG"]
+    assert [res.stats for res in results] == [expected[0], {}, expected[1]]
+    assert results[0].bars < results[2].bars
+    assert results[1].error and not results[0].error and not results[2].error
+    assert (output_dir / "LONG.csv").exists() and (output_dir / "SHORT_equity.csv").exists()
+
+    summary_path = tmp_path / "summary.csv"
+    write_summary(results, summary_path)
+    with open(summary_path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['symbol'] for row in rows] == ["SHORT", "BAD", "LONG"]
+    assert int(rows[2]['total_trades']) == expected[1]['total_trades']
+    assert rows[1]['error'] == results[1].error
+
+    # In worker processes, the results are the same
+    pool_dir = tmp_path / "pool"
+    reported = []
+    pool_results = run_batch(script_path, [short_path, bad_path, long_path], output_dir=pool_dir, workers=2,
+                             on_result=reported.append)
+    # Every result is reported when it is ready, the returned results are in the order of the data paths
+    assert sorted(res.symbol for res in reported) == ["BAD", "LONG", "SHORT"]
+    assert [(res.symbol, res.bars, res.stats) for res in pool_results] == \
+           [(res.symbol, res.bars, res.stats) for res in results]
+    assert pool_results[1].error == results[1].error
+    for name in ("SHORT.csv", "LONG.csv", "SHORT_equity.csv", "LONG_equity.csv"):
+        assert (pool_dir / name).read_bytes() == (output_dir / name).read_bytes()
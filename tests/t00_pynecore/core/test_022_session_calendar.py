@@ -0,0 +1,82 @@
+"""
+@pyne
+"""
+from pathlib import Path
+from datetime import datetime, timedelta
+
+from pynecore import lib
+from pynecore.core.syminfo import SymInfo
+from pynecore.core.session_calendar import SessionCalendar
+from pynecore.core.script_runner import _set_lib_syminfo_properties
+
+
+def main():
+    pass
+
+
+def _calendar() -> tuple[SessionCalendar, SymInfo]:
+    path = Path(__file__).parent.parent.parent / "t01_lib" / "t01_timeframe" / "data" / "timeframe.toml"
+    syminfo = SymInfo.load_toml(path)
+    return SessionCalendar(syminfo.opening_hours, syminfo.session_starts, syminfo.session_ends), syminfo
+
+
+# noinspection PyProtectedMember
+def __test_session_lookups__():
+    """ Lookups of the sessions of a forex symbol (Sunday 17:00 - Friday 17:00, daily break at 17:00) """
+    calendar, syminfo = _calendar()
+    tz = lib._parse_timezone(syminfo.timezone)
+
+    assert calendar.first_session_start(0).hour == 17 and calendar.first_session_start(5) is None
+
+    # Monday 17:05, the daily session starts after the break
+    assert calendar.is_new_session(datetime(2024, 10, 21, 17, 5, tzinfo=tz), 300)
+    assert calendar.is_first_bar(datetime(2024, 10, 21, 17, 5, tzinfo=tz), 300)
+    assert not calendar.is_new_session(datetime(2024, 10, 21, 17, 10, tzinfo=tz), 300)
+    # The hourly bar contains the session start
+    assert calendar.is_new_session(datetime(2024, 10, 21, 17, 0, tzinfo=tz), 3600)
+    # The daily break and the weekend are not in session
+    assert calendar.in_session(datetime(2024, 10, 21, 16, 0, tzinfo=tz), 300)
+    assert not calendar.in_session(datetime(2024, 10, 21, 17, 0, tzinfo=tz), 60)
+    assert not calendar.in_session(datetime(2024, 10, 26, 12, 0, tzinfo=tz), 300)
+    assert calendar.is_last_bar(datetime(2024, 10, 21, 16, 55, tzinfo=tz), 300)
+    assert not calendar.is_last_bar(datetime(2024, 10, 21, 16, 50, tzinfo=tz), 300)
+
+
+# noinspection PyProtectedMember
+def __test_new_session_bars__():
+    """ The bars starting a new session are the same as checking every bar, across a DST change too """
+    calendar, syminfo = _calendar()
+    tz = lib._parse_timezone(syminfo.timezone)
+    start = datetime(2024, 10, 21, 3, 0, tzinfo=tz)
+    end = start + timedelta(days=20)
+
+    # 11 minutes does not divide a week, so every bar is checked
+    for tf_sec in (60, 300, 3600, 4 * 3600, 11 * 60):
+        expected = []
+        dt = start
+        while dt < end:
+            if calendar.is_new_session(dt, tf_sec):
+                expected.append(dt)
+            dt += timedelta(seconds=tf_sec)
+        assert list(calendar.new_session_bars(start, end, tf_sec)) == expected
+        assert len(expected) >= 14
+
+
+# noinspection PyProtectedMember
+def __test_calendar_reuse__():
+    """ The calendar of lib is rebuilt only if the sessions of the symbol change """
+    _, syminfo = _calendar()
+    original = lib.syminfo._calendar
+    try:
+        _set_lib_syminfo_properties(syminfo, lib)
+        calendar = lib.syminfo._calendar
+        assert calendar.is_new_session(datetime(2024, 10, 21, 17, 5), 300)
+        _set_lib_syminfo_properties(syminfo, lib)
+        assert lib.syminfo._calendar is calendar
+
+        syminfo.session_starts = syminfo.session_starts[1:]
+        _set_lib_syminfo_properties(syminfo, lib)
+        assert lib.syminfo._calendar is not calendar
+        assert lib.syminfo._calendar.sessions[1] == tuple(syminfo.session_starts)
+    finally:
+        lib.syminfo._calendar = original
@@ -0,0 +1,66 @@
+"""
+@pyne
+"""
+import pickle
+import random
+
+from pynecore.core.order_book import OrderBook
+from pynecore.lib.strategy import Order
+
+
+def main():
+    pass
+
+
+def _expected(orders: dict, high: float | None, low: float | None, market: bool) -> list:
+    """ The orders which can be filled, by checking every order """
+    res = []
+    for order in orders.values():
+        if not order.limit and not order.stop:
+            if market:
+                res.append(order)
+            continue
+        buy = order.size > 0
+        if high is not None and ((buy and order.stop and order.stop <= high)
+                                 or (not buy and order.limit and order.limit <= high)):
+            res.append(order)
+        elif low is not None and ((not buy and order.stop and order.stop >= low)
+                                  or (buy and order.limit and order.limit >= low)):
+            res.append(order)
+    return res
+
+
+def __test_order_book__():
+    """ The candidates are the same as checking every order, in the order of a dict """
+    rnd = random.Random(7)
+    book = OrderBook()
+    orders: dict[str, Order] = {}
+
+    for step in range(3000):
+        op = rnd.random()
+        order_id = f"O{rnd.randrange(60)}"
+        if op < 0.6:
+            price = round(rnd.uniform(90.0, 110.0), 1)
+            kind = rnd.randrange(4)
+            order = Order(order_id, rnd.choice((-1.0, 1.0)) * rnd.randint(1, 3),
+                          limit=price if kind in (1, 3) else None,
+                          stop=price + 1.0 if kind in (2, 3) else None)
+            book[order_id] = orders[order_id] = order
+        elif op < 0.8:
+            assert book.pop(order_id, None) is orders.pop(order_id, None)
+        elif op < 0.81:
+            book.clear()
+            orders.clear()
+        else:
+            low = round(rnd.uniform(90.0, 110.0), 1)
+            high = low + round(rnd.uniform(0.0, 3.0), 1)
+            assert book.candidates(high=high, market=True) == _expected(orders, high, None, True)
+            assert book.candidates(low=low) == _expected(orders, None, low, False)
+            assert list(book.values()) == list(orders.values())
+
+        if step == 1500:
+            # The book can be saved in checkpoints
+            book = pickle.loads(pickle.dumps(book))
+            orders = dict(zip(book.keys(), book.values()))
+
+    assert len(book) == len(orders) and all(order_id in book for order_id in orders)
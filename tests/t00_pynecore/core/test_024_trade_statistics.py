@@ -0,0 +1,181 @@
+"""
+@pyne
+"""
+from collections import deque
+from datetime import datetime, timedelta, UTC
+from math import sqrt, isclose
+import csv
+import pickle
+import random
+import sys
+
+from pynecore.core.bounded_list import BoundedList
+from pynecore.core.trade_statistics import TradeStatistics
+from pynecore.core.script_runner import ScriptRunner
+from pynecore.types.ohlcv import OHLCV
+
+STRATEGY = '''"""
+@pyne
+"""
+from pynecore.lib import script, close, strategy, ta
+
+
+@script.strategy("Strategy Report Test")
+def main():
+    fast = ta.sma(close, 5)
+    slow = ta.sma(close, 15)
+    if ta.crossover(fast, slow):
+        strategy.entry("Long", strategy.long)
+    if ta.crossunder(fast, slow):
+        strategy.entry("Short", strategy.short)
+'''
+
+
+def main():
+    pass
+
+
+def __test_bounded_list__():
+    """ The bounded list has the same items as a deque with maxlen """
+    rnd = random.Random(3)
+    values: BoundedList[int] = BoundedList(50)
+    items: deque[int] = deque(maxlen=50)
+
+    for step in range(2000):
+        if rnd.random() < 0.005:
+            values.clear()
+            items.clear()
+        if step % 10 == 0:
+            values.extend(range(step, step + 3))
+            items.extend(range(step, step + 3))
+        values.append(step)
+        items.append(step)
+        assert len(values) == len(items)
+        index = rnd.randrange(-len(items), len(items))
+        assert values[index] == items[index]
+        if step % 97 == 0:
+            assert list(values) == list(items)
+            assert list(reversed(values)) == list(reversed(items))
+        if step == 1000:
+            values = pickle.loads(pickle.dumps(values))
+            assert values.maxlen == 50
+
+    for index in (len(items), -len(items) - 1):
+        try:
+            _ = values[index]
+        except IndexError:
+            pass
+        else:
+            assert False, "IndexError expected"
+
+
+def __test_trade_statistics__():
+    """ The incremental statistics are the same as the ones calculated from all trades and equities """
+    rnd = random.Random(5)
+    stats = TradeStatistics(risk_free_rate=3.0)
+    profits = [rnd.choice((-1.0, 1.0, 2.0)) * rnd.randint(0, 50) for _ in range(500)]
+    for profit in profits:
+        stats.add_trade(profit)
+
+    wins = [p for p in profits if p > 0.0]
+    losses = [-p for p in profits if p < 0.0]
+    assert stats.total_trades == len(profits)
+    assert stats.wintrades == len(wins) and stats.losstrades == len(losses)
+    assert stats.profit_factor == sum(wins) / sum(losses)
+    assert stats.percent_profitable == len(wins) / len(profits) * 100.0
+    assert abs(stats.avg_winning_trade - sum(wins) / len(wins)) < 1e-9
+    assert abs(stats.avg_losing_trade - sum(losses) / len(losses)) < 1e-9
+    assert stats.largest_win == max(wins) and stats.largest_loss == max(losses)
+    streak = longest = 0
+    for profit in profits:
+        streak = streak + 1 if profit < 0.0 else 0
+        longest = max(longest, streak)
+    assert stats.max_consecutive_losses == longest
+
+    # Daily equities for a bit more than 2 years, a month ends with the equity of its last bar, the first
+    # month starts with the first equity
+    dt = datetime(2022, 1, 3, tzinfo=UTC)
+    equity = 10000.0
+    equities = []
+    month_ends: dict[tuple[int, int], float] = {}
+    for day in range(800):
+        equity *= 1.0 + rnd.gauss(0.0005, 0.01)
+        stats.add_equity(dt.year * 12 + dt.month, equity)
+        equities.append(equity)
+        month_ends[dt.year, dt.month] = equity
+        dt += timedelta(days=1)
+        if day == 400:
+            stats = pickle.loads(pickle.dumps(stats))
+
+    returns = []
+    start = equities[0]
+    for month_equity in month_ends.values():
+        returns.append(month_equity / start - 1.0)
+        start = month_equity
+
+    target = 3.0 / 100.0 / 12.0
+    n = len(returns)
+    mean = sum(returns) / n
+    sd = sqrt(sum((r - mean) ** 2 for r in returns) / n)
+    dd = sqrt(sum(min(r - target, 0.0) ** 2 for r in returns) / n)
+    assert abs(stats.sharpe_ratio - (mean - target) / sd) < 1e-9
+    assert abs(stats.sortino_ratio - (mean - target) / dd) < 1e-9
+
+
+def _ohlcv(bars: int) -> list[OHLCV]:
+    """ Hourly random walk for some months, so the monthly returns of the ratios are calculated """
+    rnd = random.Random(11)
+    price = 100.0
+    candles = []
+    for i in range(bars):
+        open_ = price
+        price = max(price + rnd.gauss(0.0, 1.0), 10.0)
+        candles.append(OHLCV(timestamp=1672531200 + i * 3600, open=open_, high=max(open_, price) + 0.5,
+                             low=min(open_, price) - 0.5, close=price, volume=10.0))
+    return candles
+
+
+def __test_strategy_report__(tmp_path, syminfo):
+    """ The strategy statistics file has one row per statistic, the values of the position """
+    script_path = tmp_path / "strategy_report.py"
+    script_path.write_text(STRATEGY)
+    strat_path = tmp_path / "strategy_report_strat.csv"
+    sys.modules.pop(script_path.stem, None)
+
+    r = ScriptRunner(script_path, _ohlcv(3000), syminfo, strat_path=strat_path)
+    r.run()
+    position = r.script.position
+    stats = position.stats
+    assert stats.total_trades > 10
+
+    with open(strat_path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["Statistic", "Value"]
+    report = {name: float(value) for name, value in rows[1:]}
+    expected = {
+        "net_profit": position.netprofit,
+        "net_profit_percent": position.netprofit / r.script.initial_capital * 100.0,
+        "gross_profit": stats.grossprofit,
+        "gross_loss": stats.grossloss,
+        "profit_factor": stats.profit_factor,
+        "total_trades": stats.total_trades,
+        "winning_trades": stats.wintrades,
+        "losing_trades": stats.losstrades,
+        "percent_profitable": stats.percent_profitable,
+        "avg_trade": stats.avg_trade,
+        "avg_winning_trade": stats.avg_winning_trade,
+        "avg_losing_trade": stats.avg_losing_trade,
+        "ratio_avg_win_loss": stats.ratio_avg_win_loss,
+        "largest_winning_trade": stats.largest_win,
+        "largest_losing_trade": stats.largest_loss,
+        "max_consecutive_wins": stats.max_consecutive_wins,
+        "max_consecutive_losses": stats.max_consecutive_losses,
+        "max_drawdown": position.max_drawdown,
+        "max_runup": position.max_runup,
+        "sharpe_ratio": stats.sharpe_ratio,
+        "sortino_ratio": stats.sortino_ratio,
+        "open_profit": position.openprofit,
+    }
+    assert list(report) == list(expected)
+    for name, value in expected.items():
+        assert isclose(report[name], value, rel_tol=1e-6, abs_tol=1e-9), name
@@ -0,0 +1,134 @@
+"""
+@pyne
+"""
+from pathlib import Path
+
+import pytest
+
+from pynecore.lib import script, close, high, low, strategy, input, ta, bar_index
+from pynecore.lib.strategy import opentrades
+from pynecore.core.ohlcv_file import OHLCVWriter
+from pynecore.core.script_runner import ScriptRunner
+from pynecore.core.optimizer import optimize, grid_space, collect_stats
+
+
+@script.strategy("Fast Backtest Test", overlay=True, pyramiding=2, commission_type=strategy.commission.percent,
+                 commission_value=0.1)
+def main(
+        mode=input.int(0, "Mode")
+):
+    fast = ta.sma(close, 5)
+    slow = ta.sma(close, 15)
+    up = ta.crossover(fast, slow)
+    down = ta.crossunder(fast, slow)
+
+    # Reversals
+    if mode == 0:
+        if up:
+            strategy.entry("Long", strategy.long)
+        if down:
+            strategy.entry("Short", strategy.short)
+    # Pyramiding
+    elif mode == 1:
+        if up:
+            strategy.entry("Long", strategy.long)
+        if close > fast and bar_index % 7 == 0:
+            strategy.entry("Add", strategy.long)
+        if down:
+            strategy.entry("Short", strategy.short)
+    # Immediate partial close
+    elif mode == 2:
+        if up:
+            strategy.entry("Long", strategy.long, qty=2)
+        if ta.crossunder(close, fast) and opentrades.size(0) > 0:
+            strategy.close("Long", qty=1, immediately=True)
+        if down:
+            strategy.entry("Short", strategy.short)
+    # Limit and stop orders
+    elif mode == 3:
+        if up:
+            strategy.entry("Long", strategy.long, limit=low)
+        strategy.exit("Exit", "Long", profit=200, loss=100)
+    # Per-bar values read by the script
+    else:
+        if up:
+            strategy.entry("Long", strategy.long)
+        if down:
+            strategy.entry("Short", strategy.short)
+        return {
+            "equity": strategy.equity,
+            "openprofit": strategy.openprofit,
+            "max_drawdown": strategy.max_drawdown,
+            "max_runup": strategy.max_runup,
+            "trade_profit": opentrades.profit(0),
+            "trade_runup": opentrades.max_runup(0),
+            "high": high,
+        }
+
+
+def _create_data(tmp_path: Path) -> Path:
+    """ Convert the strategy test data to ohlcv format """
+    data_path = tmp_path / "fast_backtest.ohlcv"
+    csv_path = Path(__file__).parent.parent.parent / "t01_lib" / "t30_strategy" / "data" / "strat_ohlcv.csv"
+    with OHLCVWriter(data_path) as writer:
+        writer.load_from_csv(csv_path)
+    return data_path
+
+
+def _run(r, mode: int, fast: bool) -> tuple[list[dict], list[dict], dict]:
+    """ Run the script, return the plots, the closed trades and the statistics """
+    r.reset()
+    r.set_inputs(mode=mode)
+    r.fast = fast
+    plots = []
+    trades = []
+    for _, plot, new_closed_trades in r.run_iter():
+        plots.append(dict(plot))
+        trades.extend({key: getattr(trade, key) for key in trade.__slots__} for trade in new_closed_trades)
+    return plots, trades, collect_stats(r)
+
+
+# noinspection PyShadowingNames
+def __test_fast_backtest__(tmp_path, script_path, syminfo, runner):
+    """ Fast mode gives the same results as the bar by bar processing """
+    try:
+        import numpy  # noqa
+    except ImportError:
+        pytest.skip("NumPy library not available")
+    from pynecore.core.ohlcv_columns import OHLCVColumns
+    from pynecore.core.fast_backtest import FastPosition
+
+    columns = OHLCVColumns.from_file(_create_data(tmp_path))
+    r = runner(columns, syminfo_override=dict(timezone="US/Eastern"))
+
+    for mode in range(5):
+        expected = _run(r, mode, False)
+        result = _run(r, mode, True)
+        assert isinstance(r.script.position, FastPosition)
+
+        assert len(expected[1]) > 5, mode
+        # Everything is the same, not only close
+        assert result == expected, mode
+
+    # Fast mode needs columnar data
+    r.ohlcv_iter = list(columns)
+    with pytest.raises(ValueError):
+        r.run()
+    # Fast mode can't be used with checkpoints
+    with pytest.raises(ValueError):
+        ScriptRunner(script_path, columns, syminfo, fast=True, checkpoint_path=tmp_path / "fast.checkpoint")
+
+
+# noinspection PyShadowingNames
+def __test_fast_optimize__(tmp_path, script_path, syminfo):
+    """ Optimization in fast mode gives the same results """
+    try:
+        import numpy  # noqa
+    except ImportError:
+        pytest.skip("NumPy library not available")
+
+    data_path = _create_data(tmp_path)
+    space = list(grid_space(dict(mode=[0, 2, 3])))
+    expected = optimize(script_path, data_path, syminfo, space, workers=1)
+    results = optimize(script_path, data_path, syminfo, space, workers=1, fast=True)
+    assert [result.stats for result in results] == [result.stats for result in expected]
@@ -0,0 +1,108 @@
+"""
+@pyne
+"""
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+from pynecore.lib import script, close, plot, ta, na, bar_index
+from pynecore.core.ohlcv_file import OHLCVWriter, OHLCVReader
+from pynecore.core.plot_file import PlotReader, PlotWriter
+from pynecore.core.script_runner import ScriptRunner
+
+
+@script.indicator("Plot File Test", overlay=True)
+def main():
+    plot(ta.sma(close, 10), "sma")
+    return {
+        "rsi": ta.rsi(close, 14),
+        "even": bar_index % 2 == 0,
+        "sparse": close if bar_index % 3 == 0 else na(float),
+    }
+
+
+def _create_data(tmp_path: Path) -> Path:
+    """ Convert the strategy test data to ohlcv format """
+    data_path = tmp_path / "plot_file.ohlcv"
+    csv_path = Path(__file__).parent.parent.parent / "t01_lib" / "t30_strategy" / "data" / "strat_ohlcv.csv"
+    with OHLCVWriter(data_path) as writer:
+        writer.load_from_csv(csv_path)
+    return data_path
+
+
+def _run(script_path: Path, syminfo, data_path: Path, time_to: int, plot_path: Path,
+         checkpoint_path: Path | None = None) -> int:
+    """ Run the script in a freshly imported module, return the number of processed bars """
+    sys.modules.pop(script_path.stem, None)
+    with OHLCVReader(data_path) as reader:
+        r = ScriptRunner(script_path, reader.read_from(reader.start_timestamp, time_to), syminfo,
+                         plot_path=plot_path, checkpoint_path=checkpoint_path, resume=checkpoint_path is not None)
+        return sum(1 for _ in r.run_iter())
+
+
+# noinspection PyShadowingNames
+def __test_plot_file__(tmp_path, script_path, syminfo, runner):
+    """ The binary plot file has the same data as the CSV plot output """
+    # The runner fixture reloads the library with the import hook, then every run imports the script again
+    runner(())
+    data_path = _create_data(tmp_path)
+    end = 1641160800 + 2000 * 3600
+
+    bars = _run(script_path, syminfo, data_path, end, tmp_path / "out.csv")
+    assert _run(script_path, syminfo, data_path, end, tmp_path / "out.plot") == bars
+
+    with PlotReader(tmp_path / "out.plot") as reader:
+        assert reader.columns == ['time', 'open', 'high', 'low', 'close', 'volume', 'sma', 'rsi', 'even', 'sparse']
+        assert len(reader) == bars
+        rows = list(reader)
+        assert len(rows) == bars
+        assert rows[0][0] == 1641160800
+        assert [row[8] for row in rows[:4]] == [1.0, 0.0, 1.0, 0.0]
+        assert math.isnan(rows[1][9]) and rows[3][9] == rows[3][4]
+
+        # Converted to CSV it is the same as the CSV output, except the bool values
+        reader.to_csv(tmp_path / "converted.csv")
+        expected = (tmp_path / "out.csv").read_text().replace(",True,", ",1,").replace(",False,", ",0,")
+        assert (tmp_path / "converted.csv").read_text() == expected
+
+        # Columns are views of the mapped file
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        if numpy is not None:
+            assert reader.to_array().shape == (bars, 10)
+            assert reader['close'].tolist() == [row[4] for row in rows]
+            assert numpy.isnan(reader['sparse']).sum() == sum(1 for row in rows if math.isnan(row[9]))
+            with pytest.raises(KeyError):
+                reader['missing']  # noqa
+
+    # The file is continued from a checkpoint
+    checkpoint_path = tmp_path / "plot_file.checkpoint"
+    _run(script_path, syminfo, data_path, end - 800 * 3600, tmp_path / "inc.plot", checkpoint_path)
+    assert 0 < _run(script_path, syminfo, data_path, end, tmp_path / "inc.plot", checkpoint_path) < bars
+    assert (tmp_path / "inc.plot").read_bytes() == (tmp_path / "out.plot").read_bytes()
+
+
+def __test_plot_writer__(tmp_path):
+    """ Bars with missing, new or not numeric values """
+    from pynecore.types.ohlcv import OHLCV
+
+    path = tmp_path / "writer.plot"
+    with PlotWriter(path, chunk_size=2) as writer:
+        for i in range(5):
+            candle = OHLCV(i * 60, 1.0, 2.0, 0.5, 1.5, 10.0, dict(extra=i))
+            plot_data = dict(a=float(i), b=i * 2) if i != 3 else dict(b=6, c=1.0)
+            writer.write_bar(candle, plot_data)
+        with pytest.raises(ValueError):
+            writer.write_bar(OHLCV(300, 1.0, 2.0, 0.5, 1.5, 10.0), dict(a="text", b=1))
+
+    with PlotReader(path) as reader:
+        assert reader.columns == ['time', 'open', 'high', 'low', 'close', 'volume', 'extra', 'a', 'b']
+        rows = list(reader)
+    assert len(rows) == 5
+    assert rows[2] == (120.0, 1.0, 2.0, 0.5, 1.5, 10.0, 2.0, 2.0, 4.0)
+    # Missing values are NaN, new ones are dropped
+    assert math.isnan(rows[3][7]) and rows[3][6:9:2] == (3.0, 6.0)
@@ -0,0 +1,78 @@
+"""
+@pyne
+"""
+import asyncio
+import random
+
+from pynecore import Persistent
+from pynecore.lib import script, close, strategy, ta, barstate
+from pynecore.types.ohlcv import OHLCV
+
+
+@script.strategy("Realtime Strategy Test", pyramiding=2)
+def main():
+    fast = ta.sma(close, 4)
+    slow = ta.median(close, 9)
+    entries: Persistent[list[int]] = []
+    if ta.crossover(fast, slow):
+        strategy.entry("Long", strategy.long)
+        entries.append(1)
+    if ta.crossunder(fast, slow):
+        strategy.entry("Short", strategy.short)
+        entries.append(-1)
+    return {
+        "entries": len(entries),
+        "last_entry": entries[-1] if entries else 0,
+        "equity": strategy.equity,
+        "realtime": barstate.isrealtime,
+    }
+
+
+def _ohlcv(bars: int) -> list[OHLCV]:
+    rnd = random.Random(5)
+    price = 100.0
+    candles = []
+    for i in range(bars):
+        open_ = price
+        price += rnd.gauss(0.0, 1.0)
+        candles.append(OHLCV(timestamp=1672531200 + i * 60, open=open_, high=max(open_, price) + 0.5,
+                             low=min(open_, price) - 0.5, close=price, volume=10.0))
+    return candles
+
+
+async def _updates(candles: list[OHLCV]):
+    """ Every bar is updated 3 times, the last update is the final bar """
+    for candle in candles:
+        for close_ in (candle.high, candle.low):
+            yield candle._replace(close=close_)
+        yield candle
+    yield candles[-1]._replace(timestamp=candles[-1].timestamp + 60)
+
+
+def _trades(r) -> list[tuple]:
+    return [(trade.entry_id, trade.entry_bar_index, trade.exit_bar_index, trade.profit)
+            for trade in r.script.position.closed_trades]
+
+
+def __test_realtime_strategy__(runner):
+    """ Strategies are calculated only on the confirmed realtime bars, with the same results """
+    candles = _ohlcv(120)
+    history = 70
+
+    r = runner(candles)
+    expected = [{key: value for key, value in plot.items() if key != "realtime"} for _, plot, _ in r.run_iter()]
+    expected_trades = _trades(r)
+    assert len(expected_trades) > 3
+
+    r.reset()
+    r.ohlcv_iter = candles[:history]
+
+    async def run():
+        return [(dict(plot), confirmed) async for _, plot, confirmed in r.run_realtime(_updates(candles))]
+
+    results = asyncio.run(run())
+    # Unconfirmed updates are not calculated
+    assert all(confirmed for _, confirmed in results)
+    assert [plot.pop("realtime") for plot, _ in results] == [False] * history + [True] * (len(candles) - history)
+    assert [plot for plot, _ in results] == expected
+    assert _trades(r) == expected_trades
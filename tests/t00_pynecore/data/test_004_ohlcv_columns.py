@@ -0,0 +1,90 @@
+"""
+@pyne
+"""
+import pickle
+import pytest
+
+from pynecore.types.ohlcv import OHLCV
+from pynecore.core.ohlcv_file import OHLCVWriter, OHLCVReader
+
+
+def main():
+    """
+    Dummy main function to be a valid Pyne script
+    """
+    pass
+
+
+def _write_data(file_path):
+    """ Write test data with a gap in it """
+    with OHLCVWriter(file_path) as writer:
+        for i in range(10):
+            if i == 5:
+                continue  # Gap, filled by the writer
+            writer.write(OHLCV(timestamp=1609459200 + i * 60, open=100.0 + i, high=110.0 + i,
+                               low=90.0 + i, close=105.5 + i, volume=1000.0 + i))
+
+
+def __test_ohlcv_columns_iter__(tmp_path):
+    """ Columnar data gives the same bars as the reader """
+    try:
+        from pynecore.core.ohlcv_columns import OHLCVColumns
+        import numpy  # noqa
+    except ImportError:
+        pytest.skip("NumPy library not available")
+
+    file_path = tmp_path / "test_columns.ohlcv"
+    _write_data(file_path)
+
+    with OHLCVReader(str(file_path)) as reader:
+        expected = list(reader.read_from(reader.start_timestamp))
+        expected_all = list(reader.read_from(reader.start_timestamp, skip_gaps=False))
+        expected_part = list(reader.read_from(1609459200 + 2 * 60, 1609459200 + 7 * 60))
+        columns = OHLCVColumns.from_reader(reader)
+        columns_all = OHLCVColumns.from_reader(reader, skip_gaps=False)
+        columns_part = OHLCVColumns.from_reader(reader, 1609459200 + 2 * 60, 1609459200 + 7 * 60)
+
+    assert len(columns) == 9
+    assert len(columns_all) == 10
+    assert list(columns) == expected
+    assert list(columns) == expected  # It can be iterated again
+    assert list(columns_all) == expected_all
+    assert list(columns_part) == expected_part
+    assert list(columns[2:4]) == expected[2:4]
+    assert list(OHLCVColumns.from_file(file_path)) == expected
+
+    # A single record is filtered by its timestamp too
+    single_path = tmp_path / "test_columns_single.ohlcv"
+    with OHLCVWriter(single_path) as writer:
+        writer.write(expected[0])
+    assert list(OHLCVColumns.from_file(single_path)) == expected[:1]
+    assert list(OHLCVColumns.from_file(single_path, 1609459200, 1609459200)) == expected[:1]
+    assert len(OHLCVColumns.from_file(single_path, 1609459200 + 60)) == 0
+    assert len(OHLCVColumns.from_file(single_path, None, 1609459200 - 60)) == 0
+
+
+def __test_ohlcv_columns_shared__(tmp_path):
+    """ Columnar data in shared memory """
+    try:
+        from pynecore.core.ohlcv_columns import OHLCVColumns
+        import numpy  # noqa
+    except ImportError:
+        pytest.skip("NumPy library not available")
+
+    file_path = tmp_path / "test_columns_shared.ohlcv"
+    _write_data(file_path)
+
+    columns = OHLCVColumns.from_file(file_path)
+    shared = columns.share()
+    try:
+        assert shared.is_shared and not columns.is_shared
+        assert list(shared) == list(columns)
+
+        # Pickled by reference, the attached object sees the same memory
+        attached = pickle.loads(pickle.dumps(shared))
+        assert attached.is_shared
+        shared.close[0] = 1.0
+        assert attached.close[0] == 1.0
+        attached.detach()
+    finally:
+        shared.unlink()
@@ -0,0 +1,3 @@
+"""
+Request Library
+"""
@@ -0,0 +1,96 @@
+"""
+@pyne
+"""
+from pathlib import Path
+import math
+import os
+
+from pynecore.lib import script, syminfo, request, close, high, low, ta
+from pynecore.core.syminfo import SymInfo
+from pynecore.core.ohlcv_file import OHLCVWriter, OHLCVReader
+from pynecore.core.resampler import resample, resample_file
+from pynecore.types.na import NA
+
+DATA_DIR = Path(__file__).parent.parent / "t01_timeframe" / "data"
+
+
+@script.indicator(title="Request Security")
+def main():
+    return {
+        "d_close": request.security(syminfo.tickerid, "D", lambda: close),
+        "d_range": request.security(syminfo.tickerid, "D", lambda: high - low),
+        "d_sma": request.security(syminfo.tickerid, "D", lambda: ta.sma(close, 3)),
+        "close": request.security(syminfo.tickerid, "", lambda: close),
+    }
+
+
+def _daily_bars(candles) -> tuple[list[tuple[float, float, float, float]], list[int]]:
+    """ Daily bars from the timeframe.change("D") column of the data, and the daily bar of every bar """
+    bars = []
+    indices = []
+    for candle in candles:
+        if not bars or candle.extra_fields['tf_change_D']:
+            bars.append((candle.open, candle.high, candle.low, candle.close))
+        else:
+            o, h, l, _ = bars[-1]
+            bars[-1] = (o, max(h, candle.high), min(l, candle.low), candle.close)
+        indices.append(len(bars) - 1)
+    return bars, indices
+
+
+def __test_security__(csv_reader, runner):
+    """ request.security() returns the values of the last confirmed higher timeframe bar """
+    with csv_reader(DATA_DIR / "timeframe.csv") as cr:
+        candles = list(cr)
+    bars, indices = _daily_bars(candles)
+    assert len(bars) > 10
+
+    r = runner(candles, syminfo_path=DATA_DIR / "timeframe.toml")
+    for i, (candle, plot) in enumerate(r.run_iter()):
+        assert plot["close"] == candle.close
+        confirmed = indices[i] - 1
+        if confirmed < 0:
+            assert isinstance(plot["d_close"], NA) and isinstance(plot["d_range"], NA)
+            continue
+        _, h, l, c = bars[confirmed]
+        assert plot["d_close"] == c
+        assert plot["d_range"] == h - l
+        if confirmed < 2:
+            assert isinstance(plot["d_sma"], NA)
+        else:
+            expected = sum(bar[3] for bar in bars[confirmed - 2:confirmed + 1]) / 3
+            assert math.isclose(plot["d_sma"], expected, rel_tol=1e-12)
+
+
+def __test_resample__(csv_reader, tmp_path):
+    """ Higher timeframe bars follow timeframe.change() and are cached in a file """
+    with csv_reader(DATA_DIR / "timeframe.csv") as cr:
+        candles = list(cr)
+    bars, _ = _daily_bars(candles)
+    syminfo_ = SymInfo.load_toml(DATA_DIR / "timeframe.toml")
+
+    resampled = list(resample(candles, "D", syminfo_))
+    assert [(bar.open, bar.high, bar.low, bar.close) for bar in resampled] == bars
+
+    data_path = tmp_path / "eurusd.ohlcv"
+    with OHLCVWriter(data_path) as writer:
+        for candle in candles:
+            writer.write(candle)
+    syminfo_.save_toml(data_path.with_suffix(".toml"))
+
+    htf_path = resample_file(data_path, "D")
+    assert SymInfo.load_toml(htf_path.with_suffix(".toml")).period == "D"
+    # The file has float32 precision
+    with OHLCVReader(data_path) as reader:
+        expected = list(resample(reader.read_from(reader.start_timestamp, reader.end_timestamp), "D", syminfo_))
+    with OHLCVReader(htf_path) as reader:
+        assert [bar[:6] for bar in reader.read_from(reader.start_timestamp, reader.end_timestamp)] \
+               == [bar[:6] for bar in expected]
+    assert len(expected) == len(bars)
+
+    # The cached file is used until the data changes
+    mtime = htf_path.stat().st_mtime_ns
+    assert resample_file(data_path, "D") == htf_path and htf_path.stat().st_mtime_ns == mtime
+    os.utime(data_path, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+    resample_file(data_path, "D")
+    assert htf_path.stat().st_mtime_ns != mtime
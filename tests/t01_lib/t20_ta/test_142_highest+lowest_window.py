@@ -0,0 +1,37 @@
+"""
+@pyne
+"""
+from pynecore.lib import script, ta, close, bar_index
+
+
+@script.indicator(title="Highest+Lowest Window Test", shorttitle="highest+lowest window", overlay=False)
+def main():
+    # The length changes in every 100 bars
+    length = 60 - bar_index // 100 * 20
+    return {
+        "highest": ta.highest(close, 50),
+        "highestbars": ta.highestbars(close, 50),
+        "lowest": ta.lowest(close, 50),
+        "lowestbars": ta.lowestbars(close, 50),
+        "highest_var": ta.highest(close, length),
+        "highestbars_var": ta.highestbars(close, length),
+        "lowest_var": ta.lowest(close, length),
+        "lowestbars_var": ta.lowestbars(close, length),
+    }
+
+
+def __test_highest_lowest_window__(csv_reader, runner, log):
+    """ Highest + Lowest on long and changing windows, compared with a full scan of the window """
+    closes = []
+    with csv_reader('pivot.csv', subdir="data") as cr:
+        for i, (candle, plot) in enumerate(runner(cr).run_iter()):
+            closes.append(candle.close)
+            for suffix, length in (("", 50), ("_var", 60 - i // 100 * 20)):
+                if i < length - 1:
+                    assert plot["highest" + suffix] != plot["highest" + suffix]  # NA is plotted as NaN
+                    continue
+                window = closes[-length:]
+                for name, func in (("highest", max), ("lowest", min)):
+                    value, offset = plot[name + suffix], plot[name + "bars" + suffix]
+                    assert value == func(window), (i, name + suffix)
+                    assert -length < offset <= 0 and closes[i + int(offset)] == value, (i, name + suffix)
@@ -0,0 +1,89 @@
+"""
+@pyne
+"""
+import math as py_math
+
+from pynecore.lib import script, ta, math, close, bar_index
+
+
+@script.indicator(title="Order Statistics Window Test", shorttitle="order statistics window", overlay=False)
+def main():
+    # The length changes in every 100 bars
+    length = 120 - bar_index // 100 * 40
+    rounded = math.floor(close * 1000)
+    return {
+        "rounded": rounded,
+        "median": ta.median(close, 100),
+        "median_var": ta.median(close, length),
+        "mode": ta.mode(rounded, 100),
+        "mode_var": ta.mode(rounded, length),
+        "pli": ta.percentile_linear_interpolation(close, 100, 33),
+        "pli_var": ta.percentile_linear_interpolation(close, length, 33),
+        "pnr": ta.percentile_nearest_rank(close, 100, 67),
+        "pnr_var": ta.percentile_nearest_rank(close, length, 67),
+        "percentrank": ta.percentrank(close, 100),
+        "percentrank_var": ta.percentrank(close, length),
+        "rci": ta.rci(close, 100),
+        "rci_var": ta.rci(close, length),
+    }
+
+
+def _median(values: list[float]) -> float:
+    values = sorted(values)
+    n = len(values)
+    return values[n // 2] if n % 2 else (values[n // 2 - 1] + values[n // 2]) / 2
+
+
+def _mode(values: list[float]) -> float:
+    return min(values, key=lambda v: (-values.count(v), v))
+
+
+def _pli(values: list[float], percentage: float) -> float:
+    values = sorted(values)
+    pos = len(values) * percentage / 100.0
+    lower = int(pos)
+    if pos == lower:
+        return (values[lower - 1] + values[lower]) / 2.0
+    return values[lower] + (pos - lower) * (values[lower + 1] - values[lower])
+
+
+def _pnr(values: list[float], percentage: float) -> float:
+    return sorted(values)[py_math.ceil(percentage * len(values) / 100) - 1]
+
+
+def _rci(values: list[float]) -> float:
+    """ Spearman correlation of the time ranks and the data ranks, values newest first """
+    n = len(values)
+    ranks = [sum(1 for v in values if v > value) + (values.count(value) - 1) / 2.0 + 1 for value in values]
+    sum_x, sum_y = n * (n + 1) / 2, sum(ranks)
+    sum_xy = sum((i + 1) * y for i, y in enumerate(ranks))
+    sum_x2, sum_y2 = sum((i + 1) ** 2 for i in range(n)), sum(y * y for y in ranks)
+    return (n * sum_xy - sum_x * sum_y) / py_math.sqrt((n * sum_x2 - sum_x ** 2) * (n * sum_y2 - sum_y ** 2)) * 100
+
+
+def __test_order_statistics_window__(csv_reader, runner, log):
+    """ Rank based functions on long and changing windows, compared with sorting the window """
+    closes = []
+    rounded = []
+    with csv_reader('pivot.csv', subdir="data") as cr:
+        for i, (candle, plot) in enumerate(runner(cr).run_iter()):
+            closes.append(candle.close)
+            rounded.append(plot["rounded"])
+            for suffix, length in (("", 100), ("_var", 120 - i // 100 * 40)):
+                window = closes[-length:]
+                expected = {
+                    "median": _median(window) if i >= length - 1 else None,
+                    "mode": _mode(rounded[-length:]) if i >= length - 1 else None,
+                    "pli": _pli(window, 33) if i >= length - 1 else None,
+                    "pnr": _pnr(window, 67) if i >= length - 1 else None,
+                    "percentrank": (sum(1 for v in closes[-length - 1:] if v <= candle.close) - 1) * 100 / length
+                    if i >= length else None,
+                    "rci": _rci(window[::-1]) if i >= length else None,
+                }
+                for name, value in expected.items():
+                    result = plot[name + suffix]
+                    if value is None:
+                        assert result != result, (i, name + suffix)  # NA is plotted as NaN
+                    else:
+                        assert py_math.isclose(result, value, rel_tol=1e-9, abs_tol=1e-9), \
+                            (i, name + suffix, result, value)
@@ -0,0 +1,87 @@
+"""
+@pyne
+"""
+import math as py_math
+import random
+
+from pynecore.lib import script, ta, open, close
+from pynecore.types.ohlcv import OHLCV
+
+LENGTH = 30
+
+
+@script.indicator(title="Running Sums Test", shorttitle="running sums", overlay=False)
+def main():
+    return {
+        "wma": ta.wma(close, LENGTH),
+        "linreg": ta.linreg(close, LENGTH, 0),
+        "linreg_offset": ta.linreg(close, LENGTH, 2),
+        "correlation": ta.correlation(close, open, LENGTH),
+        "cog": ta.cog(close, LENGTH),
+        "dev": ta.dev(close, LENGTH),
+        "alma": ta.alma(close, LENGTH, 0.85, 6),
+    }
+
+
+def _ohlcv(bars: int) -> list[OHLCV]:
+    """ Random walk, long enough for the running sums to be renormalized """
+    rnd = random.Random(7)
+    price = 1000.0
+    candles = []
+    for i in range(bars):
+        open_ = price
+        price += rnd.gauss(0.0, 5.0)
+        candles.append(OHLCV(timestamp=1672531200 + i * 3600, open=open_, high=max(open_, price) + 1.0,
+                             low=min(open_, price) - 1.0, close=price, volume=100.0))
+    return candles
+
+
+def _linreg(values: list[float], offset: int) -> float:
+    """ Least squares line of the window (oldest value first) at the offset """
+    n = len(values)
+    mean_x = (n - 1) / 2
+    mean_y = py_math.fsum(values) / n
+    slope = (py_math.fsum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+             / py_math.fsum((x - mean_x) ** 2 for x in range(n)))
+    return mean_y + slope * (n - 1 - offset - mean_x)
+
+
+def _correlation(xs: list[float], ys: list[float]) -> float:
+    mean_x = py_math.fsum(xs) / len(xs)
+    mean_y = py_math.fsum(ys) / len(ys)
+    cov = py_math.fsum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return cov / py_math.sqrt(py_math.fsum((x - mean_x) ** 2 for x in xs)
+                              * py_math.fsum((y - mean_y) ** 2 for y in ys))
+
+
+def _alma(values: list[float]) -> float:
+    m = 0.85 * (LENGTH - 1)
+    s = LENGTH / 6
+    weights = [py_math.exp(-((i - m) ** 2) / (2 * s * s)) for i in range(LENGTH)]
+    return py_math.fsum(w * v for w, v in zip(weights, values)) / py_math.fsum(weights)
+
+
+def __test_running_sums__(runner, log):
+    """ Running sums match the sums of the whole window, also after they are renormalized """
+    closes = []
+    opens = []
+    for i, (candle, plot) in enumerate(runner(_ohlcv(2500)).run_iter()):
+        closes.append(candle.close)
+        opens.append(candle.open)
+        if i < LENGTH - 1:
+            assert plot["wma"] != plot["wma"]  # NA is plotted as NaN
+            continue
+
+        window = closes[-LENGTH:]
+        mean = py_math.fsum(window) / LENGTH
+        expected = {
+            "wma": py_math.fsum(v * (j + 1) for j, v in enumerate(window)) / (LENGTH * (LENGTH + 1) / 2),
+            "linreg": _linreg(window, 0),
+            "linreg_offset": _linreg(window, 2),
+            "correlation": _correlation(window, opens[-LENGTH:]),
+            "cog": -py_math.fsum(v * (LENGTH - j) for j, v in enumerate(window)) / py_math.fsum(window),
+            "dev": py_math.fsum(abs(v - mean) for v in window) / LENGTH,
+            "alma": _alma(window),
+        }
+        for name, value in expected.items():
+            assert py_math.isclose(plot[name], value, rel_tol=1e-9, abs_tol=1e-9), (i, name, plot[name], value)
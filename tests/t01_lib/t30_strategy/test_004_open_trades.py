@@ -0,0 +1,56 @@
+"""
+@pyne
+"""
+from pynecore import lib
+from pynecore.lib import script, strategy, bar_index
+from pynecore.lib.strategy import opentrades
+
+LOTS = 5
+
+
+@script.strategy("Open Trades", pyramiding=LOTS)
+def main():
+    if bar_index < LOTS:
+        strategy.entry(f"L{bar_index}", strategy.long, qty=1)
+    if bar_index % 7 == 3:
+        return {
+            "drawdown": opentrades.max_drawdown(0),
+            "runup": opentrades.max_runup(LOTS - 1),
+            "profit": opentrades.profit(1),
+        }
+    return {}
+
+
+# noinspection PyShadowingNames,PyProtectedMember
+def __test_open_trades__(csv_reader, runner):
+    """ The lazily updated drawdown, runup and profit of the open trades are the same as per bar values """
+    round_to_mintick = lib.math.round_to_mintick
+    entry_prices: list[float] = []
+    max_drawdowns: list[float] = []
+    max_runups: list[float] = []
+    checked = 0
+
+    with csv_reader('strat_ohlcv.csv', subdir="data") as cr:
+        r = runner(cr, syminfo_override=dict(timezone="US/Eastern"))
+        for candle, plot, _ in r.run_iter():
+            o, h, l, c = (round_to_mintick(v) for v in (candle.open, candle.high, candle.low, candle.close))
+            # The market orders of the previous bars are filled at the open
+            if 0 < r.bar_index <= LOTS:
+                entry_prices.append(o)
+                max_drawdowns.append(0.0)
+                max_runups.append(0.0)
+            avg_price = sum(entry_prices) / len(entry_prices) if entry_prices else 0.0
+            for i in range(len(entry_prices)):
+                max_drawdowns[i] = max(max_drawdowns[i], avg_price - l)
+                max_runups[i] = max(max_runups[i], h - avg_price)
+
+            if plot and len(entry_prices) == LOTS:
+                assert abs(plot["drawdown"] - max_drawdowns[0]) < 1e-9
+                assert abs(plot["runup"] - max_runups[LOTS - 1]) < 1e-9
+                assert abs(plot["profit"] - (c - entry_prices[1])) < 1e-9
+                checked += 1
+
+            if r.bar_index > 300:
+                break
+
+    assert checked > 30
@@ -0,0 +1,61 @@
+"""
+@pyne
+"""
+from pynecore.lib import script, strategy, close, ta, bar_index
+from pynecore.lib.strategy import closedtrades
+
+
+@script.strategy("Statistics")
+def main():
+    fast = ta.sma(close, 5)
+    slow = ta.sma(close, 15)
+    if ta.crossover(fast, slow):
+        strategy.entry("Long", strategy.long)
+    if ta.crossunder(fast, slow):
+        strategy.entry("Short", strategy.short)
+
+    # The profit of the recent trades, by index
+    count = strategy.wintrades + strategy.losstrades + strategy.eventrades
+    recent = 0.0
+    for i in range(max(count - 3, 0), count):
+        recent += closedtrades.profit(i)
+
+    return {
+        "wintrades": strategy.wintrades,
+        "grossprofit": strategy.grossprofit,
+        "grossloss": strategy.grossloss,
+        "avg_winning_trade": strategy.avg_winning_trade,
+        "avg_losing_trade": strategy.avg_losing_trade,
+        "recent": recent,
+        "bar_index": bar_index,
+    }
+
+
+# noinspection PyShadowingNames
+def __test_statistics__(csv_reader, runner):
+    """ The statistics of the strategy module are the same as the ones calculated from the closed trades """
+    profits: list[float] = []
+    checked = 0
+    with csv_reader('strat_ohlcv.csv', subdir="data") as cr:
+        r = runner(cr, syminfo_override=dict(timezone="US/Eastern"))
+        for candle, plot, new_closed_trades in r.run_iter():
+            profits.extend(trade.profit for trade in new_closed_trades)
+            wins = [p for p in profits if p > 0.0]
+            losses = [-p for p in profits if p < 0.0]
+
+            assert plot["wintrades"] == len(wins)
+            assert abs(plot["grossprofit"] - sum(wins)) < 1e-6
+            assert abs(plot["grossloss"] - sum(losses)) < 1e-6
+            assert abs(plot["avg_winning_trade"] - (sum(wins) / len(wins) if wins else 0.0)) < 1e-6
+            assert abs(plot["avg_losing_trade"] - (sum(losses) / len(losses) if losses else 0.0)) < 1e-6
+            assert abs(plot["recent"] - sum(profits[-3:])) < 1e-6
+            checked += bool(profits)
+
+            if plot["bar_index"] > 1000:
+                break
+
+        position = r.script.position
+        assert position.closed_trades_count == len(profits) > 10
+        assert [trade.profit for trade in position.closed_trades] == profits
+        assert position.stats.max_consecutive_losses >= 1
+    assert checked > 500